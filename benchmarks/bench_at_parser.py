@@ -0,0 +1,73 @@
+"""AT stream parser throughput in MB/s.
+
+Compares AtStreamParser with the naive approach of concatenating reads into
+a bytes object and splitting complete lines off the front.
+
+Best of three runs. Large reads (a modem dumping AT+CMGL) make the naive
+split quadratic, since every line copies the rest of the buffer.
+
+Usage: python benchmarks/bench_at_parser.py [megabytes] [chunk_size]
+"""
+
+import random
+import sys
+import time
+
+from kit_automate.modem.at_parser import AtStreamParser, is_final, is_urc
+
+SAMPLES = [
+    b"\r\n+CSQ: 17,99\r\n\r\nOK\r\n",
+    b'\r\n+CMTI: "SM",12\r\n',
+    b'\r\n+CUSD: 0,"Sisa pulsa Rp12.500 aktif s/d 31-12-2026",15\r\n',
+    b"\r\n+CMT: ,40\r\n0791261801000000040C912618" + b"A1" * 30 + b"\r\n",
+    b"\r\n+CMGL: 1,1,,23\r\n0791261801" + b"B2" * 20 + b"\r\n\r\nOK\r\n",
+    b"\r\n+CME ERROR: 10\r\n",
+]
+
+
+def _corpus(megabytes: float) -> bytes:
+    rng = random.Random(7)
+    out = bytearray()
+    while len(out) < megabytes * 1024 * 1024:
+        out += rng.choice(SAMPLES)
+    return bytes(out)
+
+
+def naive(chunks: list[bytes]) -> int:
+    buffer = b""
+    count = 0
+    for chunk in chunks:
+        buffer += chunk
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            text = line.strip().decode("latin-1")
+            if text:
+                is_final(text) or is_urc(text)
+                count += 1
+    return count
+
+
+def incremental(chunks: list[bytes]) -> int:
+    parser = AtStreamParser()
+    return sum(len(parser.feed(chunk)) for chunk in chunks)
+
+
+def main() -> None:
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 8
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 4096
+    data = _corpus(megabytes)
+    chunks = [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+    size_mb = len(data) / (1024 * 1024)
+
+    print(f"{size_mb:.1f} MB in {chunk_size}-byte reads")
+    for name, fn in (("naive", naive), ("incremental", incremental)):
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            events = fn(chunks)
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:<12} {size_mb / best:>8.1f} MB/s  {events} events")
+
+
+if __name__ == "__main__":
+    main()
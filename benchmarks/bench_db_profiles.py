@@ -0,0 +1,101 @@
+"""Insert and read throughput of each SQLite performance profile.
+
+Usage: python benchmarks/bench_db_profiles.py [rows] [threads]
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+from sqlalchemy import text
+
+from kit_automate.config.db_config import DB_PROFILES, DatabaseManager, DbConfig
+from kit_automate.config.log_config import setup_testing_logging
+
+CREATE = (
+    "CREATE TABLE IF NOT EXISTS sms ("
+    "id INTEGER PRIMARY KEY, msisdn TEXT NOT NULL, body TEXT NOT NULL)"
+)
+
+
+def _insert_worker(manager: DatabaseManager, start: int, count: int) -> None:
+    """Commit one row per transaction, like a modem thread saving an SMS."""
+    for i in range(start, start + count):
+        with manager.get_session() as session:
+            session.execute(
+                text("INSERT INTO sms (msisdn, body) VALUES (:m, :b)"),
+                {"m": f"62812{i % 500:07d}", "b": f"OTP {i:06d}"},
+            )
+            session.commit()
+
+
+def _read_worker(manager: DatabaseManager, count: int) -> None:
+    for i in range(count):
+        with manager.get_session() as session:
+            session.execute(
+                text("SELECT body FROM sms WHERE id = :id"), {"id": i + 1}
+            ).fetchall()
+
+
+def bench_profile(profile: str, db_path: Path, rows: int, threads: int) -> dict:
+    # The readonly profile needs an existing schema and data to read from
+    setup = DatabaseManager(DbConfig(path=str(db_path), profile="safe"))
+    setup.initialize()
+    with setup.get_session() as session:
+        session.execute(text(CREATE))
+        session.commit()
+    setup.cleanup()
+
+    manager = DatabaseManager(DbConfig(path=str(db_path), profile=profile))  # type: ignore[arg-type]
+    manager.initialize()
+    per_thread = rows // threads
+    result = {"profile": profile}
+
+    writer = manager
+    if DB_PROFILES[profile].query_only:
+        writer = DatabaseManager(DbConfig(path=str(db_path), profile="throughput"))
+        writer.initialize()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        futures = [
+            pool.submit(_insert_worker, writer, t * per_thread, per_thread)
+            for t in range(threads)
+        ]
+    for future in futures:
+        future.result()  # re-raise a failed worker instead of timing it
+    result["insert_per_s"] = per_thread * threads / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        futures = [
+            pool.submit(_read_worker, manager, per_thread) for _ in range(threads)
+        ]
+    for future in futures:
+        future.result()
+    result["read_per_s"] = per_thread * threads / (time.perf_counter() - start)
+
+    if writer is not manager:
+        writer.cleanup()
+    manager.cleanup()
+    return result
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 4_000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    setup_testing_logging()
+
+    print(f"{rows} rows, {threads} threads, one commit per insert")
+    print(f"{'profile':<12} {'insert/s':>10} {'read/s':>10}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for profile in DB_PROFILES:
+            db_path = Path(temp_dir) / f"{profile}.db"
+            r = bench_profile(profile, db_path, rows, threads)
+            print(f"{profile:<12} {r['insert_per_s']:>10.0f} {r['read_per_s']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
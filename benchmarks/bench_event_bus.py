@@ -0,0 +1,97 @@
+"""Event bus: publish cost and what reaches the dashboard under load.
+
+First times ``publish`` alone. Then worker threads publish port status at
+a fixed rate per port while the dispatcher drains at the dashboard frame
+rate for two seconds, and the table shows frames achieved, the slowest
+dispatch, and how many updates the widgets received after coalescing.
+
+Usage: python benchmarks/bench_event_bus.py [port counts...]
+"""
+
+import sys
+import threading
+import time
+
+from kit_automate.config.log_config import setup_testing_logging
+from kit_automate.events import EventBus
+
+THREADS = 8
+FPS = 30
+DURATION = 2.0
+# Status events per port per second
+RATE = 200
+
+
+def _publish_cost(events: int = 500_000) -> float:
+    bus = EventBus(max_pending=events)
+    start = time.perf_counter()
+    for i in range(events):
+        bus.publish("port", i & 63, i)
+    return (time.perf_counter() - start) / events
+
+
+def _worker(bus: EventBus, owned: range, stop: threading.Event) -> None:
+    tick = 0.01
+    count = 0
+    next_tick = time.perf_counter()
+    while not stop.is_set():
+        for _ in range(int(RATE * tick)):
+            for port in owned:
+                bus.publish("port", port, count)
+            count += 1
+        next_tick += tick
+        time.sleep(max(next_tick - time.perf_counter(), 0))
+
+
+def _run(ports: int) -> tuple[int, int, float, int]:
+    bus = EventBus()
+    updates = 0
+
+    def on_batch(batch: dict) -> None:
+        nonlocal updates
+        updates += len(batch)
+
+    bus.subscribe("port", on_batch)
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=_worker, args=(bus, range(i, ports, THREADS), stop))
+        for i in range(THREADS)
+    ]
+    for t in threads:
+        t.start()
+
+    frames = 0
+    slowest = 0.0
+    interval = 1 / FPS
+    deadline = time.perf_counter() + DURATION
+    while (now := time.perf_counter()) < deadline:
+        bus.dispatch()
+        elapsed = time.perf_counter() - now
+        slowest = max(slowest, elapsed)
+        frames += 1
+        time.sleep(max(interval - elapsed, 0))
+    stop.set()
+    for t in threads:
+        t.join()
+    return bus.stats.published, frames, slowest, updates
+
+
+def main() -> None:
+    port_counts = [int(p) for p in sys.argv[1:]] or [16, 64, 256]
+    setup_testing_logging()
+    print(f"publish: {_publish_cost() * 1e9:.0f} ns/event (single thread)\n")
+    print(
+        f"{'ports':>6} {'events/s':>9} {'frames/s':>9} {'max dispatch ms':>16} "
+        f"{'ui updates/s':>13} {'coalesced':>10}"
+    )
+    for ports in port_counts:
+        published, frames, slowest, updates = _run(ports)
+        print(
+            f"{ports:>6} {published / DURATION:>9.0f} {frames / DURATION:>9.1f} "
+            f"{slowest * 1000:>16.2f} {updates / DURATION:>13.0f} "
+            f"{1 - updates / max(published, 1):>10.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
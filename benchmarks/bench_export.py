@@ -0,0 +1,73 @@
+"""Export throughput and peak memory versus row count.
+
+Fills the inventory table with N rows, then exports it as CSV, JSONL and
+gzipped CSV. Throughput comes from an untraced run; peak memory from a
+second run under tracemalloc, and should stay flat as N grows.
+
+Usage: python benchmarks/bench_export.py [row counts...]
+"""
+
+from datetime import date
+from pathlib import Path
+import sys
+import tempfile
+import tracemalloc
+
+from sqlalchemy import insert
+
+from kit_automate.config.db_config import DatabaseManager, DbConfig
+from kit_automate.config.log_config import setup_testing_logging
+from kit_automate.config.path_config import AppPaths
+from kit_automate.database import MsisdnInventory, export_inventory
+
+
+def _fill(manager: DatabaseManager, count: int) -> None:
+    with manager.get_session() as session:
+        for start in range(0, count, 50_000):
+            session.execute(
+                insert(MsisdnInventory),
+                [
+                    {
+                        "msisdn": f"62{i:010d}",
+                        "balance": i % 100_000,
+                        "expiry": date(2026, 12, 31),
+                        "port": f"COM{i % 64}",
+                    }
+                    for i in range(start, min(start + 50_000, count))
+                ],
+            )
+        session.commit()
+
+
+def main() -> None:
+    counts = [int(s) for s in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    setup_testing_logging()
+    print(f"{'rows':>9} {'format':>8} {'rows/s':>10} {'MB':>7} {'peak KB':>8}")
+    for count in counts:
+        with tempfile.TemporaryDirectory() as scratch:
+            paths = AppPaths.create(Path(scratch))
+            paths.ensure_directories()
+            manager = DatabaseManager(
+                DbConfig(path=str(paths.data / "export.db"), profile="throughput")
+            )
+            manager.initialize()
+            manager.create_tables()
+            _fill(manager, count)
+            for fmt, compress in (("csv", False), ("jsonl", False), ("csv", True)):
+                # Tracing slows the loop down, so time and trace separate runs
+                result = export_inventory(manager, paths, fmt, compress)
+                result.path.unlink()
+                tracemalloc.start()
+                export_inventory(manager, paths, fmt, compress).path.unlink()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                label = f"{fmt}.gz" if compress else fmt
+                print(
+                    f"{count:>9} {label:>8} {result.rows / result.elapsed:>10,.0f} "
+                    f"{result.bytes / 1e6:>7.1f} {peak / 1024:>8.0f}"
+                )
+            manager.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Bulk upsert versus per-row ORM merge for MSISDN inventory sweeps.
+
+Each size is measured twice: a first sweep (all inserts) and a second sweep
+where 10% of balances changed.
+
+Usage: python benchmarks/bench_inventory_upsert.py [sizes...]
+"""
+
+from datetime import date
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+
+from kit_automate.config.db_config import DatabaseManager, DbConfig
+from kit_automate.config.log_config import setup_testing_logging
+from kit_automate.database import MsisdnInventory, upsert_inventory
+
+
+def _sweep(size: int, changed: float = 0.0) -> list[dict]:
+    rows = []
+    for i in range(size):
+        balance = 1000 + (random.randint(1, 500) if random.random() < changed else 0)
+        rows.append(
+            {
+                "msisdn": f"62812{i:07d}",
+                "balance": balance,
+                "expiry": date(2026, 12, 31),
+                "port": f"COM{i % 64}",
+            }
+        )
+    return rows
+
+
+def _manager(path: Path) -> DatabaseManager:
+    manager = DatabaseManager(DbConfig(path=str(path), profile="throughput"))
+    manager.initialize()
+    manager.create_tables()
+    return manager
+
+
+def orm_merge(manager: DatabaseManager, rows: list[dict]) -> None:
+    with manager.get_session() as session:
+        for row in rows:
+            session.merge(MsisdnInventory(**row))
+        session.commit()
+
+
+def bulk(manager: DatabaseManager, rows: list[dict]) -> None:
+    upsert_inventory(manager, rows)
+
+
+def measure(fn, path: Path, size: int) -> tuple[float, float]:
+    manager = _manager(path)
+    first, second = _sweep(size), _sweep(size, changed=0.1)
+    start = time.perf_counter()
+    fn(manager, first)
+    t_first = time.perf_counter() - start
+    start = time.perf_counter()
+    fn(manager, second)
+    t_second = time.perf_counter() - start
+    manager.cleanup()
+    return t_first, t_second
+
+
+def main() -> None:
+    sizes = [int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    setup_testing_logging()
+    random.seed(42)
+
+    print(
+        f"{'rows':>8} {'method':<10} {'insert s':>9} {'resweep s':>10} {'rows/s':>10}"
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size in sizes:
+            for name, fn in (("orm_merge", orm_merge), ("bulk", bulk)):
+                path = Path(temp_dir) / f"{name}-{size}.db"
+                t_first, t_second = measure(fn, path, size)
+                rate = size / t_second
+                print(
+                    f"{size:>8} {name:<10} {t_first:>9.3f} {t_second:>10.3f} {rate:>10.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
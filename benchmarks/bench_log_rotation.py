@@ -0,0 +1,83 @@
+"""logger.info latency while the log file rotates, sync vs queued sink.
+
+Both sinks rotate at a small size with zip compression so the run hits
+many rotations. The synchronous loguru file sink compresses in the
+calling thread; the queued sink only enqueues.
+
+Usage: python benchmarks/bench_log_rotation.py [records] [rotation_kb]
+"""
+
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+
+from loguru import logger
+
+from kit_automate.config.log_config import FILE_FORMAT
+from kit_automate.config.log_queue import QueuedSink, RotatingFileWriter
+
+PAYLOAD = "SIM check done port=P12 msisdn=628120001234 balance=12500 " * 3
+
+
+def _measure(records: int) -> list[float]:
+    latencies = []
+    for i in range(records):
+        start = time.perf_counter()
+        logger.info(f"{i} {PAYLOAD}")
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def _report(name: str, latencies: list[float], drain: float) -> None:
+    cuts = statistics.quantiles(latencies, n=1000, method="inclusive")
+    print(
+        f"{name:<8} {cuts[499] * 1e6:>8.1f} {cuts[989] * 1e6:>8.1f} "
+        f"{cuts[998] * 1e6:>9.1f} {max(latencies) * 1e3:>8.2f} {drain * 1e3:>9.1f}"
+    )
+
+
+def main() -> None:
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rotation_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    logger.remove()
+
+    print(f"{records:,} records, rotation every {rotation_kb} KB, zip compression")
+    print(
+        f"{'sink':<8} {'p50 us':>8} {'p99 us':>8} {'p99.9 us':>9} "
+        f"{'max ms':>8} {'drain ms':>9}"
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        handler = logger.add(
+            Path(temp_dir) / "sync" / "app.log",
+            format=FILE_FORMAT,
+            rotation=rotation_kb * 1024,
+            compression="zip",
+        )
+        latencies = _measure(records)
+        start = time.perf_counter()
+        logger.remove(handler)
+        _report("sync", latencies, time.perf_counter() - start)
+
+        sink = QueuedSink(
+            RotatingFileWriter(
+                Path(temp_dir) / "queued" / "app.log",
+                rotation_bytes=rotation_kb * 1024,
+            ),
+            max_queue=100_000,
+            overflow="block",
+        )
+        handler = logger.add(sink, format=FILE_FORMAT)
+        latencies = _measure(records)
+        start = time.perf_counter()
+        logger.remove(handler)
+        sink.close()
+        _report("queued", latencies, time.perf_counter() - start)
+        print(
+            f"queued sink: {sink.stats.rotations} rotations, {sink.stats.dropped} dropped"
+        )
+
+
+if __name__ == "__main__":
+    main()
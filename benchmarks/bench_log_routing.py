@@ -0,0 +1,121 @@
+"""Records/sec through the console filter and stdlib intercept, before/after.
+
+"before" is the previous implementation, kept here verbatim: the filter
+scans the noisy prefixes and looks up the WARNING level per record, and
+the intercept handler resolves the level and walks frames before it
+decides to drop a noisy record. "after" is the memoized routing table in
+``log_config``.
+
+Usage: python benchmarks/bench_log_routing.py [records]
+"""
+
+import inspect
+import logging
+import sys
+import time
+
+from loguru import logger
+
+from kit_automate.config.log_config import (
+    DEFAULT_NOISY_LOGGERS,
+    _create_filter,
+    _enable_stdlib_intercept,
+    _LevelRouter,
+    cleanup_logging,
+    setup_testing_logging,
+)
+
+NAMES = [
+    "kit_automate.modem.pool",
+    "sqlalchemy.engine.Engine",
+    "asyncio",
+    "vendor.sdk",
+]
+
+
+def _legacy_filter(record):
+    if record["name"].startswith("kit_automate"):
+        return True
+    for noisy in set(DEFAULT_NOISY_LOGGERS):
+        if record["name"].startswith(noisy):
+            return record["level"].no >= logger.level("WARNING").no
+    return True
+
+
+class _LegacyInterceptHandler(logging.Handler):
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            level = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+        for noisy in ["sqlalchemy.engine", "sqlalchemy.pool", "PySide6", "asyncio"]:
+            if record.name.startswith(noisy) and record.levelno < logging.WARNING:
+                return
+        frame, depth = inspect.currentframe(), 0
+        while frame and (depth == 0 or frame.f_code.co_filename == logging.__file__):
+            frame = frame.f_back
+            depth += 1
+        logger.opt(depth=depth, exception=record.exc_info).log(
+            level, record.getMessage()
+        )
+
+
+def _filter_rate(filter_record, records: int) -> float:
+    info = logger.level("INFO")
+    samples = [{"name": NAMES[i % len(NAMES)], "level": info} for i in range(1024)]
+    start = time.perf_counter()
+    for i in range(records):
+        filter_record(samples[i & 1023])
+    return records / (time.perf_counter() - start)
+
+
+def _intercept_rate(install, name: str, records: int) -> float:
+    logger.remove()
+    logger.add(lambda _message: None, level="DEBUG")
+    install()
+    stdlib = logging.getLogger(name)
+    start = time.perf_counter()
+    for i in range(records):
+        stdlib.info("row %d", i)
+    rate = records / (time.perf_counter() - start)
+    cleanup_logging()
+    return rate
+
+
+def main() -> None:
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    setup_testing_logging()
+    router = _LevelRouter(DEFAULT_NOISY_LOGGERS)
+
+    def install_legacy() -> None:
+        logging.basicConfig(handlers=[_LegacyInterceptHandler()], level=0, force=True)
+
+    def install_routed() -> None:
+        _enable_stdlib_intercept(_LevelRouter(DEFAULT_NOISY_LOGGERS))
+
+    rows = [
+        (
+            "console filter (mixed names)",
+            _filter_rate(_legacy_filter, records),
+            _filter_rate(_create_filter(router), records),
+        ),
+        (
+            "stdlib INFO, noisy (dropped)",
+            _intercept_rate(install_legacy, "sqlalchemy.pool.impl", records),
+            _intercept_rate(install_routed, "sqlalchemy.pool.impl", records),
+        ),
+        (
+            "stdlib INFO, app (forwarded)",
+            _intercept_rate(install_legacy, "kit_automate.bench", records // 4),
+            _intercept_rate(install_routed, "kit_automate.bench", records // 4),
+        ),
+    ]
+    setup_testing_logging()
+
+    print(f"{'path':<30} {'before/s':>12} {'after/s':>12} {'speedup':>8}")
+    for name, before, after in rows:
+        print(f"{name:<30} {before:>12,.0f} {after:>12,.0f} {after / before:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
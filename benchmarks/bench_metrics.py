@@ -0,0 +1,104 @@
+"""Per-observation overhead of the metrics registry.
+
+Times each operation in a tight loop (minus the empty-loop cost), then
+has 8 threads increment one shared counter to check that the lock-free
+per-thread shards lose no updates and keep aggregate throughput flat.
+
+Usage: python benchmarks/bench_metrics.py [iterations]
+"""
+
+import sys
+import threading
+import time
+
+from kit_automate.metrics import MetricsRegistry
+
+
+def _loop_cost(iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        pass
+    return time.perf_counter() - start
+
+
+def _counter_inc(registry: MetricsRegistry, iterations: int) -> None:
+    counter = registry.counter("bench_total")
+    for _ in range(iterations):
+        counter.inc()
+
+
+def _histogram_observe(registry: MetricsRegistry, iterations: int) -> None:
+    histogram = registry.histogram("bench_seconds")
+    for i in range(iterations):
+        histogram.observe(i * 1e-6)
+
+
+def _histogram_time(registry: MetricsRegistry, iterations: int) -> None:
+    histogram = registry.histogram("bench_seconds")
+    for _ in range(iterations):
+        with histogram.time():
+            pass
+
+
+def _timed_call(registry: MetricsRegistry, iterations: int) -> None:
+    @registry.timed("bench_seconds")
+    def decorated() -> None:
+        pass
+
+    for _ in range(iterations):
+        decorated()
+
+
+def _gauge_set(registry: MetricsRegistry, iterations: int) -> None:
+    gauge = registry.gauge("bench_depth")
+    for i in range(iterations):
+        gauge.set(i)
+
+
+OPERATIONS = {
+    "counter.inc": _counter_inc,
+    "histogram.observe": _histogram_observe,
+    "histogram.time()": _histogram_time,
+    "@histogram.timed": _timed_call,
+    "gauge.set": _gauge_set,
+}
+
+
+def measure(registry: MetricsRegistry, iterations: int) -> dict[str, float]:
+    """Nanoseconds per operation on the calling thread."""
+    base = _loop_cost(iterations)
+    results = {}
+    for name, op in OPERATIONS.items():
+        start = time.perf_counter()
+        op(registry, iterations)
+        results[name] = (time.perf_counter() - start - base) / iterations * 1e9
+    return results
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    print(f"{'operation':<20} {'ns/op':>8}")
+    for name, cost in measure(MetricsRegistry(), iterations).items():
+        print(f"{name:<20} {cost:>8.0f}")
+
+    counter = MetricsRegistry().counter("shared_total")
+
+    def work() -> None:
+        for _ in range(iterations // 8):
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    print(
+        f"\n8 threads, one counter: {counter.value:.0f}/{iterations // 8 * 8} "
+        f"increments counted, {counter.value / wall / 1e6:.2f}M inc/s aggregate"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""AT commands per second through ModemPool as the port count grows.
+
+Stand-in modems run in a child process on pty pairs and answer every
+command with OK immediately, so the numbers show reactor overhead rather
+than modem latency. Linux/macOS only.
+
+Usage: python benchmarks/bench_modem_reactor.py [commands_per_port] [ports...]
+"""
+
+import asyncio
+import multiprocessing as mp
+import os
+import selectors
+import sys
+import time
+import tty
+
+from kit_automate.config.log_config import setup_testing_logging
+from kit_automate.modem import ModemPool
+
+
+def _responders(count: int, conn) -> None:
+    selector = selectors.DefaultSelector()
+    names = []
+    for _ in range(count):
+        master, slave = os.openpty()
+        tty.setraw(master)
+        names.append(os.ttyname(slave))
+        os.set_blocking(master, False)
+        selector.register(master, selectors.EVENT_READ)
+    conn.send(names)
+    while True:
+        for key, _ in selector.select():
+            try:
+                data = os.read(key.fd, 65536)
+            except OSError:
+                continue
+            replies = data.count(b"\r")
+            if replies:
+                os.write(key.fd, b"\r\nOK\r\n" * replies)
+
+
+async def _run(devices: dict[str, str], per_port: int) -> float:
+    pool = ModemPool()
+    await pool.open(devices)
+
+    async def drive(name: str) -> None:
+        port = pool[name]
+        # Keep a window of commands in flight to exercise pipelining
+        for _ in range(per_port // 16):
+            await asyncio.gather(*(port.send("AT") for _ in range(16)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(drive(name) for name in devices))
+    elapsed = time.perf_counter() - start
+    await pool.close()
+    return len(devices) * (per_port // 16 * 16) / elapsed
+
+
+def main() -> None:
+    per_port = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    port_counts = [int(a) for a in sys.argv[2:]] or [1, 8, 32, 64]
+    setup_testing_logging()
+
+    print(f"{'ports':>6} {'cmd/s':>10} {'cmd/s/port':>11}")
+    for count in port_counts:
+        parent, child = mp.Pipe()
+        proc = mp.Process(target=_responders, args=(count, child), daemon=True)
+        proc.start()
+        names = parent.recv()
+        devices = {f"P{i}": name for i, name in enumerate(names)}
+        rate = asyncio.run(_run(devices, per_port))
+        proc.terminate()
+        proc.join()
+        print(f"{count:>6} {rate:>10.0f} {rate / count:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Modem pool throughput in process versus sharded across processes.
+
+Virtual modems run in one simulator process per 64 ports (zero latency,
+so the modem stack is the bottleneck). Every port runs the SIM check
+commands in a loop, in process and then with 2 and 4 shards. Reports
+commands per second and the event-loop lag of the main process, which is
+what the dashboard would feel.
+
+Usage: python benchmarks/bench_modem_sharding.py [ports] [rounds] [shards...]
+"""
+
+import asyncio
+import multiprocessing as mp
+import statistics
+import sys
+import time
+
+from kit_automate.config.log_config import setup_testing_logging
+from kit_automate.modem import SimProfile, create_modem_pool
+from kit_automate.modem.simulator import serve
+
+CHECK = ["AT+CPIN?", "AT+CIMI", "AT+CNUM", 'AT+CMGL="ALL"']
+PORTS_PER_SIMULATOR = 64
+
+
+async def _loop_lag(stop: asyncio.Event, lags: list[float]) -> None:
+    interval = 0.01
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def _run(
+    devices: dict[str, str], rounds: int, shards: int
+) -> tuple[float, float]:
+    pool = create_modem_pool(shards, default_timeout=30)
+    await pool.open(devices)
+    stop = asyncio.Event()
+    lags: list[float] = []
+    lag_task = asyncio.create_task(_loop_lag(stop, lags))
+    commands = 0
+
+    async def drive(name: str) -> None:
+        nonlocal commands
+        for _ in range(rounds):
+            for command in CHECK:
+                await pool.send(name, command)
+                commands += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(drive(name) for name in devices))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await lag_task
+    await pool.close()
+    p99 = statistics.quantiles(lags, n=100)[98] if len(lags) > 1 else 0.0
+    return commands / elapsed, p99
+
+
+def main() -> None:
+    ports = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    shard_counts = [int(a) for a in sys.argv[3:]] or [0, 2, 4]
+    setup_testing_logging()
+
+    simulators = []
+    devices: dict[str, str] = {}
+    for first in range(0, ports, PORTS_PER_SIMULATOR):
+        count = min(PORTS_PER_SIMULATOR, ports - first)
+        parent, child = mp.Pipe()
+        proc = mp.Process(
+            target=serve, args=(count, SimProfile(seed=first), child), daemon=True
+        )
+        proc.start()
+        simulators.append((parent, proc))
+        devices |= {f"S{first}-{name}": dev for name, dev in parent.recv().items()}
+
+    print(f"{ports} ports, {rounds} SIM checks each")
+    print(f"{'shards':>7} {'cmd/s':>10} {'loop lag p99 ms':>16}")
+    for shards in shard_counts:
+        rate, lag = asyncio.run(_run(devices, rounds, shards))
+        label = str(shards) if shards else "none"
+        print(f"{label:>7} {rate:>10.0f} {lag * 1000:>16.2f}")
+
+    for parent, proc in simulators:
+        parent.send("stop")
+        proc.join(5)
+
+
+if __name__ == "__main__":
+    main()
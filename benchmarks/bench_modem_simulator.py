@@ -0,0 +1,69 @@
+"""Modem stack under load against the virtual modem pool simulator.
+
+The simulator runs in a child process (so its CPU time is not counted)
+with a per-command latency and jitter. Every port runs the identity and
+inbox commands of a SIM check in a loop; the script reports throughput
+and per-command latency percentiles for 8, 64 and 256 ports. With a
+latency of L the ideal is ``ports / L`` commands per second.
+
+Usage: python benchmarks/bench_modem_simulator.py [latency_ms] [rounds] [ports...]
+"""
+
+import asyncio
+import multiprocessing as mp
+import statistics
+import sys
+import time
+
+from kit_automate.config.log_config import setup_testing_logging
+from kit_automate.modem import ModemPool, SimProfile
+from kit_automate.modem.simulator import serve
+
+CHECK = ["AT+CPIN?", "AT+CIMI", "AT+CNUM", 'AT+CMGL="ALL"']
+
+
+async def _run(devices: dict[str, str], rounds: int) -> tuple[float, list[float]]:
+    pool = ModemPool(default_timeout=10)
+    await pool.open(devices)
+    latencies: list[float] = []
+
+    async def drive(name: str) -> None:
+        for _ in range(rounds):
+            for command in CHECK:
+                response = await pool.send(name, command)
+                latencies.append(response.elapsed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(drive(name) for name in devices))
+    elapsed = time.perf_counter() - start
+    await pool.close()
+    return len(latencies) / elapsed, latencies
+
+
+def main() -> None:
+    latency = (float(sys.argv[1]) if len(sys.argv) > 1 else 5.0) / 1000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+    port_counts = [int(a) for a in sys.argv[3:]] or [8, 64, 256]
+    setup_testing_logging()
+    profile = SimProfile(latency=latency, jitter=latency / 5, seed=12)
+
+    print(f"simulated latency {latency * 1000:.1f} ms (+{latency * 200:.1f} ms jitter)")
+    print(f"{'ports':>6} {'cmd/s':>10} {'ideal':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for count in port_counts:
+        parent, child = mp.Pipe()
+        proc = mp.Process(target=serve, args=(count, profile, child), daemon=True)
+        proc.start()
+        devices = parent.recv()
+        rate, latencies = asyncio.run(_run(devices, rounds))
+        parent.send("stop")
+        proc.join(5)
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        ideal = count / (latency * 1.1) if latency else float("inf")
+        print(
+            f"{count:>6} {rate:>10.0f} {ideal:>10.0f} "
+            f"{cuts[49] * 1000:>8.2f} {cuts[98] * 1000:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""End-to-end OTP latency: +CMT URC on a pty modem to resolved waiter.
+
+For every round each port gets a waiter, then a stand-in modem writes a
+text-mode +CMT URC. Two latencies are reported: broker (URC parsed to
+future resolved) and end-to-end (bytes written to the pty until the
+awaiting coroutine resumed). Linux/macOS only.
+
+Usage: python benchmarks/bench_otp_latency.py [ports] [rounds]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+import tty
+
+from kit_automate.config.log_config import setup_testing_logging
+from kit_automate.modem import ModemPool
+from kit_automate.otp import OtpBroker
+
+
+def _ms(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1] * 1000
+
+
+async def _run(ports: int, rounds: int) -> tuple[list[float], OtpBroker]:
+    masters, devices = [], {}
+    for i in range(ports):
+        master, slave = os.openpty()
+        tty.setraw(master)
+        devices[f"P{i}"] = os.ttyname(slave)
+        masters.append(master)
+
+    broker = OtpBroker(clock=time.perf_counter)
+    msisdns = {name: f"62812{i:07d}" for i, name in enumerate(devices)}
+    pool = ModemPool(urc_handler=broker.urc_handler(msisdns))
+    await pool.open(devices)
+
+    end_to_end: list[float] = []
+    for r in range(rounds):
+        waiters = [
+            asyncio.create_task(broker.wait_for(m, sender="TOKO", timeout=5))
+            for m in msisdns.values()
+        ]
+        await asyncio.sleep(0)
+        sent = {}
+        for i, master in enumerate(masters):
+            sent[i] = time.perf_counter()
+            os.write(
+                master,
+                f'\r\n+CMT: "TOKOPAY","","26/10/17,10:00:00+28"\r\n'
+                f"Kode OTP {r:03d}{i:03d}\r\n".encode(),
+            )
+        for i, waiter in enumerate(waiters):
+            await waiter
+            end_to_end.append(time.perf_counter() - sent[i])
+
+    await pool.close()
+    for master in masters:
+        os.close(master)
+    return end_to_end, broker
+
+
+def main() -> None:
+    ports = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    setup_testing_logging()
+
+    end_to_end, broker = asyncio.run(_run(ports, rounds))
+    broker_latency = list(broker.stats.latencies)
+    print(f"{ports} ports x {rounds} rounds = {len(end_to_end)} OTPs")
+    for name, values in (("broker", broker_latency), ("end-to-end", end_to_end)):
+        print(
+            f"{name:<11} p50 {_ms(values, 50):6.3f} ms  "
+            f"p99 {_ms(values, 99):6.3f} ms  max {max(values) * 1000:6.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Opening large lists: keyset pager versus loading every row.
+
+Fills the inventory table, then measures time and peak Python memory to
+open the list (first page) with a :class:`KeysetPager`, sorted by key and
+by balance, against reading the whole table as a plain model would. Also
+times one page deep into the table, keyset versus ``OFFSET``.
+
+Usage: python benchmarks/bench_paging.py [row counts...]
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import Table, insert, select, text
+
+from kit_automate.config.db_config import DatabaseManager, DbConfig
+from kit_automate.config.log_config import setup_testing_logging
+from kit_automate.database import KeysetPager, MsisdnInventory
+
+TABLE: Table = MsisdnInventory.__table__  # type: ignore[assignment]
+PAGE = 500
+
+
+def _fill(manager: DatabaseManager, rows: int) -> None:
+    chunk = 50_000
+    with manager.get_session() as session:
+        for first in range(0, rows, chunk):
+            session.execute(
+                insert(TABLE),
+                [
+                    {"msisdn": f"62812{i:07d}", "balance": (i * 7919) % 100_000}
+                    for i in range(first, min(first + chunk, rows))
+                ],
+            )
+        # The views sort by balance, so it is indexed
+        session.execute(
+            text("CREATE INDEX ix_bench_balance ON msisdn_inventory (balance)")
+        )
+        session.commit()
+
+
+def _measure(fn: Callable[[], object]) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def _open(manager: DatabaseManager, sort: str | None) -> None:
+    pager = KeysetPager(manager, TABLE, page_size=PAGE)
+    pager.set_sort(sort)
+    pager.fetch_more()
+
+
+def _load_all(manager: DatabaseManager) -> None:
+    with manager.get_read_session() as session:
+        session.execute(select(TABLE)).all()
+
+
+def _timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _deep_page(manager: DatabaseManager, rows: int) -> tuple[float, float]:
+    pager = KeysetPager(manager, TABLE, page_size=PAGE, max_pages=1)
+    while pager.row_count < rows - PAGE:
+        pager.fetch_more()
+    keyset = _timed(pager.fetch_more)
+    offset = _timed(
+        lambda: _rows_at(manager, rows - PAGE),
+    )
+    return keyset, offset
+
+
+def _rows_at(manager: DatabaseManager, offset: int) -> list:
+    with manager.get_read_session() as session:
+        return session.execute(
+            select(TABLE).order_by(TABLE.c.msisdn).offset(offset).limit(PAGE)
+        ).all()
+
+
+def main() -> None:
+    sizes = [int(s) for s in sys.argv[1:]] or [100_000, 1_000_000]
+    setup_testing_logging()
+    print(f"{'rows':>9} {'open':>14} {'ms':>9} {'peak MB':>8}")
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as scratch:
+            manager = DatabaseManager(
+                DbConfig(path=str(Path(scratch) / "paging.db"), profile="throughput")
+            )
+            manager.initialize()
+            manager.create_tables()
+            _fill(manager, rows)
+            cases = {
+                "pager by key": lambda m=manager: _open(m, None),
+                "pager by saldo": lambda m=manager: _open(m, "balance"),
+                "load all": lambda m=manager: _load_all(m),
+            }
+            for name, fn in cases.items():
+                elapsed, peak = _measure(fn)
+                print(f"{rows:>9} {name:>14} {elapsed * 1000:>9.1f} {peak / 1e6:>8.1f}")
+            keyset, offset = _deep_page(manager, rows)
+            print(
+                f"{rows:>9} {'last page':>14} keyset {keyset * 1000:.2f} ms, "
+                f"offset {offset * 1000:.2f} ms"
+            )
+            manager.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Rekap query time: GROUP BY over the history versus the summary tables.
+
+Fills a database with a quarter of transactions (5 products, 4 statuses),
+then times the rekap screen for one week and for the whole quarter both
+ways, plus the cost of one insert including its two summary upserts.
+
+Usage: python benchmarks/bench_rekap.py [history sizes...]
+"""
+
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import func, select
+
+from kit_automate.config.db_config import DatabaseManager, DbConfig
+from kit_automate.config.log_config import setup_testing_logging
+from kit_automate.database import Transaction, add_transaction, rekap_by_day
+
+START = date(2026, 1, 1)
+DAYS = 90
+STATUSES = ("success", "failed", "pending", "refund")
+
+
+def _fill(manager: DatabaseManager, size: int) -> float:
+    rng = random.Random(size)
+    start = time.perf_counter()
+    with manager.get_session() as session:
+        for i in range(size):
+            day = START + timedelta(days=rng.randrange(DAYS))
+            add_transaction(
+                session,
+                f"62812{rng.randrange(5_000):07d}",
+                f"V{rng.randrange(5)}",
+                rng.choice(STATUSES),
+                amount=rng.choice((5_000, 10_000, 25_000)),
+                at=datetime.combine(day, datetime.min.time()) + timedelta(seconds=i),
+            )
+        session.commit()
+    return (time.perf_counter() - start) / size
+
+
+def _group_by(manager: DatabaseManager, start: date, end: date) -> list:
+    with manager.get_read_session() as session:
+        return session.execute(
+            select(
+                Transaction.day,
+                Transaction.product,
+                Transaction.status,
+                func.count(),
+                func.sum(Transaction.amount),
+            )
+            .where(Transaction.day.between(start, end))
+            .group_by(Transaction.day, Transaction.product, Transaction.status)
+        ).all()
+
+
+def _best(fn, repeat: int = 20) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    sizes = [int(s) for s in sys.argv[1:]] or [10_000, 100_000]
+    setup_testing_logging()
+    ranges = {
+        "week": (START, START + timedelta(days=6)),
+        "quarter": (START, START + timedelta(days=DAYS - 1)),
+    }
+    print(
+        f"{'history':>9} {'insert us':>10} {'range':>8} {'group by ms':>12} "
+        f"{'summary ms':>11} {'rows':>6}"
+    )
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as scratch:
+            manager = DatabaseManager(
+                DbConfig(path=str(Path(scratch) / "rekap.db"), profile="throughput")
+            )
+            manager.initialize()
+            manager.create_tables()
+            insert_cost = _fill(manager, size)
+            for name, (start, end) in ranges.items():
+                scan = _best(lambda m=manager, s=start, e=end: _group_by(m, s, e))
+                summary = _best(lambda m=manager, s=start, e=end: rekap_by_day(m, s, e))
+                rows = len(rekap_by_day(manager, start, end))
+                print(
+                    f"{size:>9} {insert_cost * 1e6:>10.1f} {name:>8} "
+                    f"{scan * 1000:>12.2f} {summary * 1000:>11.2f} {rows:>6}"
+                )
+            manager.cleanup()
+
+
+if __name__ == "__main__":
+    main()
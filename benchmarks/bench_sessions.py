@@ -0,0 +1,100 @@
+"""Purchases with and without the warm session pool.
+
+Runs a stream of purchases spread over a set of MSISDNs against the local
+:class:`StubShop`, whose login waits ``otp_delay`` seconds like a real
+OTP SMS. Compares logging in for every purchase with a
+:class:`SessionManager` of a few pool sizes, including a restart that
+starts from the saved storage state. Reports purchases per second, logins
+and where each session came from.
+
+Usage: python benchmarks/bench_sessions.py [purchases] [msisdns] [otp_delay]
+"""
+
+import asyncio
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+
+from kit_automate.automation import FakeContext, FakeDriver, SessionManager, StubShop
+from kit_automate.config.log_config import setup_testing_logging
+
+
+def _flows(shop: StubShop):
+    async def login(context: FakeContext, msisdn: str) -> None:
+        await context.fetch(f"{shop.url}/login", {"msisdn": msisdn})
+        await context.fetch(
+            f"{shop.url}/verify", {"msisdn": msisdn, "otp": shop.otps[msisdn]}
+        )
+
+    async def validate(context: FakeContext, msisdn: str) -> bool:
+        status, body = await context.fetch(f"{shop.url}/account")
+        return status == 200 and body == msisdn
+
+    return login, validate
+
+
+async def _cold(shop: StubShop, order: list[str]) -> float:
+    login, _ = _flows(shop)
+    driver = FakeDriver()
+    start = time.perf_counter()
+    for msisdn in order:
+        context = await driver.new_context()
+        await login(context, msisdn)
+        await context.fetch(f"{shop.url}/account")
+        await context.close()
+    return time.perf_counter() - start
+
+
+async def _pooled(
+    shop: StubShop, order: list[str], state_dir: Path, max_contexts: int
+) -> tuple[float, SessionManager]:
+    login, validate = _flows(shop)
+    manager = SessionManager(
+        FakeDriver(), state_dir, login, validate, max_contexts=max_contexts
+    )
+    start = time.perf_counter()
+    for msisdn in order:
+        async with manager.session(msisdn) as context:
+            await context.fetch(f"{shop.url}/account")
+    elapsed = time.perf_counter() - start
+    await manager.close()
+    return elapsed, manager
+
+
+def main() -> None:
+    purchases = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    msisdns = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    otp_delay = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+    setup_testing_logging()
+
+    rng = random.Random(7)
+    numbers = [f"0812{i:07d}" for i in range(msisdns)]
+    order = [rng.choice(numbers) for _ in range(purchases)]
+    print(f"{purchases} purchases over {msisdns} MSISDNs, OTP wait {otp_delay}s")
+    print(f"{'mode':>16} {'buys/s':>8} {'logins':>7} {'warm':>5} {'restored':>9}")
+
+    with StubShop(login_delay=otp_delay) as shop:
+        elapsed = asyncio.run(_cold(shop, order))
+        print(f"{'login each time':>16} {purchases / elapsed:>8.1f} {purchases:>7}")
+
+        for max_contexts in (4, msisdns):
+            with tempfile.TemporaryDirectory() as scratch:
+                state_dir = Path(scratch)
+                runs = [f"pool {max_contexts}", "  after restart"]
+                for label in runs:
+                    before = shop.logins
+                    elapsed, manager = asyncio.run(
+                        _pooled(shop, order, state_dir, max_contexts)
+                    )
+                    stats = manager.stats
+                    print(
+                        f"{label:>16} {purchases / elapsed:>8.1f} "
+                        f"{shop.logins - before:>7} {stats.warm:>5} "
+                        f"{stats.restored:>9}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
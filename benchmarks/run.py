@@ -0,0 +1,149 @@
+"""Run the benchmark suite and flag regressions against a baseline.
+
+Results go as JSON to ``<base>/reports/benchmarks/<timestamp>.json``
+(``AppPaths.reports``); the baseline is ``baseline.json`` next to them.
+Each case runs ``--repeat`` times and the best value is kept, which filters
+out most scheduler noise. Exits with status 1 when any metric is worse
+than its baseline by more than ``--threshold``.
+
+Usage:
+    python benchmarks/run.py                   # run all, compare to baseline
+    python benchmarks/run.py --save-baseline   # run all, store as baseline
+    python benchmarks/run.py --quick --only db otp
+"""
+
+import argparse
+from dataclasses import asdict
+from datetime import datetime
+from importlib import metadata
+import json
+from pathlib import Path
+import platform
+import sys
+import tempfile
+
+from suite import CASES, Metric
+
+from kit_automate.config.log_config import setup_testing_logging
+from kit_automate.config.path_config import AppPaths
+
+BASELINE_FILE = "baseline.json"
+
+
+def _best(runs: list[list[Metric]]) -> list[Metric]:
+    best: dict[str, Metric] = {}
+    for metrics in runs:
+        for metric in metrics:
+            current = best.get(metric.name)
+            better = current is None or (
+                metric.value > current.value
+                if metric.higher_is_better
+                else metric.value < current.value
+            )
+            if better:
+                best[metric.name] = metric
+    return list(best.values())
+
+
+def run_cases(names: list[str], scale: float, repeat: int) -> dict[str, list[dict]]:
+    results = {}
+    for name in names:
+        print(f"running {name}...", file=sys.stderr)
+        runs = []
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as scratch:
+                runs.append(CASES[name](scale, Path(scratch)))
+        results[name] = [asdict(m) for m in _best(runs)]
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print every metric with its change and return the regressed ones."""
+    regressions = []
+    print(f"{'metric':<36} {'value':>12} {'baseline':>12} {'change':>8}")
+    for case_name, metrics in results.items():
+        base_metrics = {m["name"]: m for m in baseline.get(case_name, [])}
+        for metric in metrics:
+            key = f"{case_name}.{metric['name']}"
+            base = base_metrics.get(metric["name"])
+            if base is None or not base["value"]:
+                print(f"{key:<36} {metric['value']:>12.2f} {'-':>12} {'new':>8}")
+                continue
+            change = metric["value"] / base["value"] - 1
+            worse = -change if metric["higher_is_better"] else change
+            flag = ""
+            if worse > threshold:
+                flag = "  REGRESSION"
+                regressions.append(key)
+            print(
+                f"{key:<36} {metric['value']:>12.2f} {base['value']:>12.2f} "
+                f"{change:>+8.1%}{flag}"
+            )
+    return regressions
+
+
+def _environment() -> dict:
+    try:
+        version = metadata.version("kit-automate")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "version": version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES), default=None)
+    parser.add_argument("--quick", action="store_true", help="smaller workloads")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--base-path", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    setup_testing_logging()
+    paths = AppPaths.create(args.base_path)
+    out_dir = paths.reports / "benchmarks"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    baseline_path = args.baseline or out_dir / BASELINE_FILE
+
+    names = args.only or list(CASES)
+    scale = 0.1 if args.quick else 1.0
+    report = {
+        "environment": _environment(),
+        "scale": scale,
+        "results": run_cases(names, scale, args.repeat),
+    }
+
+    result_path = out_dir / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    result_path.write_text(json.dumps(report, indent=2))
+    print(f"results written to {result_path}")
+
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2))
+        print(f"baseline saved to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"no baseline at {baseline_path}; run with --save-baseline")
+        compare(report["results"], {}, args.threshold)
+        return 0
+
+    baseline = json.loads(baseline_path.read_text())
+    if baseline.get("scale") != scale:
+        print("warning: baseline was recorded at a different --quick setting")
+    regressions = compare(report["results"], baseline["results"], args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+"""Benchmark cases run by ``benchmarks/run.py``.
+
+Every case takes a ``scale`` (1.0 normal, smaller for ``--quick``) and a
+scratch directory, and returns its metrics. Cases are fully offline:
+databases live in the scratch directory and modems are simulated on ptys.
+"""
+
+import asyncio
+from collections.abc import Callable
+import contextlib
+from dataclasses import dataclass
+import datetime as dt
+import io
+import logging
+import multiprocessing as mp
+from pathlib import Path
+import random
+import sys
+import time
+
+from sqlalchemy import select
+
+from kit_automate.config import create_application_context
+from kit_automate.config.db_config import DatabaseManager, DbConfig
+from kit_automate.config.log_config import (
+    cleanup_logging,
+    setup_logger,
+    setup_testing_logging,
+)
+
+
+@dataclass(frozen=True)
+class Metric:
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool = True
+
+
+Case = Callable[[float, Path], list[Metric]]
+CASES: dict[str, Case] = {}
+
+
+def case(name: str) -> Callable[[Case], Case]:
+    def register(fn: Case) -> Case:
+        CASES[name] = fn
+        return fn
+
+    return register
+
+
+def _rows(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "msisdn": f"62812{i:07d}",
+            "balance": rng.randrange(0, 100_000),
+            "expiry": dt.date(2026, 1, 1) + dt.timedelta(days=rng.randrange(365)),
+            "port": f"P{i % 64}",
+        }
+        for i in range(count)
+    ]
+
+
+def _database(scratch: Path, name: str) -> DatabaseManager:
+    manager = DatabaseManager(
+        DbConfig(path=str(scratch / f"{name}.db"), profile="throughput")
+    )
+    manager.initialize()
+    manager.create_tables()
+    return manager
+
+
+@case("startup")
+def bench_startup(scale: float, scratch: Path) -> list[Metric]:
+    """Full create_application_context() and cleanup on a fresh directory."""
+    runs = max(int(10 * scale), 2)
+    timings = []
+    for i in range(runs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            context = create_application_context(scratch / f"startup{i}")
+            timings.append(time.perf_counter() - start)
+            context.cleanup()
+    setup_testing_logging()
+    return [
+        Metric("create_context_ms", min(timings) * 1000, "ms", False),
+        Metric(
+            "create_context_median_ms", sorted(timings)[runs // 2] * 1000, "ms", False
+        ),
+    ]
+
+
+@case("db")
+def bench_db(scale: float, scratch: Path) -> list[Metric]:
+    """Insert, upsert and point-query throughput of the inventory table."""
+    from kit_automate.database import MsisdnInventory, upsert_inventory
+
+    count = max(int(20_000 * scale), 500)
+    rows = _rows(count, seed=1)
+    manager = _database(scratch, "db")
+    try:
+        start = time.perf_counter()
+        with manager.get_session() as session:
+            session.add_all(MsisdnInventory(**row) for row in rows)
+            session.commit()
+        insert = count / (time.perf_counter() - start)
+
+        changed = [
+            {**row, "balance": row["balance"] + 1} if i % 2 else row
+            for i, row in enumerate(rows)
+        ]
+        start = time.perf_counter()
+        upsert_inventory(manager, changed)
+        upsert = count / (time.perf_counter() - start)
+
+        lookups = count // 4
+        start = time.perf_counter()
+        with manager.get_read_session() as session:
+            for i in range(lookups):
+                session.execute(
+                    select(MsisdnInventory.balance).where(
+                        MsisdnInventory.msisdn == f"62812{i * 4 % count:07d}"
+                    )
+                ).scalar_one()
+        query = lookups / (time.perf_counter() - start)
+    finally:
+        manager.cleanup()
+    return [
+        Metric("insert_rows_per_s", insert, "rows/s"),
+        Metric("upsert_rows_per_s", upsert, "rows/s"),
+        Metric("query_per_s", query, "queries/s"),
+    ]
+
+
+@case("logging")
+def bench_logging(scale: float, scratch: Path) -> list[Metric]:
+    """Cost of one log call through the setup_logger() sinks."""
+    from loguru import logger
+
+    count = max(int(20_000 * scale), 1_000)
+    stdlib = logging.getLogger("kit_automate.bench")
+    with contextlib.redirect_stdout(io.StringIO()):
+        setup_logger(scratch / "logs", level="INFO")
+        start = time.perf_counter()
+        for i in range(count):
+            logger.info(f"SIM check done {i}")
+        loguru_cost = (time.perf_counter() - start) / count
+
+        start = time.perf_counter()
+        for i in range(count):
+            stdlib.info("SIM check done %d", i)
+        stdlib_cost = (time.perf_counter() - start) / count
+
+        start = time.perf_counter()
+        for i in range(count):
+            logger.debug(f"filtered {i}")  # below console level, file only
+        debug_cost = (time.perf_counter() - start) / count
+        cleanup_logging()
+    setup_testing_logging()
+    return [
+        Metric("loguru_info_us", loguru_cost * 1e6, "us", False),
+        Metric("stdlib_intercept_us", stdlib_cost * 1e6, "us", False),
+        Metric("debug_file_only_us", debug_cost * 1e6, "us", False),
+    ]
+
+
+@case("at_parser")
+def bench_at_parser(scale: float, _scratch: Path) -> list[Metric]:
+    """Incremental AT stream parsing throughput."""
+    from kit_automate.modem import AtStreamParser
+
+    samples = [
+        b"\r\n+CSQ: 17,99\r\n\r\nOK\r\n",
+        b'\r\n+CMTI: "SM",12\r\n',
+        b'\r\n+CUSD: 0,"Sisa pulsa Rp12.500 aktif s/d 31-12-2026",15\r\n',
+        b'\r\n+CMGL: 1,"REC UNREAD","TOKOPAY","","26/10/17,10:00:00+28"\r\n'
+        b"Kode OTP 482913\r\n\r\nOK\r\n",
+    ]
+    rng = random.Random(7)
+    data = b"".join(
+        rng.choice(samples) for _ in range(max(int(100_000 * scale), 5_000))
+    )
+    chunks = [data[i : i + 4096] for i in range(0, len(data), 4096)]
+
+    parser = AtStreamParser()
+    start = time.perf_counter()
+    for chunk in chunks:
+        parser.feed(chunk)
+    elapsed = time.perf_counter() - start
+    return [Metric("parse_mb_per_s", len(data) / elapsed / 1e6, "MB/s")]
+
+
+async def _drive_modems(devices: dict[str, str], per_port: int) -> tuple[float, float]:
+    from kit_automate.modem import ModemPool
+
+    pool = ModemPool(default_timeout=10)
+    await pool.open(devices)
+    latencies: list[float] = []
+
+    async def drive(name: str) -> None:
+        for _ in range(per_port):
+            latencies.append((await pool.send(name, "AT+CIMI")).elapsed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(drive(name) for name in devices))
+    elapsed = time.perf_counter() - start
+    await pool.close()
+    latencies.sort()
+    return len(latencies) / elapsed, latencies[int(len(latencies) * 0.99)]
+
+
+@case("serial")
+def bench_serial(scale: float, _scratch: Path) -> list[Metric]:
+    """AT round trips through ModemPool against 8 simulated modems."""
+    if sys.platform == "win32":
+        return []
+    from kit_automate.modem import SimProfile
+    from kit_automate.modem.simulator import serve
+
+    parent, child = mp.Pipe()
+    proc = mp.Process(target=serve, args=(8, SimProfile(), child), daemon=True)
+    proc.start()
+    try:
+        devices = parent.recv()
+        rate, p99 = asyncio.run(_drive_modems(devices, max(int(500 * scale), 50)))
+    finally:
+        parent.send("stop")
+        proc.join(5)
+    return [
+        Metric("at_commands_per_s", rate, "cmd/s"),
+        Metric("at_p99_ms", p99 * 1000, "ms", False),
+    ]
+
+
+@case("otp")
+def bench_otp(scale: float, _scratch: Path) -> list[Metric]:
+    """Rule extraction throughput and publish-to-waiter resolution rate."""
+    from kit_automate.otp import OtpBroker, OtpRuleEngine, SmsMessage
+    from kit_automate.otp.rules import OtpRule
+
+    engine = OtpRuleEngine(
+        [
+            OtpRule(
+                f"shop{i}",
+                rf"SHOP{i} kode otp\D*(?P<code>\d{{6}})",
+                senders=(f"SHOP{i}",),
+                keywords=("otp",),
+            )
+            for i in range(20)
+        ]
+        + [OtpRule("generic", r"code:? (?P<code>\d{4,6})")]
+    )
+    rng = random.Random(3)
+    count = max(int(50_000 * scale), 2_000)
+    messages = []
+    for _ in range(count):
+        shop = rng.randrange(20)
+        body = (
+            f"SHOP{shop} Kode OTP {rng.randrange(10**6):06d}"
+            if rng.random() < 0.2
+            else "Promo pulsa 50000 hanya hari ini"
+        )
+        messages.append(SmsMessage("0812", f"SHOP{shop}", body))
+
+    start = time.perf_counter()
+    for message in messages:
+        engine(message)
+    extract_rate = count / (time.perf_counter() - start)
+
+    async def resolve(rounds: int) -> float:
+        broker = OtpBroker(extractor=engine)
+        msisdns = [f"62812{i:07d}" for i in range(64)]
+        start = time.perf_counter()
+        for r in range(rounds):
+            waiters = [asyncio.create_task(broker.wait_for(m)) for m in msisdns]
+            await asyncio.sleep(0)
+            for m in msisdns:
+                broker.publish(SmsMessage(m, "SHOP1", f"SHOP1 kode OTP {r:06d}"))
+            await asyncio.gather(*waiters)
+        return rounds * len(msisdns) / (time.perf_counter() - start)
+
+    resolve_rate = asyncio.run(resolve(max(int(200 * scale), 10)))
+    return [
+        Metric("extract_msgs_per_s", extract_rate, "msg/s"),
+        Metric("resolve_per_s", resolve_rate, "otp/s"),
+    ]
+
+
+@case("metrics")
+def bench_metrics(scale: float, _scratch: Path) -> list[Metric]:
+    """Cost of one counter increment and one histogram timing."""
+    from kit_automate.metrics import MetricsRegistry
+
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_total")
+    histogram = registry.histogram("bench_seconds")
+    count = max(int(200_000 * scale), 10_000)
+
+    start = time.perf_counter()
+    for _ in range(count):
+        counter.inc()
+    inc_cost = (time.perf_counter() - start) / count
+
+    start = time.perf_counter()
+    for _ in range(count):
+        with histogram.time():
+            pass
+    time_cost = (time.perf_counter() - start) / count
+    return [
+        Metric("counter_inc_ns", inc_cost * 1e9, "ns", False),
+        Metric("histogram_time_ns", time_cost * 1e9, "ns", False),
+    ]
+
+
+@case("event_bus")
+def bench_event_bus(scale: float, _scratch: Path) -> list[Metric]:
+    """Publish cost and dispatch cost of one 64-port frame."""
+    from kit_automate.events import EventBus
+
+    count = max(int(200_000 * scale), 10_000)
+    bus = EventBus(max_pending=count)
+    bus.subscribe("port", len)
+
+    start = time.perf_counter()
+    for i in range(count):
+        bus.publish("port", i & 63, i)
+    publish_cost = (time.perf_counter() - start) / count
+
+    start = time.perf_counter()
+    bus.dispatch()
+    dispatch_cost = time.perf_counter() - start
+    return [
+        Metric("event_publish_ns", publish_cost * 1e9, "ns", False),
+        Metric("event_dispatch_ms", dispatch_cost * 1000, "ms", False),
+    ]
@@ -0,0 +1,9 @@
+"""Collection settings shared by tests/ and the src/ doctests."""
+
+import importlib.util
+
+# The GUI modules import PySide6 at module level; without it (headless CI
+# images) their doctests cannot be collected. tests/gui skips on its own.
+collect_ignore_glob = (
+    [] if importlib.util.find_spec("PySide6") else ["src/kit_automate/gui/*"]
+)
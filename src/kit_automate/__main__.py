@@ -0,0 +1,98 @@
+"""Command line entry point: ``kit-automate`` / ``python -m kit_automate``."""
+
+import argparse
+import json
+from pathlib import Path
+import sys
+import time
+
+
+def profile_startup() -> int:
+    """Start the application once, then report where the time went."""
+    from kit_automate.startup import ImportProfiler, StartupReport
+
+    phases: dict[str, float] = {}
+    start = time.perf_counter()
+    try:
+        with ImportProfiler() as imports:
+            from kit_automate.config import create_application_context
+
+            context = create_application_context(phase_timings=phases)
+    except RuntimeError as e:
+        from loguru import logger
+
+        logger.error(f"Application failed to start: {e}")
+        return 1
+    report = StartupReport(imports, phases, time.perf_counter() - start)
+    try:
+        path = report.write(context.paths.reports)
+    finally:
+        context.cleanup()
+    print(report.format())
+    print(f"\nReport written to {path}")
+    return 0
+
+
+def query_journal(msisdn: str | None, txn: str | None, log_dir: Path | None) -> int:
+    """Print the journal records of an MSISDN and/or transaction as JSON lines."""
+    from kit_automate.config.log_journal import query_journal as query
+    from kit_automate.config.path_config import AppPaths
+
+    found = 0
+    for record in query(log_dir or AppPaths.create().logs, msisdn=msisdn, txn=txn):
+        print(json.dumps(record, ensure_ascii=False))
+        found += 1
+    return 0 if found else 1
+
+
+def rekap(action: str) -> int:
+    """Verify or rebuild the rekap summary tables; 1 if they were out of date."""
+    from kit_automate.config.db_config import create_database_manager
+    from kit_automate.config.path_config import AppPaths
+    from kit_automate.database.rekap import rebuild_rekap, verify_rekap
+
+    db_manager = create_database_manager(AppPaths.create())
+    db_manager.initialize()
+    try:
+        db_manager.create_tables()
+        check = (rebuild_rekap if action == "rebuild" else verify_rekap)(db_manager)
+    finally:
+        db_manager.cleanup()
+    print(
+        f"rekap_daily: {check.daily_mismatches} mismatched rows, "
+        f"rekap_msisdn: {check.msisdn_mismatches} mismatched rows"
+    )
+    return 0 if check.consistent else 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="kit-automate")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="report import and initialization times, then exit",
+    )
+    parser.add_argument(
+        "--rekap",
+        choices=["verify", "rebuild"],
+        help="check the rekap summary tables against the history, or rebuild them",
+    )
+    query = parser.add_argument_group("transaction journal query")
+    query.add_argument("--msisdn", help="print journal records for this MSISDN")
+    query.add_argument("--txn", help="print journal records for this transaction")
+    query.add_argument("--log-dir", type=Path, help="defaults to ./logs")
+    args = parser.parse_args(argv)
+    if args.profile_startup:
+        return profile_startup()
+    if args.rekap:
+        return rekap(args.rekap)
+    if args.msisdn or args.txn:
+        return query_journal(args.msisdn, args.txn, args.log_dir)
+
+    from kit_automate.main import main as run
+
+    return run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
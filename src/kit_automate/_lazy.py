@@ -0,0 +1,39 @@
+"""Lazy package exports (PEP 562) so importing a package stays cheap.
+
+Heavy dependencies (SQLAlchemy, pyserial, later PySide6 and Playwright) are
+imported the first time one of their names is used, not when the package
+is imported.
+"""
+
+from collections.abc import Callable, Mapping
+import importlib
+import sys
+from typing import Any
+
+
+def lazy_exports(
+    package: str, exports: Mapping[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Build a package's ``__getattr__`` and ``__dir__``.
+
+    Args:
+        package: ``__name__`` of the package
+        exports: Exported name to the module defining it
+
+    Returns:
+        ``(__getattr__, __dir__)`` to assign at package level
+    """
+    namespace = sys.modules[package].__dict__
+
+    def get_attribute(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module), name)
+        namespace[name] = value  # cached: __getattr__ is not called again
+        return value
+
+    def list_attributes() -> list[str]:
+        return sorted({*namespace, *exports})
+
+    return get_attribute, list_attributes
@@ -0,0 +1,57 @@
+"""Browser automation: warm logged-in sessions per MSISDN.
+
+Exports load on first use, so importing the package does not pull in the
+test doubles (:class:`FakeDriver`, :class:`StubShop`) and their HTTP
+modules. Playwright is imported only when :class:`PlaywrightDriver`
+launches a browser.
+"""
+
+from typing import TYPE_CHECKING
+
+from kit_automate._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from kit_automate.automation.driver import (
+        BrowserContext,
+        BrowserDriver,
+        PlaywrightDriver,
+        StorageState,
+    )
+    from kit_automate.automation.fake import FakeContext, FakeDriver
+    from kit_automate.automation.sessions import (
+        LoginFlow,
+        SessionCheck,
+        SessionManager,
+        SessionStats,
+    )
+    from kit_automate.automation.stub import StubShop
+
+_EXPORTS = {
+    "BrowserContext": "kit_automate.automation.driver",
+    "BrowserDriver": "kit_automate.automation.driver",
+    "PlaywrightDriver": "kit_automate.automation.driver",
+    "StorageState": "kit_automate.automation.driver",
+    "FakeContext": "kit_automate.automation.fake",
+    "FakeDriver": "kit_automate.automation.fake",
+    "LoginFlow": "kit_automate.automation.sessions",
+    "SessionCheck": "kit_automate.automation.sessions",
+    "SessionManager": "kit_automate.automation.sessions",
+    "SessionStats": "kit_automate.automation.sessions",
+    "StubShop": "kit_automate.automation.stub",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = [
+    "BrowserContext",
+    "BrowserDriver",
+    "FakeContext",
+    "FakeDriver",
+    "LoginFlow",
+    "PlaywrightDriver",
+    "SessionCheck",
+    "SessionManager",
+    "SessionStats",
+    "StorageState",
+    "StubShop",
+]
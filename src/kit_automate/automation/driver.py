@@ -0,0 +1,82 @@
+"""Browser driver interface used by the automation code.
+
+Only the calls the session manager makes are part of the interface; a
+Playwright ``Browser``/``BrowserContext`` pair satisfies it as is, and
+:class:`kit_automate.automation.fake.FakeDriver` does too for tests.
+Storage state is Playwright's format: ``{"cookies": [...], "origins": [...]}``
+with localStorage under ``origins``.
+"""
+
+from typing import Any, Protocol
+
+StorageState = dict[str, Any]
+
+
+class BrowserContext(Protocol):
+    """An isolated browser profile: cookies, storage and its pages."""
+
+    async def storage_state(self) -> StorageState: ...
+
+    async def close(self) -> None: ...
+
+
+class BrowserDriver(Protocol):
+    """Creates browser contexts, optionally restored from storage state."""
+
+    async def new_context(
+        self, storage_state: StorageState | None = None
+    ) -> BrowserContext: ...
+
+    async def close(self) -> None: ...
+
+
+class PlaywrightDriver:
+    """:class:`BrowserDriver` on a Playwright browser.
+
+    Playwright is imported and the browser launched on the first
+    :meth:`new_context`, so the package imports without it installed.
+
+    Args:
+        browser: ``chromium``, ``firefox`` or ``webkit``
+        headless: Run without a window
+        launch_options: Passed to ``BrowserType.launch``
+        context_options: Passed to every ``Browser.new_context``
+    """
+
+    def __init__(
+        self,
+        browser: str = "chromium",
+        headless: bool = True,
+        launch_options: dict[str, Any] | None = None,
+        context_options: dict[str, Any] | None = None,
+    ):
+        self.browser_name = browser
+        self.headless = headless
+        self.launch_options = launch_options or {}
+        self.context_options = context_options or {}
+        self._playwright: Any = None
+        self._browser: Any = None
+
+    async def _launch(self) -> Any:
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        browser_type = getattr(self._playwright, self.browser_name)
+        self._browser = await browser_type.launch(
+            headless=self.headless, **self.launch_options
+        )
+        return self._browser
+
+    async def new_context(self, storage_state: StorageState | None = None) -> Any:
+        browser = self._browser or await self._launch()
+        return await browser.new_context(
+            storage_state=storage_state, **self.context_options
+        )
+
+    async def close(self) -> None:
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
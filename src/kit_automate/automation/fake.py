@@ -0,0 +1,120 @@
+"""Browser-less :class:`BrowserDriver` for tests and benchmarks.
+
+A :class:`FakeContext` is an HTTP client with its own cookie jar, which
+is all a login session is from the site's side. Its storage state uses
+Playwright's format, so saved sessions look the same as real ones.
+Requests run in a worker thread and only ever go where they are pointed,
+normally a local :class:`~kit_automate.automation.stub.StubShop`.
+"""
+
+import asyncio
+from http.cookies import SimpleCookie
+from typing import Any
+from urllib.error import HTTPError
+from urllib.parse import urlencode, urlsplit
+from urllib.request import Request, urlopen
+
+from kit_automate.automation.driver import StorageState
+
+
+class FakeContext:
+    """Cookie-keeping HTTP client standing in for a browser context."""
+
+    def __init__(self, driver: "FakeDriver", storage_state: StorageState | None):
+        self._driver = driver
+        self.cookies: dict[str, dict[str, Any]] = {}
+        self.local_storage: dict[str, dict[str, str]] = {}
+        self.closed = False
+        for cookie in (storage_state or {}).get("cookies", []):
+            self.cookies[cookie["name"]] = dict(cookie)
+        for origin in (storage_state or {}).get("origins", []):
+            self.local_storage[origin["origin"]] = {
+                item["name"]: item["value"] for item in origin["localStorage"]
+            }
+
+    async def fetch(
+        self, url: str, form: dict[str, str] | None = None
+    ) -> tuple[int, str]:
+        """GET ``url``, or POST ``form`` to it; returns (status, body)."""
+        if self.closed:
+            raise RuntimeError("Context is closed")
+        return await asyncio.to_thread(self._fetch, url, form)
+
+    def _fetch(self, url: str, form: dict[str, str] | None) -> tuple[int, str]:
+        data = urlencode(form).encode() if form is not None else None
+        request = Request(url, data=data)  # noqa: S310 - callers pass local URLs
+        if self.cookies:
+            request.add_header(
+                "Cookie",
+                "; ".join(f"{n}={c['value']}" for n, c in self.cookies.items()),
+            )
+        try:
+            with urlopen(request, timeout=10) as response:  # noqa: S310
+                status, headers, body = (
+                    response.status,
+                    response.headers,
+                    response.read(),
+                )
+        except HTTPError as e:
+            status, headers, body = e.code, e.headers, e.read()
+        self._store(urlsplit(url).hostname or "", headers.get_all("Set-Cookie") or [])
+        return status, body.decode()
+
+    def _store(self, domain: str, set_cookies: list[str]) -> None:
+        for header in set_cookies:
+            for name, morsel in SimpleCookie(header).items():
+                if morsel["max-age"] == "0":
+                    self.cookies.pop(name, None)
+                    continue
+                self.cookies[name] = {
+                    "name": name,
+                    "value": morsel.value,
+                    "domain": morsel["domain"] or domain,
+                    "path": morsel["path"] or "/",
+                    "expires": -1,
+                    "httpOnly": bool(morsel["httponly"]),
+                    "secure": bool(morsel["secure"]),
+                    "sameSite": "Lax",
+                }
+
+    async def storage_state(self) -> StorageState:
+        return {
+            "cookies": [dict(c) for c in self.cookies.values()],
+            "origins": [
+                {
+                    "origin": origin,
+                    "localStorage": [{"name": k, "value": v} for k, v in items.items()],
+                }
+                for origin, items in self.local_storage.items()
+            ],
+        }
+
+    async def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self._driver.closed += 1
+
+
+class FakeDriver:
+    """Creates :class:`FakeContext` objects and counts them."""
+
+    def __init__(self) -> None:
+        self.opened = 0
+        self.closed = 0
+        self.restored = 0  # contexts created from a storage state
+
+    @property
+    def live(self) -> int:
+        """Contexts opened and not closed yet."""
+        return self.opened - self.closed
+
+    async def new_context(
+        self, storage_state: StorageState | None = None
+    ) -> FakeContext:
+        self.opened += 1
+        if storage_state is not None:
+            self.restored += 1
+        return FakeContext(self, storage_state)
+
+    async def close(self) -> None:
+        pass
@@ -0,0 +1,289 @@
+"""Warm browser contexts with per-MSISDN session state.
+
+Logging in to the voucher site costs a page load, an OTP SMS and a form
+post, seconds per purchase. :class:`SessionManager` keeps up to
+``max_contexts`` logged-in browser contexts and saves each MSISDN's
+storage state (cookies and localStorage) as JSON under ``state_dir``. A
+purchase then uses, in order:
+
+1. the MSISDN's warm context, revalidated when it was last checked more
+   than ``revalidate_after`` seconds ago;
+2. a new context restored from the saved state, if it validates;
+3. a new context and a full login, whose state is saved for next time.
+
+Beyond ``max_contexts`` the least recently used idle contexts are saved
+and closed. The site-specific login and validity check are passed in, so
+the manager runs the same against Playwright or the fake driver.
+"""
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import re
+import tempfile
+import time
+
+from loguru import logger
+
+from kit_automate.automation.driver import BrowserContext, BrowserDriver, StorageState
+
+# login(context, msisdn): log in, OTP included; raise on failure
+LoginFlow = Callable[[BrowserContext, str], Awaitable[None]]
+# validate(context, msisdn): True while the context is still logged in
+SessionCheck = Callable[[BrowserContext, str], Awaitable[bool]]
+
+_UNSAFE = re.compile(r"[^0-9A-Za-z+_-]")
+
+
+@dataclass
+class SessionStats:
+    warm: int = 0  # reused a live context
+    restored: int = 0  # new context from saved state
+    logins: int = 0
+    expired: int = 0  # failed a validity check
+    evicted: int = 0
+
+
+@dataclass(eq=False)
+class _Warm:
+    context: BrowserContext
+    checked_at: float
+
+
+@dataclass(eq=False)
+class _MsisdnLock:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    users: int = 0  # holding or waiting
+
+
+class SessionManager:
+    """Bounded LRU pool of logged-in browser contexts, one per MSISDN.
+
+    Use :meth:`session` around each purchase; it holds the MSISDN's
+    context exclusively until the block exits, and :meth:`invalidate`
+    and :meth:`close` wait for it. Must be used from one event loop.
+    Closing the driver is left to its owner. The app builds it with
+    ``ApplicationContext.session_manager``.
+
+    Args:
+        driver: Creates the browser contexts
+        state_dir: Where storage state is saved, e.g. ``paths.data / "sessions"``
+        login: Logs a fresh context in
+        validate: Checks a context is still logged in
+        max_contexts: Warm contexts kept open
+        revalidate_after: Seconds a successful check is trusted
+        max_state_age: Seconds before a saved state is discarded unchecked
+        temp_dir: Where state files are written before being moved into
+            ``state_dir`` (same file system); defaults to ``state_dir``
+    """
+
+    def __init__(  # noqa: PLR0913 - tuning knobs are keyword-only
+        self,
+        driver: BrowserDriver,
+        state_dir: Path,
+        login: LoginFlow,
+        validate: SessionCheck,
+        *,
+        max_contexts: int = 8,
+        revalidate_after: float = 300.0,
+        max_state_age: float = 7 * 86400.0,
+        temp_dir: Path | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_contexts < 1:
+            raise ValueError("max_contexts must be at least 1")
+        self.driver = driver
+        self.state_dir = state_dir
+        self.max_contexts = max_contexts
+        self.revalidate_after = revalidate_after
+        self.max_state_age = max_state_age
+        self.temp_dir = temp_dir or state_dir
+        self.stats = SessionStats()
+        self._login = login
+        self._validate = validate
+        self._clock = clock
+        self._warm: OrderedDict[str, _Warm] = OrderedDict()
+        # Only MSISDNs in use have a lock, so this stays small
+        self._locks: dict[str, _MsisdnLock] = {}
+
+    def __len__(self) -> int:
+        return len(self._warm)
+
+    @property
+    def warm(self) -> list[str]:
+        """MSISDNs with an open context, least recently used first."""
+        return list(self._warm)
+
+    def state_path(self, msisdn: str) -> Path:
+        return self.state_dir / f"{_UNSAFE.sub('_', msisdn)}.json"
+
+    @asynccontextmanager
+    async def session(self, msisdn: str) -> AsyncIterator[BrowserContext]:
+        """Logged-in context for ``msisdn``, logging in only when needed.
+
+        The state is saved again when the block succeeds, since the site
+        may have refreshed its cookies. When it raises, the context stays
+        warm but is checked before its next use.
+        """
+        try:
+            async with self._exclusive(msisdn):
+                warm = await self._acquire(msisdn)
+                try:
+                    yield warm.context
+                except BaseException:
+                    warm.checked_at = float("-inf")
+                    raise
+                if self._warm.get(msisdn) is warm:
+                    await self._save(msisdn, warm.context)
+        finally:
+            await self._evict()
+
+    async def invalidate(self, msisdn: str) -> None:
+        """Close the MSISDN's context and forget its saved state."""
+        async with self._exclusive(msisdn):
+            warm = self._warm.pop(msisdn, None)
+            if warm is not None:
+                await self._close(msisdn, warm.context)
+            self.state_path(msisdn).unlink(missing_ok=True)
+
+    async def close(self) -> None:
+        """Save and close every warm context, once its session ends."""
+        while self._warm:
+            await self._retire(next(iter(self._warm)))
+
+    @asynccontextmanager
+    async def _exclusive(self, msisdn: str) -> AsyncIterator[None]:
+        """Hold the MSISDN's lock; it is dropped once nobody holds or awaits it."""
+        entry = self._locks.get(msisdn)
+        if entry is None:
+            entry = self._locks[msisdn] = _MsisdnLock()
+        entry.users += 1
+        try:
+            async with entry.lock:
+                yield
+        finally:
+            entry.users -= 1
+            if not entry.users:
+                del self._locks[msisdn]
+
+    async def _retire(self, msisdn: str) -> bool:
+        """Save and close the MSISDN's warm context, if it still has one."""
+        async with self._exclusive(msisdn):
+            warm = self._warm.pop(msisdn, None)
+            if warm is None:
+                return False
+            await self._save(msisdn, warm.context)
+            await self._close(msisdn, warm.context)
+            return True
+
+    async def _acquire(self, msisdn: str) -> _Warm:
+        warm = self._warm.get(msisdn)
+        if warm is not None:
+            self._warm.move_to_end(msisdn)
+            fresh = self._clock() - warm.checked_at < self.revalidate_after
+            if fresh or await self._check(msisdn, warm.context):
+                if not fresh:
+                    warm.checked_at = self._clock()
+                self.stats.warm += 1
+                return warm
+            # The saved state is the same logged-out session
+            del self._warm[msisdn]
+            await self._close(msisdn, warm.context)
+            self.state_path(msisdn).unlink(missing_ok=True)
+
+        context = await self._restore(msisdn)
+        if context is None:
+            context = await self._log_in(msisdn)
+        warm = _Warm(context, self._clock())
+        self._warm[msisdn] = warm
+        return warm
+
+    async def _check(self, msisdn: str, context: BrowserContext) -> bool:
+        try:
+            valid = await self._validate(context, msisdn)
+        except Exception as e:
+            logger.warning(f"Session check for {msisdn} failed: {e}")
+            valid = False
+        if not valid:
+            self.stats.expired += 1
+        return valid
+
+    async def _restore(self, msisdn: str) -> BrowserContext | None:
+        state = self._load(msisdn)
+        if state is None:
+            return None
+        context = await self.driver.new_context(state)
+        if await self._check(msisdn, context):
+            self.stats.restored += 1
+            return context
+        await self._close(msisdn, context)
+        self.state_path(msisdn).unlink(missing_ok=True)
+        return None
+
+    async def _log_in(self, msisdn: str) -> BrowserContext:
+        context = await self.driver.new_context()
+        try:
+            await self._login(context, msisdn)
+        except BaseException:
+            await self._close(msisdn, context)
+            raise
+        self.stats.logins += 1
+        logger.info(f"Logged in {msisdn}")
+        await self._save(msisdn, context)
+        return context
+
+    async def _evict(self) -> None:
+        # Contexts in use are skipped, so the pool can briefly run over
+        while len(self._warm) > self.max_contexts:
+            msisdn = next((m for m in self._warm if m not in self._locks), None)
+            if msisdn is None:
+                return
+            if await self._retire(msisdn):
+                self.stats.evicted += 1
+
+    def _load(self, msisdn: str) -> StorageState | None:
+        path = self.state_path(msisdn)
+        try:
+            if time.time() - path.stat().st_mtime > self.max_state_age:
+                path.unlink(missing_ok=True)
+                return None
+            return json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring saved session {path.name}: {e}")
+            return None
+
+    async def _save(self, msisdn: str, context: BrowserContext) -> None:
+        try:
+            state = await context.storage_state()
+        except Exception as e:
+            logger.warning(f"Could not read session state for {msisdn}: {e}")
+            return
+        _write_state(self.state_path(msisdn), state, self.temp_dir)
+
+    async def _close(self, msisdn: str, context: BrowserContext) -> None:
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning(f"Closing context for {msisdn} failed: {e}")
+
+
+def _write_state(path: Path, state: StorageState, temp_dir: Path) -> None:
+    """Replace ``path`` atomically, readable by the owner only."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    # Session cookies are credentials; mkstemp creates the file as 0600
+    fd, partial = tempfile.mkstemp(suffix=".tmp", prefix=f".{path.name}.", dir=temp_dir)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(state, file)
+        Path(partial).replace(path)
+    except BaseException:
+        Path(partial).unlink(missing_ok=True)
+        raise
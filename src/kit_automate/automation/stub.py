@@ -0,0 +1,150 @@
+"""Local stand-in for the voucher site's OTP login, for tests and benchmarks.
+
+:class:`StubShop` serves on 127.0.0.1 from a daemon thread:
+
+- ``POST /login`` with ``msisdn`` sends an OTP: it is kept in ``otps``
+  and handed to ``on_otp(msisdn, code)``, which can publish it to an
+  :class:`~kit_automate.otp.OtpBroker` as if the SIM received it
+- ``POST /verify`` with ``msisdn`` and ``otp`` sets the ``session``
+  cookie, or answers 403
+- ``GET /account`` answers 200 with the MSISDN while the cookie is a
+  live session, 401 otherwise
+
+Sessions last ``session_ttl`` seconds and can be ended early with
+:meth:`StubShop.expire`, like the real site logging a SIM out.
+"""
+
+from collections.abc import Callable
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import secrets
+import threading
+import time
+from urllib.parse import parse_qs
+
+
+class StubShop:
+    """Minimal OTP login site on a free localhost port."""
+
+    def __init__(
+        self,
+        session_ttl: float = 3600.0,
+        on_otp: Callable[[str, str], None] | None = None,
+        login_delay: float = 0.0,
+    ):
+        self.session_ttl = session_ttl
+        self.on_otp = on_otp
+        self.login_delay = login_delay  # seconds before the OTP is sent
+        self.otps: dict[str, str] = {}
+        self.logins = 0
+        self.requests = 0
+        self._sessions: dict[str, tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("StubShop is not started")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Start serving; returns the base URL."""
+        handler = type("Handler", (_ShopHandler,), {"shop": self})
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever, name="stub-shop", daemon=True
+        ).start()
+        return self.url
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubShop":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def expire(self, msisdn: str) -> None:
+        """End every session of ``msisdn``."""
+        with self._lock:
+            for token in [t for t, (m, _) in self._sessions.items() if m == msisdn]:
+                del self._sessions[token]
+
+    def _send_otp(self, msisdn: str) -> None:
+        if self.login_delay:
+            time.sleep(self.login_delay)
+        code = f"{secrets.randbelow(1_000_000):06d}"
+        with self._lock:
+            self.otps[msisdn] = code
+        if self.on_otp is not None:
+            self.on_otp(msisdn, code)
+
+    def _verify(self, msisdn: str, code: str) -> str | None:
+        with self._lock:
+            if not code or self.otps.get(msisdn) != code:
+                return None
+            del self.otps[msisdn]
+            token = secrets.token_urlsafe(16)
+            self._sessions[token] = (msisdn, time.monotonic() + self.session_ttl)
+            self.logins += 1
+            return token
+
+    def _account(self, token: str | None) -> str | None:
+        with self._lock:
+            msisdn, expires = self._sessions.get(token or "", (None, 0.0))
+            return msisdn if time.monotonic() < expires else None
+
+
+class _ShopHandler(BaseHTTPRequestHandler):
+    shop: StubShop
+
+    def do_GET(self) -> None:
+        self.shop.requests += 1
+        if self.path != "/account":
+            self._reply(404, "not found")
+            return
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        token = cookie["session"].value if "session" in cookie else None
+        msisdn = self.shop._account(token)
+        if msisdn is None:
+            self._reply(401, "login required")
+        else:
+            self._reply(200, msisdn)
+
+    def do_POST(self) -> None:
+        self.shop.requests += 1
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode())
+        msisdn = form.get("msisdn", [""])[0]
+        if self.path == "/login" and msisdn:
+            self.shop._send_otp(msisdn)
+            self._reply(200, "otp sent")
+        elif self.path == "/verify":
+            token = self.shop._verify(msisdn, form.get("otp", [""])[0])
+            if token is None:
+                self._reply(403, "wrong otp")
+            else:
+                self._reply(200, "ok", f"session={token}; Path=/; HttpOnly")
+        else:
+            self._reply(400, "bad request")
+
+    def _reply(self, status: int, body: str, cookie: str = "") -> None:
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if cookie:
+            self.send_header("Set-Cookie", cookie)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
@@ -1,13 +1,51 @@
-"""Configuration package with application initialization utilities."""
+"""Configuration package with application initialization utilities.
 
-from dataclasses import dataclass
+The database layer (and with it SQLAlchemy) is imported when the database
+is set up, not when this package is imported.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import os
 from pathlib import Path
+import time
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
-from kit_automate.config.db_config import DatabaseManager, create_database_manager
-from kit_automate.config.log_config import cleanup_logging, setup_logger
+from kit_automate._lazy import lazy_exports
+from kit_automate.config.log_config import (
+    cleanup_logging,
+    flush_logging,
+    setup_logger,
+)
 from kit_automate.config.path_config import AppPaths
+from kit_automate.events import EventBus
+from kit_automate.metrics import METRICS_FILE, MetricsRegistry
+
+if TYPE_CHECKING:
+    from kit_automate.automation import (
+        BrowserDriver,
+        LoginFlow,
+        SessionCheck,
+        SessionManager,
+    )
+    from kit_automate.config.db_config import (
+        DatabaseManager,
+        create_database_manager,
+    )
+    from kit_automate.config.db_writer import BatchWriter
+    from kit_automate.modem import ModemPool, ShardedModemPool
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "BatchWriter": "kit_automate.config.db_writer",
+        "DatabaseManager": "kit_automate.config.db_config",
+        "create_database_manager": "kit_automate.config.db_config",
+    },
+)
 
 
 @dataclass
@@ -15,10 +53,88 @@ class ApplicationContext:
     """Application context with initialized components."""
 
     paths: AppPaths
-    db_manager: DatabaseManager  # Fixed type annotation
+    db_manager: "DatabaseManager"
+    db_writer: "BatchWriter | None" = None
+    metrics: MetricsRegistry = field(default_factory=MetricsRegistry)
+    events: EventBus = field(default_factory=EventBus)
+    modem_shards: int = 0
+    _modem_pool: "ModemPool | ShardedModemPool | None" = field(
+        default=None, init=False, repr=False
+    )
+
+    @property
+    def modem_pool(self) -> "ModemPool | ShardedModemPool":
+        """The modem pool, built on first use and opened by the caller.
+
+        In-process, or spread over ``modem_shards`` worker processes; both
+        offer the same ``open``/``send``/``broadcast``/``close`` API.
+        :meth:`aclose` closes it together with the rest of the context.
+        """
+        if self._modem_pool is None:
+            from kit_automate.modem.sharding import create_modem_pool
+
+            self._modem_pool = create_modem_pool(
+                self.modem_shards, metrics=self.metrics
+            )
+        return self._modem_pool
+
+    def session_manager(
+        self,
+        driver: "BrowserDriver",
+        login: "LoginFlow",
+        validate: "SessionCheck",
+        **kwargs: Any,
+    ) -> "SessionManager":
+        """Warm browser sessions with their state saved under ``data/sessions``.
+
+        State files are written in ``temp`` first. Keyword arguments such
+        as ``max_contexts`` go to :class:`~kit_automate.automation.SessionManager`.
+        """
+        from kit_automate.automation.sessions import SessionManager
+
+        return SessionManager(
+            driver,
+            self.paths.data / "sessions",
+            login,
+            validate,
+            temp_dir=self.paths.temp,
+            **kwargs,
+        )
+
+    def write_metrics(self) -> Path:
+        """Snapshot the metrics in Prometheus text format under reports/."""
+        return self.metrics.write_prometheus(self.paths.reports / METRICS_FILE)
+
+    async def aclose(self) -> None:
+        """Close the modem pool, then everything else (see :meth:`cleanup`).
+
+        Use this instead of :meth:`cleanup` once the modem pool has been
+        used: closing it needs the event loop it was opened on.
+        """
+        if self._modem_pool is not None:
+            try:
+                await self._modem_pool.close()
+                logger.debug("Modem pool closed")
+            except Exception as e:
+                logger.warning(f"Error closing modem pool: {e}")
+            self._modem_pool = None
+        self.cleanup()
 
     def cleanup(self) -> None:
         """Cleanup application resources properly."""
+        if self._modem_pool is not None and len(self._modem_pool):
+            logger.warning("Modem pool left open; close it with aclose()")
+
+        self.metrics.close()
+
+        # Flush queued writes while the engine is still alive
+        if self.db_writer is not None:
+            try:
+                self.db_writer.close()
+                logger.debug("Database writer flushed")
+            except Exception as e:
+                logger.warning(f"Error flushing database writer: {e}")
+
         try:
             self.db_manager.cleanup()  # Now properly typed - no hasattr needed
             logger.debug("Database manager cleaned up")
@@ -36,11 +152,32 @@ class ApplicationContext:
         logger.info("Application context cleaned up")
 
 
-def create_application_context(base_path: Path | None = None) -> ApplicationContext:
+@contextmanager
+def _phase(timings: dict[str, float] | None, name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[name] = time.perf_counter() - start
+
+
+def create_application_context(
+    base_path: Path | None = None,
+    phase_timings: dict[str, float] | None = None,
+    modem_shards: int | None = None,
+    journal: bool | None = None,
+) -> ApplicationContext:
     """Create and initialize application context.
 
     Args:
         base_path: Override base path (useful for testing)
+        phase_timings: Filled with seconds spent per startup phase (paths,
+            logging, db_init, connection_test), for ``--profile-startup``
+        modem_shards: Worker processes for the modem pool; 0 keeps it in
+            process. Defaults to ``MODEM_SHARDS`` from the environment
+        journal: Write the transaction journal next to the log file.
+            Defaults to ``LOG_JOURNAL`` (``true``/``false``) from the environment
 
     Returns:
         ApplicationContext with initialized components
@@ -50,21 +187,43 @@ def create_application_context(base_path: Path | None = None) -> ApplicationCont
     """
     try:
         # Create paths
-        app_paths = AppPaths.create(base_path)
-        app_paths.ensure_directories()
+        with _phase(phase_timings, "paths"):
+            app_paths = AppPaths.create(base_path)
+            app_paths.ensure_directories()
 
         # Setup logging
-        setup_logger(app_paths.logs)
+        with _phase(phase_timings, "logging"):
+            if journal is None:
+                journal = os.getenv("LOG_JOURNAL", "false").lower() == "true"
+            setup_logger(app_paths.logs, journal=journal)
 
-        # Setup database
-        db_manager = create_database_manager(app_paths)
-        db_manager.initialize()
+        # Setup database (first use of SQLAlchemy)
+        with _phase(phase_timings, "db_init"):
+            from kit_automate.config.db_config import create_database_manager
+            from kit_automate.config.db_writer import BatchWriter
 
-        # Test database connection
-        if not db_manager.test_connection():
-            raise RuntimeError("Database connection failed during initialization")
+            metrics = MetricsRegistry()
+            db_manager = create_database_manager(app_paths)
+            db_manager.attach_metrics(metrics)
+            db_manager.initialize()
 
-        return ApplicationContext(paths=app_paths, db_manager=db_manager)
+        # Test database connection
+        with _phase(phase_timings, "connection_test"):
+            if not db_manager.test_connection():
+                raise RuntimeError("Database connection failed during initialization")
+
+        return ApplicationContext(
+            paths=app_paths,
+            db_manager=db_manager,
+            db_writer=BatchWriter(db_manager),
+            metrics=metrics,
+            events=EventBus(metrics=metrics),
+            modem_shards=(
+                int(os.getenv("MODEM_SHARDS", "0"))
+                if modem_shards is None
+                else modem_shards
+            ),
+        )
 
     except Exception as e:
         raise RuntimeError(f"Application initialization failed: {e}") from e
@@ -73,9 +232,14 @@ def create_application_context(base_path: Path | None = None) -> ApplicationCont
 __all__ = [
     "AppPaths",
     "ApplicationContext",
+    "BatchWriter",
+    "DatabaseManager",
+    "EventBus",
+    "MetricsRegistry",
     "cleanup_logging",
     "create_application_context",
     "create_database_manager",
+    "flush_logging",
     "setup_logger",
 ]
 
@@ -0,0 +1,135 @@
+"""Asyncio facade over DatabaseManager."""
+
+import asyncio
+from collections.abc import AsyncGenerator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import functools
+from typing import Any, TypeVar
+
+from loguru import logger
+from sqlalchemy import Executable
+from sqlalchemy.orm import Session
+
+from kit_automate.config.db_config import DatabaseManager
+
+T = TypeVar("T")
+
+
+class ExecutorSession:
+    """Session whose blocking calls run on the manager's executor.
+
+    Calls must be awaited one after another, never concurrently, since the
+    underlying session is not thread-safe.
+    """
+
+    def __init__(self, manager: "AsyncDatabaseManager", session: Session):
+        self._manager = manager
+        self.sync_session = session
+
+    async def run_sync(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn(session, *args, **kwargs)`` on the executor."""
+        return await self._manager._call(fn, self.sync_session, *args, **kwargs)
+
+    async def execute(self, statement: Executable, params: Any = None) -> list[Any]:
+        """Execute a statement and fetch all rows (empty for DML)."""
+        return await self.run_sync(_fetch_all, statement, params)
+
+    async def scalar(self, statement: Executable, params: Any = None) -> Any:
+        return await self.run_sync(lambda s: s.execute(statement, params).scalar())
+
+    async def get(self, entity: type[T], ident: Any) -> T | None:
+        return await self.run_sync(lambda s: s.get(entity, ident))
+
+    def add(self, instance: object) -> None:
+        """Stage an object; no I/O until flush or commit."""
+        self.sync_session.add(instance)
+
+    async def flush(self) -> None:
+        await self.run_sync(Session.flush)
+
+    async def commit(self) -> None:
+        await self.run_sync(Session.commit)
+
+    async def rollback(self) -> None:
+        await self.run_sync(Session.rollback)
+
+
+def _fetch_all(session: Session, statement: Executable, params: Any) -> list[Any]:
+    result = session.execute(statement, params)
+    return list(result.all()) if result.returns_rows else []
+
+
+class AsyncDatabaseManager:
+    """Run DatabaseManager work on a bounded, dedicated thread pool.
+
+    Shares the engine and config of the wrapped manager, so the sync and
+    async paths see the same pool and pragmas. The event loop only awaits
+    futures; all SQLite I/O happens on the executor threads.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, max_workers: int | None = None):
+        if db_manager.config.path == ":memory:":
+            # One shared connection (StaticPool): no concurrent statements
+            max_workers = 1
+        elif max_workers is None:
+            max_workers = min(db_manager.config.performance.pool_size, 4)
+        self.db_manager = db_manager
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="kit-automate-db-async"
+        )
+
+    async def _call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    @asynccontextmanager
+    async def session(self) -> AsyncGenerator[ExecutorSession, None]:
+        """Async context manager for a session (manual commit required)."""
+        if self.db_manager.SessionLocal is None:
+            raise RuntimeError("Database not initialized. Call initialize() first.")
+
+        session = await self._call(self.db_manager.SessionLocal)
+        try:
+            yield ExecutorSession(self, session)
+        except Exception as e:
+            logger.error(f"Database error occurred: {e}")
+            await self._call(session.rollback)
+            raise
+        finally:
+            await self._call(session.close)
+
+    async def run(self, fn: Callable[[Session], T], commit: bool = False) -> T:
+        """Run ``fn`` with a fresh session on the executor.
+
+        The whole unit of work runs in one executor call, which is cheaper
+        than awaiting each statement separately.
+        """
+
+        def unit_of_work() -> T:
+            with self.db_manager.get_session() as session:
+                result = fn(session)
+                if commit:
+                    session.commit()
+                return result
+
+        return await self._call(unit_of_work)
+
+    async def execute(self, statement: Executable, params: Any = None) -> list[Any]:
+        """Execute a read query and return all rows."""
+        return await self.run(lambda s: _fetch_all(s, statement, params))
+
+    async def scalar(self, statement: Executable, params: Any = None) -> Any:
+        """Execute a query and return the first column of the first row."""
+        return await self.run(lambda s: s.execute(statement, params).scalar())
+
+    async def test_connection(self) -> bool:
+        return await self._call(self.db_manager.test_connection)
+
+    def close(self, wait: bool = True) -> None:
+        """Shut down the executor; the wrapped manager stays usable."""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        logger.debug("Async database executor shut down")
@@ -5,15 +5,19 @@ from contextlib import contextmanager
 from dataclasses import dataclass
 import os
 from pathlib import Path
-from typing import Annotated
+import time
+from typing import Annotated, Any, Literal
 
 from loguru import logger
-from sqlalchemy import create_engine, event, text
+from sqlalchemy import URL, Engine, create_engine, event, text
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, Pool, QueuePool, StaticPool
 
+from kit_automate.config.db_stats import QueryStats
 from kit_automate.config.path_config import AppPaths
+from kit_automate.database.models import Base
+from kit_automate.metrics import Histogram, MetricsRegistry
 
 # Custom type for self-documenting code
 CommitRequiredSession = Annotated[
@@ -22,13 +26,102 @@ CommitRequiredSession = Annotated[
 ]
 
 
+DbProfileName = Literal["safe", "throughput", "readonly"]
+
+
+@dataclass(frozen=True)
+class DbProfile:
+    """SQLite pragmas and pool settings applied to every new connection.
+
+    A ``None`` pragma is left at the SQLite default. ``pool_size`` and
+    ``max_overflow`` only apply to a ``QueuePool``.
+    """
+
+    journal_mode: str | None = "WAL"
+    synchronous: str = "FULL"
+    cache_size: int = -8_000  # negative = KiB
+    mmap_size: int = 0
+    temp_store: str = "DEFAULT"
+    busy_timeout: int = 5_000  # ms
+    wal_autocheckpoint: int | None = 1_000  # pages
+    query_only: bool = False
+    pool_class: type[Pool] = QueuePool
+    pool_size: int = 5
+    max_overflow: int = 10
+
+    def pragmas(self) -> list[str]:
+        """Build PRAGMA statements in the order they must be applied."""
+        # busy_timeout first so switching journal mode can wait for a lock
+        statements = [f"PRAGMA busy_timeout={self.busy_timeout}"]
+        if self.journal_mode is not None:
+            statements.append(f"PRAGMA journal_mode={self.journal_mode}")
+        statements += [
+            f"PRAGMA synchronous={self.synchronous}",
+            f"PRAGMA cache_size={self.cache_size}",
+            f"PRAGMA mmap_size={self.mmap_size}",
+            f"PRAGMA temp_store={self.temp_store}",
+        ]
+        if self.wal_autocheckpoint is not None:
+            statements.append(f"PRAGMA wal_autocheckpoint={self.wal_autocheckpoint}")
+        if self.query_only:
+            statements.append("PRAGMA query_only=ON")
+        return statements
+
+
+DB_PROFILES: dict[str, DbProfile] = {
+    # Durability first: every commit is fsynced, WAL keeps readers unblocked.
+    "safe": DbProfile(),
+    # Many writer threads: fsync only on checkpoint, bigger cache and mmap.
+    "throughput": DbProfile(
+        synchronous="NORMAL",
+        cache_size=-64_000,
+        mmap_size=256 * 1024 * 1024,
+        temp_store="MEMORY",
+        pool_size=16,
+        max_overflow=16,
+    ),
+    # Dashboards and reports: never writes, so journal mode is left alone.
+    "readonly": DbProfile(
+        journal_mode=None,
+        synchronous="NORMAL",
+        cache_size=-32_000,
+        mmap_size=256 * 1024 * 1024,
+        temp_store="MEMORY",
+        wal_autocheckpoint=None,
+        query_only=True,
+        # Occasional report processes: no idle connection keeps a WAL
+        # snapshot or the file open between queries
+        pool_class=NullPool,
+    ),
+}
+
+
 @dataclass(frozen=True)
 class DbConfig:
     """Database configuration dataclass."""
 
     path: str
     echo: bool = False
-    pool_pre_ping: bool = True
+    pool_pre_ping: bool = False
+    profile: DbProfileName = "safe"
+    # The reader engine of a writer process is a QueuePool of its own size
+    read_pool_size: int = 8
+    read_max_overflow: int = 8
+    # Per-statement timing, slow-query plans and a summary on cleanup
+    instrument: bool = False
+    slow_query_ms: float = 100.0
+
+    def __post_init__(self) -> None:
+        if self.profile not in DB_PROFILES:
+            raise ValueError(
+                f"Unknown database profile {self.profile!r}, "
+                f"expected one of {sorted(DB_PROFILES)}"
+            )
+
+    @property
+    def performance(self) -> DbProfile:
+        """Resolved performance profile."""
+        return DB_PROFILES[self.profile]
 
 
 def get_db_config(paths: AppPaths) -> DbConfig:
@@ -39,7 +132,14 @@ def get_db_config(paths: AppPaths) -> DbConfig:
     return DbConfig(
         path=db_path_str,
         echo=os.getenv("SQL_ECHO", "false").lower() == "true",
-        pool_pre_ping=True,
+        # Local file database: a SELECT 1 on every checkout is pure overhead
+        pool_pre_ping=os.getenv("DB_POOL_PRE_PING", "false").lower() == "true",
+        profile=os.getenv("DB_PROFILE", "safe"),  # type: ignore[arg-type]
+        read_pool_size=int(
+            os.getenv("DB_READ_POOL_SIZE", str(DbConfig.read_pool_size))
+        ),
+        instrument=os.getenv("SQL_INSTRUMENT", "false").lower() == "true",
+        slow_query_ms=float(os.getenv("SQL_SLOW_MS", "100")),
     )
 
 
@@ -51,8 +151,19 @@ class DatabaseManager:
         self.url = f"sqlite:///{config.path}"
         self.engine = None
         self.SessionLocal = None
+        self.read_engine = None
+        self.ReadSessionLocal = None
         self.Base = None
         self._initialized = False
+        self._write_timer: Histogram | None = None
+        self._read_timer: Histogram | None = None
+        self.query_stats: QueryStats | None = None
+
+    def attach_metrics(self, metrics: MetricsRegistry) -> None:
+        """Time every write and read session into ``db_session_seconds``."""
+        help = "Seconds a database session was held open"
+        self._write_timer = metrics.histogram("db_session_seconds", help, mode="write")
+        self._read_timer = metrics.histogram("db_session_seconds", help, mode="read")
 
     def initialize(self) -> None:
         """Initialize database engine and session factory."""
@@ -65,33 +176,109 @@ class DatabaseManager:
             Path(self.config.path).parent.mkdir(parents=True, exist_ok=True)
 
         # Create engine
+        profile = self.config.performance
         self.engine = create_engine(
             self.url,
             connect_args={"check_same_thread": False},
             pool_pre_ping=self.config.pool_pre_ping,
             echo=self.config.echo,
+            **self._pool_args(profile),
+        )
+
+        # Enable foreign keys and apply the performance profile
+        self._apply_pragmas(self.engine, profile)
+
+        if self.config.instrument:
+            self.query_stats = QueryStats(self.config.slow_query_ms / 1000)
+            self.query_stats.attach(self.engine)
+
+        # Create session factory and bind the shared model base
+        self.SessionLocal = sessionmaker(
+            autocommit=False, autoflush=False, bind=self.engine
+        )
+        self.Base = Base
+
+        if self.config.path != ":memory:":
+            self._initialize_read_engine()
+
+        self._initialized = True
+        logger.info(
+            f"Database initialized - Path: {self.config.path}, "
+            f"profile: {self.config.profile}"
+        )
+
+    def _initialize_read_engine(self) -> None:
+        """Create the read-only engine used by dashboards and reports.
+
+        Opened with ``mode=ro`` so SQLite itself refuses writes, and with the
+        readonly profile so ``query_only`` is set. Under WAL its readers never
+        block the writer engine.
+        """
+        # mode=ro cannot create the file; one writer connection creates it
+        # and switches it to WAL before any reader opens it.
+        assert self.engine is not None
+        with self.engine.connect():
+            pass
+
+        read_profile = DB_PROFILES["readonly"]
+        self.read_engine = create_engine(
+            URL.create(
+                "sqlite",
+                database=Path(self.config.path).resolve().as_uri(),
+                query={"mode": "ro", "uri": "true"},
+            ),
+            connect_args={"check_same_thread": False},
+            pool_pre_ping=self.config.pool_pre_ping,
+            echo=self.config.echo,
+            poolclass=QueuePool,
+            pool_size=self.config.read_pool_size,
+            max_overflow=self.config.read_max_overflow,
+        )
+        self._apply_pragmas(self.read_engine, read_profile)
+        if self.query_stats is not None:
+            self.query_stats.attach(self.read_engine)
+        self.ReadSessionLocal = sessionmaker(
+            autocommit=False, autoflush=False, bind=self.read_engine
         )
 
-        # Enable foreign keys
-        @event.listens_for(self.engine, "connect")
+    def _apply_pragmas(self, engine: Engine, profile: DbProfile) -> None:
+        @event.listens_for(engine, "connect")
         def set_sqlite_pragma(dbapi_connection, connection_record) -> None:  # noqa: ARG001
-            """Enable foreign keys for SQLite connections."""
+            """Apply pragmas to each new SQLite connection."""
             if self.url.startswith("sqlite"):
                 cursor = dbapi_connection.cursor()
                 cursor.execute("PRAGMA foreign_keys=ON")
+                for statement in profile.pragmas():
+                    cursor.execute(statement)
                 cursor.close()
 
-        # Create session factory and base
-        self.SessionLocal = sessionmaker(
-            autocommit=False, autoflush=False, bind=self.engine
-        )
-        self.Base = declarative_base()
+    def _pool_args(self, profile: DbProfile) -> dict[str, Any]:
+        """Pool arguments for the engine.
 
-        self._initialized = True
-        logger.info(f"Database initialized - Path: {self.config.path}")
+        In-memory databases share one connection across all threads, since
+        every new connection would open a fresh, empty database.
+        """
+        if self.config.path == ":memory:":
+            return {"poolclass": StaticPool}
+        args: dict[str, Any] = {"poolclass": profile.pool_class}
+        if profile.pool_class is QueuePool:
+            args["pool_size"] = profile.pool_size
+            args["max_overflow"] = profile.max_overflow
+        return args
 
     def cleanup(self) -> None:
         """Cleanup database resources properly."""
+        if self.query_stats is not None and self.query_stats.statements:
+            logger.info(f"Query statistics:\n{self.query_stats.report()}")
+        self.query_stats = None
+
+        if self.read_engine is not None:
+            try:
+                self.read_engine.dispose()
+                logger.debug("Read-only database engine disposed")
+            except Exception as e:
+                logger.warning(f"Error disposing read engine: {e}")
+
         if self.engine is not None:
             try:
                 # Close all connections in the pool
@@ -103,6 +290,8 @@ class DatabaseManager:
         # Reset state
         self.engine = None
         self.SessionLocal = None
+        self.read_engine = None
+        self.ReadSessionLocal = None
         self.Base = None
         self._initialized = False
         logger.info("Database manager cleaned up")
@@ -145,6 +334,7 @@ class DatabaseManager:
         if self.SessionLocal is None:
             raise RuntimeError("Session factory not properly initialized.")
 
+        start = time.perf_counter()
         session = self.SessionLocal()
         try:
             yield session
@@ -155,6 +345,36 @@ class DatabaseManager:
             raise
         finally:
             session.close()
+            if self._write_timer is not None:
+                self._write_timer.observe(time.perf_counter() - start)
+
+    @contextmanager
+    def get_read_session(self) -> Generator[Session, None, None]:
+        """Context manager for a read-only session on the reader pool.
+
+        Intended for long dashboard and rekap queries so they never hold a
+        writer connection. In-memory databases have no separate reader and
+        fall back to the regular session factory.
+        """
+        if not self._initialized:
+            raise RuntimeError("Database not initialized. Call initialize() first.")
+
+        factory = self.ReadSessionLocal or self.SessionLocal
+        if factory is None:
+            raise RuntimeError("Session factory not properly initialized.")
+
+        start = time.perf_counter()
+        session = factory()
+        try:
+            yield session
+        except Exception as e:
+            logger.error(f"Database read error occurred: {e}")
+            raise
+        finally:
+            # Ends the read transaction, releasing its WAL snapshot
+            session.close()
+            if self._read_timer is not None:
+                self._read_timer.observe(time.perf_counter() - start)
 
 
 def create_database_manager(paths: AppPaths) -> DatabaseManager:
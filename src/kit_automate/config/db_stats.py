@@ -0,0 +1,166 @@
+"""Per-statement query statistics and slow-query logging.
+
+:class:`QueryStats` hooks SQLAlchemy's ``before_cursor_execute`` and
+``after_cursor_execute`` events and aggregates by normalized statement:
+literals become ``?`` and expanded ``IN (?, ?, ...)`` lists or multi-row
+``VALUES`` collapse to one form, so an N+1 pattern shows up as one
+statement with a huge call count. Statements slower than the threshold are
+logged once per normalized form together with their ``EXPLAIN QUERY PLAN``,
+which is where a missing index shows up as ``SCAN``.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+import re
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import Engine, event
+
+# Durations kept per statement for the p95
+_SAMPLES = 1024
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROW_LIST = re.compile(r"\(\?, \.\.\.\)(?:\s*,\s*\(\?, \.\.\.\))+")
+_SPACE = re.compile(r"\s+")
+
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+
+
+@lru_cache(maxsize=4096)
+def normalize_statement(statement: str) -> str:
+    """Reduce a SQL statement to its shape.
+
+    >>> normalize_statement("SELECT * FROM t WHERE id IN (?, ?, ?) AND x = 'a'")
+    'SELECT * FROM t WHERE id IN (?, ...) AND x = ?'
+    """
+    text = _SPACE.sub(" ", statement).strip()
+    text = _STRING.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _PARAM_LIST.sub("(?, ...)", text)
+    return _ROW_LIST.sub("(?, ...), ...", text)
+
+
+@dataclass
+class StatementStats:
+    calls: int = 0
+    total: float = 0.0
+    rows: int = 0
+    durations: deque = field(default_factory=lambda: deque(maxlen=_SAMPLES))
+
+    @property
+    def p95(self) -> float:
+        ordered = sorted(self.durations)
+        return ordered[int(0.95 * (len(ordered) - 1))] if ordered else 0.0
+
+
+class QueryStats:
+    """Statement statistics for one or more engines.
+
+    Args:
+        slow_threshold: Seconds after which a statement is logged with its
+            query plan; ``None`` disables slow-query logging
+    """
+
+    def __init__(self, slow_threshold: float | None = 0.1):
+        self.slow_threshold = slow_threshold
+        self.statements: dict[str, StatementStats] = {}
+        self._explained: set[str] = set()
+        self._lock = threading.Lock()
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def detach(self, engine: Engine) -> None:
+        event.remove(engine, "before_cursor_execute", self._before)
+        event.remove(engine, "after_cursor_execute", self._after)
+
+    def _before(
+        self,
+        _conn: Any,
+        _cursor: Any,
+        _stmt: Any,
+        _params: Any,
+        context: Any,
+        _many: bool,
+    ) -> None:
+        # Kept on the execution context, which is dropped with the statement
+        # whether it succeeds or raises
+        context._query_start = time.perf_counter()
+
+    def _after(
+        self,
+        _conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        start = getattr(context, "_query_start", None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        key = normalize_statement(statement)
+        # rowcount is -1 for SELECT and RETURNING on sqlite3, so rows only
+        # counts what the driver reports, mostly UPDATE and DELETE
+        rows = max(cursor.rowcount, 0)
+        with self._lock:
+            stats = self.statements.get(key)
+            if stats is None:
+                stats = self.statements[key] = StatementStats()
+            stats.calls += 1
+            stats.total += elapsed
+            stats.rows += rows
+            stats.durations.append(elapsed)
+            first_slow = (
+                self.slow_threshold is not None
+                and elapsed >= self.slow_threshold
+                and key not in self._explained
+            )
+            if first_slow:
+                self._explained.add(key)
+        if first_slow:
+            params = parameters[0] if executemany and parameters else parameters
+            plan = self._explain(cursor, statement, params)
+            logger.warning(
+                f"Slow query {elapsed * 1000:.1f}ms: {key}\nQuery plan:\n{plan}"
+            )
+
+    @staticmethod
+    def _explain(cursor: Any, statement: str, parameters: Any) -> str:
+        if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+            return "  (not explainable)"
+        try:
+            # A separate cursor leaves the statement's own results untouched
+            rows = cursor.connection.execute(
+                f"EXPLAIN QUERY PLAN {statement}", parameters or ()
+            ).fetchall()
+        except sqlite3.Error as e:
+            return f"  (unavailable: {e})"
+        return "\n".join(f"  {row[-1]}" for row in rows) or "  (empty)"
+
+    def report(self, limit: int = 20) -> str:
+        """Top statements by total time, as a text table."""
+        with self._lock:
+            items = list(self.statements.items())
+        items.sort(key=lambda item: item[1].total, reverse=True)
+        del items[limit:]
+        lines = [
+            f"{'calls':>8} {'total ms':>10} {'avg ms':>8} {'p95 ms':>8} "
+            f"{'rows':>8}  statement"
+        ]
+        for key, stats in items:
+            lines.append(
+                f"{stats.calls:>8} {stats.total * 1000:>10.1f} "
+                f"{stats.total / stats.calls * 1000:>8.2f} "
+                f"{stats.p95 * 1000:>8.2f} {stats.rows:>8}  {key[:160]}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,188 @@
+"""Single-writer batching queue for SQLite writes."""
+
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+import queue
+import threading
+import time
+from typing import Any, TypeVar
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from kit_automate.config.db_config import DatabaseManager
+
+T = TypeVar("T")
+
+WriteOperation = Callable[[Session], T]
+
+
+@dataclass
+class _Job:
+    operation: WriteOperation[Any] | None
+    future: Future = field(default_factory=Future)
+    stop: bool = False
+
+
+@dataclass
+class WriterStats:
+    """Counters describing how writes were grouped (updated by the writer)."""
+
+    committed: int = 0
+    failed: int = 0
+    batches: int = 0
+    fallbacks: int = 0
+
+
+class BatchWriter:
+    """Funnel writes from many threads through one writer thread.
+
+    Operations are callables taking a session. The writer groups queued
+    operations into a single transaction, bounded by ``max_batch`` operations
+    and ``max_latency`` seconds after the first one arrived. Each caller gets
+    a future resolved with the operation's return value once the transaction
+    has committed.
+
+    If a grouped commit fails, the batch is replayed one operation per
+    transaction so a single bad write only fails its own future.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        max_batch: int = 256,
+        max_latency: float = 0.01,
+        max_queue: int = 10_000,
+    ):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.db_manager = db_manager
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.stats = WriterStats()
+        self._queue: queue.Queue[_Job] = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="kit-automate-db-writer", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the writer stopped accepting work."""
+        return self._closed
+
+    def submit(self, operation: WriteOperation[T]) -> "Future[T]":
+        """Queue a write operation.
+
+        Blocks when the queue is full, which pushes back on producers that
+        outrun the disk.
+
+        Raises:
+            RuntimeError: If the writer has been closed
+        """
+        if self._closed:
+            raise RuntimeError("BatchWriter is closed")
+        job = _Job(operation)
+        self._queue.put(job)
+        return job.future
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Block until everything submitted so far has been committed."""
+        if not self._thread.is_alive():
+            return
+        marker = _Job(None)
+        self._queue.put(marker)
+        marker.future.result(timeout=timeout)
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Flush pending writes and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_Job(None, stop=True))
+            self._thread.join(timeout)
+
+        # Anything that raced in after the stop marker is refused
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if not job.future.done():
+                job.future.set_exception(RuntimeError("BatchWriter is closed"))
+        logger.debug(
+            f"DB writer closed - {self.stats.committed} committed in "
+            f"{self.stats.batches} batches, {self.stats.failed} failed"
+        )
+
+    def _run(self) -> None:
+        while True:
+            batch, markers, stop = self._collect()
+            if batch:
+                self._write(batch)
+            for marker in markers:
+                marker.future.set_result(None)
+            if stop:
+                return
+
+    def _collect(self) -> tuple[list[_Job], list[_Job], bool]:
+        """Wait for the first job, then gather more until size or deadline."""
+        batch: list[_Job] = []
+        markers: list[_Job] = []
+        first = self._queue.get()
+        deadline = time.monotonic() + self.max_latency
+        job: _Job | None = first
+        while job is not None:
+            if job.operation is None:
+                # Flush and stop markers end the batch so they return promptly
+                markers.append(job)
+                return batch, markers, job.stop
+            batch.append(job)
+            if len(batch) >= self.max_batch:
+                break
+            remaining = deadline - time.monotonic()
+            try:
+                job = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                job = None
+        return batch, markers, False
+
+    def _write(self, batch: list[_Job]) -> None:
+        jobs = [job for job in batch if job.future.set_running_or_notify_cancel()]
+        if not jobs:
+            return
+        try:
+            with self.db_manager.get_session() as session:
+                results = [job.operation(session) for job in jobs]  # type: ignore[misc]
+                session.commit()
+        except Exception as e:
+            logger.warning(f"Batched write failed ({e}), retrying one by one")
+            self.stats.fallbacks += 1
+            for job in jobs:
+                self._write_one(job)
+            return
+
+        self.stats.batches += 1
+        self.stats.committed += len(jobs)
+        for job, result in zip(jobs, results, strict=True):
+            job.future.set_result(result)
+
+    def _write_one(self, job: _Job) -> None:
+        try:
+            with self.db_manager.get_session() as session:
+                result = job.operation(session)  # type: ignore[misc]
+                session.commit()
+        except Exception as e:
+            self.stats.failed += 1
+            job.future.set_exception(e)
+            return
+        self.stats.batches += 1
+        self.stats.committed += 1
+        job.future.set_result(result)
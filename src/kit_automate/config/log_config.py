@@ -1,5 +1,7 @@
 """Simple Loguru configuration with configurable stdlib intercept."""
 
+from collections.abc import Iterable
+from datetime import timedelta
 import inspect
 import logging
 from pathlib import Path
@@ -7,6 +9,18 @@ import sys
 
 from loguru import logger
 
+from kit_automate.config.log_journal import (
+    JOURNAL_FILE,
+    JournalWriter,
+    has_context,
+    serialize_record,
+)
+from kit_automate.config.log_queue import (
+    OverflowPolicy,
+    QueuedSink,
+    RotatingFileWriter,
+)
+
 CONSOLE_FORMAT = (
     "<green>{time:HH:mm:ss}</green> | "
     "<level>{level: <8}</level> | "
@@ -14,6 +28,20 @@ CONSOLE_FORMAT = (
     "{message}"
 )
 
+# Third-party loggers quieted to WARNING+ (prefix match on the logger name)
+DEFAULT_NOISY_LOGGERS = (
+    "sqlalchemy.engine",
+    "sqlalchemy.pool",
+    "PySide6",
+    "Qt",
+    "asyncio",
+    "urllib3",
+    "requests",
+)
+
+# Queued file sinks, closed (and drained) by cleanup_logging()
+_queued_sinks: list[QueuedSink] = []
+
 FILE_FORMAT = (
     "{time:YYYY-MM-DD HH:mm:ss.SSS} | "
     "{level: <8} | "
@@ -22,11 +50,17 @@ FILE_FORMAT = (
 )
 
 
-def setup_logger(
+def setup_logger(  # noqa: PLR0913 - flat keyword options mirror the sinks
     log_dir: Path | None = None,
     level: str = "DEBUG",
     intercept_stdlib: bool = True,
     quiet_libraries: bool = True,
+    async_file: bool = True,
+    queue_size: int = 10_000,
+    overflow: OverflowPolicy = "drop",
+    *,
+    noisy_loggers: Iterable[str] | None = None,
+    journal: bool = False,
 ) -> None:
     """Setup loguru logging with configurable options.
 
@@ -35,9 +69,25 @@ def setup_logger(
         level: Logging level for our app
         intercept_stdlib: Redirect stdlib logging to loguru
         quiet_libraries: Reduce noise from third-party libraries
+        async_file: Write the log file from a background thread; callers
+            only enqueue, and rotation compression runs off-thread too
+        queue_size: Records buffered by the async file sink
+        overflow: When the queue is full, ``"drop"`` (counted) or ``"block"``
+        noisy_loggers: Logger name prefixes held to WARNING and above when
+            ``quiet_libraries`` is set (default ``DEFAULT_NOISY_LOGGERS``)
+        journal: Also write records with bound transaction context
+            (``logger.bind(msisdn=..., txn=...)``) as indexed JSON lines to
+            ``transactions.jsonl``; needs ``log_dir``
     """
+    router = None
+    if quiet_libraries:
+        router = _LevelRouter(
+            DEFAULT_NOISY_LOGGERS if noisy_loggers is None else noisy_loggers
+        )
+
     # Remove default handler
     logger.remove()
+    _close_queued_sinks()
 
     # Console logging
     logger.add(
@@ -45,93 +95,122 @@ def setup_logger(
         format=CONSOLE_FORMAT,
         level=level,
         colorize=True,
-        filter=_create_filter(quiet_libraries),
+        filter=_create_filter(router),
     )
 
     # File logging if directory provided
     if log_dir is not None:
         log_dir.mkdir(parents=True, exist_ok=True)
-        logger.add(
-            log_dir / "kit-automate.log",
-            format=FILE_FORMAT,
-            level="DEBUG",  # Always DEBUG in file
-            rotation="10 MB",
-            retention="1 week",
-            compression="zip",
-            filter=None,  # No filter for file (capture everything)
-        )
+        if async_file:
+            sink = QueuedSink(
+                RotatingFileWriter(
+                    log_dir / "kit-automate.log",
+                    rotation_bytes=10 * 1024 * 1024,
+                    retention=timedelta(weeks=1),
+                    compression="zip",
+                ),
+                max_queue=queue_size,
+                overflow=overflow,
+            )
+            _queued_sinks.append(sink)
+            logger.add(sink, format=FILE_FORMAT, level="DEBUG", filter=None)
+        else:
+            logger.add(
+                log_dir / "kit-automate.log",
+                format=FILE_FORMAT,
+                level="DEBUG",  # Always DEBUG in file
+                rotation="10 MB",
+                retention="1 week",
+                compression="zip",
+                filter=None,  # No filter for file (capture everything)
+            )
         logger.info(f"File logging enabled: {log_dir / 'kit-automate.log'}")
 
+        if journal:
+            sink = QueuedSink(
+                JournalWriter(log_dir),
+                max_queue=queue_size,
+                overflow=overflow,
+                serialize=serialize_record,
+            )
+            _queued_sinks.append(sink)
+            logger.add(sink, level="DEBUG", filter=has_context)
+            logger.info(f"Transaction journal enabled: {log_dir / JOURNAL_FILE}")
+
     # Optional stdlib interception
     if intercept_stdlib:
-        _enable_stdlib_intercept(quiet_libraries)
+        _enable_stdlib_intercept(router)
         logger.debug("Stdlib logging interception enabled")
 
 
-def _create_filter(quiet_libraries: bool):
+class _LevelRouter:
+    """Minimum level per logger name, computed once per name.
+
+    Names under ``kit_automate`` or outside ``noisy`` pass everything;
+    names under a noisy prefix need WARNING or above.
+    """
+
+    def __init__(self, noisy: Iterable[str]):
+        self.noisy = tuple(noisy)
+        self._thresholds: dict[str | None, int] = {}
+
+    def threshold(self, name: str | None) -> int:
+        try:
+            return self._thresholds[name]
+        except KeyError:
+            pass
+        text = name or ""
+        if not text.startswith("kit_automate") and text.startswith(self.noisy):
+            value = logging.WARNING
+        else:
+            value = 0
+        self._thresholds[name] = value
+        return value
+
+
+def _create_filter(router: _LevelRouter | None):
     """Create filter function for reducing library noise."""
-    if not quiet_libraries:
+    if router is None:
         return None
 
-    # Libraries to quiet down
-    noisy_loggers = {
-        "sqlalchemy.engine",
-        "sqlalchemy.pool",
-        "PySide6",
-        "Qt",
-        "asyncio",
-        "urllib3",
-        "requests",
-    }
+    thresholds = router._thresholds
+    threshold = router.threshold
 
     def filter_record(record):
-        # Allow all our app logs
-        if record["name"].startswith("kit_automate"):
-            return True
-
-        # Quiet noisy libraries (only WARNING and above)
-        for noisy in noisy_loggers:
-            if record["name"].startswith(noisy):
-                return record["level"].no >= logger.level("WARNING").no
-
-        # Allow everything else
-        return True
+        name = record["name"]
+        limit = thresholds.get(name)
+        if limit is None:
+            limit = threshold(name)
+        return record["level"].no >= limit
 
     return filter_record
 
 
-def _enable_stdlib_intercept(quiet_libraries: bool) -> None:
+def _enable_stdlib_intercept(router: _LevelRouter | None) -> None:
     """Enable stdlib logging interception with optional filtering."""
+    logging_file = logging.__file__
+    level_names: dict[str, str | int] = {}
 
     class InterceptHandler(logging.Handler):
         def emit(self, record: logging.LogRecord) -> None:
-            # Get loguru level
-            try:
-                level = logger.level(record.levelname).name
-            except ValueError:
-                level = record.levelno
-
-            # Apply library filtering if enabled
-            if quiet_libraries:
-                noisy_loggers = [
-                    "sqlalchemy.engine",
-                    "sqlalchemy.pool",
-                    "PySide6",
-                    "asyncio",
-                ]
-
-                for noisy in noisy_loggers:
-                    if (
-                        record.name.startswith(noisy)
-                        and record.levelno < logging.WARNING
-                    ):
-                        return  # Skip DEBUG/INFO from noisy libraries
+            # Drop noisy DEBUG/INFO before any level lookup or frame walk
+            if router is not None and record.levelno < router.threshold(record.name):
+                return
+
+            # Get loguru level (stdlib level names map to loguru ones)
+            levelname = record.levelname
+            level = level_names.get(levelname)
+            if level is None:
+                try:
+                    level = logger.level(levelname).name
+                except ValueError:
+                    level = record.levelno
+                else:
+                    level_names[levelname] = level
 
             # Find caller and log to loguru
             frame, depth = inspect.currentframe(), 0
-            while frame and (
-                depth == 0 or frame.f_code.co_filename == logging.__file__
-            ):
+            while frame and (depth == 0 or frame.f_code.co_filename == logging_file):
                 frame = frame.f_back
                 depth += 1
 
@@ -167,11 +246,27 @@ def setup_testing_logging() -> None:
     setup_logger(None, "WARNING", intercept_stdlib=False, quiet_libraries=True)
 
 
+def flush_logging(timeout: float | None = None) -> bool:
+    """Wait until queued file sinks have written every record so far."""
+    return all(sink.flush(timeout) for sink in _queued_sinks)
+
+
+def _close_queued_sinks() -> None:
+    while _queued_sinks:
+        sink = _queued_sinks.pop()
+        sink.close()
+        if sink.stats.dropped:
+            logger.warning(f"Log queue dropped {sink.stats.dropped} records")
+
+
 def cleanup_logging() -> None:
     """Cleanup all loguru handlers and reset logging."""
     # Remove all loguru handlers to release file handles
     logger.remove()
 
+    # Drain queued sinks: no handler can enqueue anymore, so this is final
+    _close_queued_sinks()
+
     # Reset stdlib logging
     disable_stdlib_intercept()
 
@@ -0,0 +1,219 @@
+"""Structured JSON-lines transaction journal with an offset index.
+
+Records that carry bound transaction context (``logger.bind(msisdn=...,
+txn=...)``) are written as compact JSON lines to ``transactions.jsonl``.
+Next to every segment, ``<segment>.idx`` lists ``key<TAB>value<TAB>offset``
+for each record's MSISDN and transaction id, appended as records are
+written. :func:`query_journal` reads only the small index files and then
+seeks straight to the matching records, across rotated segments.
+
+Segments are rotated and named like the log file (see
+:mod:`~kit_automate.config.log_queue`) but never compressed, so that offsets
+stay seekable; old segments and their indexes are deleted after
+``retention`` instead.
+"""
+
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+import json
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from kit_automate.config.log_queue import prune_rotated, rotated_path
+
+JOURNAL_FILE = "transactions.jsonl"
+INDEX_SUFFIX = ".idx"
+
+# Bound ``extra`` keys copied into journal records, in output order
+CONTEXT_FIELDS = ("msisdn", "txn", "port", "phase", "duration")
+
+# Context keys with an index entry
+INDEXED_FIELDS = ("msisdn", "txn")
+
+
+def has_context(record: dict) -> bool:
+    """Loguru filter: only records with transaction context are journaled."""
+    extra = record["extra"]
+    return any(key in extra for key in CONTEXT_FIELDS)
+
+
+def serialize_record(message: Any) -> str:
+    """Render a loguru message as one compact JSON line."""
+    record = message.record
+    data: dict[str, Any] = {
+        "ts": record["time"].isoformat(timespec="milliseconds"),
+        "level": record["level"].name,
+        "name": record["name"],
+        "msg": record["message"],
+    }
+    extra = record["extra"]
+    for key in CONTEXT_FIELDS:
+        if key in extra:
+            data[key] = extra[key]
+    if record["exception"] is not None:
+        data["exc"] = str(record["exception"].value)
+    return json.dumps(data, separators=(",", ":"), default=str) + "\n"
+
+
+def _index_lines(line: bytes, offset: int) -> list[str]:
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return []
+    return [f"{key}\t{data[key]}\t{offset}\n" for key in INDEXED_FIELDS if key in data]
+
+
+def index_path(segment: Path) -> Path:
+    return segment.with_name(segment.name + INDEX_SUFFIX)
+
+
+def rebuild_index(segment: Path) -> Path:
+    """Recreate a segment's index by scanning it, e.g. after a crash."""
+    entries = []
+    offset = 0
+    with segment.open("rb") as f:
+        for line in f:
+            entries.extend(_index_lines(line, offset))
+            offset += len(line)
+    path = index_path(segment)
+    path.write_text("".join(entries), encoding="utf-8")
+    return path
+
+
+def _entry_offset(entry: str) -> int:
+    return int(entry.rsplit("\t", 1)[1])
+
+
+def index_tail(segment: Path) -> bool:
+    """Index records the index is missing at its end, e.g. after a crash.
+
+    Records are written before their index entries, so a crash can leave
+    the last records unindexed or the last entries cut short. Entries of
+    the last indexed record are recomputed along with everything after it.
+    Returns whether the index changed.
+    """
+    path = index_path(segment)
+    entries = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    cut = bool(entries) and not entries[-1].endswith("\n")
+    if cut:
+        entries.pop()  # half-written entry
+    start = _entry_offset(entries[-1]) if entries else 0
+    kept = [e for e in entries if _entry_offset(e) < start]
+    tail = []
+    offset = start
+    with segment.open("rb") as f:
+        f.seek(start)
+        for line in f:
+            tail.extend(_index_lines(line, offset))
+            offset += len(line)
+    if not cut and kept + tail == entries:
+        return False
+    path.write_text("".join(kept + tail), encoding="utf-8")
+    return True
+
+
+class JournalWriter:
+    """Journal segment writer for :class:`~.log_queue.QueuedSink`.
+
+    Data is written and flushed before its index entries, so an index
+    never points past the end of its segment.
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        rotation_bytes: int = 10 * 1024 * 1024,
+        retention: timedelta | None = timedelta(weeks=4),
+    ):
+        self.path = log_dir / JOURNAL_FILE
+        self.rotation_bytes = rotation_bytes
+        self.retention = retention
+        self.rotations = 0
+        log_dir.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            if index_path(self.path).exists():
+                index_tail(self.path)
+            else:
+                rebuild_index(self.path)
+        self._open()
+
+    def _open(self) -> None:
+        self._file: BinaryIO = self.path.open("ab")
+        self._index = index_path(self.path).open("a", encoding="utf-8")
+        self._size = self._file.tell()
+
+    def write(self, text: str) -> None:
+        data = text.encode("utf-8")
+        if self._size and self._size + len(data) > self.rotation_bytes:
+            self._rotate()
+        entries = []
+        offset = self._size
+        for line in data.splitlines(keepends=True):
+            entries.extend(_index_lines(line, offset))
+            offset += len(line)
+        self._file.write(data)
+        self._file.flush()
+        self._size = offset
+        self._index.write("".join(entries))
+
+    def notice(self, text: str) -> None:
+        ts = datetime.now().astimezone().isoformat(timespec="milliseconds")
+        data = {"ts": ts, "level": "WARNING", "name": __name__, "msg": text}
+        self.write(json.dumps(data, separators=(",", ":")) + "\n")
+
+    def flush(self) -> None:
+        self._file.flush()
+        self._index.flush()
+
+    def close(self) -> None:
+        self._file.close()
+        self._index.close()
+
+    def _rotate(self) -> None:
+        self.close()
+        rotated = rotated_path(self.path)
+        self.path.rename(rotated)
+        index_path(self.path).rename(index_path(rotated))
+        self._open()
+        self.rotations += 1
+        if self.retention is not None:
+            # Matches the rotated indexes (<segment>.idx) too
+            prune_rotated(self.path, self.retention)
+
+
+def journal_segments(log_dir: Path) -> list[Path]:
+    """Journal segments oldest first, the active one last."""
+    stem, suffix = Path(JOURNAL_FILE).stem, Path(JOURNAL_FILE).suffix
+    rotated = sorted(log_dir.glob(f"{stem}.*{suffix}"))
+    active = log_dir / JOURNAL_FILE
+    return rotated + ([active] if active.exists() else [])
+
+
+def _offsets(segment: Path, key: str, value: str) -> set[int]:
+    index = index_path(segment)
+    if not index.exists():
+        index = rebuild_index(segment)
+    prefix = f"{key}\t{value}\t"
+    with index.open(encoding="utf-8") as f:
+        return {int(line[len(prefix) :]) for line in f if line.startswith(prefix)}
+
+
+def query_journal(
+    log_dir: Path, msisdn: str | None = None, txn: str | None = None
+) -> Iterator[dict]:
+    """Yield journal records for an MSISDN and/or transaction, oldest first."""
+    if msisdn is None and txn is None:
+        raise ValueError("query_journal needs msisdn or txn")
+    for segment in journal_segments(log_dir):
+        offsets: set[int] | None = None
+        for key, value in (("msisdn", msisdn), ("txn", txn)):
+            if value is None:
+                continue
+            found = _offsets(segment, key, value)
+            offsets = found if offsets is None else offsets & found
+        if not offsets:
+            continue
+        with segment.open("rb") as f:
+            for offset in sorted(offsets):
+                f.seek(offset)
+                yield json.loads(f.readline())
@@ -0,0 +1,242 @@
+"""Queue-backed log file sink so logging calls never wait on disk.
+
+Loguru's file sink writes, rotates and zips in the calling thread, so a
+rotation can stall a modem reader or the UI thread for hundreds of
+milliseconds. :class:`QueuedSink` only puts the formatted line on a bounded
+queue; one writer thread appends to a :class:`RotatingFileWriter`, which in
+turn hands rotated files to a compression thread.
+"""
+
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+import queue
+import sys
+import threading
+from typing import Any, Literal, Protocol, TextIO
+import zipfile
+
+OverflowPolicy = Literal["drop", "block"]
+
+_STOP = object()
+
+
+@dataclass
+class SinkStats:
+    written: int = 0
+    dropped: int = 0
+    rotations: int = 0
+    errors: int = 0
+
+
+class LogWriter(Protocol):
+    """Destination driven by the :class:`QueuedSink` writer thread."""
+
+    rotations: int
+
+    def write(self, text: str) -> None: ...
+
+    def notice(self, text: str) -> None: ...
+
+    def flush(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
+def rotated_path(path: Path) -> Path:
+    """Name for ``path`` rotated now: ``<stem>.<timestamp><suffix>``."""
+    stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f")
+    return path.with_name(f"{path.stem}.{stamp}{path.suffix}")
+
+
+def prune_rotated(path: Path, retention: timedelta) -> None:
+    """Delete rotated copies of ``path`` (archives too) older than ``retention``."""
+    cutoff = (datetime.now() - retention).timestamp()
+    for old in path.parent.glob(f"{path.stem}.*{path.suffix}*"):
+        if old != path and old.stat().st_mtime < cutoff:
+            old.unlink(missing_ok=True)
+
+
+class _FlushMarker:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+class RotatingFileWriter:
+    """Append-only log file rotated by size.
+
+    Rotation is a rename plus reopen; compressing the rotated file and
+    deleting archives older than ``retention`` run on a separate thread.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        rotation_bytes: int = 10 * 1024 * 1024,
+        retention: timedelta | None = timedelta(weeks=1),
+        compression: Literal["zip"] | None = "zip",
+    ):
+        self.path = path
+        self.rotation_bytes = rotation_bytes
+        self.retention = retention
+        self.compression = compression
+        self.rotations = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: TextIO = path.open("a", encoding="utf-8")
+        self._size = self._file.tell()
+        self._compressor = ThreadPoolExecutor(1, thread_name_prefix="log-compress")
+        self._archives: list[Future] = []
+
+    def write(self, text: str) -> None:
+        # Size counts characters, close enough to bytes for log text
+        if self._size and self._size + len(text) > self.rotation_bytes:
+            self._rotate()
+        self._file.write(text)
+        self._size += len(text)
+
+    def notice(self, text: str) -> None:
+        """Write a warning line of the sink's own."""
+        self.write(f"{datetime.now():%Y-%m-%d %H:%M:%S.%f} | WARNING  | {text}\n")
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the file and wait for pending compressions."""
+        self._file.close()
+        self._compressor.shutdown(wait=True)
+
+    def wait_archives(self) -> None:
+        """Block until every rotated file has been compressed."""
+        for archive in list(self._archives):
+            archive.result()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        rotated = rotated_path(self.path)
+        self.path.rename(rotated)
+        self._file = self.path.open("a", encoding="utf-8")
+        self._size = 0
+        self.rotations += 1
+        self._archives = [f for f in self._archives if not f.done()]
+        archive = self._compressor.submit(self._archive, rotated)
+        archive.add_done_callback(_report_archive_error)
+        self._archives.append(archive)
+
+    def _archive(self, rotated: Path) -> None:
+        if self.compression == "zip":
+            archive = rotated.with_name(rotated.name + ".zip")
+            with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+                zf.write(rotated, rotated.name)
+            rotated.unlink()
+        if self.retention is not None:
+            prune_rotated(self.path, self.retention)
+
+
+def _report_archive_error(archive: Future) -> None:
+    # Nobody waits on archives during normal runs; stderr is all there is
+    if not archive.cancelled() and (e := archive.exception()) is not None:
+        print(f"Log archive error: {e}", file=sys.stderr)
+
+
+class QueuedSink:
+    """Loguru sink enqueuing formatted records for a background writer.
+
+    Args:
+        writer: Destination, e.g. a :class:`RotatingFileWriter`
+        max_queue: Records buffered before the overflow policy applies
+        overflow: ``"drop"`` discards (and counts) records when full,
+            ``"block"`` makes the caller wait for room
+        serialize: Turns the loguru message into the text to enqueue
+    """
+
+    def __init__(
+        self,
+        writer: LogWriter,
+        max_queue: int = 10_000,
+        overflow: OverflowPolicy = "drop",
+        serialize: Callable[[Any], str] = str,
+    ):
+        if overflow not in {"drop", "block"}:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.writer = writer
+        self.overflow = overflow
+        self.serialize = serialize
+        self.stats = SinkStats()
+        self._queue: queue.Queue = queue.Queue(max_queue)
+        self._drop_lock = threading.Lock()
+        self._reported_drops = 0
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def __call__(self, message: str) -> None:
+        if self._closed:
+            return
+        # Serializing drops loguru's record reference held by the message
+        text = self.serialize(message)
+        if self.overflow == "block":
+            self._queue.put(text)
+            return
+        try:
+            self._queue.put_nowait(text)
+        except queue.Full:
+            with self._drop_lock:
+                self.stats.dropped += 1
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every record enqueued so far is written and flushed."""
+        if not self._thread.is_alive():
+            return True
+        marker = _FlushMarker()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Drain the queue, stop the writer thread and close the file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self.writer.close()
+
+    def _run(self) -> None:
+        while True:
+            # Take everything already queued and write it in one call, which
+            # keeps this thread's share of the GIL small
+            batch = [self._queue.get()]
+            while len(batch) < 4096:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            texts = [e for e in batch if isinstance(e, str)]
+            try:
+                if texts:
+                    self.writer.write("".join(texts))
+                    self.stats.written += len(texts)
+                self._report_drops()
+                self.writer.flush()
+            except (OSError, ValueError) as e:
+                # Disk full or file gone: keep draining so callers never hang
+                self.stats.errors += 1
+                print(f"Log writer error: {e}", file=sys.stderr)
+            self.stats.rotations = self.writer.rotations
+            for entry in batch:
+                if isinstance(entry, _FlushMarker):
+                    entry.done.set()
+            if _STOP in batch:
+                return
+
+    def _report_drops(self) -> None:
+        dropped = self.stats.dropped
+        if dropped > self._reported_drops:
+            self.writer.notice(
+                f"log queue full, dropped {dropped - self._reported_drops} records"
+            )
+            self._reported_drops = dropped
@@ -0,0 +1,106 @@
+"""Database models and bulk data access helpers.
+
+Exports load on first use, so importing the package does not pull in
+SQLAlchemy.
+"""
+
+from typing import TYPE_CHECKING
+
+from kit_automate._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from kit_automate.database.cache import CacheStats, MsisdnCache, MsisdnRecord
+    from kit_automate.database.export import (
+        ExportResult,
+        export_inventory,
+        export_query,
+        export_transactions,
+    )
+    from kit_automate.database.inventory import (
+        UpsertResult,
+        bulk_upsert,
+        inventory_upsert,
+        upsert_inventory,
+    )
+    from kit_automate.database.models import (
+        Base,
+        MsisdnInventory,
+        RekapDaily,
+        RekapMsisdn,
+        Transaction,
+    )
+    from kit_automate.database.paging import KeysetPager
+    from kit_automate.database.rekap import (
+        DailyTotal,
+        MsisdnTotal,
+        RekapCheck,
+        add_transaction,
+        rebuild_rekap,
+        record_transaction,
+        rekap_by_day,
+        rekap_by_msisdn,
+        set_transaction_status,
+        verify_rekap,
+    )
+
+_EXPORTS = {
+    "CacheStats": "kit_automate.database.cache",
+    "MsisdnCache": "kit_automate.database.cache",
+    "MsisdnRecord": "kit_automate.database.cache",
+    "ExportResult": "kit_automate.database.export",
+    "export_inventory": "kit_automate.database.export",
+    "export_query": "kit_automate.database.export",
+    "export_transactions": "kit_automate.database.export",
+    "UpsertResult": "kit_automate.database.inventory",
+    "bulk_upsert": "kit_automate.database.inventory",
+    "inventory_upsert": "kit_automate.database.inventory",
+    "upsert_inventory": "kit_automate.database.inventory",
+    "Base": "kit_automate.database.models",
+    "MsisdnInventory": "kit_automate.database.models",
+    "RekapDaily": "kit_automate.database.models",
+    "RekapMsisdn": "kit_automate.database.models",
+    "Transaction": "kit_automate.database.models",
+    "KeysetPager": "kit_automate.database.paging",
+    "DailyTotal": "kit_automate.database.rekap",
+    "MsisdnTotal": "kit_automate.database.rekap",
+    "RekapCheck": "kit_automate.database.rekap",
+    "add_transaction": "kit_automate.database.rekap",
+    "rebuild_rekap": "kit_automate.database.rekap",
+    "record_transaction": "kit_automate.database.rekap",
+    "rekap_by_day": "kit_automate.database.rekap",
+    "rekap_by_msisdn": "kit_automate.database.rekap",
+    "set_transaction_status": "kit_automate.database.rekap",
+    "verify_rekap": "kit_automate.database.rekap",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = [
+    "Base",
+    "CacheStats",
+    "DailyTotal",
+    "ExportResult",
+    "KeysetPager",
+    "MsisdnCache",
+    "MsisdnInventory",
+    "MsisdnRecord",
+    "MsisdnTotal",
+    "RekapCheck",
+    "RekapDaily",
+    "RekapMsisdn",
+    "Transaction",
+    "UpsertResult",
+    "add_transaction",
+    "bulk_upsert",
+    "export_inventory",
+    "export_query",
+    "export_transactions",
+    "inventory_upsert",
+    "rebuild_rekap",
+    "record_transaction",
+    "rekap_by_day",
+    "rekap_by_msisdn",
+    "set_transaction_status",
+    "upsert_inventory",
+    "verify_rekap",
+]
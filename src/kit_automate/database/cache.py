@@ -0,0 +1,222 @@
+"""Write-through cache for hot MSISDN lookups."""
+
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Future
+from dataclasses import dataclass, fields
+from datetime import date
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from kit_automate.database.inventory import (
+    UpsertResult,
+    inventory_upsert,
+    upserted_keys,
+)
+from kit_automate.database.models import MsisdnInventory
+
+if TYPE_CHECKING:
+    from kit_automate.config.db_config import DatabaseManager
+    from kit_automate.config.db_writer import BatchWriter
+
+
+@dataclass(frozen=True)
+class MsisdnRecord:
+    """Immutable snapshot of a SIM, safe to share between threads."""
+
+    msisdn: str
+    balance: int | None
+    expiry: date | None
+    port: str | None
+
+    @property
+    def active(self) -> bool:
+        """Whether the SIM is still within its active period."""
+        return self.expiry is None or self.expiry >= date.today()
+
+
+_RECORD_FIELDS = tuple(f.name for f in fields(MsisdnRecord))
+
+
+@dataclass
+class CacheStats:
+    """Counters for tuning cache size and TTL."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class MsisdnCache:
+    """LRU + TTL cache of MSISDN inventory rows.
+
+    Reads fall through to the reader pool on a miss. Writes go through
+    :meth:`write`, which persists first and then refreshes the cached
+    entries, so callers never see a balance older than the database.
+    Inventory upserts made elsewhere on the same manager
+    (``upsert_inventory``, ``BatchWriter.submit(inventory_upsert(...))``)
+    invalidate their keys when they commit; call :meth:`close` to stop
+    listening.
+
+    Every key carries a generation number bumped on each write or
+    invalidation (and :meth:`clear` bumps a global epoch); a miss that
+    loaded a row while a write was in flight does not put its (now stale)
+    result into the cache.
+    """
+
+    def __init__(
+        self,
+        db_manager: "DatabaseManager",
+        max_entries: int = 10_000,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if db_manager.SessionLocal is None:
+            raise RuntimeError("Database not initialized. Call initialize() first.")
+        self.db_manager = db_manager
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[MsisdnRecord, float]] = OrderedDict()
+        # One counter per SIM in the pool, so this stays small
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._sessions = db_manager.SessionLocal
+        event.listen(self._sessions, "after_commit", self._after_commit)
+
+    def close(self) -> None:
+        """Stop invalidating on other writers' commits."""
+        if event.contains(self._sessions, "after_commit", self._after_commit):
+            event.remove(self._sessions, "after_commit", self._after_commit)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, msisdn: str) -> MsisdnRecord | None:
+        """Return the record for ``msisdn``, loading it on a miss."""
+        with self._lock:
+            entry = self._entries.get(msisdn)
+            if entry is not None:
+                record, expires_at = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(msisdn)
+                    self.stats.hits += 1
+                    return record
+                del self._entries[msisdn]
+                self.stats.expirations += 1
+            self.stats.misses += 1
+            generation = (self._epoch, self._generations.get(msisdn, 0))
+
+        record = self._load(msisdn)
+        if record is not None:
+            with self._lock:
+                if (self._epoch, self._generations.get(msisdn, 0)) == generation:
+                    self._store(record)
+        return record
+
+    def put(self, record: MsisdnRecord) -> None:
+        """Insert or replace a cached record (no database write)."""
+        with self._lock:
+            self._bump(record.msisdn)
+            self._store(record)
+
+    def invalidate(self, msisdn: str) -> None:
+        with self._lock:
+            self._bump(msisdn)
+            if self._entries.pop(msisdn, None) is not None:
+                self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self.stats.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def write(
+        self,
+        snapshots: Iterable[Mapping[str, Any]],
+        writer: "BatchWriter | None" = None,
+    ) -> "Future[UpsertResult]":
+        """Persist snapshots, then refresh the cache after the commit.
+
+        Affected keys are invalidated right away, so until the commit lands
+        lookups read the database instead of an outdated cached value.
+
+        Args:
+            snapshots: Inventory rows, at least ``msisdn`` each
+            writer: Route the write through the batching writer; when omitted
+                the write is committed synchronously
+
+        Returns:
+            Future with the upsert counts, already resolved without a writer
+        """
+        snapshots = list(snapshots)
+        for snapshot in snapshots:
+            self.invalidate(snapshot["msisdn"])
+
+        operation = inventory_upsert(snapshots)
+        if writer is not None:
+            future = writer.submit(operation)
+        else:
+            future = Future()
+            try:
+                with self.db_manager.get_session() as session:
+                    result = operation(session)
+                    session.commit()
+            except Exception as e:
+                future.set_exception(e)
+                raise
+            future.set_result(result)
+
+        future.add_done_callback(lambda f: self._after_write(f, snapshots))
+        return future
+
+    def _after_write(
+        self, future: "Future[UpsertResult]", snapshots: list[Mapping[str, Any]]
+    ) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        for snapshot in snapshots:
+            if all(name in snapshot for name in _RECORD_FIELDS):
+                self.put(MsisdnRecord(**{n: snapshot[n] for n in _RECORD_FIELDS}))
+            else:
+                # Partial update: the merged row is only known to the database
+                self.invalidate(snapshot["msisdn"])
+
+    def _after_commit(self, session: Session) -> None:
+        for (msisdn,) in upserted_keys(session, MsisdnInventory.__tablename__):
+            self.invalidate(msisdn)
+
+    def _load(self, msisdn: str) -> MsisdnRecord | None:
+        with self.db_manager.get_read_session() as session:
+            row = session.get(MsisdnInventory, msisdn)
+            if row is None:
+                return None
+            return MsisdnRecord(
+                msisdn=row.msisdn, balance=row.balance, expiry=row.expiry, port=row.port
+            )
+
+    def _bump(self, msisdn: str) -> None:
+        self._generations[msisdn] = self._generations.get(msisdn, 0) + 1
+
+    def _store(self, record: MsisdnRecord) -> None:
+        self._entries[record.msisdn] = (record, self._clock() + self.ttl)
+        self._entries.move_to_end(record.msisdn)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
@@ -0,0 +1,215 @@
+"""Streaming CSV/JSONL exports to ``AppPaths.exports``.
+
+Rows come from the reader pool as plain tuples, ``yield_per`` rows at a
+time, are encoded one chunk at a time and written straight to disk, so
+memory stays flat however many rows are exported. The file is written to
+a unique temporary file in ``AppPaths.temp`` and renamed into ``exports``
+only once complete; readers never see a partial export, and exports
+started in the same second never share a name.
+"""
+
+from collections.abc import Callable, Iterable, Sequence
+import csv
+from dataclasses import dataclass
+from datetime import date, datetime
+import gzip
+import io
+import json
+import os
+from pathlib import Path
+import tempfile
+import time
+from typing import IO, TYPE_CHECKING, Any, Literal
+from uuid import uuid4
+
+from loguru import logger
+from sqlalchemy import Select, Table, select
+
+from kit_automate.database.models import MsisdnInventory, Transaction
+
+if TYPE_CHECKING:
+    from kit_automate.config.db_config import DatabaseManager
+    from kit_automate.config.path_config import AppPaths
+
+ExportFormat = Literal["csv", "jsonl"]
+
+# Called with the rows written so far
+ProgressCallback = Callable[[int], None]
+
+Encoder = Callable[[Iterable[Sequence]], str]
+
+
+@dataclass
+class ExportResult:
+    path: Path
+    rows: int
+    bytes: int
+    elapsed: float
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, date | datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_encoder(columns: Sequence[str]) -> tuple[str, Encoder]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    def encode(rows: Iterable[Sequence]) -> str:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        return buffer.getvalue()
+
+    return encode([columns]), encode
+
+
+def _jsonl_encoder(columns: Sequence[str]) -> tuple[str, Encoder]:
+    dumps = json.JSONEncoder(
+        separators=(",", ":"), ensure_ascii=False, default=_json_default
+    ).encode
+
+    def encode(rows: Iterable[Sequence]) -> str:
+        return "".join(
+            dumps(dict(zip(columns, row, strict=True))) + "\n" for row in rows
+        )
+
+    return "", encode
+
+
+# Build (header, chunk encoder) for the result columns
+_ENCODERS: dict[str, Callable[[Sequence[str]], tuple[str, Encoder]]] = {
+    "csv": _csv_encoder,
+    "jsonl": _jsonl_encoder,
+}
+
+
+def export_query(  # noqa: PLR0913 - tuning knobs are keyword-only
+    db_manager: "DatabaseManager",
+    statement: Select,
+    paths: "AppPaths",
+    name: str,
+    fmt: ExportFormat = "csv",
+    compress: bool = False,
+    *,
+    chunk_rows: int = 2_000,
+    progress: ProgressCallback | None = None,
+    progress_every: int = 50_000,
+) -> ExportResult:
+    """Stream a Core ``select`` into ``exports/<name>-<time>-<id>.<fmt>``.
+
+    Args:
+        db_manager: Initialized database manager; rows come from its reader
+        statement: Column select (not ORM entities) to export
+        paths: Application paths; writes go through ``paths.temp``
+        name: File name prefix
+        fmt: ``"csv"`` (with a header row) or ``"jsonl"``
+        compress: Gzip on the fly and append ``.gz``
+        chunk_rows: Rows fetched, encoded and written per step
+        progress: Called with the row count every ``progress_every`` rows
+            (checked once per chunk, so it costs nothing per row) and once
+            at the end; raising from it cancels the export
+        progress_every: Rows between progress calls
+
+    Returns:
+        Final path, row count, bytes written and elapsed seconds
+    """
+    if fmt not in _ENCODERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    suffix = f".{fmt}.gz" if compress else f".{fmt}"
+    stamp = f"{datetime.now():%Y%m%d-%H%M%S}-{uuid4().hex[:8]}"
+    target = paths.exports / f"{name}-{stamp}{suffix}"
+    paths.exports.mkdir(parents=True, exist_ok=True)
+    paths.temp.mkdir(parents=True, exist_ok=True)
+    fd, partial_name = tempfile.mkstemp(
+        suffix=".partial", prefix=f".{target.name}.", dir=paths.temp
+    )
+    partial = Path(partial_name)
+
+    start = time.perf_counter()
+    rows = 0
+    next_progress = progress_every
+    try:
+        raw: IO[bytes] = os.fdopen(fd, "wb")
+        out: IO[bytes] = (
+            gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) if compress else raw
+        )
+        try:
+            with db_manager.get_read_session() as session:
+                result = session.execute(
+                    statement.execution_options(yield_per=chunk_rows)
+                )
+                header, encode = _ENCODERS[fmt](list(result.keys()))
+                out.write(header.encode("utf-8"))
+                for chunk in result.partitions():
+                    out.write(encode(chunk).encode("utf-8"))
+                    rows += len(chunk)
+                    if progress is not None and rows >= next_progress:
+                        progress(rows)
+                        next_progress = rows + progress_every
+                if progress is not None:
+                    progress(rows)
+        finally:
+            if out is not raw:
+                out.close()
+            raw.close()
+        partial.replace(target)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+    export = ExportResult(
+        target, rows, target.stat().st_size, time.perf_counter() - start
+    )
+    logger.info(
+        f"Exported {rows} rows to {target} "
+        f"({export.bytes / 1e6:.1f} MB in {export.elapsed:.1f}s)"
+    )
+    return export
+
+
+def _table_select(table: Table, order_by: str) -> Select:
+    return select(*table.c).order_by(table.c[order_by])
+
+
+def export_transactions(
+    db_manager: "DatabaseManager",
+    paths: "AppPaths",
+    fmt: ExportFormat = "csv",
+    compress: bool = False,
+    start: date | None = None,
+    end: date | None = None,
+    progress: ProgressCallback | None = None,
+) -> ExportResult:
+    """Export the transaction history, optionally limited to a day range."""
+    table: Table = Transaction.__table__  # type: ignore[assignment]
+    statement = _table_select(table, "id")
+    if start is not None:
+        statement = statement.where(table.c.day >= start)
+    if end is not None:
+        statement = statement.where(table.c.day <= end)
+    return export_query(
+        db_manager, statement, paths, "transactions", fmt, compress, progress=progress
+    )
+
+
+def export_inventory(
+    db_manager: "DatabaseManager",
+    paths: "AppPaths",
+    fmt: ExportFormat = "csv",
+    compress: bool = False,
+    progress: ProgressCallback | None = None,
+) -> ExportResult:
+    """Export the MSISDN inventory."""
+    table: Table = MsisdnInventory.__table__  # type: ignore[assignment]
+    return export_query(
+        db_manager,
+        _table_select(table, "msisdn"),
+        paths,
+        "inventory",
+        fmt,
+        compress,
+        progress=progress,
+    )
@@ -0,0 +1,203 @@
+"""Bulk upsert of MSISDN inventory snapshots."""
+
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+from sqlalchemy import Table, event, or_, select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, SessionTransaction
+
+from kit_automate.database.models import MsisdnInventory
+
+if TYPE_CHECKING:
+    from kit_automate.config.db_config import DatabaseManager
+
+
+# session.info key: {table name: keys written by bulk_upsert in this transaction},
+# read by after_commit listeners and dropped when the transaction ends
+UPSERTED_KEYS = "kit_automate.upserted_keys"
+
+
+def upserted_keys(session: Session, table: str) -> set[tuple]:
+    """Keys of ``table`` upserted in the session's current transaction."""
+    return session.info.get(UPSERTED_KEYS, {}).get(table, set())
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_upserted_keys(session: Session, transaction: SessionTransaction) -> None:
+    # Runs after the after_commit/after_rollback listeners; a savepoint
+    # ending leaves the keys to its enclosing transaction
+    if transaction.parent is None:
+        session.info.pop(UPSERTED_KEYS, None)
+
+
+@dataclass
+class UpsertResult:
+    """Row counts of a bulk upsert."""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        """Number of distinct keys processed."""
+        return self.inserted + self.updated + self.unchanged
+
+    def __iadd__(self, other: "UpsertResult") -> "UpsertResult":
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        return self
+
+
+def bulk_upsert(
+    session: Session,
+    table: Table,
+    rows: Iterable[Mapping[str, Any]],
+    key_columns: Sequence[str],
+    ignore_columns: Sequence[str] = (),
+    batch_size: int = 500,
+) -> UpsertResult:
+    """Insert or update rows with ``INSERT ... ON CONFLICT DO UPDATE``.
+
+    Rows whose compared values already match the stored row are left
+    untouched, so they cost no page writes. Duplicate keys in ``rows`` are
+    collapsed, the last one wins. Runs inside the caller's transaction; the
+    caller commits. The keys are recorded for :func:`upserted_keys`, which
+    is how caches learn about the write once it commits.
+
+    Args:
+        session: Session to execute in
+        table: Target table, must have a unique constraint on ``key_columns``
+        rows: Mappings that all share the same columns
+        key_columns: Conflict target columns
+        ignore_columns: Columns written on update but not compared
+            (e.g. ``updated_at``)
+        batch_size: Rows per executemany call
+
+    Returns:
+        Inserted, updated and unchanged counts
+    """
+    result = UpsertResult()
+    batch: dict[tuple, Mapping[str, Any]] = {}
+    columns: tuple[str, ...] | None = None
+    statement = None
+
+    for row in rows:
+        if columns is None:
+            columns = tuple(row)
+            statement = _upsert_statement(table, columns, key_columns, ignore_columns)
+        elif tuple(row) != columns:
+            raise ValueError(f"All rows must have columns {columns}, got {tuple(row)}")
+        batch[tuple(row[k] for k in key_columns)] = row
+        if len(batch) >= batch_size:
+            result += _execute_batch(session, table, statement, key_columns, batch)
+            batch = {}
+
+    if batch:
+        result += _execute_batch(session, table, statement, key_columns, batch)
+    return result
+
+
+def _upsert_statement(
+    table: Table,
+    columns: Sequence[str],
+    key_columns: Sequence[str],
+    ignore_columns: Sequence[str],
+):
+    missing = set(key_columns) - set(columns)
+    if missing:
+        raise ValueError(f"Rows are missing key columns: {sorted(missing)}")
+
+    statement = sqlite_insert(table)
+    update_columns = [c for c in columns if c not in key_columns]
+    if not update_columns:
+        return statement.on_conflict_do_nothing(index_elements=list(key_columns))
+
+    compared = [c for c in update_columns if c not in ignore_columns]
+    return statement.on_conflict_do_update(
+        index_elements=list(key_columns),
+        set_={c: statement.excluded[c] for c in update_columns},
+        # Skip the write entirely when nothing we care about changed
+        where=or_(
+            *(table.c[c].is_distinct_from(statement.excluded[c]) for c in compared)
+        )
+        if compared
+        else None,
+    )
+
+
+def _execute_batch(
+    session: Session,
+    table: Table,
+    statement,
+    key_columns: Sequence[str],
+    batch: dict[tuple, Mapping[str, Any]],
+) -> UpsertResult:
+    written = session.info.setdefault(UPSERTED_KEYS, {})
+    written.setdefault(table.name, set()).update(batch)
+    existing = _count_existing(session, table, key_columns, list(batch))
+    changed = session.execute(statement, list(batch.values())).rowcount
+    # rowcount covers inserted + updated rows; skipped conflicts are not counted
+    inserted = len(batch) - existing
+    updated = changed - inserted
+    return UpsertResult(
+        inserted=inserted, updated=updated, unchanged=existing - updated
+    )
+
+
+def _count_existing(
+    session: Session, table: Table, key_columns: Sequence[str], keys: list[tuple]
+) -> int:
+    if len(key_columns) == 1:
+        column = table.c[key_columns[0]]
+        condition = column.in_([k[0] for k in keys])
+    else:
+        condition = tuple_(*(table.c[c] for c in key_columns)).in_(keys)
+    query = select(table.c[key_columns[0]]).where(condition)
+    return len(session.execute(query).all())
+
+
+def inventory_upsert(
+    snapshots: Iterable[Mapping[str, Any]], batch_size: int = 500
+) -> Callable[[Session], UpsertResult]:
+    """Build a write operation for a sweep of SIM snapshots.
+
+    The returned callable runs in the caller's session, which makes it
+    usable with ``BatchWriter.submit``. ``updated_at`` is refreshed only for
+    SIMs whose values changed.
+    """
+    now = datetime.now()
+    rows = [{**snapshot, "updated_at": now} for snapshot in snapshots]
+
+    def operation(session: Session) -> UpsertResult:
+        return bulk_upsert(
+            session,
+            MsisdnInventory.__table__,  # type: ignore[arg-type]
+            rows,
+            key_columns=("msisdn",),
+            ignore_columns=("updated_at",),
+            batch_size=batch_size,
+        )
+
+    return operation
+
+
+def upsert_inventory(
+    db_manager: "DatabaseManager",
+    snapshots: Iterable[Mapping[str, Any]],
+    batch_size: int = 500,
+) -> UpsertResult:
+    """Save a sweep of SIM snapshots (msisdn, balance, expiry, port)."""
+    with db_manager.get_session() as session:
+        result = inventory_upsert(snapshots, batch_size)(session)
+        session.commit()
+    logger.debug(
+        f"Inventory upsert - {result.inserted} inserted, "
+        f"{result.updated} updated, {result.unchanged} unchanged"
+    )
+    return result
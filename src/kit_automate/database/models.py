@@ -0,0 +1,67 @@
+"""ORM models shared by every DatabaseManager."""
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Index, Integer, String, func
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+
+class Base(DeclarativeBase):
+    """Declarative base for all kit-automate tables."""
+
+
+class MsisdnInventory(Base):
+    """Latest known state of a SIM in the modem pool (flow step 3, SAVE INFO)."""
+
+    __tablename__ = "msisdn_inventory"
+
+    msisdn: Mapped[str] = mapped_column(String(20), primary_key=True)
+    balance: Mapped[int | None] = mapped_column(Integer)
+    expiry: Mapped[date | None] = mapped_column(Date)
+    port: Mapped[str | None] = mapped_column(String(32))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.current_timestamp()
+    )
+
+
+class Transaction(Base):
+    """One voucher purchase attempt (flow step 4, AUTOMATISASI).
+
+    Written through ``kit_automate.database.rekap`` so the rekap summary
+    tables stay in step with it.
+    """
+
+    __tablename__ = "transactions"
+    __table_args__ = (Index("ix_transactions_msisdn_day", "msisdn", "day"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    msisdn: Mapped[str] = mapped_column(String(20))
+    product: Mapped[str] = mapped_column(String(64))
+    status: Mapped[str] = mapped_column(String(16))
+    amount: Mapped[int] = mapped_column(Integer, default=0)
+    day: Mapped[date] = mapped_column(Date, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+    updated_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+class RekapDaily(Base):
+    """Transaction count and amount per day, product and status."""
+
+    __tablename__ = "rekap_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    product: Mapped[str] = mapped_column(String(64), primary_key=True)
+    status: Mapped[str] = mapped_column(String(16), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0)
+    amount: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class RekapMsisdn(Base):
+    """Transaction count and amount per MSISDN and status."""
+
+    __tablename__ = "rekap_msisdn"
+
+    msisdn: Mapped[str] = mapped_column(String(20), primary_key=True)
+    status: Mapped[str] = mapped_column(String(16), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0)
+    amount: Mapped[int] = mapped_column(Integer, default=0)
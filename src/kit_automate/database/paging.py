@@ -0,0 +1,218 @@
+"""Keyset pagination for the large list views (rekap, MSISDN inventory).
+
+A :class:`KeysetPager` reads one table a page at a time, ordered by the
+sort column with the primary key as tie-breaker, and asks for the next
+page with ``WHERE (sort, pk) > (last sort, last pk) LIMIT n`` instead of
+``OFFSET``. Every page costs one index seek whatever its position, and
+opening a million-row table reads one page and no ``COUNT(*)``. Only the
+``max_pages`` most recently used pages are kept; an evicted page is read
+again from its remembered start key. Sorting and filtering are part of
+the query, never done in Python.
+
+The pager knows nothing about Qt; ``kit_automate.gui.PagedTableModel``
+wraps it for the views.
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Column, ColumnElement, Select, Table, and_, or_, select, tuple_
+
+if TYPE_CHECKING:
+    from kit_automate.config.db_config import DatabaseManager
+
+# Sort value (when sorting by a non-key column) followed by the primary key
+Key = tuple[Any, ...]
+
+
+class KeysetPager:
+    """Paged, sorted and filtered rows of one table.
+
+    Pages are appended with :meth:`fetch_more` (a view's ``fetchMore``);
+    :meth:`value` then reads any loaded row, re-querying its page when it
+    was evicted. Sorting by an unindexed column makes each page a sort of
+    the whole table, so index the columns the views sort by.
+
+    Args:
+        db_manager: Initialized database manager; pages come from its reader
+        table: Table with a primary key
+        columns: Columns to show, all by default
+        page_size: Rows per query
+        max_pages: Pages kept in memory
+    """
+
+    def __init__(
+        self,
+        db_manager: "DatabaseManager",
+        table: Table,
+        columns: Sequence[str] | None = None,
+        *,
+        page_size: int = 500,
+        max_pages: int = 16,
+    ):
+        if not table.primary_key.columns:
+            raise ValueError(f"Table {table.name} has no primary key")
+        self._db = db_manager
+        self._table = table
+        self.columns = list(columns or table.c.keys())
+        for name in self.columns:
+            self._column(name)
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._pk: list[Column] = list(table.primary_key.columns)
+        self._sort: Column | None = None
+        self._descending = False
+        self._where: tuple[ColumnElement[bool], ...] = ()
+        self.reset()
+
+    def _column(self, name: str) -> Column:
+        if name not in self._table.c:
+            raise ValueError(f"Unknown column {name!r} in {self._table.name}")
+        return self._table.c[name]
+
+    @property
+    def sort(self) -> tuple[str | None, bool]:
+        """Sort column name (None for primary key order) and direction."""
+        return (self._sort.name if self._sort is not None else None, self._descending)
+
+    def set_sort(self, column: str | None, descending: bool = False) -> None:
+        """Order by ``column`` (primary key when None) and start over."""
+        sort = self._column(column) if column is not None else None
+        self._sort = None if sort is not None and [sort] == self._pk else sort
+        self._descending = descending
+        self.reset()
+
+    def set_filter(self, *criteria: ColumnElement[bool]) -> None:
+        """Replace the filter with SQL criteria on the table and start over.
+
+        Example: ``pager.set_filter(table.c.status == "failed")``
+        """
+        self._where = criteria
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget every page, e.g. after the underlying rows changed."""
+        self._pages: OrderedDict[int, list[tuple]] = OrderedDict()
+        # Key after which each page starts; page 0 starts at the beginning
+        self._starts: list[Key | None] = [None]
+        self._rows = 0
+        self._exhausted = False
+
+    @property
+    def row_count(self) -> int:
+        """Rows fetched so far (not the table size, which is never counted)."""
+        return self._rows
+
+    @property
+    def can_fetch_more(self) -> bool:
+        return not self._exhausted
+
+    @property
+    def cached_pages(self) -> int:
+        return len(self._pages)
+
+    def _keys(self) -> list[Column]:
+        return self._pk if self._sort is None else [self._sort, *self._pk]
+
+    def _selected(self) -> list[Column]:
+        shown = [self._table.c[name] for name in self.columns]
+        return shown + [c for c in self._keys() if c.name not in self.columns]
+
+    def _order(self) -> list[ColumnElement]:
+        keys = self._keys()
+        return [k.desc() for k in keys] if self._descending else list(keys)
+
+    def _segments(self, key: Key) -> list[ColumnElement[bool]]:
+        """Criteria for the rows after ``key``, each one index range, in order.
+
+        SQLite sorts NULLs first ascending and last descending. A NULL
+        never compares, so NULL and non-NULL sort values are separate
+        ranges and a page may need the next one to fill up.
+        """
+
+        def later(columns: list[Column], values: Sequence) -> ColumnElement[bool]:
+            left, right = tuple_(*columns), tuple_(*values)
+            return left < right if self._descending else left > right
+
+        sort = self._sort
+        if sort is None:
+            return [later(self._pk, key)]
+        value, pk = key[0], key[1:]
+        if value is None:
+            rest = and_(sort.is_(None), later(self._pk, pk))
+            return [rest] if self._descending else [rest, sort.is_not(None)]
+        if self._descending:
+            segment = and_(sort <= value, or_(sort < value, later(self._pk, pk)))
+        else:
+            segment = and_(sort >= value, or_(sort > value, later(self._pk, pk)))
+        if self._descending and sort.nullable:
+            return [segment, sort.is_(None)]
+        return [segment]
+
+    def _statement(self, where: ColumnElement[bool] | None, limit: int) -> Select:
+        statement = select(*self._selected()).where(*self._where)
+        if where is not None:
+            statement = statement.where(where)
+        return statement.order_by(*self._order()).limit(limit)
+
+    def _key_of(self, row: tuple) -> Key:
+        positions = {c.name: i for i, c in enumerate(self._selected())}
+        return tuple(row[positions[c.name]] for c in self._keys())
+
+    def _load(self, page: int) -> list[tuple]:
+        start = self._starts[page]
+        segments = [None] if start is None else self._segments(start)
+        rows: list[tuple] = []
+        with self._db.get_read_session() as session:
+            for where in segments:
+                statement = self._statement(where, self.page_size - len(rows))
+                rows.extend(tuple(row) for row in session.execute(statement))
+                if len(rows) == self.page_size:
+                    break
+        self._pages[page] = rows
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return rows
+
+    def fetch_more(
+        self, before_insert: Callable[[int, int], None] | None = None
+    ) -> int:
+        """Load the next page; returns the number of rows added.
+
+        ``before_insert(first, last)`` is called after the query and before
+        ``row_count`` grows, which is where a Qt model calls
+        ``beginInsertRows``. It is not called when no rows were added.
+        """
+        if self._exhausted:
+            return 0
+        page = len(self._starts) - 1
+        rows = self._load(page)
+        if len(rows) < self.page_size:
+            self._exhausted = True
+        else:
+            self._starts.append(self._key_of(rows[-1]))
+        if rows:
+            if before_insert is not None:
+                before_insert(self._rows, self._rows + len(rows) - 1)
+            self._rows += len(rows)
+        return len(rows)
+
+    def row(self, index: int) -> tuple | None:
+        """Shown columns of row ``index``; None when out of range."""
+        if not 0 <= index < self._rows:
+            return None
+        page, offset = divmod(index, self.page_size)
+        rows = self._pages.get(page)
+        if rows is None:
+            rows = self._load(page)
+        else:
+            self._pages.move_to_end(page)
+        # A re-read page can be shorter if rows were deleted meanwhile
+        if offset >= len(rows):
+            return None
+        return rows[offset][: len(self.columns)]
+
+    def value(self, index: int, column: int) -> Any:
+        row = self.row(index)
+        return None if row is None else row[column]
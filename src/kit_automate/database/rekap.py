@@ -0,0 +1,257 @@
+"""Transaction writes with incrementally maintained rekap summaries.
+
+Every insert or status change of a :class:`Transaction` applies a +1/-1
+delta to ``rekap_daily`` and ``rekap_msisdn`` in the same transaction, with
+``INSERT ... ON CONFLICT DO UPDATE SET count = count + excluded.count``.
+Rekap queries then read the small summary tables and cost O(result size)
+however long the history grows. :func:`rebuild_rekap` recomputes both
+tables from the history when they are suspected to have drifted.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import TYPE_CHECKING
+
+from loguru import logger
+from sqlalchemy import Select, Table, delete, func, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from kit_automate.database.models import RekapDaily, RekapMsisdn, Transaction
+
+if TYPE_CHECKING:
+    from kit_automate.config.db_config import DatabaseManager
+
+_TRANSACTIONS: Table = Transaction.__table__  # type: ignore[assignment]
+_DAILY: Table = RekapDaily.__table__  # type: ignore[assignment]
+_MSISDN: Table = RekapMsisdn.__table__  # type: ignore[assignment]
+
+# History columns each summary table groups by
+_DAILY_KEYS = [Transaction.day, Transaction.product, Transaction.status]
+_MSISDN_KEYS = [Transaction.msisdn, Transaction.status]
+
+
+@dataclass(frozen=True)
+class DailyTotal:
+    """Transactions of one day, product and status."""
+
+    day: date
+    product: str
+    status: str
+    count: int
+    amount: int
+
+
+@dataclass(frozen=True)
+class MsisdnTotal:
+    """Transactions of one MSISDN and status."""
+
+    msisdn: str
+    status: str
+    count: int
+    amount: int
+
+
+@dataclass
+class RekapCheck:
+    """Summary rows that differ from a recomputation over the history."""
+
+    daily_mismatches: int = 0
+    msisdn_mismatches: int = 0
+
+    @property
+    def consistent(self) -> bool:
+        return not (self.daily_mismatches or self.msisdn_mismatches)
+
+
+def _upsert(table: Table, keys: list[str]):
+    statement = sqlite_insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={
+            "count": table.c.count + statement.excluded.count,
+            "amount": table.c.amount + statement.excluded.amount,
+        },
+    )
+
+
+# Built once: constructing a statement per call costs more than running it
+_DAILY_UPSERT = _upsert(_DAILY, ["day", "product", "status"])
+_MSISDN_UPSERT = _upsert(_MSISDN, ["msisdn", "status"])
+_INSERT = insert(_TRANSACTIONS).returning(_TRANSACTIONS.c.id)
+
+
+def _apply(
+    session: Session,
+    msisdn: str,
+    product: str,
+    status: str,
+    day: date,
+    amount: int,
+    sign: int,
+) -> None:
+    delta = {"status": status, "count": sign, "amount": sign * amount}
+    session.execute(_DAILY_UPSERT, {**delta, "day": day, "product": product})
+    session.execute(_MSISDN_UPSERT, {**delta, "msisdn": msisdn})
+
+
+def add_transaction(
+    session: Session,
+    msisdn: str,
+    product: str,
+    status: str,
+    amount: int = 0,
+    at: datetime | None = None,
+) -> int:
+    """Insert a transaction and count it in the rekap tables.
+
+    Runs inside the caller's transaction (``get_session`` or a
+    ``BatchWriter`` operation); the caller commits. Returns the new id.
+    """
+    at = at or datetime.now()
+    transaction_id = session.execute(
+        _INSERT,
+        {
+            "msisdn": msisdn,
+            "product": product,
+            "status": status,
+            "amount": amount,
+            "day": at.date(),
+            "created_at": at,
+            "updated_at": at,
+        },
+    ).scalar_one()
+    _apply(session, msisdn, product, status, at.date(), amount, +1)
+    return transaction_id
+
+
+def set_transaction_status(
+    session: Session, transaction_id: int, status: str, at: datetime | None = None
+) -> bool:
+    """Change a transaction's status and move it between rekap buckets.
+
+    Returns False when the status was already ``status``. Runs inside the
+    caller's transaction; the caller commits.
+
+    Raises:
+        ValueError: If the transaction does not exist
+    """
+    row = session.execute(
+        select(
+            Transaction.msisdn,
+            Transaction.product,
+            Transaction.status,
+            Transaction.amount,
+            Transaction.day,
+        ).where(Transaction.id == transaction_id)
+    ).one_or_none()
+    if row is None:
+        raise ValueError(f"Unknown transaction {transaction_id}")
+    if row.status == status:
+        return False
+    session.execute(
+        update(Transaction)
+        .where(Transaction.id == transaction_id)
+        .values(status=status, updated_at=at or datetime.now())
+    )
+    _apply(session, row.msisdn, row.product, row.status, row.day, row.amount, -1)
+    _apply(session, row.msisdn, row.product, status, row.day, row.amount, +1)
+    return True
+
+
+def record_transaction(
+    db_manager: "DatabaseManager",
+    msisdn: str,
+    product: str,
+    status: str,
+    amount: int = 0,
+) -> int:
+    """Insert and commit one transaction; returns its id."""
+    with db_manager.get_session() as session:
+        transaction_id = add_transaction(session, msisdn, product, status, amount)
+        session.commit()
+    return transaction_id
+
+
+def rekap_by_day(
+    db_manager: "DatabaseManager", start: date, end: date
+) -> list[DailyTotal]:
+    """Totals for ``start`` through ``end`` inclusive."""
+    with db_manager.get_read_session() as session:
+        rows = session.execute(
+            select(_DAILY)
+            .where(_DAILY.c.day.between(start, end), _DAILY.c.count != 0)
+            .order_by(_DAILY.c.day, _DAILY.c.product, _DAILY.c.status)
+        ).all()
+    return [DailyTotal(*row) for row in rows]
+
+
+def rekap_by_msisdn(db_manager: "DatabaseManager", msisdn: str) -> list[MsisdnTotal]:
+    """Totals of one MSISDN, one per status."""
+    with db_manager.get_read_session() as session:
+        rows = session.execute(
+            select(_MSISDN)
+            .where(_MSISDN.c.msisdn == msisdn, _MSISDN.c.count != 0)
+            .order_by(_MSISDN.c.status)
+        ).all()
+    return [MsisdnTotal(*row) for row in rows]
+
+
+def _recomputed(keys: list) -> Select:
+    return select(
+        *keys, func.count(), func.coalesce(func.sum(Transaction.amount), 0)
+    ).group_by(*keys)
+
+
+def _mismatches(session: Session, table: Table, keys: list) -> int:
+    key_columns = [table.c[k.key] for k in keys]
+    stored = {
+        tuple(row[:-2]): tuple(row[-2:])
+        for row in session.execute(
+            select(*key_columns, table.c.count, table.c.amount).where(
+                table.c.count != 0
+            )
+        )
+    }
+    expected = {
+        tuple(row[:-2]): tuple(row[-2:]) for row in session.execute(_recomputed(keys))
+    }
+    return sum(
+        1
+        for key in stored.keys() | expected.keys()
+        if stored.get(key) != expected.get(key)
+    )
+
+
+def verify_rekap(db_manager: "DatabaseManager") -> RekapCheck:
+    """Compare the summary tables with a full recomputation (read only)."""
+    with db_manager.get_read_session() as session:
+        return RekapCheck(
+            daily_mismatches=_mismatches(session, _DAILY, _DAILY_KEYS),
+            msisdn_mismatches=_mismatches(session, _MSISDN, _MSISDN_KEYS),
+        )
+
+
+def rebuild_rekap(db_manager: "DatabaseManager") -> RekapCheck:
+    """Recompute both summary tables from the history in one transaction.
+
+    Returns the mismatches found before the rebuild.
+    """
+    with db_manager.get_session() as session:
+        check = RekapCheck(
+            daily_mismatches=_mismatches(session, _DAILY, _DAILY_KEYS),
+            msisdn_mismatches=_mismatches(session, _MSISDN, _MSISDN_KEYS),
+        )
+        for table, keys in ((_DAILY, _DAILY_KEYS), (_MSISDN, _MSISDN_KEYS)):
+            session.execute(delete(table))
+            session.execute(
+                insert(table).from_select(
+                    [*(k.key for k in keys), "count", "amount"], _recomputed(keys)
+                )
+            )
+        session.commit()
+    logger.info(
+        f"Rekap rebuilt - {check.daily_mismatches} daily and "
+        f"{check.msisdn_mismatches} msisdn rows were out of date"
+    )
+    return check
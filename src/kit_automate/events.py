@@ -0,0 +1,165 @@
+"""Coalescing event bus between worker threads and the dashboard.
+
+Publishers (modem readers, the OTP broker, automation steps) call
+:meth:`EventBus.publish` from any thread; that is a ``deque.append`` plus
+per-thread counter increments, with no lock. The UI thread calls
+:meth:`EventBus.dispatch` once per frame, via :func:`qt_timer` or
+:meth:`EventBus.run`. Dispatch drains everything pending and keeps only
+the latest event per ``(topic, key)``, so 64 ports each reporting 100
+status changes per frame cost the widgets 64 updates, not 6400.
+
+Headless use (tests, benchmarks) is calling :meth:`EventBus.dispatch`
+directly.
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from loguru import logger
+
+from kit_automate.metrics import Counter, MetricsRegistry
+
+# Latest data per key for one topic, in first-seen order
+Batch = dict[Hashable, Any]
+Subscriber = Callable[[Batch], None]
+
+
+@dataclass(frozen=True)
+class BusStats:
+    published: int
+    delivered: int
+    coalesced: int
+    dropped: int
+
+
+class EventBus:
+    """Lock-free publish, batched and key-coalesced delivery.
+
+    Args:
+        max_pending: Events buffered between dispatches; beyond that the
+            oldest are dropped (and counted) so a stalled UI cannot grow
+            memory without bound
+        metrics: Registry for the ``events_*_total`` counters; standalone
+            counters are used when omitted
+    """
+
+    def __init__(
+        self, max_pending: int = 100_000, metrics: MetricsRegistry | None = None
+    ):
+        self._max_pending = max_pending
+        self._pending: deque[tuple[str, Hashable, Any]] = deque(maxlen=max_pending)
+        self._subscribers: dict[str, list[Subscriber]] = {}
+
+        def counter(name: str, help: str) -> Counter:
+            if metrics is not None:
+                return metrics.counter(name, help)
+            return Counter(name, help, ())
+
+        self._published = counter("events_published_total", "Events published")
+        self._delivered = counter(
+            "events_delivered_total", "Events delivered after coalescing"
+        )
+        self._coalesced = counter(
+            "events_coalesced_total", "Events superseded before delivery"
+        )
+        self._dropped = counter(
+            "events_dropped_total", "Events dropped because the bus was full"
+        )
+
+    def publish(self, topic: str, key: Hashable, data: Any) -> None:
+        """Post an event; safe from any thread, never blocks."""
+        pending = self._pending
+        if len(pending) >= self._max_pending:
+            # The append below evicts the oldest pending event
+            self._dropped.inc()
+        pending.append((topic, key, data))
+        self._published.inc()
+
+    def subscribe(self, topic: str, callback: Subscriber) -> Callable[[], None]:
+        """Deliver batches of ``topic`` to ``callback``; returns an unsubscribe.
+
+        Calling the unsubscribe again does nothing.
+        """
+        subscribers = self._subscribers.setdefault(topic, [])
+        subscribers.append(callback)
+        subscribed = True
+
+        def unsubscribe() -> None:
+            nonlocal subscribed
+            if subscribed:
+                subscribed = False
+                subscribers.remove(callback)
+
+        return unsubscribe
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def stats(self) -> BusStats:
+        return BusStats(
+            published=int(self._published.value),
+            delivered=int(self._delivered.value),
+            coalesced=int(self._coalesced.value),
+            dropped=int(self._dropped.value),
+        )
+
+    def dispatch(self) -> int:
+        """Deliver everything pending, coalesced; returns events delivered.
+
+        Call from one thread only (the UI thread). Events published while
+        dispatching wait for the next call.
+        """
+        pending = self._pending
+        count = len(pending)
+        if not count:
+            return 0
+        batches: dict[str, Batch] = {}
+        popleft = pending.popleft
+        for _ in range(count):
+            topic, key, data = popleft()
+            batch = batches.get(topic)
+            if batch is None:
+                batch = batches[topic] = {}
+            batch[key] = data
+
+        delivered = 0
+        for topic, batch in batches.items():
+            delivered += len(batch)
+            # A copy, so callbacks may unsubscribe while being called
+            for callback in tuple(self._subscribers.get(topic, ())):
+                try:
+                    callback(batch)
+                except Exception as e:
+                    logger.error(f"Event subscriber for {topic!r} failed: {e}")
+        self._delivered.inc(delivered)
+        self._coalesced.inc(count - delivered)
+        return delivered
+
+    async def run(self, fps: float = 30.0) -> None:
+        """Dispatch at most ``fps`` times per second until cancelled."""
+        interval = 1 / fps
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            self.dispatch()
+            await asyncio.sleep(max(interval - (loop.time() - started), 0))
+
+
+def qt_timer(bus: EventBus, fps: float = 30.0, parent: Any = None) -> Any:
+    """Start a ``QTimer`` dispatching ``bus`` on the Qt (UI) thread.
+
+    Must be called on the UI thread. Returns the timer; keep a reference
+    (or pass ``parent``) so it is not garbage collected.
+    """
+    from PySide6.QtCore import QTimer
+
+    timer = QTimer(parent)
+    timer.setInterval(max(int(1000 / fps), 1))
+    timer.timeout.connect(bus.dispatch)
+    timer.start()
+    return timer
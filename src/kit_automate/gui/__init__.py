@@ -0,0 +1,18 @@
+"""PySide6 views and models for the dashboard.
+
+Exports load on first use, so importing the package does not pull in
+PySide6.
+"""
+
+from typing import TYPE_CHECKING
+
+from kit_automate._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from kit_automate.gui.table_model import PagedTableModel
+
+__getattr__, __dir__ = lazy_exports(
+    __name__, {"PagedTableModel": "kit_automate.gui.table_model"}
+)
+
+__all__ = ["PagedTableModel"]
@@ -0,0 +1,104 @@
+"""Lazy table model over a :class:`~kit_automate.database.KeysetPager`.
+
+The view asks for rows with ``canFetchMore``/``fetchMore`` as it scrolls,
+so opening a table reads one page. Header clicks and filters reset the
+model and are answered by SQL, never by a ``QSortFilterProxyModel`` over
+loaded rows.
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    Qt,
+)
+from sqlalchemy import ColumnElement
+
+from kit_automate.database.paging import KeysetPager
+
+Index = QModelIndex | QPersistentModelIndex
+
+
+class PagedTableModel(QAbstractTableModel):
+    """Read-only table model fed page by page from the database.
+
+    Args:
+        pager: Pager over the table to show
+        headers: Column titles, the column names by default
+        parent: Qt parent object
+    """
+
+    def __init__(
+        self,
+        pager: KeysetPager,
+        headers: Sequence[str] | None = None,
+        parent: Any = None,
+    ):
+        super().__init__(parent)
+        self._pager = pager
+        self._headers = list(headers or pager.columns)
+
+    @property
+    def pager(self) -> KeysetPager:
+        return self._pager
+
+    def rowCount(self, parent: Index = QModelIndex()) -> int:  # noqa: N802 - Qt override
+        return 0 if parent.isValid() else self._pager.row_count
+
+    def columnCount(self, parent: Index = QModelIndex()) -> int:  # noqa: N802 - Qt override
+        return 0 if parent.isValid() else len(self._pager.columns)
+
+    def data(self, index: Index, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return self._pager.value(index.row(), index.column())
+
+    def headerData(  # noqa: N802 - Qt override
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._headers[section]
+        return section + 1
+
+    def canFetchMore(self, parent: Index) -> bool:  # noqa: N802 - Qt override
+        return not parent.isValid() and self._pager.can_fetch_more
+
+    def fetchMore(self, parent: Index) -> None:  # noqa: N802 - Qt override
+        if parent.isValid():
+            return
+
+        def begin(first: int, last: int) -> None:
+            self.beginInsertRows(QModelIndex(), first, last)
+
+        if self._pager.fetch_more(begin):
+            self.endInsertRows()
+
+    def sort(
+        self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder
+    ) -> None:
+        """Re-query ordered by ``column``; the view fetches the first page."""
+        self.beginResetModel()
+        self._pager.set_sort(
+            self._pager.columns[column], order == Qt.SortOrder.DescendingOrder
+        )
+        self.endResetModel()
+
+    def setFilter(self, *criteria: ColumnElement[bool]) -> None:  # noqa: N802 - Qt naming
+        """Re-query with SQL ``criteria``; no arguments clears the filter."""
+        self.beginResetModel()
+        self._pager.set_filter(*criteria)
+        self.endResetModel()
+
+    def refresh(self) -> None:
+        """Drop loaded pages so the view reads current rows again."""
+        self.beginResetModel()
+        self._pager.reset()
+        self.endResetModel()
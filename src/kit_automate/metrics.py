@@ -0,0 +1,385 @@
+"""In-process metrics: counters, gauges and fixed-bucket histograms.
+
+Counters and histograms are sharded per thread: an observation only
+touches the calling thread's own cell, so the hot path takes no lock and
+threads never contend. Shards are summed when a snapshot is rendered, and
+a thread's shard is folded into a base total when the thread exits.
+Snapshots use the Prometheus text format and can be written to a file or
+served on a localhost HTTP endpoint.
+
+Example:
+    >>> registry = MetricsRegistry()
+    >>> registry.counter("at_commands_total", port="P1").inc()
+    >>> print(registry.to_prometheus().splitlines()[-1])
+    at_commands_total{port="P1"} 1.0
+"""
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+import functools
+import inspect
+import os
+from pathlib import Path
+import re
+import threading
+import time
+from typing import Any, TypeVar
+import weakref
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Seconds, from a fast SQLite query up to a slow USSD session
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+METRICS_FILE = "metrics.prom"
+
+_NAME = re.compile(r"[a-zA-Z_:][a-zA-Z0-9_:]*")
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels: Labels, extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _CellOwner:
+    """Lives in a thread's local storage; dies when the thread exits."""
+
+    __slots__ = ("__weakref__",)
+
+
+def _retire(shards_ref: "weakref.ref[_Shards]", key: int) -> None:
+    shards = shards_ref()
+    if shards is not None:
+        shards._retire(key)
+
+
+class _Shards:
+    """One list of floats per thread; finished threads fold into ``_base``."""
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._cells: dict[int, list[float]] = {}
+        self._base = [0.0] * size
+        self._lock = threading.Lock()
+
+    def cell(self) -> list[float]:
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = [0.0] * self._size
+            with self._lock:
+                self._cells[id(cell)] = cell
+            owner = _CellOwner()
+            weakref.finalize(owner, _retire, weakref.ref(self), id(cell))
+            self._local.owner = owner
+            self._local.cell = cell
+            return cell
+
+    def _retire(self, key: int) -> None:
+        with self._lock:
+            cell = self._cells.pop(key)
+            self._base = [a + b for a, b in zip(self._base, cell, strict=True)]
+
+    def total(self) -> list[float]:
+        with self._lock:
+            cells = [self._base, *self._cells.values()]
+        return [sum(column) for column in zip(*cells, strict=True)]
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Labels):
+        self.name = name
+        self.help = help
+        self.labels = labels
+
+    @abstractmethod
+    def samples(self) -> list[str]:
+        """Prometheus sample lines, without the HELP/TYPE header."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing total."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Labels):
+        super().__init__(name, help, labels)
+        self._shards = _Shards(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._shards.cell()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._shards.total()[0]
+
+    def samples(self) -> list[str]:
+        return [f"{self.name}{_label_text(self.labels)} {self.value!r}"]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, e.g. open ports or queue depth.
+
+    ``set`` is a plain assignment; ``inc``/``dec`` take a lock, so keep
+    gauges off per-record hot paths.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Labels):
+        super().__init__(name, help, labels)
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def samples(self) -> list[str]:
+        return [f"{self.name}{_label_text(self.labels)} {self.value!r}"]
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: "Histogram"):
+        self._histogram = histogram
+        self._start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class Histogram(_Metric):
+    """Distribution over fixed upper bounds, plus sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Labels,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        if not self.buckets:
+            raise ValueError(f"Histogram {name} needs at least one bucket")
+        # Cells: one count per bucket, one for +Inf, then the sum
+        self._shards = _Shards(len(self.buckets) + 2)
+
+    def observe(self, value: float) -> None:
+        cell = self._shards.cell()
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def time(self) -> _Timer:
+        """Context manager observing the seconds spent in its block."""
+        return _Timer(self)
+
+    def timed(self, fn: F) -> F:
+        """Decorator observing each call's duration; supports ``async def``."""
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - start)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.observe(time.perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    @property
+    def count(self) -> int:
+        return int(sum(self._shards.total()[:-1]))
+
+    @property
+    def sum(self) -> float:
+        return self._shards.total()[-1]
+
+    def samples(self) -> list[str]:
+        totals = self._shards.total()
+        lines = []
+        cumulative = 0.0
+        for bound, count in zip((*self.buckets, "+Inf"), totals[:-1], strict=True):
+            cumulative += count
+            le = f'le="{bound}"'
+            lines.append(
+                f"{self.name}_bucket{_label_text(self.labels, le)} {int(cumulative)}"
+            )
+        labels = _label_text(self.labels)
+        lines.append(f"{self.name}_sum{labels} {totals[-1]!r}")
+        lines.append(f"{self.name}_count{labels} {int(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Get-or-create store of metrics, keyed by name and labels.
+
+    Look a metric up once and keep the returned object on hot paths; the
+    lookup itself builds a key and is slower than an observation.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[tuple[str, Labels], _Metric] = {}
+        self._kinds: dict[str, type[_Metric]] = {}
+        self._lock = threading.Lock()
+        self._server: Any = None
+
+    def _get(
+        self, cls: type[_Metric], name: str, help: str, labels: dict, **kwargs: Any
+    ) -> Any:
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    if not _NAME.fullmatch(name):
+                        raise ValueError(f"Invalid metric name: {name!r}")
+                    if self._kinds.setdefault(name, cls) is not cls:
+                        raise ValueError(
+                            f"Metric {name} is a {self._kinds[name].kind}, "
+                            f"not a {cls.kind}"
+                        )
+                    metric = cls(name, help, key[1], **kwargs)
+                    self._metrics[key] = metric
+        if type(metric) is not cls:
+            raise ValueError(f"Metric {name} is a {metric.kind}, not a {cls.kind}")
+        return metric
+
+    def counter(self, name: str, help: str = "", **labels: object) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str = "", **labels: object) -> Gauge:
+        return self._get(Gauge, name, help, labels)
+
+    def histogram(
+        self,
+        name: str,
+        help: str = "",
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+        **labels: object,
+    ) -> Histogram:
+        return self._get(Histogram, name, help, labels, buckets=buckets)
+
+    def timed(self, name: str, help: str = "", **labels: object) -> Callable[[F], F]:
+        """Decorator factory timing calls into histogram ``name``."""
+        return self.histogram(name, help, **labels).timed
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: (m.name, m.labels))
+        lines = []
+        family = None
+        for metric in metrics:
+            if metric.name != family:
+                family = metric.name
+                if metric.help:
+                    lines.append(f"# HELP {metric.name} {_escape(metric.help)}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_prometheus(self, path: Path) -> Path:
+        """Write a snapshot to ``path`` atomically (for node_exporter's textfile)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        partial.write_text(self.to_prometheus(), encoding="utf-8")
+        partial.replace(path)
+        return path
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> tuple[str, int]:
+        """Serve ``/metrics`` over HTTP from a daemon thread.
+
+        Binds to localhost by default; pass ``port=0`` for a free port.
+        Returns the bound address.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        if self._server is not None:
+            return self._server.server_address
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] not in {"/", "/metrics"}:
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header(
+                    "Content-Type", "text/plain; version=0.0.4; charset=utf-8"
+                )
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(
+            target=self._server.serve_forever, name="metrics-http", daemon=True
+        ).start()
+        return self._server.server_address
+
+    def close(self) -> None:
+        """Stop the HTTP endpoint, if serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,98 @@
+"""GSM modem pool I/O.
+
+Exports load on first use, so importing the package does not pull in
+pyserial.
+"""
+
+from typing import TYPE_CHECKING
+
+from kit_automate._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from kit_automate.modem.at_parser import (
+        AtEvent,
+        AtStreamParser,
+        FinalResult,
+        InformationLine,
+        PduPayload,
+        Prompt,
+        Urc,
+    )
+    from kit_automate.modem.reactor import (
+        AtResponse,
+        AtTimeoutError,
+        ModemError,
+        ModemPool,
+        ModemPort,
+        PortClosedError,
+    )
+    from kit_automate.modem.scheduler import (
+        Priority,
+        SchedulerStats,
+        SimCheckScheduler,
+    )
+    from kit_automate.modem.sharding import (
+        ShardedModemPool,
+        ShardStats,
+        create_modem_pool,
+    )
+    from kit_automate.modem.simulator import (
+        SimCard,
+        SimProfile,
+        VirtualModem,
+        VirtualModemPool,
+    )
+
+_EXPORTS = {
+    "AtEvent": "kit_automate.modem.at_parser",
+    "AtStreamParser": "kit_automate.modem.at_parser",
+    "FinalResult": "kit_automate.modem.at_parser",
+    "InformationLine": "kit_automate.modem.at_parser",
+    "PduPayload": "kit_automate.modem.at_parser",
+    "Prompt": "kit_automate.modem.at_parser",
+    "Urc": "kit_automate.modem.at_parser",
+    "AtResponse": "kit_automate.modem.reactor",
+    "AtTimeoutError": "kit_automate.modem.reactor",
+    "ModemError": "kit_automate.modem.reactor",
+    "ModemPool": "kit_automate.modem.reactor",
+    "ModemPort": "kit_automate.modem.reactor",
+    "PortClosedError": "kit_automate.modem.reactor",
+    "Priority": "kit_automate.modem.scheduler",
+    "SchedulerStats": "kit_automate.modem.scheduler",
+    "SimCheckScheduler": "kit_automate.modem.scheduler",
+    "ShardedModemPool": "kit_automate.modem.sharding",
+    "ShardStats": "kit_automate.modem.sharding",
+    "create_modem_pool": "kit_automate.modem.sharding",
+    "SimCard": "kit_automate.modem.simulator",
+    "SimProfile": "kit_automate.modem.simulator",
+    "VirtualModem": "kit_automate.modem.simulator",
+    "VirtualModemPool": "kit_automate.modem.simulator",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = [
+    "AtEvent",
+    "AtResponse",
+    "AtStreamParser",
+    "AtTimeoutError",
+    "FinalResult",
+    "InformationLine",
+    "ModemError",
+    "ModemPool",
+    "ModemPort",
+    "PduPayload",
+    "PortClosedError",
+    "Priority",
+    "Prompt",
+    "SchedulerStats",
+    "ShardStats",
+    "ShardedModemPool",
+    "SimCard",
+    "SimCheckScheduler",
+    "SimProfile",
+    "Urc",
+    "VirtualModem",
+    "VirtualModemPool",
+    "create_modem_pool",
+]
@@ -0,0 +1,209 @@
+r"""Incremental parser for the AT response / URC byte stream.
+
+Modems interleave command responses with unsolicited result codes, and a
+serial read can end anywhere, even in the middle of a line. The parser keeps
+one reusable ``bytearray``, scans it through a ``memoryview`` and decodes
+each complete line straight from the buffer, so a line is copied exactly
+once (into its ``str``). Consumed bytes are compacted away lazily.
+
+>>> parser = AtStreamParser()
+>>> parser.feed(b"\r\n+CSQ: 20,0\r\n\r\nO")
+[InformationLine(text='+CSQ: 20,0')]
+>>> parser.feed(b'K\r\n\r\n+CMTI: "SM",3\r\n')
+[FinalResult(text='OK'), Urc(text='+CMTI: "SM",3')]
+"""
+
+from dataclasses import dataclass
+
+FINAL_OK = "OK"
+FINAL_RESULTS = frozenset(
+    {
+        "OK",
+        "ERROR",
+        "NO CARRIER",
+        "BUSY",
+        "NO ANSWER",
+        "NO DIALTONE",
+    }
+)
+FINAL_ERROR_PREFIXES = ("+CME ERROR:", "+CMS ERROR:")
+URC_PREFIXES = (
+    "+CMTI:",
+    "+CMT:",
+    "+CUSD:",
+    "+CDS:",
+    "+CDSI:",
+    "+CBM:",
+    "+CLIP:",
+    "+CREG:",
+    "+CGREG:",
+    "RING",
+)
+# Headers whose next line is a payload (PDU or text body), not a new line
+PAYLOAD_HEADERS = ("+CMT:", "+CDS:", "+CBM:", "+CMGR:", "+CMGL:")
+
+_LF = 0x0A
+_CR = 0x0D
+_PROMPT = 0x3E  # ">"
+_COMPACT_THRESHOLD = 4096
+
+
+@dataclass(frozen=True, slots=True)
+class FinalResult:
+    """Final result code ending the current command."""
+
+    text: str
+
+    @property
+    def ok(self) -> bool:
+        return self.text == FINAL_OK
+
+
+@dataclass(frozen=True, slots=True)
+class InformationLine:
+    """Intermediate line belonging to the current command's response."""
+
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class Urc:
+    """Unsolicited result code."""
+
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class PduPayload:
+    """Payload line following a header such as ``+CMT:`` or ``+CMGL:``."""
+
+    header: str
+    data: str
+    unsolicited: bool
+
+
+@dataclass(frozen=True, slots=True)
+class Prompt:
+    """The ``> `` prompt asking for a command payload (e.g. AT+CMGS)."""
+
+
+AtEvent = FinalResult | InformationLine | Urc | PduPayload | Prompt
+
+PROMPT = Prompt()
+
+
+def is_final(line: str) -> bool:
+    """Whether ``line`` terminates the response of the current command."""
+    return line in FINAL_RESULTS or line.startswith(FINAL_ERROR_PREFIXES)
+
+
+def is_urc(line: str) -> bool:
+    """Whether ``line`` is an unsolicited result code."""
+    return line.startswith(URC_PREFIXES)
+
+
+def _declares_empty_body(header: str) -> bool:
+    """Whether a payload header ends with a zero body length.
+
+    >>> _declares_empty_body("+CMT: ,0"), _declares_empty_body("+CMT: ,23")
+    (True, False)
+    """
+    last = header.rpartition(",")[2] if "," in header else header.partition(":")[2]
+    return last.strip() == "0"
+
+
+class AtStreamParser:
+    """Turn raw chunks from one port into typed AT events."""
+
+    def __init__(self, encoding: str = "latin-1"):
+        # latin-1 maps every byte, so line noise can never raise
+        self.encoding = encoding
+        self._buffer = bytearray()
+        self._start = 0
+        self._payload_header: str | None = None
+        self._payload_unsolicited = False
+
+    @property
+    def pending(self) -> int:
+        """Bytes buffered but not yet part of a complete line."""
+        return len(self._buffer) - self._start
+
+    def reset(self) -> None:
+        """Drop buffered bytes, e.g. after a command timed out."""
+        self._buffer.clear()
+        self._start = 0
+        self._payload_header = None
+
+    def feed(self, data: bytes | bytearray | memoryview) -> list[AtEvent]:
+        """Consume a chunk and return the events it completed."""
+        buffer = self._buffer
+        buffer += data
+        events: list[AtEvent] = []
+        start = self._start
+        newline = buffer.find(_LF, start)
+
+        if newline >= 0:
+            encoding = self.encoding
+            emit = self._emit
+            with memoryview(buffer) as view:
+                while newline >= 0:
+                    # Trim the CR of CRLF without creating a slice
+                    line_start, line_end = start, newline
+                    while line_start < line_end and buffer[line_start] == _CR:
+                        line_start += 1
+                    if line_end > line_start and buffer[line_end - 1] == _CR:
+                        line_end -= 1
+                    start = newline + 1
+                    if line_start < line_end:
+                        # Decoded straight from the buffer: the str is the only copy
+                        emit(str(view[line_start:line_end], encoding), events)
+                    newline = buffer.find(_LF, start)
+
+        # A body line after a payload header may start with ">" too
+        if self._payload_header is None and self._is_prompt(start):
+            events.append(PROMPT)
+            start = len(buffer)
+
+        if start >= len(buffer):
+            buffer.clear()
+            start = 0
+        elif start > _COMPACT_THRESHOLD:
+            del buffer[:start]
+            start = 0
+        self._start = start
+        return events
+
+    def _is_prompt(self, start: int) -> bool:
+        buffer = self._buffer
+        end = len(buffer)
+        while start < end and buffer[start] == _CR:
+            start += 1
+        return start < end and buffer[start] == _PROMPT
+
+    def _emit(self, line: str, events: list[AtEvent]) -> None:
+        final = line in FINAL_RESULTS or line.startswith(FINAL_ERROR_PREFIXES)
+        header = self._payload_header
+        if header is not None:
+            self._payload_header = None
+            unsolicited = self._payload_unsolicited
+            if not final:
+                events.append(PduPayload(header, line, unsolicited))
+                return
+            # A final result right after the header means an empty body
+            events.append(Urc(header) if unsolicited else InformationLine(header))
+
+        if final:
+            events.append(FinalResult(line))
+            return
+
+        unsolicited = is_urc(line)
+        if line.startswith(PAYLOAD_HEADERS):
+            if _declares_empty_body(line):
+                # Nothing follows, and a blank line would be read as the body
+                events.append(PduPayload(line, "", unsolicited))
+                return
+            # Held back and emitted together with its payload line
+            self._payload_header = line
+            self._payload_unsolicited = unsolicited
+            return
+        events.append(Urc(line) if unsolicited else InformationLine(line))
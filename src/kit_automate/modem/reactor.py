@@ -0,0 +1,468 @@
+"""Asyncio reactor multiplexing every modem serial port on one event loop.
+
+Each port is registered with the loop's selector (``add_reader``) instead of
+getting its own blocking reader thread, so a 64-port pool costs 64 file
+descriptors and no extra threads. Platforms whose serial handles are not
+selectable (Windows COM ports) fall back to a non-blocking poll coroutine,
+still on the same loop.
+"""
+
+import asyncio
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+import os
+import time
+from typing import Any
+
+from loguru import logger
+import serial
+
+from kit_automate.modem.at_parser import (
+    FINAL_OK,
+    AtStreamParser,
+    FinalResult,
+    InformationLine,
+    PduPayload,
+    Prompt,
+    Urc,
+)
+
+CTRL_Z = b"\x1a"
+
+UrcHandler = Callable[[str, Urc | PduPayload], None]
+
+
+class ModemError(Exception):
+    """Base error for modem port failures."""
+
+
+class AtTimeoutError(ModemError, TimeoutError):
+    """No final result code arrived within the command timeout."""
+
+
+class PortClosedError(ModemError):
+    """The port was closed or its device disappeared."""
+
+
+@dataclass(frozen=True)
+class AtResponse:
+    """Lines returned by one AT command, up to its final result code."""
+
+    command: str
+    lines: tuple[str, ...]
+    final: str
+    elapsed: float
+
+    @property
+    def ok(self) -> bool:
+        return self.final == FINAL_OK
+
+
+@dataclass
+class PortStats:
+    commands: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    urcs: int = 0
+
+
+@dataclass
+class _Pending:
+    command: str
+    timeout: float
+    payload: bytes | None
+    future: asyncio.Future
+    lines: list[str] = field(default_factory=list)
+    started: float = 0.0
+    prompt: asyncio.Event = field(default_factory=asyncio.Event)
+    answered: bool = False
+
+
+class ModemPort:
+    """One serial modem with a pipelined AT command queue.
+
+    Callers await :meth:`send`; commands are queued and written back to back
+    as soon as the previous one reaches its final result code, without a
+    round-trip through the caller. Unsolicited result codes (and ``+CMT``
+    style URCs with their payload line) are handed to
+    ``urc_handler(port_name, event)``.
+
+    A command that timed out or was cancelled may still get its final
+    result later; the port waits up to ``drain_timeout`` for it before
+    writing the next command, so the late answer cannot resolve the wrong
+    caller.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        device: str,
+        baudrate: int = 115_200,
+        default_timeout: float = 5.0,
+        urc_handler: UrcHandler | None = None,
+        poll_interval: float = 0.005,
+        drain_timeout: float = 0.5,
+    ):
+        self.name = name
+        self.device = device
+        self.baudrate = baudrate
+        self.default_timeout = default_timeout
+        self.urc_handler = urc_handler
+        self.poll_interval = poll_interval
+        self.drain_timeout = drain_timeout
+        self.stats = PortStats()
+        self._serial: Any = None
+        self._fd: int | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[_Pending] = asyncio.Queue()
+        self._current: _Pending | None = None
+        self._parser = AtStreamParser()
+        self._tasks: list[asyncio.Task] = []
+        # Set once the final result of an abandoned command shows up
+        self._stale: asyncio.Event | None = None
+        self._closed = True
+        self._lost = False  # device gone; close() still has to clean up
+
+    @property
+    def is_open(self) -> bool:
+        return not self._closed and not self._lost
+
+    async def open(self) -> None:
+        """Open the device and register it with the running loop."""
+        self._loop = asyncio.get_running_loop()
+        self._serial = serial.serial_for_url(
+            self.device, baudrate=self.baudrate, timeout=0, write_timeout=1
+        )
+        self._closed = False
+        self._lost = False
+        try:
+            self._fd = self._serial.fileno()
+        except (AttributeError, OSError, NotImplementedError):
+            self._fd = None
+
+        if self._fd is not None and os.name == "posix":
+            self._loop.add_reader(self._fd, self._on_readable)
+        else:
+            self._tasks.append(asyncio.create_task(self._poll()))
+        self._tasks.append(asyncio.create_task(self._run()))
+        logger.debug(f"Modem port {self.name} opened on {self.device}")
+
+    async def send(
+        self,
+        command: str,
+        timeout: float | None = None,  # noqa: ASYNC109 - counted from the write, not the call
+        payload: bytes | str | None = None,
+    ) -> AtResponse:
+        """Queue an AT command and wait for its final result code.
+
+        Args:
+            command: Command without the trailing carriage return
+            timeout: Seconds from write to final result (default per port)
+            payload: Data sent after the ``>`` prompt, e.g. AT+CMGS text;
+                Ctrl-Z is appended
+
+        Raises:
+            AtTimeoutError: No final result code in time
+            PortClosedError: Port closed before the command completed
+        """
+        if not self.is_open or self._loop is None:
+            raise PortClosedError(f"Port {self.name} is not open")
+        if isinstance(payload, str):
+            payload = payload.encode()
+        pending = _Pending(
+            command=command,
+            timeout=self.default_timeout if timeout is None else timeout,
+            payload=payload,
+            future=self._loop.create_future(),
+        )
+        await self._queue.put(pending)
+        return await pending.future
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._fd is not None and self._loop is not None and os.name == "posix":
+            self._loop.remove_reader(self._fd)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._fail_all(PortClosedError(f"Port {self.name} closed"))
+        if self._serial is not None:
+            try:
+                self._serial.close()
+            except (OSError, serial.SerialException) as e:
+                logger.debug(f"Closing {self.name} after loss: {e}")
+            self._serial = None
+        self._fd = None
+        logger.debug(f"Modem port {self.name} closed")
+
+    async def _run(self) -> None:
+        """Write queued commands one after another."""
+        while True:
+            pending = await self._queue.get()
+            if pending.future.done():
+                continue
+            self._current = pending
+            pending.started = time.perf_counter()
+            self.stats.commands += 1
+            try:
+                await self._exchange(pending)
+            except (OSError, serial.SerialException) as e:
+                if not pending.future.done():
+                    pending.future.set_exception(PortClosedError(str(e)))
+            finally:
+                self._current = None
+            if not pending.answered and self.is_open:
+                await self._drain()
+
+    async def _exchange(self, pending: _Pending) -> None:
+        """Write one command (and its payload) and wait for the outcome."""
+        assert self._loop is not None
+        deadline = self._loop.time() + pending.timeout
+        await self._write(pending.command.encode() + b"\r")
+        # asyncio.wait never raises for the futures' own outcome, so a
+        # caller cancelling its send() cannot kill this worker
+        if pending.payload is not None:
+            prompt = asyncio.ensure_future(pending.prompt.wait())
+            await asyncio.wait(
+                {pending.future, prompt},
+                timeout=pending.timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            prompt.cancel()
+            if pending.prompt.is_set() and not pending.future.done():
+                await self._write(pending.payload + CTRL_Z)
+        remaining = max(deadline - self._loop.time(), 0)
+        done, _ = await asyncio.wait({pending.future}, timeout=remaining)
+        if not done:
+            self.stats.timeouts += 1
+            pending.future.set_exception(
+                AtTimeoutError(
+                    f"{self.name}: {pending.command} timed out after {pending.timeout}s"
+                )
+            )
+            # Drop any partial response so it cannot leak into the next one
+            self._parser.reset()
+
+    async def _drain(self) -> None:
+        """Give an abandoned command's late final result time to arrive."""
+        self._stale = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._stale.wait(), self.drain_timeout)
+        except TimeoutError:
+            pass
+        finally:
+            self._stale = None
+
+    async def _write(self, data: bytes) -> None:
+        """Write all of ``data``, waiting for the tty buffer when it is full."""
+        if self._fd is None or os.name != "posix":
+            self._serial.write(data)  # blocking, bounded by write_timeout
+            return
+        view = memoryview(data)
+        while view:
+            if self._fd is None:
+                raise PortClosedError(f"Port {self.name} lost")
+            try:
+                written = os.write(self._fd, view)
+            except BlockingIOError:
+                await self._writable(self._fd)
+                continue
+            view = view[written:]
+
+    async def _writable(self, fd: int) -> None:
+        assert self._loop is not None
+        ready = self._loop.create_future()
+        self._loop.add_writer(fd, ready.set_result, None)
+        try:
+            await ready
+        finally:
+            self._loop.remove_writer(fd)
+
+    def _on_readable(self) -> None:
+        try:
+            data = os.read(self._fd, 4096)  # type: ignore[arg-type]
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._on_lost(e)
+            return
+        if not data:
+            self._on_lost(OSError("EOF"))
+            return
+        self.feed(data)
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                waiting = self._serial.in_waiting
+                if waiting:
+                    self.feed(self._serial.read(waiting))
+            except (OSError, serial.SerialException) as e:
+                self._on_lost(e)
+                return
+            await asyncio.sleep(self.poll_interval)
+
+    def _on_lost(self, error: Exception) -> None:
+        logger.warning(f"Modem port {self.name} lost: {error}")
+        if self._fd is not None and self._loop is not None and os.name == "posix":
+            self._loop.remove_reader(self._fd)
+            self._fd = None
+        self._lost = True
+        self._fail_all(PortClosedError(f"Port {self.name} lost: {error}"))
+
+    def _fail_all(self, error: Exception) -> None:
+        if self._current is not None and not self._current.future.done():
+            self._current.future.set_exception(error)
+        while not self._queue.empty():
+            pending = self._queue.get_nowait()
+            if not pending.future.done():
+                pending.future.set_exception(error)
+
+    def feed(self, data: bytes) -> None:
+        """Consume raw bytes read from the device."""
+        for event in self._parser.feed(data):
+            match event:
+                case FinalResult():
+                    self._on_final(event)
+                case InformationLine():
+                    self._on_information(event.text)
+                case Urc():
+                    if self._owns(event.text):
+                        self._on_information(event.text)
+                    else:
+                        self._dispatch(event)
+                case PduPayload():
+                    if event.unsolicited and not self._owns(event.header):
+                        self._dispatch(event)
+                    else:
+                        self._on_information(event.header)
+                        self._on_information(event.data)
+                case Prompt():
+                    self._on_prompt()
+
+    def _active(self) -> _Pending | None:
+        current = self._current
+        if current is None or current.future.done():
+            return None
+        return current
+
+    def _owns(self, line: str) -> bool:
+        current = self._active()
+        return current is not None and _answers(current.command, line)
+
+    def _on_final(self, event: FinalResult) -> None:
+        current = self._active()
+        if current is None:
+            if self._stale is not None:
+                self._stale.set()
+                logger.debug(f"Late final result on {self.name}: {event.text}")
+            else:
+                logger.debug(f"Stray final result on {self.name}: {event.text}")
+            return
+        if not event.ok:
+            self.stats.errors += 1
+        current.answered = True
+        current.future.set_result(
+            AtResponse(
+                command=current.command,
+                lines=tuple(current.lines),
+                final=event.text,
+                elapsed=time.perf_counter() - current.started,
+            )
+        )
+
+    def _on_information(self, line: str) -> None:
+        current = self._active()
+        if current is None:
+            logger.debug(f"Unsolicited line on {self.name}: {line}")
+        elif line != current.command:  # skip command echo (ATE1)
+            current.lines.append(line)
+
+    def _on_prompt(self) -> None:
+        current = self._active()
+        if current is not None and current.payload is not None:
+            current.prompt.set()  # _exchange writes the payload
+
+    def _dispatch(self, event: Urc | PduPayload) -> None:
+        self.stats.urcs += 1
+        if self.urc_handler is None:
+            logger.debug(f"Unhandled URC on {self.name}: {event}")
+            return
+        try:
+            self.urc_handler(self.name, event)
+        except Exception as e:
+            logger.error(f"URC handler failed on {self.name}: {e}")
+
+
+def _answers(command: str, line: str) -> bool:
+    """Whether ``line`` is the information response of ``command``.
+
+    ``AT+CUSD?`` answers ``+CUSD: 1`` which would otherwise look like a URC.
+    """
+    name = command[2:].split("=", 1)[0].rstrip("?")
+    return bool(name) and line.startswith(name + ":")
+
+
+class ModemPool:
+    """All modem ports of a pool, multiplexed on the running event loop."""
+
+    def __init__(
+        self,
+        urc_handler: UrcHandler | None = None,
+        default_timeout: float = 5.0,
+        baudrate: int = 115_200,
+    ):
+        self.urc_handler = urc_handler
+        self.default_timeout = default_timeout
+        self.baudrate = baudrate
+        self.ports: dict[str, ModemPort] = {}
+
+    def __getitem__(self, name: str) -> ModemPort:
+        return self.ports[name]
+
+    def __len__(self) -> int:
+        return len(self.ports)
+
+    async def open(self, devices: Mapping[str, str]) -> None:
+        """Open ports given as ``{name: device}``.
+
+        A port that fails to open is logged and skipped so one bad modem
+        does not take the whole pool down.
+        """
+        for name, device in devices.items():
+            port = ModemPort(
+                name,
+                device,
+                baudrate=self.baudrate,
+                default_timeout=self.default_timeout,
+                urc_handler=self.urc_handler,
+            )
+            try:
+                await port.open()
+            except (OSError, serial.SerialException) as e:
+                logger.error(f"Cannot open modem port {name} ({device}): {e}")
+                continue
+            self.ports[name] = port
+        logger.info(f"Modem pool opened - {len(self.ports)}/{len(devices)} ports")
+
+    async def send(self, name: str, command: str, **kwargs: Any) -> AtResponse:
+        return await self.ports[name].send(command, **kwargs)
+
+    async def broadcast(
+        self, command: str, names: Iterable[str] | None = None, **kwargs: Any
+    ) -> dict[str, AtResponse | Exception]:
+        """Send ``command`` to many ports concurrently."""
+        targets = list(self.ports if names is None else names)
+        results = await asyncio.gather(
+            *(self.ports[n].send(command, **kwargs) for n in targets),
+            return_exceptions=True,
+        )
+        return dict(zip(targets, results, strict=True))
+
+    async def close(self) -> None:
+        await asyncio.gather(*(port.close() for port in self.ports.values()))
+        self.ports.clear()
+        logger.info("Modem pool closed")
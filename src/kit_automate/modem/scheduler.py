@@ -0,0 +1,227 @@
+"""Priority scheduler for per-SIM checks (balance, USSD, expiry sweeps).
+
+A modem runs one USSD session at a time and a session takes seconds, so
+checks are queued per port and started from one global priority order:
+
+- per-port exclusivity: at most one check runs on a port at any time
+- a global cap on checks running across the pool
+- urgent (purchase-time) checks jump ahead of queued sweeps and can keep
+  ``urgent_reserve`` global slots that sweeps may not use
+- backpressure: :meth:`SimCheckScheduler.schedule` waits while a port
+  already has ``max_pending_per_port`` checks queued
+
+A running check is never interrupted (an aborted USSD session leaves the
+modem in an unknown menu state); preemption happens at the queue. With
+``P`` ports a sweep of ``N`` SIMs takes about ``N / P`` check latencies.
+"""
+
+import asyncio
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from enum import IntEnum
+import heapq
+import itertools
+from typing import Any
+
+from loguru import logger
+
+Check = Callable[[], Awaitable[Any]]
+
+
+class Priority(IntEnum):
+    URGENT = 0
+    NORMAL = 1
+    SWEEP = 2
+
+
+@dataclass
+class SchedulerStats:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    backpressure_waits: int = 0
+
+
+@dataclass(order=True)
+class _Job:
+    priority: int
+    seq: int
+    port: str = field(compare=False)
+    check: Check = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class SimCheckScheduler:
+    """Run SIM checks on a modem pool, one per port, highest priority first.
+
+    Must be used from the event loop thread.
+    """
+
+    def __init__(
+        self,
+        ports: Iterable[str],
+        max_concurrency: int | None = None,
+        urgent_reserve: int = 0,
+        max_pending_per_port: int = 32,
+    ):
+        self._queues: dict[str, list[_Job]] = {port: [] for port in ports}
+        self.max_concurrency = max_concurrency or len(self._queues)
+        if not 0 <= urgent_reserve < self.max_concurrency:
+            raise ValueError("urgent_reserve must be below max_concurrency")
+        self.urgent_reserve = urgent_reserve
+        self.max_pending_per_port = max_pending_per_port
+        self.stats = SchedulerStats()
+        self._seq = itertools.count()
+        # Head job of every idle port with queued work; stale entries are
+        # skipped on pop
+        self._ready: list[tuple[int, int, str]] = []
+        self._busy: set[str] = set()
+        self._space: dict[str, list[asyncio.Future]] = defaultdict(list)
+        self._tasks: set[asyncio.Task] = set()
+        self._closed = False
+
+    @property
+    def running(self) -> int:
+        return len(self._busy)
+
+    def pending(self, port: str | None = None) -> int:
+        """Queued (not yet running) checks on ``port`` or the whole pool."""
+        if port is not None:
+            return len(self._queues[port])
+        return sum(len(q) for q in self._queues.values())
+
+    async def schedule(
+        self, port: str, check: Check, priority: Priority = Priority.NORMAL
+    ) -> asyncio.Future:
+        """Queue ``check`` on ``port`` and return the future of its result.
+
+        Waits while the port's queue is full; urgent checks never wait.
+
+        Raises:
+            KeyError: Unknown port
+            RuntimeError: Scheduler closed
+        """
+        queue = self._queues[port]
+        loop = asyncio.get_running_loop()
+        while (
+            not self._closed
+            and priority != Priority.URGENT
+            and len(queue) >= self.max_pending_per_port
+        ):
+            self.stats.backpressure_waits += 1
+            waiter = loop.create_future()
+            self._space[port].append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._space[port]:
+                    self._space[port].remove(waiter)
+        if self._closed:
+            raise RuntimeError("SimCheckScheduler is closed")
+
+        job = _Job(
+            priority,
+            next(self._seq),
+            port,
+            check,
+            loop.create_future(),
+        )
+        heapq.heappush(queue, job)
+        self.stats.submitted += 1
+        if port not in self._busy and queue[0] is job:
+            heapq.heappush(self._ready, (job.priority, job.seq, port))
+        self._dispatch()
+        return job.future
+
+    async def run(
+        self, port: str, check: Check, priority: Priority = Priority.NORMAL
+    ) -> Any:
+        """Queue ``check`` and wait for its result."""
+        return await (await self.schedule(port, check, priority))
+
+    async def sweep(
+        self, checks: Iterable[tuple[str, Check]]
+    ) -> list[Any | BaseException]:
+        """Run background checks given as ``(port, check)``, in input order.
+
+        Checks are fed in under backpressure, so a sweep over thousands of
+        SIMs keeps only ``max_pending_per_port`` checks queued per port.
+        Failed checks are returned as their exception.
+        """
+        futures = [
+            await self.schedule(port, check, Priority.SWEEP) for port, check in checks
+        ]
+        return await asyncio.gather(*futures, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Cancel queued checks and wait for the running ones."""
+        self._closed = True
+        for queue in self._queues.values():
+            for job in queue:
+                if job.future.cancel():
+                    self.stats.cancelled += 1
+            queue.clear()
+        self._ready.clear()
+        for port in list(self._space):
+            self._release_space(port)
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _dispatch(self) -> None:
+        ready = self._ready
+        while ready and len(self._busy) < self.max_concurrency:
+            priority, seq, port = ready[0]
+            queue = self._queues[port]
+            if port in self._busy or not queue or queue[0].seq != seq:
+                heapq.heappop(ready)  # stale entry
+                continue
+            if (
+                priority != Priority.URGENT
+                and len(self._busy) >= self.max_concurrency - self.urgent_reserve
+            ):
+                return  # everything left is lower priority
+            heapq.heappop(ready)
+            job = heapq.heappop(queue)
+            if job.future.done():  # cancelled by its caller while queued
+                self.stats.cancelled += 1
+                self._push_head(port)
+                continue
+            self._busy.add(port)
+            task = asyncio.create_task(self._execute(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            self._release_space(port)
+
+    def _push_head(self, port: str) -> None:
+        queue = self._queues[port]
+        if queue:
+            heapq.heappush(self._ready, (queue[0].priority, queue[0].seq, port))
+
+    def _release_space(self, port: str) -> None:
+        # Wake every waiter; each re-checks the queue length itself
+        for waiter in self._space.pop(port, ()):
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def _execute(self, job: _Job) -> None:
+        try:
+            result = await job.check()
+        except asyncio.CancelledError:
+            job.future.cancel()
+            self.stats.cancelled += 1
+            raise
+        except Exception as e:
+            self.stats.failed += 1
+            logger.warning(f"SIM check on {job.port} failed: {e}")
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            self.stats.completed += 1
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            self._busy.discard(job.port)
+            if not self._closed:
+                self._push_head(job.port)
+                self._dispatch()
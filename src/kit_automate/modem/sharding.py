@@ -0,0 +1,688 @@
+"""Modem ports sharded across worker processes for very large pools.
+
+One process tops out (on the GIL) once several 64-port pools share it:
+serial reads, AT parsing and PDU handling for every port run on one core.
+:class:`ShardedModemPool` spreads the ports over ``shards`` child
+processes, each running an ordinary :class:`ModemPool` on its own event
+loop, and offers the same API (``open``, ``send``, ``broadcast``,
+``close``, ``urc_handler``) to the rest of the app.
+
+Commands, results, URCs, port status and the shards' log records cross
+the process boundary as tuples of builtins encoded with :mod:`marshal`. Everything one side
+produces during a loop iteration goes out as a single ``send_bytes``, so
+a broadcast to 64 ports costs one pipe write per shard, not 64.
+
+A supervisor restarts a shard that exits or stops reporting and reopens
+its ports there. A shard that keeps crashing is retired and its ports
+are moved to the least loaded remaining shards.
+"""
+
+import asyncio
+from collections.abc import Callable, Coroutine, Iterable, Mapping
+from contextlib import suppress
+from dataclasses import dataclass, field
+import itertools
+import marshal
+import multiprocessing as mp
+import threading
+from typing import Any
+
+from loguru import logger
+
+from kit_automate.metrics import Counter, MetricsRegistry
+from kit_automate.modem.at_parser import PduPayload, Urc
+from kit_automate.modem.reactor import (
+    AtResponse,
+    AtTimeoutError,
+    ModemError,
+    ModemPool,
+    PortClosedError,
+    PortStats,
+    UrcHandler,
+)
+
+
+class _Op:
+    """Message opcodes, plain ints so marshal encodes them.
+
+    Every message is a tuple of builtins starting with its opcode.
+    """
+
+    # Pool to shard
+    OPEN = 1
+    SEND = 2
+    STOP = 3
+    # Shard to pool
+    OPENED = 11
+    RESULT = 12
+    FAILED = 13
+    URC = 14
+    PDU = 15
+    STATUS = 16
+    LOG = 17
+
+
+# A new shard imports the app before it reports; not a hang
+_STARTUP_GRACE = 10.0
+
+# Failure kinds sent back for a command, mapped to the error raised
+_ERRORS: dict[str, type[ModemError]] = {
+    "timeout": AtTimeoutError,
+    "closed": PortClosedError,
+    "error": ModemError,
+}
+
+
+class _Channel:
+    """Batched marshal messages over a ``multiprocessing`` connection.
+
+    Messages put during one loop iteration are sent as one batch. A reader
+    thread blocks in ``recv_bytes`` (portable, unlike selecting on pipe
+    handles on Windows) and hands each batch to ``on_batch`` on the loop;
+    ``on_closed`` runs there once the other process is gone.
+    """
+
+    def __init__(
+        self,
+        conn: Any,
+        loop: asyncio.AbstractEventLoop,
+        on_batch: Callable[[list[tuple]], None],
+        on_closed: Callable[[], None],
+        name: str,
+    ):
+        self._conn = conn
+        self._loop = loop
+        self._on_batch = on_batch
+        self._on_closed = on_closed
+        self._out: list[tuple] = []
+        self.batches = 0
+        self.messages = 0
+        self._reader = threading.Thread(target=self._read, name=name, daemon=True)
+
+    def start(self) -> None:
+        self._reader.start()
+
+    def put(self, message: tuple) -> None:
+        if not self._out:
+            self._loop.call_soon(self.flush)
+        self._out.append(message)
+
+    def flush(self) -> None:
+        if not self._out:
+            return
+        batch, self._out = self._out, []
+        try:
+            self._conn.send_bytes(marshal.dumps(batch))
+        except (OSError, ValueError):
+            return  # the other side is gone; the reader reports it
+        self.batches += 1
+        self.messages += len(batch)
+
+    def _read(self) -> None:
+        while True:
+            try:
+                # Only our own shard processes are on the other end
+                batch = marshal.loads(self._conn.recv_bytes())  # noqa: S302
+            except (EOFError, OSError):
+                break
+            try:
+                self._loop.call_soon_threadsafe(self._on_batch, batch)
+            except RuntimeError:  # loop closed
+                return
+        with suppress(RuntimeError):
+            self._loop.call_soon_threadsafe(self._on_closed)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# ----------------------------------------------------------------------
+# Shard process
+# ----------------------------------------------------------------------
+
+
+class _Shard:
+    """A ModemPool driven by messages from the parent process."""
+
+    def __init__(self, conn: Any, default_timeout: float, baudrate: int):
+        self._conn = conn
+        self._pool = ModemPool(
+            urc_handler=self._on_urc, default_timeout=default_timeout, baudrate=baudrate
+        )
+        self._tasks: set[asyncio.Task] = set()
+        self._stop = asyncio.Event()
+        self._channel: _Channel | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def run(self, status_interval: float) -> None:
+        self._loop = loop = asyncio.get_running_loop()
+        self._channel = _Channel(
+            self._conn, loop, self._on_batch, self._stop.set, "shard-reader"
+        )
+        self._channel.start()
+        logger.add(self._forward_log, level="DEBUG", format="{message}")
+        status = asyncio.create_task(self._report_status(status_interval))
+        await self._stop.wait()
+        status.cancel()
+        await self._pool.close()
+        self._channel.flush()
+
+    def _spawn(self, coroutine: Coroutine) -> None:
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _put(self, message: tuple) -> None:
+        if self._channel is not None:
+            self._channel.put(message)
+
+    def _on_batch(self, batch: list[tuple]) -> None:
+        for message in batch:
+            match message[0]:
+                case _Op.SEND:
+                    self._spawn(self._send(*message[1:]))
+                case _Op.OPEN:
+                    self._spawn(self._open(*message[1:]))
+                case _Op.STOP:
+                    self._stop.set()
+
+    async def _send(
+        self,
+        request: int,
+        name: str,
+        command: str,
+        timeout: float | None,  # noqa: ASYNC109 - enforced by the port
+        payload: bytes | None,
+    ) -> None:
+        try:
+            response = await self._pool.send(
+                name, command, timeout=timeout, payload=payload
+            )
+        except AtTimeoutError as e:
+            self._put((_Op.FAILED, request, "timeout", str(e)))
+        except (PortClosedError, KeyError) as e:
+            self._put((_Op.FAILED, request, "closed", f"Port {name} not open: {e}"))
+        except Exception as e:
+            self._put((_Op.FAILED, request, "error", f"{type(e).__name__}: {e}"))
+        else:
+            self._put(
+                (
+                    _Op.RESULT,
+                    request,
+                    response.command,
+                    response.lines,
+                    response.final,
+                    response.elapsed,
+                )
+            )
+
+    async def _open(self, request: int, devices: dict[str, str]) -> None:
+        await self._pool.open(devices)
+        self._put((_Op.OPENED, request, {n: n in self._pool.ports for n in devices}))
+
+    def _on_urc(self, name: str, event: Urc | PduPayload) -> None:
+        if isinstance(event, PduPayload):
+            self._put((_Op.PDU, name, event.header, event.data, event.unsolicited))
+        else:
+            self._put((_Op.URC, name, event.text))
+
+    def _forward_log(self, message: Any) -> None:
+        """Loguru sink sending records to the parent, which logs them."""
+        record = message.record
+        entry = (
+            _Op.LOG,
+            record["level"].name,
+            record["name"],
+            record["function"],
+            record["line"],
+            str(message).rstrip("\n"),  # with the traceback, if any
+        )
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._put(entry)
+        elif self._loop is not None:
+            # From another thread of the shard
+            with suppress(RuntimeError):  # loop closed
+                self._loop.call_soon_threadsafe(self._put, entry)
+
+    async def _report_status(self, interval: float) -> None:
+        """Send port counters periodically; doubles as the heartbeat."""
+        while True:
+            ports = {}
+            for name, port in self._pool.ports.items():
+                stats = port.stats
+                ports[name] = (stats.commands, stats.timeouts, stats.errors, stats.urcs)
+            self._put((_Op.STATUS, ports))
+            await asyncio.sleep(interval)
+
+
+def _shard_main(
+    conn: Any,
+    default_timeout: float,
+    baudrate: int,
+    status_interval: float,
+) -> None:
+    """Process entry point of one shard; its records go to the parent's logger."""
+    logger.remove()
+    asyncio.run(_Shard(conn, default_timeout, baudrate).run(status_interval))
+
+
+# ----------------------------------------------------------------------
+# Parent side
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class ShardStats:
+    """State of one shard process."""
+
+    index: int
+    pid: int | None
+    alive: bool
+    retired: bool
+    ports: int
+    restarts: int
+
+
+@dataclass
+class _ShardHandle:
+    index: int
+    process: Any = None
+    channel: _Channel | None = None
+    ports: dict[str, str] = field(default_factory=dict)
+    pending: dict[int, asyncio.Future] = field(default_factory=dict)
+    last_seen: float = 0.0
+    restarts: list[float] = field(default_factory=list)
+    total_restarts: int = 0
+    retired: bool = False
+
+    @property
+    def alive(self) -> bool:
+        return self.channel is not None and not self.retired
+
+
+class ShardedModemPool:
+    """:class:`ModemPool` API over ports spread across worker processes.
+
+    Processes start on the first :meth:`open`. ``urc_handler`` runs in this
+    process, on the loop that opened the pool, with the same arguments as
+    for :class:`ModemPool`. ``ports`` maps each open port to its shard.
+
+    Args:
+        shards: Worker processes
+        urc_handler: Called with ``(port, event)`` for every URC
+        default_timeout: Command timeout, enforced in the shard
+        baudrate: Serial speed of every port
+        status_interval: Seconds between port status reports; a shard
+            silent for three intervals is considered hung and restarted
+        max_restarts: Restarts allowed per shard within ``restart_window``
+            before it is retired and its ports move to the other shards
+        restart_window: Seconds over which restarts are counted
+        metrics: Registry for restart and IPC counters
+    """
+
+    def __init__(
+        self,
+        shards: int = 2,
+        urc_handler: UrcHandler | None = None,
+        default_timeout: float = 5.0,
+        baudrate: int = 115_200,
+        *,
+        status_interval: float = 1.0,
+        max_restarts: int = 3,
+        restart_window: float = 60.0,
+        metrics: MetricsRegistry | None = None,
+    ):
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self.urc_handler = urc_handler
+        self.default_timeout = default_timeout
+        self.baudrate = baudrate
+        self.status_interval = status_interval
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.ports: dict[str, int] = {}
+        self.port_stats: dict[str, PortStats] = {}
+        self._shards = [_ShardHandle(i) for i in range(shards)]
+        self._requests = itertools.count()
+        self._context = mp.get_context("spawn")
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._supervisor: asyncio.Task | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._closing = False
+
+        def counter(name: str, help: str) -> Counter:
+            if metrics is not None:
+                return metrics.counter(name, help)
+            return Counter(name, help, ())
+
+        self._restarts = counter(
+            "modem_shard_restarts_total", "Modem shard processes restarted"
+        )
+        self._batches = counter(
+            "modem_ipc_batches_total", "IPC batches received from modem shards"
+        )
+        self._messages = counter(
+            "modem_ipc_messages_total", "IPC messages received from modem shards"
+        )
+
+    def __len__(self) -> int:
+        return len(self.ports)
+
+    def shard_stats(self) -> list[ShardStats]:
+        return [
+            ShardStats(
+                index=s.index,
+                pid=s.process.pid if s.process is not None else None,
+                alive=s.alive,
+                retired=s.retired,
+                ports=len(s.ports),
+                restarts=s.total_restarts,
+            )
+            for s in self._shards
+        ]
+
+    async def open(self, devices: Mapping[str, str]) -> None:
+        """Open ports given as ``{name: device}`` on the least loaded shards.
+
+        Like :class:`ModemPool`, a port that fails to open is logged and
+        skipped; shards send their log records to this process's logger.
+        """
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            for shard in self._shards:
+                self._launch(shard)
+            self._supervisor = asyncio.create_task(self._supervise())
+        opened = await self._place(dict(devices))
+        logger.info(
+            f"Sharded modem pool opened - {opened}/{len(devices)} ports "
+            f"on {sum(s.alive for s in self._shards)} shards"
+        )
+
+    async def send(
+        self,
+        name: str,
+        command: str,
+        timeout: float | None = None,  # noqa: ASYNC109 - counted in the shard from the write
+        payload: bytes | str | None = None,
+    ) -> AtResponse:
+        """Send an AT command to port ``name``; see :meth:`ModemPort.send`.
+
+        Raises:
+            KeyError: Unknown port
+            AtTimeoutError: No final result code in time
+            PortClosedError: Port or its shard went away meanwhile
+        """
+        shard = self._shards[self.ports[name]]
+        if isinstance(payload, str):
+            payload = payload.encode()
+        return await self._request(shard, _Op.SEND, name, command, timeout, payload)
+
+    async def broadcast(
+        self, command: str, names: Iterable[str] | None = None, **kwargs: Any
+    ) -> dict[str, AtResponse | Exception]:
+        """Send ``command`` to many ports concurrently."""
+        targets = list(self.ports if names is None else names)
+        results = await asyncio.gather(
+            *(self.send(n, command, **kwargs) for n in targets),
+            return_exceptions=True,
+        )
+        return dict(zip(targets, results, strict=True))
+
+    async def close(self) -> None:
+        """Stop every shard, closing its ports.
+
+        The pool can be opened again afterwards, with fresh shards.
+        """
+        self._closing = True
+        # Recoveries first: one may be launching a shard that needs a STOP
+        background = [*self._tasks]
+        if self._supervisor is not None:
+            background.append(self._supervisor)
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        for shard in self._shards:
+            if shard.channel is not None:
+                shard.channel.put((_Op.STOP,))
+                shard.channel.flush()
+        await asyncio.gather(*(self._stop(s) for s in self._shards))
+        self.ports.clear()
+        self.port_stats.clear()
+        self._shards = [_ShardHandle(s.index) for s in self._shards]
+        self._loop = None
+        self._supervisor = None
+        self._closing = False
+        logger.info("Sharded modem pool closed")
+
+    # -- shard lifecycle ------------------------------------------------
+
+    def _launch(self, shard: _ShardHandle) -> None:
+        assert self._loop is not None
+        parent, child = self._context.Pipe()
+        shard.process = self._context.Process(
+            target=_shard_main,
+            args=(
+                child,
+                self.default_timeout,
+                self.baudrate,
+                self.status_interval,
+            ),
+            name=f"modem-shard-{shard.index}",
+            daemon=True,
+        )
+        shard.process.start()
+        child.close()  # so a dead shard reads as EOF here
+        shard.channel = _Channel(
+            parent,
+            self._loop,
+            lambda batch: self._on_batch(shard, batch),
+            lambda: self._on_closed(shard),
+            f"modem-shard-{shard.index}-reader",
+        )
+        shard.channel.start()
+        shard.last_seen = self._loop.time() + _STARTUP_GRACE
+
+    async def _stop(self, shard: _ShardHandle) -> None:
+        process = shard.process
+        if process is not None:
+            await asyncio.to_thread(process.join, 5)
+            if process.is_alive():
+                process.kill()
+                await asyncio.to_thread(process.join, 1)
+        self._fail_pending(shard, "pool closed")
+        if shard.channel is not None:
+            shard.channel.close()
+            shard.channel = None
+
+    def _on_closed(self, shard: _ShardHandle) -> None:
+        if shard.channel is None:
+            return
+        shard.channel.close()
+        shard.channel = None
+        self._fail_pending(shard, "shard exited")
+        if not self._closing:
+            self._spawn(self._recover(shard))
+
+    async def _recover(self, shard: _ShardHandle) -> None:
+        """Restart a dead shard, or retire it and move its ports."""
+        assert self._loop is not None
+        if shard.process is not None:
+            await asyncio.to_thread(shard.process.join, 1)
+            logger.warning(
+                f"Modem shard {shard.index} exited (code {shard.process.exitcode})"
+            )
+        now = self._loop.time()
+        shard.restarts = [t for t in shard.restarts if now - t < self.restart_window]
+        ports, shard.ports = shard.ports, {}
+        for name in ports:
+            self.ports.pop(name, None)
+        if len(shard.restarts) < self.max_restarts:
+            shard.restarts.append(now)
+            shard.total_restarts += 1
+            self._restarts.inc()
+            self._launch(shard)
+            opened = await self._open_on(shard, ports)
+            logger.info(
+                f"Modem shard {shard.index} restarted - {opened}/{len(ports)} ports"
+            )
+            return
+        shard.retired = True
+        logger.error(
+            f"Modem shard {shard.index} keeps crashing; moving its "
+            f"{len(ports)} ports to the other shards"
+        )
+        opened = await self._place(ports)
+        if opened < len(ports):
+            logger.error(f"{len(ports) - opened} ports lost with shard {shard.index}")
+
+    async def _supervise(self) -> None:
+        """Kill shards that stopped reporting; their EOF triggers recovery."""
+        assert self._loop is not None
+        while True:
+            await asyncio.sleep(self.status_interval)
+            deadline = self._loop.time() - 3 * self.status_interval
+            for shard in self._shards:
+                if shard.alive and shard.last_seen < deadline:
+                    logger.error(f"Modem shard {shard.index} is not responding")
+                    shard.process.kill()
+
+    # -- port placement -------------------------------------------------
+
+    async def _place(self, devices: dict[str, str]) -> int:
+        """Assign ports to the least loaded live shards and open them."""
+        live = [s for s in self._shards if s.alive]
+        if not live:
+            logger.error("No modem shard left to open ports on")
+            return 0
+        groups: dict[int, dict[str, str]] = {}
+        loads = {s.index: len(s.ports) for s in live}
+        for name, device in devices.items():
+            index = min(loads, key=lambda i: loads[i])
+            loads[index] += 1
+            groups.setdefault(index, {})[name] = device
+        opened = await asyncio.gather(
+            *(self._open_on(self._shards[i], group) for i, group in groups.items())
+        )
+        return sum(opened)
+
+    async def _open_on(self, shard: _ShardHandle, devices: dict[str, str]) -> int:
+        if not devices:
+            return 0
+        if not shard.alive:
+            logger.error(f"Modem shard {shard.index} is not running")
+            return 0
+        # Assigned before the OPEN goes out: if the shard dies opening them,
+        # its recovery reopens or moves them like any other of its ports
+        shard.ports.update(devices)
+        try:
+            result = await self._request(shard, _Op.OPEN, devices)
+        except ModemError as e:
+            logger.error(f"Opening ports on modem shard {shard.index} failed: {e}")
+            return 0
+        for name, ok in result.items():
+            if ok:
+                self.ports[name] = shard.index
+            else:
+                shard.ports.pop(name, None)
+        return sum(result.values())
+
+    # -- messages -------------------------------------------------------
+
+    async def _request(self, shard: _ShardHandle, op: int, *args: Any) -> Any:
+        if shard.channel is None or self._loop is None:
+            raise PortClosedError(f"Modem shard {shard.index} is not running")
+        request = next(self._requests)
+        future = self._loop.create_future()
+        shard.pending[request] = future
+        shard.channel.put((op, request, *args))
+        try:
+            return await future
+        finally:
+            shard.pending.pop(request, None)
+
+    def _fail_pending(self, shard: _ShardHandle, reason: str) -> None:
+        for future in shard.pending.values():
+            if not future.done():
+                future.set_exception(
+                    PortClosedError(f"Modem shard {shard.index}: {reason}")
+                )
+        shard.pending.clear()
+
+    def _resolve(self, shard: _ShardHandle, request: int, value: Any) -> None:
+        future = shard.pending.get(request)
+        if future is None or future.done():
+            return
+        if isinstance(value, BaseException):
+            future.set_exception(value)
+        else:
+            future.set_result(value)
+
+    def _on_batch(self, shard: _ShardHandle, batch: list[tuple]) -> None:
+        assert self._loop is not None
+        shard.last_seen = self._loop.time()
+        self._batches.inc()
+        self._messages.inc(len(batch))
+        for message in batch:
+            match message:
+                case (_Op.RESULT, request, command, lines, final, elapsed):
+                    self._resolve(
+                        shard, request, AtResponse(command, lines, final, elapsed)
+                    )
+                case (_Op.FAILED, request, kind, text):
+                    self._resolve(shard, request, _ERRORS[kind](text))
+                case (_Op.OPENED, request, opened):
+                    self._resolve(shard, request, opened)
+                case (_Op.URC, name, text):
+                    self._dispatch(name, Urc(text))
+                case (_Op.PDU, name, header, data, unsolicited):
+                    self._dispatch(name, PduPayload(header, data, unsolicited))
+                case (_Op.STATUS, ports):
+                    for name, counts in ports.items():
+                        self.port_stats[name] = PortStats(*counts)
+                case (_Op.LOG, level, name, function, line, text):
+                    _relog(shard.index, level, name, function, line, text)
+
+    def _dispatch(self, name: str, event: Urc | PduPayload) -> None:
+        if self.urc_handler is None:
+            logger.debug(f"Unhandled URC on {name}: {event}")
+            return
+        try:
+            self.urc_handler(name, event)
+        except Exception as e:
+            logger.error(f"URC handler failed on {name}: {e}")
+
+    def _spawn(self, coroutine: Coroutine) -> None:
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+def _relog(
+    index: int, level: str, name: str, function: str, line: int, text: str
+) -> None:
+    """Log a shard's record here, under its origin, for the app's sinks."""
+
+    def origin(record: dict) -> None:
+        record.update(name=name, function=function, line=line)
+
+    logger.patch(origin).log(level, f"[shard {index}] {text}")
+
+
+def create_modem_pool(
+    shards: int = 0,
+    urc_handler: UrcHandler | None = None,
+    metrics: MetricsRegistry | None = None,
+    **kwargs: Any,
+) -> ModemPool | ShardedModemPool:
+    """Build the app's modem pool.
+
+    An in-process :class:`ModemPool` for ``shards <= 0``, otherwise a
+    :class:`ShardedModemPool`. Extra keyword arguments go to the pool.
+    """
+    if shards <= 0:
+        return ModemPool(urc_handler=urc_handler, **kwargs)
+    return ShardedModemPool(shards, urc_handler, metrics=metrics, **kwargs)
@@ -0,0 +1,367 @@
+"""Virtual GSM modem pool on pty pairs, for tests and load benchmarks.
+
+Every virtual modem owns the master side of a pseudo-terminal; the slave
+path is handed to :class:`ModemPool` as if it were ``/dev/ttyUSB0``. The
+modems answer the AT subset the app uses (CPIN, CIMI, CNUM, CUSD, CMGF,
+CMGL, CMGR, CMGD, CMGS, text mode only) with configurable latency, jitter
+and error rate. SMS or URCs can be injected at any time, and the profile
+can add background traffic at a steady per-port rate. Hundreds of modems
+fit on one event loop; run them in a child process with
+:func:`serve` to keep their CPU time out of the measurement. POSIX only.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import date, datetime
+import os
+import random
+import re
+from typing import Any
+
+from loguru import logger
+
+CTRL_Z = b"\x1a"
+
+_CMGS = re.compile(r'^AT\+CMGS="?([^"]*)"?$')
+_CUSD = re.compile(r'^AT\+CUSD=1,"([^"]*)"')
+_INDEX = re.compile(r"^AT\+CMG[RD]=(\d+)(?:,(\d))?$")
+
+# Background traffic: promos and OTPs from short codes, network status
+_SENDERS = ("TOKOPAY", "INFO", "PROMO")
+_NETWORK_URCS = ("+CREG: 1", "+CREG: 5", "+CGREG: 1", "RING")
+
+
+@dataclass
+class SimProfile:
+    """Timing and failure behaviour shared by the modems of a pool."""
+
+    latency: float = 0.0  # seconds from command to final result
+    jitter: float = 0.0  # extra uniform random delay, 0..jitter
+    error_rate: float = 0.0  # chance a command answers +CME ERROR: 100
+    ussd_latency: float = 0.0  # seconds from AT+CUSD OK to the +CUSD URC
+    sms_rate: float = 0.0  # background +CMT SMS per second per port
+    urc_rate: float = 0.0  # background network URCs per second per port
+    seed: int | None = None
+
+
+@dataclass
+class SimCard:
+    msisdn: str
+    imsi: str
+    balance: int = 10_000
+    expiry: date = date(2026, 12, 31)
+
+    @classmethod
+    def numbered(cls, index: int) -> "SimCard":
+        return cls(msisdn=f"+62812{index:07d}", imsi=f"51010{index:010d}")
+
+
+@dataclass
+class StoredSms:
+    index: int
+    sender: str
+    body: str
+    timestamp: str
+    read: bool = False
+
+
+@dataclass
+class _Inbox:
+    messages: dict[int, StoredSms] = field(default_factory=dict)
+    next_index: int = 1
+
+    def store(self, sender: str, body: str, timestamp: str) -> int:
+        index = self.next_index
+        self.next_index += 1
+        self.messages[index] = StoredSms(index, sender, body, timestamp)
+        return index
+
+
+def _timestamp() -> str:
+    return datetime.now().strftime("%y/%m/%d,%H:%M:%S+28")
+
+
+class VirtualModem:
+    """One simulated modem answering on the master side of a pty."""
+
+    def __init__(
+        self,
+        name: str,
+        sim: SimCard,
+        profile: SimProfile,
+        rng: random.Random | None = None,
+    ):
+        self.name = name
+        self.sim = sim
+        self.profile = profile
+        self.commands: list[str] = []
+        self.sent: list[tuple[str, str]] = []
+        self.inbox = _Inbox()
+        self._rng = rng or random.Random(profile.seed)  # noqa: S311 - simulated jitter
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._master: int | None = None
+        self._slave: int | None = None
+        self._buffer = b""
+        self._sms_to: str | None = None
+        self._traffic: dict[str, asyncio.TimerHandle] = {}
+        self.background = 0  # background SMS and URCs written so far
+        self.device = ""
+
+    def open(self) -> str:
+        """Create the pty pair and start answering; returns the device path."""
+        # POSIX only, imported here so the module stays importable elsewhere
+        import termios
+        import tty
+
+        self._loop = asyncio.get_running_loop()
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._master, termios.TCSANOW)
+        os.set_blocking(self._master, False)
+        # The slave stays open here: a pty without an open slave reports
+        # EIO on every read of the master
+        self.device = os.ttyname(self._slave)
+        self._loop.add_reader(self._master, self._on_readable)
+        self._schedule("sms", self.profile.sms_rate)
+        self._schedule("urc", self.profile.urc_rate)
+        return self.device
+
+    def close(self) -> None:
+        if self._master is None or self._loop is None:
+            return
+        for handle in self._traffic.values():
+            handle.cancel()
+        self._traffic.clear()
+        self._loop.remove_reader(self._master)
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+
+    def inject_sms(self, sender: str, body: str, store: bool = False) -> None:
+        """Deliver an SMS: a ``+CMT`` URC, or stored with a ``+CMTI`` notice."""
+        timestamp = _timestamp()
+        if store:
+            index = self.inbox.store(sender, body, timestamp)
+            self.inject_urc(f'+CMTI: "SM",{index}')
+        else:
+            self.inject_urc(f'+CMT: "{sender}","","{timestamp}"\r\n{body}')
+
+    def inject_urc(self, text: str) -> None:
+        self._write(f"\r\n{text}\r\n")
+
+    def _schedule(self, kind: str, rate: float) -> None:
+        """Arm the next background event; Poisson arrivals at ``rate``/s."""
+        if rate > 0 and self._loop is not None:
+            self._traffic[kind] = self._loop.call_later(
+                self._rng.expovariate(rate), self._background, kind, rate
+            )
+
+    def _background(self, kind: str, rate: float) -> None:
+        if self._master is None:
+            return
+        try:
+            if kind == "sms":
+                sender = self._rng.choice(_SENDERS)
+                code = self._rng.randrange(1_000_000)
+                self.inject_sms(sender, f"Kode OTP {code:06d}. Jangan dibagikan")
+            else:
+                self.inject_urc(self._rng.choice(_NETWORK_URCS))
+            self.background += 1
+        except BlockingIOError:
+            pass  # nobody reads the port and its buffer is full: drop the event
+        self._schedule(kind, rate)
+
+    def _write(self, text: str) -> None:
+        if self._master is not None:
+            os.write(self._master, text.encode("latin-1", errors="replace"))
+
+    def _reply(self, text: str, follow_up: str | None = None) -> None:
+        """Write ``text`` after the profile latency, then ``follow_up`` (a URC)."""
+        delay = self.profile.latency
+        if self.profile.jitter:
+            delay += self._rng.uniform(0, self.profile.jitter)
+        if delay > 0 and self._loop is not None:
+            self._loop.call_later(delay, self._send, text, follow_up)
+        else:
+            self._send(text, follow_up)
+
+    def _send(self, text: str, follow_up: str | None) -> None:
+        self._write(text)
+        if follow_up is None:
+            return
+        if self.profile.ussd_latency > 0 and self._loop is not None:
+            self._loop.call_later(self.profile.ussd_latency, self._write, follow_up)
+        else:
+            self._write(follow_up)
+
+    def _on_readable(self) -> None:
+        try:
+            self._buffer += os.read(self._master, 4096)  # type: ignore[arg-type]
+        except OSError:
+            return
+        while True:
+            if self._sms_to is not None:
+                end = self._buffer.find(CTRL_Z)
+                if end < 0:
+                    return
+                body = self._buffer[:end].decode("latin-1")
+                self._buffer = self._buffer[end + 1 :]
+                self.sent.append((self._sms_to, body))
+                self._sms_to = None
+                self._reply(f"\r\n+CMGS: {len(self.sent) % 256}\r\n\r\nOK\r\n")
+                continue
+            end = self._buffer.find(b"\r")
+            if end < 0:
+                return
+            command = self._buffer[:end].decode("latin-1").strip()
+            self._buffer = self._buffer[end + 1 :]
+            if command:
+                self.commands.append(command)
+                self._handle(command)
+
+    def _handle(self, command: str) -> None:
+        upper = command.upper()
+        if not upper.startswith("AT"):
+            self._reply("\r\nERROR\r\n")
+            return
+        if self.profile.error_rate and self._rng.random() < self.profile.error_rate:
+            self._reply("\r\n+CME ERROR: 100\r\n")
+            return
+
+        if match := _CMGS.match(command):
+            self._sms_to = match.group(1)
+            self._reply("\r\n> ")
+            return
+        if match := _CUSD.match(command):
+            # OK first, the network's answer arrives later as a URC
+            self._reply(
+                "\r\nOK\r\n", f'\r\n+CUSD: 0,"{self._ussd(match.group(1))}",15\r\n'
+            )
+            return
+        lines = self._answer(upper)
+        if lines is None:
+            self._reply("\r\nERROR\r\n")
+            return
+        self._reply("".join(f"\r\n{line}\r\n" for line in lines))
+
+    def _answer(self, upper: str) -> list[str] | None:
+        sim = self.sim
+        if upper in {"AT", "ATE0", "ATE1", "ATZ", "AT+CMGF=1"} or upper.startswith(
+            ("AT+CNMI=", "AT+CSCS=")
+        ):
+            return ["OK"]
+        if upper == "AT+CMGF=0":
+            return ["+CMS ERROR: 303"]  # PDU mode not simulated
+        if upper == "AT+CPIN?":
+            return ["+CPIN: READY", "OK"]
+        if upper == "AT+CIMI":
+            return [sim.imsi, "OK"]
+        if upper == "AT+CNUM":
+            return [f'+CNUM: "","{sim.msisdn}",145', "OK"]
+        if upper.startswith("AT+CMGL"):
+            return self._list(unread_only="UNREAD" in upper)
+        if match := _INDEX.match(upper):
+            return self._read_or_delete(upper, int(match.group(1)), match.group(2))
+        return None
+
+    def _ussd(self, code: str) -> str:
+        if not code.startswith("*888"):
+            return "Layanan tidak tersedia"
+        sim = self.sim
+        return (
+            f"Sisa pulsa Rp{sim.balance}. Aktif s/d {sim.expiry:%d-%m-%Y}. "
+            f"No {sim.msisdn}"
+        )
+
+    def _list(self, unread_only: bool) -> list[str]:
+        lines = []
+        for sms in self.inbox.messages.values():
+            if unread_only and sms.read:
+                continue
+            status = "REC READ" if sms.read else "REC UNREAD"
+            lines += [
+                f'+CMGL: {sms.index},"{status}","{sms.sender}","","{sms.timestamp}"',
+                sms.body,
+            ]
+            sms.read = True
+        return [*lines, "OK"]
+
+    def _read_or_delete(self, upper: str, index: int, flag: str | None) -> list[str]:
+        messages = self.inbox.messages
+        if upper.startswith("AT+CMGD"):
+            if flag == "4":
+                messages.clear()
+            else:
+                messages.pop(index, None)
+            return ["OK"]
+        sms = messages.get(index)
+        if sms is None:
+            return ["+CMS ERROR: 321"]  # invalid memory index
+        status = "REC READ" if sms.read else "REC UNREAD"
+        sms.read = True
+        return [
+            f'+CMGR: "{status}","{sms.sender}","","{sms.timestamp}"',
+            sms.body,
+            "OK",
+        ]
+
+
+class VirtualModemPool:
+    """Many virtual modems on the running event loop."""
+
+    def __init__(self, profile: SimProfile | None = None):
+        self.profile = profile or SimProfile()
+        self.modems: dict[str, VirtualModem] = {}
+        self._rng = random.Random(self.profile.seed)  # noqa: S311 - simulated jitter
+
+    def __getitem__(self, name: str) -> VirtualModem:
+        return self.modems[name]
+
+    def __len__(self) -> int:
+        return len(self.modems)
+
+    @property
+    def devices(self) -> dict[str, str]:
+        """``{name: device}`` ready for :meth:`ModemPool.open`."""
+        return {name: modem.device for name, modem in self.modems.items()}
+
+    def start(self, count: int, prefix: str = "SIM") -> dict[str, str]:
+        """Create ``count`` more modems and return their devices."""
+        first = len(self.modems)
+        for index in range(first, first + count):
+            name = f"{prefix}{index}"
+            modem = VirtualModem(
+                name,
+                SimCard.numbered(index),
+                self.profile,
+                random.Random(self._rng.random()),  # noqa: S311
+            )
+            modem.open()
+            self.modems[name] = modem
+        logger.debug(f"Virtual modem pool started - {len(self.modems)} modems")
+        return self.devices
+
+    def close(self) -> None:
+        for modem in self.modems.values():
+            modem.close()
+        self.modems.clear()
+
+
+def serve(count: int, profile: SimProfile, conn: Any) -> None:
+    """Run a virtual pool until ``conn`` receives anything or closes.
+
+    Meant as a ``multiprocessing.Process`` target: the device map is sent
+    back through ``conn`` once every modem is listening.
+    """
+
+    async def run() -> None:
+        pool = VirtualModemPool(profile)
+        conn.send(pool.start(count))
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        loop.add_reader(conn.fileno(), stop.set)
+        await stop.wait()
+        loop.remove_reader(conn.fileno())
+        pool.close()
+
+    asyncio.run(run())
@@ -0,0 +1,114 @@
+"""Decode incoming SMS from ``+CMT`` URCs (text and PDU mode).
+
+>>> decode_deliver_pdu(
+...     "07917283010010F5040BC87238880900F10000993092516195800AE8329BFD4697D9EC37"
+... )
+('27838890001', 'hellohello')
+"""
+
+import re
+
+from kit_automate.modem.at_parser import PduPayload
+
+# GSM 03.38 default alphabet and extension table
+GSM7_BASIC = (
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞ\x1bÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+GSM7_EXTENSION = {
+    0x0A: "\f",
+    0x14: "^",
+    0x28: "{",
+    0x29: "}",
+    0x2F: "\\",
+    0x3C: "[",
+    0x3D: "~",
+    0x3E: "]",
+    0x40: "|",
+    0x65: "€",
+}
+
+_TEXT_CMT = re.compile(r'^\+CMT:\s*"([^"]*)"')
+
+
+def _unpack_septets(data: bytes, count: int, skip_bits: int = 0) -> list[int]:
+    septets = []
+    value = int.from_bytes(data, "little")
+    for i in range(count):
+        septets.append((value >> (skip_bits + 7 * i)) & 0x7F)
+    return septets
+
+
+def _gsm7_text(septets: list[int]) -> str:
+    chars = []
+    escape = False
+    for septet in septets:
+        if escape:
+            chars.append(GSM7_EXTENSION.get(septet, " "))
+            escape = False
+        elif septet == 0x1B:
+            escape = True
+        else:
+            chars.append(GSM7_BASIC[septet])
+    return "".join(chars)
+
+
+def _decode_address(data: bytes, digits: int, type_of_address: int) -> str:
+    if type_of_address & 0x70 == 0x50:  # alphanumeric sender ID
+        return _gsm7_text(_unpack_septets(data, digits * 4 // 7))
+    number = "".join(f"{b & 0x0F:X}{b >> 4:X}" for b in data)[:digits]
+    return ("+" if type_of_address & 0x70 == 0x10 else "") + number
+
+
+def decode_deliver_pdu(pdu: str) -> tuple[str, str]:
+    """Decode an SMS-DELIVER PDU into ``(sender, text)``.
+
+    Handles GSM 7-bit, 8-bit and UCS-2 bodies. A user data header (e.g. of
+    a concatenated SMS) is skipped, so each part decodes on its own.
+
+    Raises:
+        ValueError: If the PDU is malformed
+    """
+    try:
+        raw = bytes.fromhex(pdu)
+        pos = raw[0] + 1  # SMSC information
+        first_octet = raw[pos]
+        digits, type_of_address = raw[pos + 1], raw[pos + 2]
+        pos += 3
+        address_octets = (digits + 1) // 2
+        sender = _decode_address(
+            raw[pos : pos + address_octets], digits, type_of_address
+        )
+        pos += address_octets
+        dcs = raw[pos + 1]
+        pos += 2 + 7  # PID, DCS, service centre time stamp
+        length = raw[pos]
+        user_data = raw[pos + 1 :]
+    except (IndexError, ValueError) as e:
+        raise ValueError(f"Malformed SMS-DELIVER PDU: {e}") from e
+
+    has_header = bool(first_octet & 0x40)
+    header_octets = user_data[0] + 1 if has_header and user_data else 0
+    alphabet = (dcs >> 2) & 0x03 if dcs & 0xC0 == 0 else (dcs >> 2) & 0x01
+
+    if alphabet == 0:  # GSM 7-bit: length counts septets, header included
+        skip = (header_octets * 8 + 6) // 7
+        septets = _unpack_septets(user_data, length)[skip:]
+        return sender, _gsm7_text(septets)
+    body = user_data[header_octets:length]
+    if alphabet == 2:
+        return sender, body.decode("utf-16-be", errors="replace")
+    return sender, body.decode("latin-1")
+
+
+def parse_cmt(event: PduPayload) -> tuple[str, str] | None:
+    """Extract ``(sender, text)`` from a ``+CMT`` URC, text or PDU mode."""
+    if not event.header.startswith("+CMT:"):
+        return None
+    match = _TEXT_CMT.match(event.header)
+    if match is not None:  # text mode: +CMT: "<sender>",...
+        return match.group(1), event.data
+    try:
+        return decode_deliver_pdu(event.data)
+    except ValueError:
+        return None
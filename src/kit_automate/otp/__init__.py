@@ -0,0 +1,22 @@
+"""OTP delivery from the modem pool to automation code."""
+
+from kit_automate.otp.broker import (
+    OtpBroker,
+    OtpMatch,
+    OtpStats,
+    SmsMessage,
+    default_extractor,
+)
+from kit_automate.otp.rules import OtpExtraction, OtpRule, OtpRuleEngine, RuleStats
+
+__all__ = [
+    "OtpBroker",
+    "OtpExtraction",
+    "OtpMatch",
+    "OtpRule",
+    "OtpRuleEngine",
+    "OtpStats",
+    "RuleStats",
+    "SmsMessage",
+    "default_extractor",
+]
@@ -0,0 +1,267 @@
+"""OTP broker: hand incoming SMS straight to the coroutine waiting for it.
+
+Automation code registers a waiter for (MSISDN, sender pattern, time
+window). The modem layer publishes every incoming SMS; the broker looks up
+waiters in a dict keyed by MSISDN and resolves the first match directly, so
+there is no polling of the database or ``AT+CMGL``. Messages nobody is
+waiting for yet are kept for a short while, so a waiter registered just
+after its SMS arrived still gets the code.
+"""
+
+import asyncio
+from collections import defaultdict, deque
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+import re
+import statistics
+import time
+
+from loguru import logger
+
+from kit_automate.modem.at_parser import PduPayload, Urc
+from kit_automate.modem.sms import parse_cmt
+
+_DEFAULT_CODE = re.compile(r"(?<!\d)(\d{4,8})(?!\d)")
+
+
+@dataclass(frozen=True)
+class SmsMessage:
+    """An SMS received on one SIM of the pool."""
+
+    msisdn: str
+    sender: str
+    body: str
+    received_at: float = field(default_factory=time.monotonic)
+    port: str | None = None
+
+
+@dataclass(frozen=True)
+class OtpMatch:
+    """Resolved waiter: the SMS, the extracted code and how long it took."""
+
+    message: SmsMessage
+    code: str
+    rule: str | None
+    latency: float
+
+
+CodeExtractor = Callable[[SmsMessage], tuple[str, str | None] | None]
+
+
+def default_extractor(message: SmsMessage) -> tuple[str, str | None] | None:
+    """First standalone run of 4-8 digits, no rule name."""
+    match = _DEFAULT_CODE.search(message.body)
+    return (match.group(1), None) if match else None
+
+
+@dataclass
+class OtpStats:
+    published: int = 0
+    resolved: int = 0
+    resolved_from_buffer: int = 0
+    buffered: int = 0
+    expired: int = 0
+    timeouts: int = 0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+
+    def latency_percentile(self, percentile: float) -> float:
+        """Latency percentile (0-100) over the last 1000 resolutions."""
+        if not self.latencies:
+            return 0.0
+        if len(self.latencies) == 1:
+            return self.latencies[0]
+        cuts = statistics.quantiles(self.latencies, n=100, method="inclusive")
+        return cuts[min(max(int(percentile) - 1, 0), 98)]
+
+
+@dataclass(eq=False)
+class _Waiter:
+    sender: re.Pattern[str] | None
+    since: float
+    future: asyncio.Future
+
+    def accepts(self, message: SmsMessage) -> bool:
+        return message.received_at >= self.since and (
+            self.sender is None or self.sender.search(message.sender) is not None
+        )
+
+
+class OtpBroker:
+    """Route incoming SMS to OTP waiters keyed by MSISDN.
+
+    Must be used from the event loop thread; other threads publish through
+    :meth:`publish_threadsafe`.
+    """
+
+    def __init__(
+        self,
+        buffer_ttl: float = 30.0,
+        max_buffered: int = 1_000,
+        extractor: CodeExtractor = default_extractor,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.buffer_ttl = buffer_ttl
+        self.max_buffered = max_buffered
+        self.extractor = extractor
+        self.stats = OtpStats()
+        self._clock = clock
+        self._waiters: dict[str, list[_Waiter]] = defaultdict(list)
+        self._buffer: dict[str, deque[SmsMessage]] = defaultdict(deque)
+        self._buffered = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def waiting(self) -> int:
+        """Number of registered waiters."""
+        return sum(len(w) for w in self._waiters.values())
+
+    async def wait_for(
+        self,
+        msisdn: str,
+        sender: str | re.Pattern[str] | None = None,
+        since: float | None = None,
+        timeout: float = 120.0,  # noqa: ASYNC109 - also bounds the buffered lookup window
+    ) -> OtpMatch:
+        """Wait for the next OTP sent to ``msisdn``.
+
+        Args:
+            msisdn: Receiving SIM
+            sender: Regex the sender ID must match (``search``), any if None
+            since: Only accept messages received at or after this clock value;
+                defaults to ``buffer_ttl`` seconds ago, so an SMS that beat the
+                registration is still accepted
+            timeout: Seconds to wait
+
+        Raises:
+            TimeoutError: No matching OTP arrived in time
+        """
+        self._loop = asyncio.get_running_loop()
+        if isinstance(sender, str):
+            sender = re.compile(sender)
+        if since is None:
+            since = self._clock() - self.buffer_ttl
+        waiter = _Waiter(sender, since, self._loop.create_future())
+
+        buffered = self._take_buffered(msisdn, waiter)
+        if buffered is not None:
+            self.stats.resolved_from_buffer += 1
+            return buffered
+
+        waiters = self._waiters[msisdn]
+        waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(waiter.future, timeout)
+        except TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            if waiter in waiters:
+                waiters.remove(waiter)
+            if not waiters:
+                self._waiters.pop(msisdn, None)
+
+    def publish(self, message: SmsMessage) -> bool:
+        """Deliver an incoming SMS. Returns whether a waiter took it."""
+        self.stats.published += 1
+        extracted = None
+        for waiter in self._waiters.get(message.msisdn, ()):
+            if waiter.future.done() or not waiter.accepts(message):
+                continue
+            if extracted is None:
+                extracted = self.extractor(message)
+                if extracted is None:
+                    return False  # not an OTP: promo spam, balance info...
+            waiter.future.set_result(self._match(message, extracted))
+            self.stats.resolved += 1
+            return True
+
+        self._store(message)
+        return False
+
+    def publish_threadsafe(self, message: SmsMessage) -> None:
+        """Deliver an SMS from a thread other than the event loop's."""
+        if self._loop is None:
+            raise RuntimeError("OtpBroker has no event loop yet")
+        self._loop.call_soon_threadsafe(self.publish, message)
+
+    def urc_handler(
+        self, msisdn_of_port: Mapping[str, str] | Callable[[str], str | None]
+    ) -> Callable[[str, Urc | PduPayload], None]:
+        """Build a ModemPool URC handler publishing every ``+CMT`` SMS.
+
+        Args:
+            msisdn_of_port: Port name to MSISDN lookup
+        """
+        lookup = (
+            msisdn_of_port.get
+            if isinstance(msisdn_of_port, Mapping)
+            else msisdn_of_port
+        )
+
+        def handle(port: str, event: Urc | PduPayload) -> None:
+            if not isinstance(event, PduPayload):
+                return
+            now = self._clock()
+            parsed = parse_cmt(event)
+            msisdn = lookup(port)
+            if parsed is None or msisdn is None:
+                return
+            sender, body = parsed
+            self.publish(SmsMessage(msisdn, sender, body, now, port))
+
+        return handle
+
+    def _match(
+        self, message: SmsMessage, extracted: tuple[str, str | None]
+    ) -> OtpMatch:
+        latency = max(self._clock() - message.received_at, 0.0)
+        self.stats.latencies.append(latency)
+        code, rule = extracted
+        return OtpMatch(message, code, rule, latency)
+
+    def _take_buffered(self, msisdn: str, waiter: _Waiter) -> OtpMatch | None:
+        messages = self._buffer.get(msisdn)
+        if not messages:
+            return None
+        self._expire(msisdn, messages)
+        for message in messages:
+            if not waiter.accepts(message):
+                continue
+            extracted = self.extractor(message)
+            if extracted is None:
+                continue
+            messages.remove(message)
+            self._buffered -= 1
+            if not messages:
+                del self._buffer[msisdn]
+            return self._match(message, extracted)
+        return None
+
+    def _store(self, message: SmsMessage) -> None:
+        messages = self._buffer.get(message.msisdn)
+        if messages:
+            self._expire(message.msisdn, messages)
+        self._buffer[message.msisdn].append(message)
+        self._buffered += 1
+        self.stats.buffered += 1
+        if self._buffered > self.max_buffered:
+            self._evict_oldest()
+
+    def _expire(self, msisdn: str, messages: deque[SmsMessage]) -> None:
+        cutoff = self._clock() - self.buffer_ttl
+        while messages and messages[0].received_at < cutoff:
+            messages.popleft()
+            self._buffered -= 1
+            self.stats.expired += 1
+        if not messages:
+            self._buffer.pop(msisdn, None)
+
+    def _evict_oldest(self) -> None:
+        # Rare path: only when a burst exceeds max_buffered
+        msisdn = min(self._buffer, key=lambda m: self._buffer[m][0].received_at)
+        self._buffer[msisdn].popleft()
+        self._buffered -= 1
+        self.stats.expired += 1
+        if not self._buffer[msisdn]:
+            del self._buffer[msisdn]
+        logger.debug("OTP buffer full, dropped oldest unclaimed SMS")
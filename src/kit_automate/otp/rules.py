@@ -0,0 +1,217 @@
+"""Sender-indexed OTP extraction rules.
+
+Rules live in ``otp_rules.toml`` in the configs directory (``AppPaths.configs``)
+and fall back to the defaults shipped with the package::
+
+    [[rule]]
+    name = "tokopay"
+    senders = ["TOKOPAY"]  # omit or ["*"] for any sender
+    keywords = ["otp", "kode"]  # cheap pre-filter, case-insensitive
+    pattern = "kode otp[^0-9]*(?P<code>[0-9]{6})"
+
+Rules are grouped by sender and every group is compiled into one
+alternation, so an SMS costs one dict lookup, one keyword scan and one
+regex search no matter how many rules exist. Within a group the earliest
+match in the text wins; ties go to the rule listed first. A leading inline
+flag such as ``(?i)`` is scoped to its rule and ``(?P=code)`` is renamed
+along with the group; rules using numbered backreferences would break the
+numbering and are searched on their own.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from importlib import resources
+from pathlib import Path
+import re
+import tomllib
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from kit_automate.config.path_config import AppPaths
+    from kit_automate.otp.broker import SmsMessage
+
+RULES_FILE = "otp_rules.toml"
+ANY_SENDER = "*"
+DEFAULT_KEYWORDS = ("otp", "kode", "code", "verif", "pin")
+
+_NAMED_GROUP = re.compile(r"\(\?P<(\w+)>")
+_LEADING_FLAGS = re.compile(r"^\(\?([aiLmsux]+)\)")
+_NUMBERED_REFERENCE = re.compile(r"\\[1-9]|\(\?\(\d")
+
+
+@dataclass(frozen=True)
+class OtpRule:
+    """One extraction rule; ``pattern`` must have a ``code`` named group."""
+
+    name: str
+    pattern: str
+    senders: tuple[str, ...] = (ANY_SENDER,)
+    keywords: tuple[str, ...] = DEFAULT_KEYWORDS
+
+    def __post_init__(self) -> None:
+        groups = _NAMED_GROUP.findall(self.pattern)
+        if groups != ["code"]:
+            raise ValueError(
+                f"Rule {self.name!r} needs exactly one named group 'code', "
+                f"found {groups}"
+            )
+        try:
+            re.compile(self.pattern, re.IGNORECASE)
+            alternative = _alternative(self, 0)
+            if alternative is not None:
+                re.compile(alternative, re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"Rule {self.name!r} has an invalid pattern: {e}") from e
+
+
+def _alternative(rule: OtpRule, index: int) -> str | None:
+    """``rule.pattern`` as alternative ``index`` of a group's alternation.
+
+    None when the rule must be compiled on its own.
+    """
+    pattern = rule.pattern
+    if _NUMBERED_REFERENCE.search(pattern):
+        return None
+    flags = _LEADING_FLAGS.match(pattern)
+    if flags is not None:
+        # A global flag anywhere but the start of the whole regex is an error
+        pattern = f"(?{flags.group(1)}:{pattern[flags.end() :]})"
+    pattern = pattern.replace("(?P<code>", f"(?P<c{index}>")
+    pattern = pattern.replace("(?P=code)", f"(?P=c{index})")
+    # r<i> wraps the whole alternative, so match.lastgroup names the rule
+    return f"(?P<r{index}>{pattern})"
+
+
+@dataclass(frozen=True)
+class OtpExtraction:
+    code: str
+    rule: str
+
+
+@dataclass
+class RuleStats:
+    checked: int = 0
+    no_rules: int = 0
+    prefiltered: int = 0
+    matched: int = 0
+
+
+@dataclass
+class _RuleGroup:
+    rules: list[OtpRule]
+    keywords: re.Pattern[str] = field(init=False)
+    combined: re.Pattern[str] | None = field(init=False)
+    separate: list[tuple[int, re.Pattern[str]]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        words = sorted({k.lower() for r in self.rules for k in r.keywords}, key=len)
+        self.keywords = re.compile("|".join(map(re.escape, words)), re.IGNORECASE)
+        alternatives = []
+        self.separate = []
+        for i, rule in enumerate(self.rules):
+            alternative = _alternative(rule, i)
+            if alternative is None:
+                self.separate.append((i, re.compile(rule.pattern, re.IGNORECASE)))
+            else:
+                alternatives.append(alternative)
+        self.combined = (
+            re.compile("|".join(alternatives), re.IGNORECASE) if alternatives else None
+        )
+
+    def extract(self, body: str) -> OtpExtraction | None:
+        # (start, rule index, code): earliest match first, then rule order
+        best: tuple[int, int, str] | None = None
+        match = self.combined.search(body) if self.combined is not None else None
+        if match is not None:
+            index = int(match.lastgroup[1:])  # type: ignore[index]
+            best = (match.start(), index, match.group(f"c{index}"))
+        for index, pattern in self.separate:
+            match = pattern.search(body)
+            if match is not None:
+                found = (match.start(), index, match.group("code"))
+                best = found if best is None else min(best, found)
+        if best is None:
+            return None
+        return OtpExtraction(best[2], self.rules[best[1]].name)
+
+
+def normalize_sender(sender: str) -> str:
+    return sender.strip().lstrip("+").upper()
+
+
+class OtpRuleEngine:
+    """Extract OTP codes using rules indexed by sender.
+
+    Instances are callable with an :class:`SmsMessage`, which makes them a
+    drop-in ``extractor`` for :class:`OtpBroker`.
+    """
+
+    def __init__(self, rules: Iterable[OtpRule]):
+        self.rules = list(rules)
+        self.stats = RuleStats()
+        wildcard = [r for r in self.rules if ANY_SENDER in r.senders]
+        by_sender: dict[str, list[OtpRule]] = {}
+        for rule in self.rules:
+            for sender in rule.senders:
+                if sender != ANY_SENDER:
+                    by_sender.setdefault(normalize_sender(sender), []).append(rule)
+
+        # Sender-specific rules first, wildcard rules as the fallback
+        self._groups = {
+            sender: _RuleGroup(rules + wildcard) for sender, rules in by_sender.items()
+        }
+        self._wildcard = _RuleGroup(wildcard) if wildcard else None
+
+    @classmethod
+    def from_file(cls, path: Path) -> "OtpRuleEngine":
+        """Load rules from a TOML file with ``[[rule]]`` tables.
+
+        Raises:
+            ValueError: If a rule is invalid
+        """
+        with path.open("rb") as f:
+            data = tomllib.load(f)
+        rules = []
+        for entry in data.get("rule", []):
+            rules.append(
+                OtpRule(
+                    name=entry["name"],
+                    pattern=entry["pattern"],
+                    senders=tuple(entry.get("senders", [ANY_SENDER])),
+                    keywords=tuple(entry.get("keywords", DEFAULT_KEYWORDS)),
+                )
+            )
+        logger.debug(f"Loaded {len(rules)} OTP rules from {path}")
+        return cls(rules)
+
+    @classmethod
+    def load(cls, paths: "AppPaths") -> "OtpRuleEngine":
+        """Load ``otp_rules.toml`` from the configs dir, else the defaults."""
+        user_rules = paths.configs / RULES_FILE
+        if user_rules.is_file():
+            return cls.from_file(user_rules)
+        with resources.as_file(
+            resources.files("kit_automate.otp") / "default_rules.toml"
+        ) as default_rules:
+            return cls.from_file(default_rules)
+
+    def extract(self, sender: str, body: str) -> OtpExtraction | None:
+        """Return the code and rule name, or None for a non-OTP message."""
+        self.stats.checked += 1
+        group = self._groups.get(normalize_sender(sender), self._wildcard)
+        if group is None:
+            self.stats.no_rules += 1
+            return None
+        if group.keywords.search(body) is None:
+            self.stats.prefiltered += 1
+            return None
+        extraction = group.extract(body)
+        if extraction is not None:
+            self.stats.matched += 1
+        return extraction
+
+    def __call__(self, message: "SmsMessage") -> tuple[str, str | None] | None:
+        extraction = self.extract(message.sender, message.body)
+        return None if extraction is None else (extraction.code, extraction.rule)
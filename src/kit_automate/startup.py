@@ -0,0 +1,149 @@
+"""Startup profiling for ``kit-automate --profile-startup``.
+
+:class:`ImportProfiler` records every first-time import as a tree with
+self and cumulative time. It hooks ``__import__`` and
+``importlib.import_module`` instead of relying on ``python -X importtime``,
+so it also works in the frozen executable.
+"""
+
+import builtins
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+import importlib
+import importlib.util
+import json
+from pathlib import Path
+import sys
+import time
+from typing import Any
+
+
+@dataclass
+class ImportNode:
+    name: str
+    cumulative: float = 0.0
+    children: list["ImportNode"] = field(default_factory=list)
+
+    @property
+    def self_time(self) -> float:
+        return self.cumulative - sum(c.cumulative for c in self.children)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "cumulative_ms": round(self.cumulative * 1000, 3),
+            "self_ms": round(self.self_time * 1000, 3),
+            "children": [c.to_dict() for c in self.children],
+        }
+
+
+def _resolve(name: str, globals_: dict | None, level: int) -> str:
+    if level == 0 or not globals_:
+        return name
+    package = globals_.get("__package__") or ""
+    base = package.rsplit(".", level - 1)[0] if level > 1 else package
+    return f"{base}.{name}" if name else base
+
+
+class ImportProfiler:
+    """Context manager timing the modules imported while it is active."""
+
+    def __init__(self) -> None:
+        self.root = ImportNode("<startup>")
+        self._stack = [self.root]
+        self._original_import: Callable[..., Any] = builtins.__import__
+        self._original_import_module = importlib.import_module
+
+    def __enter__(self) -> "ImportProfiler":
+        self._original_import = builtins.__import__
+        self._original_import_module = importlib.import_module
+        builtins.__import__ = self._import
+        importlib.import_module = self._import_module  # type: ignore[assignment]
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        builtins.__import__ = self._original_import
+        importlib.import_module = self._original_import_module
+        self.root.cumulative = sum(c.cumulative for c in self.root.children)
+
+    def _timed(self, name: str, load: Callable[[], Any]) -> Any:
+        # importlib re-enters for the module already being timed
+        if name in sys.modules or name == self._stack[-1].name:
+            return load()
+        node = ImportNode(name)
+        self._stack[-1].children.append(node)
+        self._stack.append(node)
+        start = time.perf_counter()
+        try:
+            return load()
+        finally:
+            node.cumulative = time.perf_counter() - start
+            self._stack.pop()
+
+    def _import(
+        self,
+        name: str,
+        globals: dict | None = None,
+        locals: dict | None = None,
+        fromlist: tuple = (),
+        level: int = 0,
+    ) -> Any:
+        return self._timed(
+            _resolve(name, globals, level),
+            lambda: self._original_import(name, globals, locals, fromlist, level),
+        )
+
+    def _import_module(self, name: str, package: str | None = None) -> Any:
+        resolved = importlib.util.resolve_name(name, package) if package else name
+        return self._timed(
+            resolved, lambda: self._original_import_module(name, package)
+        )
+
+    def format(self, min_ms: float = 1.0) -> str:
+        """Render the import tree, hiding subtrees cheaper than ``min_ms``."""
+        lines = [f"{'cumulative':>10} {'self':>8}  module"]
+
+        def walk(node: ImportNode, depth: int) -> None:
+            for child in sorted(node.children, key=lambda c: -c.cumulative):
+                if child.cumulative * 1000 < min_ms:
+                    continue
+                lines.append(
+                    f"{child.cumulative * 1000:>8.1f}ms {child.self_time * 1000:>6.1f}ms"
+                    f"  {'  ' * depth}{child.name}"
+                )
+                walk(child, depth + 1)
+
+        walk(self.root, 0)
+        return "\n".join(lines)
+
+
+@dataclass
+class StartupReport:
+    imports: ImportProfiler
+    phases: dict[str, float]
+    total: float
+
+    def format(self, min_ms: float = 1.0) -> str:
+        phases = "\n".join(
+            f"{seconds * 1000:>10.1f}ms  {name}"
+            for name, seconds in self.phases.items()
+        )
+        return (
+            f"Startup took {self.total * 1000:.1f}ms "
+            f"(imports {self.imports.root.cumulative * 1000:.1f}ms)\n\n"
+            f"create_application_context phases:\n{phases}\n\n"
+            f"Imports (>= {min_ms}ms):\n{self.imports.format(min_ms)}"
+        )
+
+    def write(self, reports_dir: Path) -> Path:
+        """Save the report as JSON under ``reports_dir`` and return its path."""
+        reports_dir.mkdir(parents=True, exist_ok=True)
+        path = reports_dir / f"startup-profile-{datetime.now():%Y%m%d-%H%M%S}.json"
+        data = {
+            "total_ms": round(self.total * 1000, 3),
+            "phases_ms": {k: round(v * 1000, 3) for k, v in self.phases.items()},
+            "imports": self.imports.root.to_dict(),
+        }
+        path.write_text(json.dumps(data, indent=2))
+        return path
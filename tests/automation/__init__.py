@@ -0,0 +1 @@
+"""Automation package tests."""
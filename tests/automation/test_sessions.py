@@ -0,0 +1,305 @@
+"""Test the warm session pool against the stub site and the fake driver."""
+
+import asyncio
+import json
+import sys
+
+import pytest
+
+from kit_automate.automation import FakeDriver, SessionManager, StubShop
+from kit_automate.otp import OtpBroker, SmsMessage
+
+
+@pytest.fixture
+def broker() -> OtpBroker:
+    return OtpBroker()
+
+
+@pytest.fixture
+def shop(broker):
+    def deliver(msisdn: str, code: str) -> None:
+        broker.publish_threadsafe(SmsMessage(msisdn, "SHOP", f"Kode OTP {code}"))
+
+    with StubShop(on_otp=deliver) as shop:
+        yield shop
+
+
+@pytest.fixture
+async def sessions(shop, broker, temp_dir):
+    managers: list[SessionManager] = []
+
+    async def login(context, msisdn: str) -> None:
+        # Register the waiter first: the SMS can beat the HTTP response
+        otp = asyncio.create_task(broker.wait_for(msisdn, sender="SHOP", timeout=5))
+        await asyncio.sleep(0)
+        await context.fetch(f"{shop.url}/login", {"msisdn": msisdn})
+        code = (await otp).code
+        status, _ = await context.fetch(
+            f"{shop.url}/verify", {"msisdn": msisdn, "otp": code}
+        )
+        if status != 200:
+            raise RuntimeError(f"login failed: {status}")
+
+    async def validate(context, msisdn: str) -> bool:
+        status, body = await context.fetch(f"{shop.url}/account")
+        return status == 200 and body == msisdn
+
+    def create(driver: FakeDriver | None = None, **kwargs) -> SessionManager:
+        manager = SessionManager(
+            driver or FakeDriver(),
+            temp_dir / "sessions",
+            login,
+            validate,
+            **kwargs,
+        )
+        managers.append(manager)
+        return manager
+
+    yield create
+    for manager in managers:
+        await manager.close()
+
+
+async def _buy(manager: SessionManager, shop: StubShop, msisdn: str) -> None:
+    async with manager.session(msisdn) as context:
+        status, body = await context.fetch(f"{shop.url}/account")
+        assert (status, body) == (200, msisdn)
+
+
+class TestSessionManager:
+    """Test reuse, persistence, validity checks and eviction."""
+
+    async def test_login_once_then_warm(self, sessions, shop):
+        manager = sessions()
+
+        for _ in range(3):
+            await _buy(manager, shop, "0812")
+
+        assert shop.logins == 1
+        assert (manager.stats.logins, manager.stats.warm) == (1, 2)
+        assert manager.warm == ["0812"]
+
+    async def test_state_survives_restart(self, sessions, shop):
+        first = sessions()
+        await _buy(first, shop, "0812")
+        await first.close()
+
+        driver = FakeDriver()
+        second = sessions(driver)
+        await _buy(second, shop, "0812")
+
+        assert shop.logins == 1
+        assert second.stats.restored == 1
+        assert driver.restored == 1
+        state = json.loads(second.state_path("0812").read_text())
+        assert [c["name"] for c in state["cookies"]] == ["session"]
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+    async def test_state_file_private(self, sessions, shop):
+        manager = sessions()
+        await _buy(manager, shop, "0812")
+
+        assert manager.state_path("0812").stat().st_mode & 0o777 == 0o600
+
+    async def test_expired_session_logs_in_again(self, sessions, shop):
+        manager = sessions(revalidate_after=0)
+        await _buy(manager, shop, "0812")
+
+        shop.expire("0812")
+        await _buy(manager, shop, "0812")
+
+        assert shop.logins == 2
+        assert manager.stats.expired == 1
+
+    async def test_stale_saved_state_not_restored(self, sessions, shop):
+        first = sessions()
+        await _buy(first, shop, "0812")
+        await first.close()
+        shop.expire("0812")
+
+        second = sessions()
+        await _buy(second, shop, "0812")
+
+        assert shop.logins == 2
+        assert (second.stats.restored, second.stats.expired) == (0, 1)
+
+    async def test_trusted_check_skips_request(self, sessions, shop):
+        manager = sessions(revalidate_after=300)
+        await _buy(manager, shop, "0812")
+        before = shop.requests
+
+        await _buy(manager, shop, "0812")
+
+        # Only the purchase's own request, no validity check
+        assert shop.requests - before == 1
+
+    async def test_lru_eviction(self, sessions, shop):
+        driver = FakeDriver()
+        manager = sessions(driver, max_contexts=2)
+
+        for msisdn in ["0811", "0812", "0811", "0813"]:
+            await _buy(manager, shop, msisdn)
+
+        assert manager.warm == ["0811", "0813"]
+        assert manager.stats.evicted == 1
+        assert driver.live == 2
+
+        # The evicted MSISDN comes back from disk, not a new login
+        await _buy(manager, shop, "0812")
+        assert shop.logins == 3
+        assert manager.stats.restored == 1
+        assert manager.warm == ["0813", "0812"]
+
+    async def test_same_msisdn_serialized(self, sessions, shop):
+        manager = sessions()
+        inside = 0
+        peak = 0
+
+        async def buy() -> None:
+            nonlocal inside, peak
+            async with manager.session("0812"):
+                inside += 1
+                peak = max(peak, inside)
+                await asyncio.sleep(0.01)
+                inside -= 1
+
+        await asyncio.gather(*(buy() for _ in range(4)))
+
+        assert peak == 1
+        assert shop.logins == 1
+
+    async def test_failed_block_rechecks(self, sessions, shop):
+        manager = sessions(revalidate_after=300)
+        await _buy(manager, shop, "0812")
+
+        with pytest.raises(ValueError):
+            async with manager.session("0812"):
+                raise ValueError("purchase failed")
+        shop.expire("0812")
+        await _buy(manager, shop, "0812")
+
+        assert manager.stats.expired == 1
+        assert shop.logins == 2
+
+    async def test_failed_login_closes_context(self, temp_dir):
+        async def login(context, msisdn):
+            raise RuntimeError("no OTP")
+
+        async def validate(context, msisdn):
+            return True
+
+        driver = FakeDriver()
+        manager = SessionManager(driver, temp_dir, login, validate)
+
+        with pytest.raises(RuntimeError):
+            async with manager.session("0812"):
+                pass
+
+        assert driver.live == 0
+        assert len(manager) == 0
+
+    async def test_invalidate(self, sessions, shop):
+        driver = FakeDriver()
+        manager = sessions(driver)
+        await _buy(manager, shop, "0812")
+
+        await manager.invalidate("0812")
+
+        assert not manager.state_path("0812").exists()
+        assert driver.live == 0
+        await _buy(manager, shop, "0812")
+        assert shop.logins == 2
+
+    async def test_invalidate_and_close_wait_for_session(self, sessions, shop):
+        driver = FakeDriver()
+        manager = sessions(driver)
+        await _buy(manager, shop, "0811")
+
+        async with manager.session("0812"):
+            invalidate = asyncio.create_task(manager.invalidate("0812"))
+            close = asyncio.create_task(manager.close())
+            await asyncio.sleep(0.05)
+            assert not invalidate.done()
+            assert not close.done()
+            assert manager.warm == ["0812"]
+        await asyncio.gather(invalidate, close)
+
+        assert not manager.state_path("0812").exists()
+        assert manager.state_path("0811").exists()
+        assert driver.live == 0
+
+    async def test_locks_only_while_in_use(self, sessions, shop):
+        manager = sessions(max_contexts=2)
+
+        await asyncio.gather(*(_buy(manager, shop, f"081{i}") for i in range(5)))
+        await manager.invalidate("0810")
+        await manager.invalidate("0819")
+
+        assert manager._locks == {}
+
+    async def test_corrupt_state_ignored(self, sessions, shop):
+        manager = sessions()
+        manager.state_dir.mkdir(parents=True)
+        manager.state_path("0812").write_text("{not json")
+
+        await _buy(manager, shop, "0812")
+
+        assert shop.logins == 1
+
+
+class TestContextWiring:
+    """Test the manager built by ApplicationContext."""
+
+    async def test_session_manager_uses_app_paths(self, temp_dir, shop):
+        from kit_automate.config import create_application_context
+
+        async def validate(context, msisdn):
+            status, _ = await context.fetch(f"{shop.url}/account")
+            return status == 200
+
+        context = create_application_context(temp_dir)
+        try:
+            manager = context.session_manager(
+                FakeDriver(), lambda *_: asyncio.sleep(0), validate, max_contexts=1
+            )
+            async with manager.session("0812"):
+                pass
+            await manager.close()
+        finally:
+            context.cleanup()
+
+        assert manager.max_contexts == 1
+        assert manager.state_path("0812").parent == context.paths.data / "sessions"
+        assert manager.state_path("0812").exists()
+        assert list(context.paths.temp.iterdir()) == []
+
+
+class TestPlaywrightDriver:
+    """Test the real browser against the stub site, when available."""
+
+    @pytest.mark.web
+    async def test_storage_state_round_trip(self):
+        pytest.importorskip("playwright")
+        from kit_automate.automation import PlaywrightDriver
+
+        driver = PlaywrightDriver()
+        with StubShop() as shop:
+            try:
+                context = await driver.new_context()
+            except Exception as e:  # browsers not downloaded
+                await driver.close()
+                pytest.skip(f"no browser: {e}")
+            try:
+                await context.request.post(f"{shop.url}/login", form={"msisdn": "0812"})
+                code = shop.otps["0812"]
+                await context.request.post(
+                    f"{shop.url}/verify", form={"msisdn": "0812", "otp": code}
+                )
+                state = await context.storage_state()
+                await context.close()
+
+                restored = await driver.new_context(state)
+                response = await restored.request.get(f"{shop.url}/account")
+                assert response.status == 200
+            finally:
+                await driver.close()
@@ -0,0 +1,78 @@
+"""Test best-of-runs selection and baseline comparison in benchmarks/run.py."""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parents[2] / "benchmarks"))
+
+from run import _best, compare
+from suite import Metric
+
+
+def _result(value: float, higher_is_better: bool = True) -> dict:
+    return {
+        "otp": [{"name": "rate", "value": value, "higher_is_better": higher_is_better}]
+    }
+
+
+class TestBest:
+    """The best run depends on the metric's direction."""
+
+    def test_keeps_best_value_per_direction(self):
+        runs = [
+            [Metric("rate", 90, "/s"), Metric("latency", 5, "ms", False)],
+            [Metric("rate", 120, "/s"), Metric("latency", 7, "ms", False)],
+            [Metric("rate", 100, "/s"), Metric("latency", 6, "ms", False)],
+        ]
+
+        best = {m.name: m.value for m in _best(runs)}
+
+        assert best == {"rate": 120, "latency": 5}
+
+    def test_metric_missing_from_some_runs(self):
+        runs = [
+            [Metric("rate", 90, "/s")],
+            [Metric("rate", 80, "/s"), Metric("extra", 1, "n")],
+        ]
+
+        best = {m.name: m.value for m in _best(runs)}
+
+        assert best == {"rate": 90, "extra": 1}
+
+
+class TestCompare:
+    """Regressions are flagged only beyond the threshold, in the worse direction."""
+
+    @pytest.mark.parametrize(
+        ("value", "higher_is_better", "regressed"),
+        [
+            (70, True, True),
+            (85, True, False),
+            (130, True, False),
+            (130, False, True),
+            (115, False, False),
+            (70, False, False),
+        ],
+    )
+    def test_threshold_direction(self, value, higher_is_better, regressed, capsys):
+        regressions = compare(
+            _result(value, higher_is_better), _result(100, higher_is_better), 0.2
+        )
+
+        assert regressions == (["otp.rate"] if regressed else [])
+        assert ("REGRESSION" in capsys.readouterr().out) is regressed
+
+    def test_missing_baseline(self, capsys):
+        assert compare(_result(1), {}, 0.2) == []
+        assert "new" in capsys.readouterr().out
+
+    def test_missing_metric(self, capsys):
+        baseline = {"otp": [{"name": "latency", "value": 5, "higher_is_better": False}]}
+
+        assert compare(_result(1), baseline, 0.2) == []
+        assert "new" in capsys.readouterr().out
+
+    def test_zero_baseline_is_treated_as_missing(self):
+        assert compare(_result(1), _result(0), 0.2) == []
@@ -0,0 +1,91 @@
+"""Test the asyncio database facade."""
+
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import text
+
+from kit_automate.config.db_async import AsyncDatabaseManager
+from kit_automate.config.db_config import DatabaseManager
+
+
+@pytest.fixture
+def async_db(test_file_db_manager: DatabaseManager):
+    with test_file_db_manager.get_session() as session:
+        session.execute(text("CREATE TABLE sms (id INTEGER PRIMARY KEY, body TEXT)"))
+        session.commit()
+    manager = AsyncDatabaseManager(test_file_db_manager)
+    yield manager
+    manager.close()
+
+
+def _heavy_write(session, rows: int = 20_000) -> None:
+    for chunk in range(0, rows, 2_000):
+        session.execute(
+            text("INSERT INTO sms (body) VALUES (:b)"),
+            [{"b": f"otp {i}" * 20} for i in range(chunk, chunk + 2_000)],
+        )
+        session.commit()
+
+
+async def _max_loop_lag(stop: asyncio.Event, interval: float = 0.002) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+class TestAsyncDatabaseManager:
+    """Test session helpers and event loop responsiveness."""
+
+    async def test_session_commit_and_query(self, async_db: AsyncDatabaseManager):
+        async with async_db.session() as session:
+            await session.execute(text("INSERT INTO sms (body) VALUES ('a')"))
+            await session.commit()
+
+        assert await async_db.scalar(text("SELECT COUNT(*) FROM sms")) == 1
+        rows = await async_db.execute(text("SELECT body FROM sms"))
+        assert [r.body for r in rows] == ["a"]
+
+    async def test_session_rolls_back_on_error(self, async_db: AsyncDatabaseManager):
+        with pytest.raises(ValueError):
+            async with async_db.session() as session:
+                await session.execute(text("INSERT INTO sms (body) VALUES ('x')"))
+                raise ValueError("boom")
+
+        assert await async_db.scalar(text("SELECT COUNT(*) FROM sms")) == 0
+
+    async def test_memory_database_uses_single_worker(self, test_db_manager):
+        manager = AsyncDatabaseManager(test_db_manager, max_workers=8)
+        assert manager.max_workers == 1
+        assert await manager.test_connection()
+        manager.close()
+
+    async def test_memory_database_shared_with_sync_path(self, test_db_manager):
+        with test_db_manager.get_session() as session:
+            session.execute(text("CREATE TABLE sms (id INTEGER PRIMARY KEY)"))
+            session.execute(text("INSERT INTO sms (id) VALUES (1), (2)"))
+            session.commit()
+        manager = AsyncDatabaseManager(test_db_manager)
+
+        assert await manager.scalar(text("SELECT COUNT(*) FROM sms")) == 2
+        manager.close()
+
+    async def test_loop_stays_responsive_during_heavy_writes(
+        self, async_db: AsyncDatabaseManager
+    ):
+        stop = asyncio.Event()
+        lag_task = asyncio.create_task(_max_loop_lag(stop))
+        start = time.perf_counter()
+        await async_db.run(_heavy_write, commit=True)
+        write_time = time.perf_counter() - start
+        stop.set()
+        worst_lag = await lag_task
+
+        assert await async_db.scalar(text("SELECT COUNT(*) FROM sms")) == 20_000
+        # The loop kept ticking while the writes ran
+        assert worst_lag < 0.1
+        assert worst_lag < write_time
@@ -0,0 +1,76 @@
+"""Test SQLite performance profiles."""
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import NullPool, QueuePool
+
+from kit_automate.config.db_config import (
+    DB_PROFILES,
+    DatabaseManager,
+    DbConfig,
+    get_db_config,
+)
+from kit_automate.config.path_config import AppPaths
+
+
+def _pragma(manager: DatabaseManager, name: str):
+    assert manager.engine is not None
+    with manager.engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+class TestDbProfiles:
+    """Test profile selection and pragma application."""
+
+    def test_unknown_profile_rejected(self):
+        with pytest.raises(ValueError, match="Unknown database profile"):
+            DbConfig(path=":memory:", profile="turbo")  # type: ignore[arg-type]
+
+    def test_default_config_has_no_pre_ping(self, test_app_paths: AppPaths):
+        config = get_db_config(test_app_paths)
+        assert config.pool_pre_ping is False
+        assert config.profile == "safe"
+
+    def test_profile_from_env(self, test_app_paths: AppPaths, monkeypatch):
+        monkeypatch.setenv("DB_PROFILE", "throughput")
+        assert get_db_config(test_app_paths).profile == "throughput"
+
+    @pytest.mark.parametrize(
+        ("profile", "synchronous"), [("safe", 2), ("throughput", 1)]
+    )
+    def test_writer_profiles_enable_wal(
+        self, temp_dir: Path, profile: str, synchronous: int
+    ):
+        manager = DatabaseManager(
+            DbConfig(path=str(temp_dir / "db.sqlite"), profile=profile)  # type: ignore[arg-type]
+        )
+        manager.initialize()
+        try:
+            assert _pragma(manager, "journal_mode") == "wal"
+            assert _pragma(manager, "synchronous") == synchronous
+            assert _pragma(manager, "busy_timeout") == 5000
+            assert _pragma(manager, "foreign_keys") == 1
+            assert isinstance(manager.engine.pool, QueuePool)  # type: ignore[union-attr]
+            assert manager.engine.pool.size() == DB_PROFILES[profile].pool_size  # type: ignore[union-attr]
+        finally:
+            manager.cleanup()
+
+    def test_readonly_profile_rejects_writes(self, temp_dir: Path):
+        manager = DatabaseManager(
+            DbConfig(path=str(temp_dir / "db.sqlite"), profile="readonly")
+        )
+        manager.initialize()
+        try:
+            assert manager.test_connection()
+            assert _pragma(manager, "query_only") == 1
+            assert isinstance(manager.engine.pool, NullPool)  # type: ignore[union-attr]
+            with (
+                pytest.raises(OperationalError),
+                manager.engine.connect() as conn,  # type: ignore[union-attr]
+            ):
+                conn.execute(text("CREATE TABLE t (id INTEGER)"))
+        finally:
+            manager.cleanup()
@@ -0,0 +1,69 @@
+"""Test the read-only connection pool."""
+
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from kit_automate.config.db_config import DatabaseManager
+
+
+@pytest.fixture
+def sms_db(test_file_db_manager: DatabaseManager) -> DatabaseManager:
+    with test_file_db_manager.get_session() as session:
+        session.execute(text("CREATE TABLE sms (id INTEGER PRIMARY KEY, body TEXT)"))
+        session.execute(text("INSERT INTO sms (body) VALUES ('first')"))
+        session.commit()
+    return test_file_db_manager
+
+
+class TestReadPool:
+    """Test reader engine isolation from the writer engine."""
+
+    def test_read_session_sees_committed_rows(self, sms_db: DatabaseManager):
+        assert sms_db.read_engine is not None
+        assert sms_db.read_engine is not sms_db.engine
+        with sms_db.get_read_session() as session:
+            assert session.execute(text("SELECT body FROM sms")).scalar() == "first"
+
+    def test_read_session_refuses_writes(self, sms_db: DatabaseManager):
+        with (
+            sms_db.get_read_session() as session,
+            pytest.raises(OperationalError, match=r"readonly|query_only"),
+        ):
+            session.execute(text("INSERT INTO sms (body) VALUES ('nope')"))
+
+    def test_open_reader_does_not_block_writer(self, sms_db: DatabaseManager):
+        with sms_db.get_session() as writer:
+            writer.execute(
+                text("INSERT INTO sms (body) VALUES (:b)"),
+                [{"b": str(i)} for i in range(500)],
+            )
+            writer.commit()
+
+        with sms_db.get_read_session() as reader:
+            # A half-consumed cursor keeps a read lock on the database
+            rows = reader.execute(text("SELECT id FROM sms"))
+            assert rows.fetchone() is not None
+
+            start = time.perf_counter()
+            with sms_db.get_session() as writer:
+                writer.execute(text("INSERT INTO sms (body) VALUES ('second')"))
+                writer.commit()
+            assert time.perf_counter() - start < 1.0
+            rows.close()
+
+        with sms_db.get_read_session() as reader:
+            assert reader.execute(text("SELECT COUNT(*) FROM sms")).scalar() == 502
+
+    def test_pool_sizing_and_cleanup(self, sms_db: DatabaseManager):
+        assert sms_db.read_engine.pool.size() == sms_db.config.read_pool_size  # type: ignore[union-attr]
+        sms_db.cleanup()
+        assert sms_db.read_engine is None
+        assert sms_db.ReadSessionLocal is None
+
+    def test_memory_database_falls_back(self, test_db_manager: DatabaseManager):
+        assert test_db_manager.read_engine is None
+        with test_db_manager.get_read_session() as session:
+            assert session.execute(text("SELECT 1")).scalar() == 1
@@ -0,0 +1,117 @@
+"""Test per-statement query statistics and slow-query plans."""
+
+from loguru import logger
+import pytest
+from sqlalchemy import select, text, update
+from sqlalchemy.exc import OperationalError
+
+from kit_automate.config.db_config import DatabaseManager, DbConfig
+from kit_automate.config.db_stats import normalize_statement
+from kit_automate.database import MsisdnInventory
+
+
+@pytest.fixture
+def instrumented_db(temp_dir):
+    manager = DatabaseManager(
+        DbConfig(path=str(temp_dir / "stats.db"), instrument=True, slow_query_ms=0)
+    )
+    manager.initialize()
+    manager.create_tables()
+    yield manager
+    manager.cleanup()
+
+
+class TestNormalize:
+    """Test statement normalization."""
+
+    @pytest.mark.parametrize(
+        ("statement", "expected"),
+        [
+            ("SELECT a FROM t WHERE id = 5", "SELECT a FROM t WHERE id = ?"),
+            ("SELECT a\n  FROM t WHERE x = 'it''s'", "SELECT a FROM t WHERE x = ?"),
+            ("DELETE FROM t WHERE id IN (?)", "DELETE FROM t WHERE id IN (?, ...)"),
+            (
+                "INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)",
+                "INSERT INTO t (a, b) VALUES (?, ...), ...",
+            ),
+            ("SELECT t1.a FROM t1", "SELECT t1.a FROM t1"),
+        ],
+    )
+    def test_shapes(self, statement, expected):
+        assert normalize_statement(statement) == expected
+
+
+class TestQueryStats:
+    """Test aggregation, slow-query logging and the cleanup report."""
+
+    def test_failing_statements_leave_no_state(self, instrumented_db):
+        with instrumented_db.engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    conn.execute(text("SELECT * FROM missing_table"))
+            conn.execute(text("SELECT 1"))
+            info = dict(conn.info)
+
+        stats = instrumented_db.query_stats
+        assert stats is not None
+        assert not info.get("query_start")
+        assert stats.statements["SELECT ?"].calls == 1
+        assert "SELECT * FROM missing_table" not in stats.statements
+
+    def test_n_plus_one_aggregates(self, instrumented_db):
+        with instrumented_db.get_session() as session:
+            session.add_all(MsisdnInventory(msisdn=f"0812{i}") for i in range(10))
+            session.commit()
+            for i in range(10):
+                session.execute(
+                    select(MsisdnInventory).where(MsisdnInventory.msisdn == f"0812{i}")
+                ).scalar_one()
+            session.execute(update(MsisdnInventory).values(balance=1))
+            session.commit()
+
+        stats = instrumented_db.query_stats
+        assert stats is not None
+        lookups = [
+            s
+            for key, s in stats.statements.items()
+            if key.startswith("SELECT") and "msisdn_inventory.msisdn = ?" in key
+        ]
+        assert len(lookups) == 1
+        assert lookups[0].calls == 10
+        updates = [s for k, s in stats.statements.items() if k.startswith("UPDATE")]
+        assert updates[0].rows == 10
+
+    def test_slow_query_logs_plan_once(self, instrumented_db):
+        messages = []
+        sink = logger.add(messages.append, level="WARNING", format="{message}")
+        try:
+            with instrumented_db.get_read_session() as session:
+                for _ in range(3):
+                    session.execute(
+                        select(MsisdnInventory).where(MsisdnInventory.balance > 5)
+                    ).all()
+        finally:
+            logger.remove(sink)
+
+        plans = [m for m in messages if "msisdn_inventory.balance > ?" in m]
+        assert len(plans) == 1
+        assert "SCAN" in plans[0]
+
+    def test_report_on_cleanup(self, temp_dir):
+        manager = DatabaseManager(
+            DbConfig(path=str(temp_dir / "r.db"), instrument=True, slow_query_ms=1e6)
+        )
+        manager.initialize()
+        manager.test_connection()
+        messages = []
+        sink = logger.add(messages.append, level="INFO", format="{message}")
+        try:
+            manager.cleanup()
+        finally:
+            logger.remove(sink)
+
+        report = next(m for m in messages if m.startswith("Query statistics"))
+        assert "SELECT ?" in report
+
+    def test_disabled_by_default(self, test_db_manager):
+        assert test_db_manager.query_stats is None
@@ -0,0 +1,94 @@
+"""Test the batching database writer."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import text
+
+from kit_automate.config import ApplicationContext
+from kit_automate.config.db_config import DatabaseManager
+from kit_automate.config.db_writer import BatchWriter
+
+
+@pytest.fixture
+def sms_db(test_file_db_manager: DatabaseManager) -> DatabaseManager:
+    with test_file_db_manager.get_session() as session:
+        session.execute(
+            text("CREATE TABLE sms (id INTEGER PRIMARY KEY, body TEXT UNIQUE)")
+        )
+        session.commit()
+    return test_file_db_manager
+
+
+def _insert(body: str):
+    def operation(session):
+        return session.execute(
+            text("INSERT INTO sms (body) VALUES (:b)"), {"b": body}
+        ).lastrowid
+
+    return operation
+
+
+def _count(db: DatabaseManager) -> int:
+    with db.get_session() as session:
+        return session.execute(text("SELECT COUNT(*) FROM sms")).scalar_one()
+
+
+class TestBatchWriter:
+    """Test grouping, failure isolation and shutdown."""
+
+    def test_concurrent_writes_are_grouped(self, sms_db: DatabaseManager):
+        writer = BatchWriter(sms_db, max_batch=50, max_latency=0.05)
+        with ThreadPoolExecutor(8) as pool:
+            futures = list(
+                pool.map(lambda i: writer.submit(_insert(f"otp-{i}")), range(200))
+            )
+        ids = [f.result(timeout=5) for f in futures]
+        writer.close()
+
+        assert len(set(ids)) == 200
+        assert _count(sms_db) == 200
+        assert writer.stats.committed == 200
+        assert writer.stats.batches < 200
+
+    def test_failing_operation_only_fails_its_future(self, sms_db: DatabaseManager):
+        writer = BatchWriter(sms_db, max_latency=0.05)
+        good = writer.submit(_insert("a"))
+        bad = writer.submit(_insert("a"))  # violates UNIQUE
+        other = writer.submit(_insert("b"))
+        writer.flush(timeout=5)
+
+        assert good.result() is not None
+        assert other.result() is not None
+        assert bad.exception() is not None
+        assert writer.stats.failed == 1
+        assert writer.stats.fallbacks == 1
+        assert _count(sms_db) == 2
+        writer.close()
+
+    def test_close_flushes_and_refuses_new_work(self, sms_db: DatabaseManager):
+        writer = BatchWriter(sms_db, max_latency=1.0)
+        futures = [writer.submit(_insert(str(i))) for i in range(10)]
+        writer.close()
+
+        assert all(f.done() for f in futures)
+        assert _count(sms_db) == 10
+        with pytest.raises(RuntimeError, match="closed"):
+            writer.submit(_insert("late"))
+
+    def test_context_cleanup_flushes_writer(
+        self, test_app_paths, sms_db: DatabaseManager
+    ):
+        writer = BatchWriter(sms_db, max_latency=1.0)
+        context = ApplicationContext(
+            paths=test_app_paths, db_manager=sms_db, db_writer=writer
+        )
+        future = writer.submit(_insert("shutdown"))
+        context.cleanup()
+
+        assert future.done()
+        assert writer.closed
+        reopened = DatabaseManager(sms_db.config)
+        reopened.initialize()
+        assert _count(reopened) == 1
+        reopened.cleanup()
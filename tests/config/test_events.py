@@ -0,0 +1,131 @@
+"""Test the coalescing event bus, headless."""
+
+import asyncio
+import threading
+
+from kit_automate.events import EventBus
+from kit_automate.metrics import MetricsRegistry
+
+
+class TestEventBus:
+    """Test publish, coalescing and delivery."""
+
+    def test_latest_state_per_key(self):
+        bus = EventBus()
+        received = []
+        bus.subscribe("port", received.append)
+
+        for signal in range(5):
+            bus.publish("port", "COM1", {"signal": signal})
+        bus.publish("port", "COM2", {"signal": 9})
+
+        assert bus.dispatch() == 2
+        assert received == [{"COM1": {"signal": 4}, "COM2": {"signal": 9}}]
+        assert bus.dispatch() == 0
+        assert len(received) == 1
+
+    def test_topics_are_separate(self):
+        bus = EventBus()
+        ports, msisdns = [], []
+        bus.subscribe("port", ports.append)
+        bus.subscribe("msisdn", msisdns.append)
+
+        bus.publish("port", "COM1", "ready")
+        bus.publish("msisdn", "COM1", "0812")
+        bus.dispatch()
+
+        assert ports == [{"COM1": "ready"}]
+        assert msisdns == [{"COM1": "0812"}]
+
+    def test_unsubscribe_and_failing_subscriber(self):
+        bus = EventBus()
+        received = []
+
+        def broken(batch):
+            raise RuntimeError("widget gone")
+
+        bus.subscribe("port", broken)
+        unsubscribe = bus.subscribe("port", received.append)
+        bus.publish("port", "COM1", 1)
+        bus.dispatch()
+        unsubscribe()
+        unsubscribe()
+        bus.publish("port", "COM1", 2)
+        bus.dispatch()
+
+        assert received == [{"COM1": 1}]
+
+    def test_unsubscribe_during_dispatch(self):
+        bus = EventBus()
+        received = []
+        unsubscribe = bus.subscribe("port", lambda _: unsubscribe())
+        bus.subscribe("port", received.append)
+        bus.subscribe("port", received.append)
+        bus.publish("port", "COM1", 1)
+        bus.dispatch()
+        bus.publish("port", "COM1", 2)
+        bus.dispatch()
+
+        assert received == [{"COM1": 1}, {"COM1": 1}, {"COM1": 2}, {"COM1": 2}]
+
+    def test_overflow_drops_oldest(self):
+        bus = EventBus(max_pending=3)
+        received = []
+        bus.subscribe("port", received.append)
+
+        for i in range(5):
+            bus.publish("port", f"COM{i}", i)
+        bus.dispatch()
+
+        assert received == [{"COM2": 2, "COM3": 3, "COM4": 4}]
+        assert bus.stats.dropped == 2
+
+    def test_publish_from_threads(self):
+        bus = EventBus()
+        received = {}
+        bus.subscribe("port", received.update)
+
+        def work(port: int) -> None:
+            for i in range(10_000):
+                bus.publish("port", port, i)
+
+        threads = [threading.Thread(target=work, args=(p,)) for p in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        bus.dispatch()
+
+        stats = bus.stats
+        assert received == dict.fromkeys(range(8), 9_999)
+        assert stats.published == 80_000
+        assert stats.delivered == 8
+        assert stats.coalesced == 80_000 - 8
+        assert stats.dropped == 0
+
+    def test_metrics_registry(self):
+        registry = MetricsRegistry()
+        bus = EventBus(metrics=registry)
+        bus.publish("port", "COM1", 1)
+        bus.publish("port", "COM1", 2)
+        bus.dispatch()
+
+        text = registry.to_prometheus()
+        assert "events_published_total 2.0" in text
+        assert "events_coalesced_total 1.0" in text
+
+    async def test_run_caps_frame_rate(self):
+        bus = EventBus()
+        frames = []
+        bus.subscribe("port", frames.append)
+
+        task = asyncio.create_task(bus.run(fps=20))
+        for i in range(30):
+            bus.publish("port", "COM1", i)
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(0.06)
+        task.cancel()
+
+        # ~0.2s at 20 fps: a handful of frames, not one per event
+        assert 2 <= len(frames) <= 8
+        assert frames[-1] == {"COM1": 29}
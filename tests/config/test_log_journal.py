@@ -0,0 +1,135 @@
+"""Test the JSON-lines transaction journal and its offset index."""
+
+from datetime import timedelta
+import json
+
+from loguru import logger
+import pytest
+
+from kit_automate.__main__ import main as cli
+from kit_automate.config import create_application_context
+from kit_automate.config.log_config import (
+    cleanup_logging,
+    flush_logging,
+    setup_logger,
+    setup_testing_logging,
+)
+from kit_automate.config.log_journal import (
+    JournalWriter,
+    index_path,
+    journal_segments,
+    query_journal,
+)
+
+
+def _line(**fields) -> str:
+    return json.dumps(fields, separators=(",", ":")) + "\n"
+
+
+class TestJournalWriter:
+    """Test segment writing, indexing and rotation."""
+
+    def test_index_points_at_records(self, temp_dir):
+        writer = JournalWriter(temp_dir)
+        writer.write(_line(msg="a", msisdn="0811", txn="t1") + _line(msg="b"))
+        writer.write(_line(msg="c", msisdn="0812"))
+        writer.close()
+
+        data = (temp_dir / "transactions.jsonl").read_bytes()
+        entries = index_path(temp_dir / "transactions.jsonl").read_text().splitlines()
+        assert len(entries) == 3
+        for entry in entries:
+            key, value, offset = entry.split("\t")
+            record = json.loads(data[int(offset) :].split(b"\n")[0])
+            assert record[key] == value
+
+    def test_query_across_rotations(self, temp_dir):
+        writer = JournalWriter(temp_dir, rotation_bytes=200)
+        for i in range(50):
+            writer.write(_line(msg=f"step {i}", msisdn=f"081{i % 5}", txn=f"t{i}"))
+        writer.close()
+
+        assert writer.rotations > 5
+        assert len(journal_segments(temp_dir)) == writer.rotations + 1
+        records = list(query_journal(temp_dir, msisdn="0813"))
+        assert [r["msg"] for r in records] == [f"step {i}" for i in range(3, 50, 5)]
+        assert [r["msg"] for r in query_journal(temp_dir, txn="t7")] == ["step 7"]
+        assert list(query_journal(temp_dir, msisdn="0813", txn="t7")) == []
+
+    def test_missing_index_is_rebuilt(self, temp_dir):
+        writer = JournalWriter(temp_dir)
+        writer.write(_line(msg="a", msisdn="0811") + "not json\n")
+        writer.close()
+        index_path(temp_dir / "transactions.jsonl").unlink()
+
+        assert [r["msg"] for r in query_journal(temp_dir, msisdn="0811")] == ["a"]
+
+    def test_unindexed_tail_is_indexed_on_open(self, temp_dir):
+        writer = JournalWriter(temp_dir)
+        writer.write(_line(msg="a", msisdn="0811", txn="t1"))
+        writer.close()
+        # Crash after the data write: one record unindexed, one entry cut short
+        with writer.path.open("ab") as f:
+            f.write(_line(msg="b", msisdn="0811", txn="t2").encode())
+        index = index_path(writer.path)
+        index.write_text(index.read_text(encoding="utf-8") + "msisdn\t08", "utf-8")
+
+        JournalWriter(temp_dir).close()
+
+        assert [r["msg"] for r in query_journal(temp_dir, msisdn="0811")] == ["a", "b"]
+        assert [r["msg"] for r in query_journal(temp_dir, txn="t2")] == ["b"]
+        assert len(index.read_text(encoding="utf-8").splitlines()) == 4
+
+    def test_retention_prunes_segments_and_indexes(self, temp_dir):
+        writer = JournalWriter(temp_dir, rotation_bytes=200, retention=timedelta(0))
+        for i in range(20):
+            writer.write(_line(msg=f"step {i}", msisdn="0811", txn=f"t{i}"))
+        writer.close()
+
+        assert writer.rotations > 2
+        assert journal_segments(temp_dir) == [writer.path]
+        assert sorted(p.name for p in temp_dir.iterdir()) == [
+            "transactions.jsonl",
+            "transactions.jsonl.idx",
+        ]
+
+    def test_query_needs_a_key(self, temp_dir):
+        with pytest.raises(ValueError):
+            list(query_journal(temp_dir))
+
+
+class TestJournalSink:
+    """Test setup_logger(journal=True) end to end."""
+
+    def test_enabled_from_environment(self, temp_dir, monkeypatch):
+        monkeypatch.setenv("LOG_JOURNAL", "true")
+        context = create_application_context(temp_dir)
+        logger.bind(txn="env").info("journaled")
+        flush_logging(timeout=5)
+        context.cleanup()
+        setup_testing_logging()
+
+        records = list(query_journal(context.paths.logs, txn="env"))
+        assert [r["msg"] for r in records] == ["journaled"]
+
+    def test_bound_records_are_journaled(self, temp_dir, capsys):
+        setup_logger(temp_dir, level="WARNING", intercept_stdlib=False, journal=True)
+        txn_log = logger.bind(msisdn="628120001", txn="abc", port="P3")
+        txn_log.info("balance checked")
+        txn_log.bind(phase="otp", duration=1.25).info("otp received")
+        logger.info("no context")
+        flush_logging(timeout=5)
+        cleanup_logging()
+        setup_testing_logging()
+
+        records = list(query_journal(temp_dir, txn="abc"))
+        assert [r["msg"] for r in records] == ["balance checked", "otp received"]
+        assert records[1]["phase"] == "otp"
+        assert records[1]["duration"] == 1.25
+        assert records[0]["port"] == "P3"
+        assert "no context" not in (temp_dir / "transactions.jsonl").read_text()
+
+        capsys.readouterr()
+        assert cli(["--msisdn", "628120001", "--log-dir", str(temp_dir)]) == 0
+        assert len(capsys.readouterr().out.splitlines()) == 2
+        assert cli(["--msisdn", "0000", "--log-dir", str(temp_dir)]) == 1
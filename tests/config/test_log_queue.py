@@ -0,0 +1,108 @@
+"""Test the queue-backed log file sink."""
+
+import threading
+import zipfile
+
+from loguru import logger
+import pytest
+
+from kit_automate.config.log_config import cleanup_logging, flush_logging, setup_logger
+from kit_automate.config.log_queue import QueuedSink, RotatingFileWriter
+
+
+@pytest.fixture
+def writer(temp_dir):
+    return RotatingFileWriter(temp_dir / "app.log", rotation_bytes=1024)
+
+
+class TestQueuedSink:
+    """Test enqueueing, overflow policies and flushing."""
+
+    def test_flush_writes_everything(self, temp_dir):
+        sink = QueuedSink(RotatingFileWriter(temp_dir / "big.log"))
+        for i in range(100):
+            sink(f"line {i}\n")
+
+        assert sink.flush(timeout=5)
+        assert len((temp_dir / "big.log").read_text().splitlines()) == 100
+        assert sink.stats.written == 100
+        sink.close()
+
+    def test_drop_policy_counts_and_reports(self, writer):
+        release = threading.Event()
+        original = writer.write
+
+        def stalled(text: str) -> None:
+            release.wait(5)
+            original(text)
+
+        writer.write = stalled
+        sink = QueuedSink(writer, max_queue=2, overflow="drop")
+        for i in range(20):
+            sink(f"{i}\n")
+        release.set()
+        sink.close()
+
+        assert sink.stats.dropped > 0
+        assert sink.stats.written + sink.stats.dropped == 20
+        assert "dropped" in writer.path.read_text()
+
+    def test_block_policy_never_drops(self, writer):
+        sink = QueuedSink(writer, max_queue=2, overflow="block")
+        for i in range(200):
+            sink(f"{i}\n")
+        sink.close()
+
+        assert sink.stats.dropped == 0
+        assert sink.stats.written == 200
+
+    def test_unknown_policy(self, writer):
+        with pytest.raises(ValueError, match="overflow policy"):
+            QueuedSink(writer, overflow="spill")  # type: ignore[arg-type]
+        writer.close()
+
+
+class TestRotatingFileWriter:
+    """Test size rotation with off-thread compression."""
+
+    def test_rotated_files_are_zipped(self, writer):
+        for i in range(100):
+            writer.write(f"record {i:04d} " + "x" * 40 + "\n")
+        writer.wait_archives()
+        writer.close()
+
+        archives = sorted(writer.path.parent.glob("app.*.log.zip"))
+        assert writer.rotations == len(archives) > 0
+        assert not list(writer.path.parent.glob("app.*.log"))
+        with zipfile.ZipFile(archives[0]) as zf:
+            assert "record 0000" in zf.read(zf.namelist()[0]).decode()
+
+    def test_archive_errors_reach_stderr(self, writer, capsys):
+        def fail(rotated):
+            raise OSError(f"cannot compress {rotated.name}")
+
+        writer._archive = fail
+        writer.write("x" * 1000 + "\n")
+        writer.write("y" * 1000 + "\n")
+        with pytest.raises(OSError):
+            writer.wait_archives()
+        writer.close()
+
+        assert "Log archive error: cannot compress app." in capsys.readouterr().err
+
+
+class TestAsyncLoggingSetup:
+    """Test setup_logger(async_file=True) and cleanup."""
+
+    def test_cleanup_flushes_deterministically(self, temp_dir, capsys):
+        setup_logger(temp_dir, level="WARNING", intercept_stdlib=False)
+        for i in range(500):
+            logger.debug(f"record {i}")
+        assert flush_logging(timeout=5)
+        for i in range(500, 1000):
+            logger.debug(f"record {i}")
+        cleanup_logging()
+
+        content = (temp_dir / "kit-automate.log").read_text()
+        assert "record 999" in content
+        assert content.count("record ") == 1000
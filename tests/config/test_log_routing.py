@@ -0,0 +1,73 @@
+"""Test per-logger level routing for console and stdlib records."""
+
+import logging
+
+from kit_automate.config.log_config import (
+    DEFAULT_NOISY_LOGGERS,
+    _LevelRouter,
+    cleanup_logging,
+    flush_logging,
+    setup_logger,
+    setup_testing_logging,
+)
+
+
+class TestLevelRouter:
+    """Test threshold lookup and caching."""
+
+    def test_thresholds(self):
+        router = _LevelRouter(DEFAULT_NOISY_LOGGERS)
+
+        assert router.threshold("sqlalchemy.engine.Engine") == logging.WARNING
+        assert router.threshold("asyncio") == logging.WARNING
+        assert router.threshold("kit_automate.modem") == 0
+        assert router.threshold("sqlalchemy.orm") == 0
+        assert router.threshold(None) == 0
+
+    def test_app_loggers_never_quieted(self):
+        router = _LevelRouter(["kit_automate.modem"])
+
+        assert router.threshold("kit_automate.modem.pool") == 0
+
+    def test_threshold_is_cached(self):
+        router = _LevelRouter(["noisy"])
+        router.threshold("noisy.child")
+        router.noisy = ()
+
+        assert router.threshold("noisy.child") == logging.WARNING
+        assert router.threshold("noisy.other") == 0
+
+
+class TestStdlibRouting:
+    """Test noisy stdlib records are dropped before reaching loguru."""
+
+    def _run(self, temp_dir, **kwargs) -> str:
+        setup_logger(temp_dir, level="WARNING", **kwargs)
+        logging.getLogger("asyncio").info("loop chatter")
+        logging.getLogger("asyncio").warning("slow callback")
+        logging.getLogger("vendor.lib").info("vendor chatter")
+        logging.getLogger("kit_automate.test").debug("app detail")
+        flush_logging(timeout=5)
+        cleanup_logging()
+        setup_testing_logging()
+        return (temp_dir / "kit-automate.log").read_text()
+
+    def test_default_noisy_loggers(self, temp_dir):
+        text = self._run(temp_dir)
+
+        assert "loop chatter" not in text
+        assert "slow callback" in text
+        assert "vendor chatter" in text
+        assert "app detail" in text
+
+    def test_configured_noisy_loggers(self, temp_dir):
+        text = self._run(temp_dir, noisy_loggers=["vendor"])
+
+        assert "loop chatter" in text
+        assert "vendor chatter" not in text
+
+    def test_quiet_disabled(self, temp_dir):
+        text = self._run(temp_dir, quiet_libraries=False)
+
+        assert "loop chatter" in text
+        assert "vendor chatter" in text
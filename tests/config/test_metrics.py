@@ -0,0 +1,143 @@
+"""Test the metrics registry, Prometheus export and context wiring."""
+
+import asyncio
+import threading
+import urllib.request
+
+import pytest
+
+from kit_automate.metrics import MetricsRegistry, _Metric
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    yield registry
+    registry.close()
+
+
+class TestMetrics:
+    """Test counters, gauges and histograms."""
+
+    def test_counter_sums_threads(self, registry):
+        counter = registry.counter("checks_total")
+
+        def work() -> None:
+            for _ in range(10_000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert counter.value == 80_000
+
+    def test_finished_threads_release_their_cells(self, registry):
+        histogram = registry.histogram("wait_seconds", buckets=(1.0,))
+
+        for _ in range(20):
+            thread = threading.Thread(target=histogram.observe, args=(0.5,))
+            thread.start()
+            thread.join()
+        histogram.observe(2.0)
+
+        assert len(histogram._shards._cells) == 1
+        assert histogram.count == 21
+        assert histogram.sum == 12.0
+
+    def test_get_or_create(self, registry):
+        assert registry.counter("a_total", port="P1") is registry.counter(
+            "a_total", port="P1"
+        )
+        assert registry.counter("a_total", port="P1") is not registry.counter(
+            "a_total", port="P2"
+        )
+        with pytest.raises(ValueError):
+            registry.gauge("a_total")
+        with pytest.raises(ValueError):
+            registry.counter("bad name")
+
+    def test_metric_kinds_must_render_samples(self):
+        class Incomplete(_Metric):
+            kind = "untyped"
+
+        with pytest.raises(TypeError, match="samples"):
+            Incomplete("x", "", ())
+
+    def test_gauge(self, registry):
+        gauge = registry.gauge("open_ports")
+        gauge.set(5)
+        gauge.inc(2)
+        gauge.dec()
+
+        assert gauge.value == 6
+
+    def test_histogram_buckets(self, registry):
+        histogram = registry.histogram("step_seconds", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        text = registry.to_prometheus()
+        assert 'step_seconds_bucket{le="0.1"} 2' in text
+        assert 'step_seconds_bucket{le="1.0"} 3' in text
+        assert 'step_seconds_bucket{le="+Inf"} 4' in text
+        assert "step_seconds_count 4" in text
+        assert histogram.sum == pytest.approx(3.65)
+
+    def test_timers(self, registry):
+        histogram = registry.histogram("call_seconds")
+
+        @histogram.timed
+        def sync_call() -> int:
+            return 1
+
+        @registry.timed("call_seconds")
+        async def async_call() -> int:
+            await asyncio.sleep(0.01)
+            return 2
+
+        with histogram.time():
+            pass
+        assert sync_call() == 1
+        assert asyncio.run(async_call()) == 2
+
+        assert histogram.count == 3
+        assert histogram.sum >= 0.01
+
+    def test_prometheus_format(self, registry):
+        registry.counter("sms_total", "Received SMS", port='P"1').inc(3)
+
+        assert registry.to_prometheus() == (
+            "# HELP sms_total Received SMS\n"
+            "# TYPE sms_total counter\n"
+            'sms_total{port="P\\"1"} 3.0\n'
+        )
+
+
+class TestExport:
+    """Test file and HTTP export."""
+
+    def test_http_endpoint(self, registry):
+        registry.counter("hits_total").inc()
+        host, port = registry.serve(port=0)
+
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics") as response:
+            body = response.read().decode()
+
+        assert "hits_total 1.0" in body
+
+    def test_context_metrics(self, temp_dir, capsys):
+        from kit_automate.config import create_application_context
+
+        context = create_application_context(temp_dir)
+        try:
+            with context.db_manager.get_session():
+                pass
+            path = context.write_metrics()
+        finally:
+            context.cleanup()
+
+        assert path.parent == context.paths.reports
+        assert 'db_session_seconds_count{mode="write"} 1' in path.read_text()
@@ -0,0 +1,97 @@
+"""Test lazy package imports and the startup profile mode."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from kit_automate.config import create_application_context
+from kit_automate.startup import ImportProfiler
+
+
+def _imported_after(statement: str) -> set[str]:
+    code = f"import sys; {statement}; print(' '.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return set(output.split())
+
+
+class TestLazyImports:
+    """Heavy dependencies load on first use only."""
+
+    @pytest.mark.parametrize(
+        "package",
+        ["kit_automate.config", "kit_automate.database", "kit_automate.modem"],
+    )
+    def test_package_import_is_light(self, package):
+        modules = _imported_after(f"import {package}")
+        assert "sqlalchemy" not in modules
+        assert "serial" not in modules
+
+    def test_automation_import_skips_test_doubles(self):
+        modules = _imported_after("import kit_automate.automation")
+        assert "kit_automate.automation.stub" not in modules
+        assert "http.server" not in modules
+
+    def test_export_loads_on_access(self):
+        modules = _imported_after("from kit_automate.modem import ModemPool")
+        assert "serial" in modules
+
+    def test_unknown_attribute(self):
+        import kit_automate.modem
+
+        with pytest.raises(AttributeError, match="NoSuchThing"):
+            kit_automate.modem.NoSuchThing  # noqa: B018
+        assert "ModemPool" in dir(kit_automate.modem)
+
+
+class TestStartupProfile:
+    """Test phase timings and the import tree."""
+
+    def test_phase_timings(self, temp_dir):
+        phases: dict[str, float] = {}
+        context = create_application_context(temp_dir, phase_timings=phases)
+        context.cleanup()
+
+        assert list(phases) == ["paths", "logging", "db_init", "connection_test"]
+        assert all(seconds >= 0 for seconds in phases.values())
+
+    def test_import_tree(self):
+        sys.modules.pop("colorsys", None)
+        with ImportProfiler() as profiler:
+            import colorsys  # noqa: F401
+
+        names = [node.name for node in profiler.root.children]
+        assert "colorsys" in names
+        assert "colorsys" in profiler.format(min_ms=0)
+
+    def test_profile_startup_writes_report(self, temp_dir, monkeypatch, capsys):
+        from kit_automate.__main__ import main
+
+        monkeypatch.chdir(temp_dir)
+        assert main(["--profile-startup"]) == 0
+
+        reports = list((temp_dir / "reports").glob("startup-profile-*.json"))
+        assert len(reports) == 1
+        report = json.loads(reports[0].read_text())
+        assert set(report["phases_ms"]) == {
+            "paths",
+            "logging",
+            "db_init",
+            "connection_test",
+        }
+        assert "create_application_context phases" in capsys.readouterr().out
+
+    def test_profile_startup_failure(self, monkeypatch, capsys):
+        from kit_automate.__main__ import main
+        import kit_automate.config
+
+        def fail(**_):
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(kit_automate.config, "create_application_context", fail)
+
+        assert main(["--profile-startup"]) == 1
+        assert "Startup took" not in capsys.readouterr().out
@@ -1,7 +1,8 @@
 """Global test configuration and fixtures."""
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from pathlib import Path
+import sys
 import tempfile
 
 import pytest
@@ -46,6 +47,26 @@ def test_db_manager(test_app_paths: AppPaths) -> Generator[DatabaseManager, None
     db_manager.cleanup()
 
 
+@pytest.fixture
+def test_file_db_manager(
+    test_app_paths: AppPaths,
+) -> Generator[DatabaseManager, None, None]:
+    """Provide initialized file-backed database manager.
+
+    Needed when several threads must see the same data, which an in-memory
+    database cannot offer.
+    """
+    from kit_automate.config.db_config import DatabaseManager, DbConfig
+
+    config = DbConfig(path=str(test_app_paths.data / "test.db"), profile="throughput")
+    db_manager = DatabaseManager(config)
+    db_manager.initialize()
+
+    yield db_manager
+
+    db_manager.cleanup()
+
+
 @pytest.fixture
 def test_db_session(test_db_manager: DatabaseManager):
     """Provide database session for testing (auto-rollback)."""
@@ -113,6 +134,41 @@ def isolated_logging():
         logger.add(**handler)
 
 
+# ========================================
+# MODEM SIMULATOR FIXTURES
+# ========================================
+
+
+@pytest.fixture
+async def virtual_modems() -> AsyncGenerator:
+    """Provide an empty virtual modem pool; call ``start(count)`` to add modems."""
+    from kit_automate.modem import VirtualModemPool
+
+    if sys.platform == "win32":
+        pytest.skip("virtual modems need pty support")
+
+    simulator = VirtualModemPool()
+    yield simulator
+    simulator.close()
+
+
+@pytest.fixture
+async def simulated_modem_pool(virtual_modems, request) -> AsyncGenerator:
+    """Provide a ModemPool connected to virtual modems.
+
+    The port count defaults to 8; parametrize indirectly to change it.
+    """
+    from kit_automate.modem import ModemPool
+
+    devices = virtual_modems.start(getattr(request, "param", 8))
+    pool = ModemPool(default_timeout=2.0)
+    await pool.open(devices)
+
+    yield pool
+
+    await pool.close()
+
+
 # ========================================
 # PYTEST CONFIGURATION
 # ========================================
@@ -0,0 +1,160 @@
+"""Test the write-through MSISDN cache."""
+
+from datetime import date
+
+import pytest
+
+from kit_automate.config.db_config import DatabaseManager
+from kit_automate.config.db_writer import BatchWriter
+from kit_automate.database import (
+    MsisdnCache,
+    MsisdnRecord,
+    inventory_upsert,
+    upsert_inventory,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def inventory_db(test_file_db_manager: DatabaseManager) -> DatabaseManager:
+    test_file_db_manager.create_tables()
+    upsert_inventory(
+        test_file_db_manager,
+        [_snapshot(f"0812{i:04d}", 1000 + i) for i in range(5)],
+    )
+    return test_file_db_manager
+
+
+def _snapshot(msisdn: str, balance: int) -> dict:
+    return {
+        "msisdn": msisdn,
+        "balance": balance,
+        "expiry": date(2099, 1, 1),
+        "port": "COM1",
+    }
+
+
+class TestMsisdnCache:
+    """Test read-through, eviction and write invalidation."""
+
+    def test_miss_then_hit(self, inventory_db: DatabaseManager):
+        cache = MsisdnCache(inventory_db)
+
+        first = cache.get("08120001")
+        second = cache.get("08120001")
+
+        assert first == second
+        assert first is not None and first.balance == 1001 and first.active
+        assert (cache.stats.misses, cache.stats.hits) == (1, 1)
+        assert cache.get("unknown") is None
+
+    def test_ttl_expiry(self, inventory_db: DatabaseManager):
+        clock = FakeClock()
+        cache = MsisdnCache(inventory_db, ttl=10, clock=clock)
+        cache.get("08120001")
+        clock.now = 11
+
+        cache.get("08120001")
+
+        assert cache.stats.expirations == 1
+        assert cache.stats.misses == 2
+
+    def test_lru_eviction(self, inventory_db: DatabaseManager):
+        cache = MsisdnCache(inventory_db, max_entries=2)
+        cache.get("08120000")
+        cache.get("08120001")
+        cache.get("08120000")  # refresh, 0001 is now least recent
+        cache.get("08120002")
+
+        assert len(cache) == 2
+        assert cache.stats.evictions == 1
+        cache.get("08120000")
+        assert cache.stats.hits == 2
+
+    def test_sync_write_updates_cache(self, inventory_db: DatabaseManager):
+        cache = MsisdnCache(inventory_db)
+        cache.get("08120001")
+
+        result = cache.write([_snapshot("08120001", 5)]).result()
+
+        assert result.updated == 1
+        assert cache.get("08120001").balance == 5  # type: ignore[union-attr]
+        assert cache.stats.hits == 1
+
+    def test_batched_write_never_serves_stale_balance(
+        self, inventory_db: DatabaseManager
+    ):
+        cache = MsisdnCache(inventory_db)
+        writer = BatchWriter(inventory_db, max_latency=0.05)
+        cache.get("08120002")
+
+        future = cache.write([_snapshot("08120002", 7)], writer=writer)
+        # Invalidated immediately: the lookup goes to the database
+        seen = cache.get("08120002")
+        future.result(timeout=5)
+        writer.close()
+
+        assert seen is not None and seen.balance in {1002, 7}
+        assert cache.get("08120002").balance == 7  # type: ignore[union-attr]
+
+    def test_partial_write_invalidates(self, inventory_db: DatabaseManager):
+        cache = MsisdnCache(inventory_db)
+        cache.get("08120003")
+
+        cache.write([{"msisdn": "08120003", "balance": 1}])
+
+        assert len(cache) == 0
+        record = cache.get("08120003")
+        assert record is not None and record.balance == 1 and record.port == "COM1"
+
+    def test_upsert_elsewhere_invalidates(self, inventory_db: DatabaseManager):
+        cache = MsisdnCache(inventory_db)
+        cache.get("08120001")
+
+        upsert_inventory(inventory_db, [_snapshot("08120001", 9)])
+
+        assert cache.get("08120001").balance == 9  # type: ignore[union-attr]
+        assert cache.stats.invalidations == 1
+
+        # The keys are consumed by their commit, not replayed by later ones
+        with inventory_db.get_session() as session:
+            inventory_upsert([_snapshot("08120001", 5)])(session)
+            session.commit()
+            cache.get("08120001")
+            session.commit()
+        assert cache.stats.invalidations == 2
+        assert len(cache) == 1
+
+    def test_writer_upsert_invalidates(self, inventory_db: DatabaseManager):
+        cache = MsisdnCache(inventory_db)
+        writer = BatchWriter(inventory_db)
+        cache.get("08120004")
+
+        writer.submit(inventory_upsert([_snapshot("08120004", 3)])).result(timeout=5)
+        writer.close()
+
+        assert cache.get("08120004").balance == 3  # type: ignore[union-attr]
+
+    def test_closed_cache_stops_listening(self, inventory_db: DatabaseManager):
+        cache = MsisdnCache(inventory_db)
+        cache.get("08120001")
+        cache.close()
+
+        upsert_inventory(inventory_db, [_snapshot("08120001", 9)])
+
+        assert cache.stats.invalidations == 0
+
+    def test_put_and_clear(self, inventory_db: DatabaseManager):
+        cache = MsisdnCache(inventory_db)
+        cache.put(MsisdnRecord("x", 1, None, None))
+        assert cache.get("x") is not None
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats.invalidations == 1
@@ -0,0 +1,141 @@
+"""Test streaming CSV/JSONL exports."""
+
+import csv
+from datetime import date, datetime
+import gzip
+import json
+import tracemalloc
+
+import pytest
+from sqlalchemy import select
+
+from kit_automate.config.db_config import DatabaseManager
+from kit_automate.database import (
+    MsisdnInventory,
+    add_transaction,
+    export_inventory,
+    export_query,
+    export_transactions,
+    upsert_inventory,
+)
+
+
+@pytest.fixture
+def export_db(test_file_db_manager: DatabaseManager) -> DatabaseManager:
+    test_file_db_manager.create_tables()
+    return test_file_db_manager
+
+
+def _fill_inventory(db: DatabaseManager, count: int) -> None:
+    upsert_inventory(
+        db,
+        (
+            {
+                "msisdn": f"62812{i:07d}",
+                "balance": i,
+                "expiry": date(2026, 12, 31),
+                "port": f"COM{i % 8}",
+            }
+            for i in range(count)
+        ),
+    )
+
+
+class TestExport:
+    """Test formats, compression, atomic writes and progress."""
+
+    def test_csv(self, export_db, test_app_paths):
+        _fill_inventory(export_db, 250)
+
+        result = export_inventory(export_db, test_app_paths)
+
+        assert result.rows == 250
+        assert result.path.parent == test_app_paths.exports
+        with result.path.open(newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0][:4] == ["msisdn", "balance", "expiry", "port"]
+        assert rows[1][:4] == ["628120000000", "0", "2026-12-31", "COM0"]
+        assert len(rows) == 251
+        assert list(test_app_paths.temp.iterdir()) == []
+
+    def test_gzip_jsonl(self, export_db, test_app_paths):
+        with export_db.get_session() as session:
+            for day in (1, 2, 3):
+                add_transaction(
+                    session, "0811", "V10", "success", 5000, datetime(2026, 1, day)
+                )
+            session.commit()
+
+        result = export_transactions(
+            export_db,
+            test_app_paths,
+            fmt="jsonl",
+            compress=True,
+            start=date(2026, 1, 2),
+        )
+
+        assert result.path.name.endswith(".jsonl.gz")
+        with gzip.open(result.path, "rt") as f:
+            records = [json.loads(line) for line in f]
+        assert [r["day"] for r in records] == ["2026-01-02", "2026-01-03"]
+        assert records[0]["created_at"] == "2026-01-02T00:00:00"
+
+    def test_progress_per_chunk(self, export_db, test_app_paths):
+        _fill_inventory(export_db, 1000)
+        seen = []
+
+        export_query(
+            export_db,
+            select(MsisdnInventory.msisdn),
+            test_app_paths,
+            "progress",
+            chunk_rows=100,
+            progress=seen.append,
+            progress_every=300,
+        )
+
+        assert seen == [300, 600, 900, 1000]
+
+    def test_failure_leaves_no_file(self, export_db, test_app_paths):
+        _fill_inventory(export_db, 10)
+
+        def fail(rows: int) -> None:
+            raise RuntimeError("cancelled")
+
+        with pytest.raises(RuntimeError):
+            export_inventory(export_db, test_app_paths, progress=fail)
+
+        assert list(test_app_paths.exports.iterdir()) == []
+        assert list(test_app_paths.temp.iterdir()) == []
+
+    def test_same_second_exports_do_not_collide(self, export_db, test_app_paths):
+        _fill_inventory(export_db, 10)
+
+        results = [export_inventory(export_db, test_app_paths) for _ in range(3)]
+
+        assert len({r.path for r in results}) == 3
+        assert all(r.path.exists() and r.rows == 10 for r in results)
+        assert list(test_app_paths.temp.iterdir()) == []
+
+    def test_unknown_format(self, export_db, test_app_paths):
+        with pytest.raises(ValueError):
+            export_inventory(export_db, test_app_paths, fmt="xlsx")  # type: ignore[arg-type]
+
+    def test_memory_is_flat(self, export_db, test_app_paths):
+        statement = select(*MsisdnInventory.__table__.c)
+
+        def peak(count: int) -> int:
+            _fill_inventory(export_db, count)
+            tracemalloc.start()
+            export_query(
+                export_db, statement, test_app_paths, "mem", "jsonl", chunk_rows=200
+            )
+            _, peak_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return peak_bytes
+
+        peak(2_000)  # warm statement caches
+        small = peak(2_000)
+        large = peak(20_000)
+
+        assert large < small * 1.5
@@ -0,0 +1,83 @@
+"""Test bulk upsert of MSISDN inventory."""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from kit_automate.config.db_config import DatabaseManager
+from kit_automate.database import MsisdnInventory, bulk_upsert, upsert_inventory
+from kit_automate.database.inventory import upserted_keys
+
+
+@pytest.fixture
+def inventory_db(test_db_manager: DatabaseManager) -> DatabaseManager:
+    test_db_manager.create_tables()
+    return test_db_manager
+
+
+def _snapshot(i: int, balance: int = 1000) -> dict:
+    return {
+        "msisdn": f"62812{i:07d}",
+        "balance": balance,
+        "expiry": date(2026, 12, 31),
+        "port": f"COM{i % 8}",
+    }
+
+
+class TestBulkUpsert:
+    """Test insert/update/unchanged accounting."""
+
+    def test_first_sweep_inserts_everything(self, inventory_db: DatabaseManager):
+        result = upsert_inventory(inventory_db, [_snapshot(i) for i in range(1200)])
+
+        assert (result.inserted, result.updated, result.unchanged) == (1200, 0, 0)
+        with inventory_db.get_session() as session:
+            assert len(session.execute(select(MsisdnInventory.msisdn)).all()) == 1200
+
+    def test_second_sweep_counts_changes(self, inventory_db: DatabaseManager):
+        upsert_inventory(inventory_db, [_snapshot(i) for i in range(100)])
+        with inventory_db.get_session() as session:
+            before = session.get(MsisdnInventory, "628120000050").updated_at  # type: ignore[union-attr]
+
+        sweep = [_snapshot(i, 500 if i < 10 else 1000) for i in range(105)]
+        result = upsert_inventory(inventory_db, sweep, batch_size=32)
+
+        assert (result.inserted, result.updated, result.unchanged) == (5, 10, 90)
+        with inventory_db.get_session() as session:
+            assert session.get(MsisdnInventory, "628120000003").balance == 500  # type: ignore[union-attr]
+            # Unchanged rows keep their timestamp
+            assert session.get(MsisdnInventory, "628120000050").updated_at == before  # type: ignore[union-attr]
+
+    def test_duplicate_keys_collapse(self, inventory_db: DatabaseManager):
+        rows = [_snapshot(1, 100), _snapshot(1, 200)]
+        result = upsert_inventory(inventory_db, rows)
+
+        assert result.total == 1
+        with inventory_db.get_session() as session:
+            assert session.get(MsisdnInventory, "628120000001").balance == 200  # type: ignore[union-attr]
+
+    def test_upserted_keys_cleared_when_transaction_ends(
+        self, inventory_db: DatabaseManager
+    ):
+        table = MsisdnInventory.__table__
+        name = MsisdnInventory.__tablename__
+        with inventory_db.get_session() as session:
+            bulk_upsert(session, table, [_snapshot(1)], ["msisdn"])
+            with session.begin_nested():
+                bulk_upsert(session, table, [_snapshot(2)], ["msisdn"])
+            assert len(upserted_keys(session, name)) == 2
+            session.commit()
+            assert upserted_keys(session, name) == set()
+
+            bulk_upsert(session, table, [_snapshot(3)], ["msisdn"])
+            session.rollback()
+            assert upserted_keys(session, name) == set()
+
+    def test_rows_must_share_columns(self, inventory_db: DatabaseManager):
+        rows = [{"msisdn": "1", "balance": 1}, {"msisdn": "2"}]
+        with (
+            inventory_db.get_session() as session,
+            pytest.raises(ValueError, match="columns"),
+        ):
+            bulk_upsert(session, MsisdnInventory.__table__, rows, ["msisdn"])  # type: ignore[arg-type]
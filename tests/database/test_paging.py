@@ -0,0 +1,113 @@
+"""Test keyset pagination over the inventory table."""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import Table, insert, select
+
+from kit_automate.config.db_config import DatabaseManager
+from kit_automate.database import KeysetPager, MsisdnInventory
+
+TABLE: Table = MsisdnInventory.__table__  # type: ignore[assignment]
+
+
+@pytest.fixture
+def paging_db(test_file_db_manager: DatabaseManager) -> DatabaseManager:
+    test_file_db_manager.create_tables()
+    with test_file_db_manager.get_session() as session:
+        session.execute(
+            insert(TABLE),
+            [
+                {
+                    "msisdn": f"62812{i:07d}",
+                    # Every fifth balance is unknown, and balances repeat
+                    "balance": None if i % 5 == 0 else i % 40,
+                    "expiry": date(2026, 12, 31),
+                    "port": f"COM{i % 8}",
+                }
+                for i in range(1_000)
+            ],
+        )
+        session.commit()
+    return test_file_db_manager
+
+
+def _read_all(pager: KeysetPager) -> list[tuple]:
+    while pager.fetch_more():
+        pass
+    return [pager.row(i) for i in range(pager.row_count)]
+
+
+def _expected(db: DatabaseManager, *order, where=()) -> list[tuple]:
+    with db.get_read_session() as session:
+        return [
+            tuple(row)
+            for row in session.execute(
+                select(TABLE.c.msisdn, TABLE.c.balance).where(*where).order_by(*order)
+            )
+        ]
+
+
+class TestKeysetPager:
+    """Test paging, sorting, filtering and the page window."""
+
+    def test_pages_in_key_order(self, paging_db):
+        pager = KeysetPager(paging_db, TABLE, ["msisdn", "balance"], page_size=64)
+
+        assert pager.row_count == 0
+        assert pager.fetch_more() == 64
+        assert pager.row_count == 64
+        assert _read_all(pager) == _expected(paging_db, TABLE.c.msisdn)
+        assert not pager.can_fetch_more
+        assert pager.row(pager.row_count) is None
+
+    @pytest.mark.parametrize("descending", [False, True])
+    def test_sort_nullable_column(self, paging_db, descending):
+        pager = KeysetPager(paging_db, TABLE, ["msisdn", "balance"], page_size=37)
+        pager.set_sort("balance", descending)
+
+        balance, msisdn = TABLE.c.balance, TABLE.c.msisdn
+        # NULL balances first ascending, last descending, as SQLite sorts
+        order = [balance, msisdn]
+        if descending:
+            order = [c.desc() for c in order]
+        assert _read_all(pager) == _expected(paging_db, *order)
+
+    def test_filter(self, paging_db):
+        pager = KeysetPager(paging_db, TABLE, ["msisdn", "balance"], page_size=10)
+        pager.set_sort("balance", descending=True)
+        pager.set_filter(TABLE.c.port == "COM3")
+
+        rows = _read_all(pager)
+        assert len(rows) == 125
+        assert rows == _expected(
+            paging_db,
+            TABLE.c.balance.desc(),
+            TABLE.c.msisdn.desc(),
+            where=[TABLE.c.port == "COM3"],
+        )
+
+    def test_window_is_bounded(self, paging_db):
+        pager = KeysetPager(paging_db, TABLE, ["msisdn"], page_size=50, max_pages=3)
+        rows = _read_all(pager)
+
+        assert pager.cached_pages == 3
+        # Evicted pages come back from their start keys
+        assert pager.row(0) == rows[0]
+        assert pager.row(475) == rows[475]
+        assert pager.cached_pages == 3
+
+    def test_before_insert_hook(self, paging_db):
+        pager = KeysetPager(paging_db, TABLE, page_size=400)
+        calls = []
+
+        while pager.fetch_more(lambda first, last: calls.append((first, last))):
+            pass
+
+        assert calls == [(0, 399), (400, 799), (800, 999)]
+
+    def test_unknown_column(self, paging_db):
+        with pytest.raises(ValueError):
+            KeysetPager(paging_db, TABLE, ["nope"])
+        with pytest.raises(ValueError):
+            KeysetPager(paging_db, TABLE).set_sort("nope")
@@ -0,0 +1,102 @@
+"""Test incrementally maintained rekap summaries."""
+
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import update
+
+from kit_automate.config.db_config import DatabaseManager
+from kit_automate.config.db_writer import BatchWriter
+from kit_automate.database import (
+    RekapDaily,
+    add_transaction,
+    rebuild_rekap,
+    rekap_by_day,
+    rekap_by_msisdn,
+    set_transaction_status,
+    verify_rekap,
+)
+
+DAY = date(2026, 10, 17)
+
+
+@pytest.fixture
+def rekap_db(test_file_db_manager: DatabaseManager) -> DatabaseManager:
+    test_file_db_manager.create_tables()
+    return test_file_db_manager
+
+
+def _add(db: DatabaseManager, msisdn: str, product: str, status: str, day=DAY) -> int:
+    with db.get_session() as session:
+        transaction_id = add_transaction(
+            session,
+            msisdn,
+            product,
+            status,
+            amount=10_000,
+            at=datetime.combine(day, datetime.min.time()),
+        )
+        session.commit()
+    return transaction_id
+
+
+class TestRekap:
+    """Test summaries follow inserts and status changes."""
+
+    def test_inserts_are_counted(self, rekap_db):
+        _add(rekap_db, "0811", "V10", "pending")
+        _add(rekap_db, "0811", "V10", "pending")
+        _add(rekap_db, "0812", "V25", "success", day=date(2026, 10, 18))
+
+        rows = rekap_by_day(rekap_db, DAY, DAY)
+        assert [(r.product, r.status, r.count, r.amount) for r in rows] == [
+            ("V10", "pending", 2, 20_000)
+        ]
+        assert len(rekap_by_day(rekap_db, DAY, date(2026, 10, 18))) == 2
+        assert verify_rekap(rekap_db).consistent
+
+    def test_status_change_moves_bucket(self, rekap_db):
+        transaction_id = _add(rekap_db, "0811", "V10", "pending")
+        with rekap_db.get_session() as session:
+            assert set_transaction_status(session, transaction_id, "success")
+            assert not set_transaction_status(session, transaction_id, "success")
+            session.commit()
+
+        assert [(r.status, r.count) for r in rekap_by_msisdn(rekap_db, "0811")] == [
+            ("success", 1)
+        ]
+        assert verify_rekap(rekap_db).consistent
+
+    def test_unknown_transaction(self, rekap_db):
+        with rekap_db.get_session() as session, pytest.raises(ValueError):
+            set_transaction_status(session, 404, "failed")
+
+    def test_batch_writer_path(self, rekap_db):
+        writer = BatchWriter(rekap_db)
+        futures = [
+            writer.submit(
+                lambda s, i=i: add_transaction(s, f"08{i % 3}", "V10", "success")
+            )
+            for i in range(30)
+        ]
+        for future in futures:
+            future.result(timeout=5)
+        writer.close()
+
+        assert sum(r.count for r in rekap_by_msisdn(rekap_db, "080")) == 10
+        assert verify_rekap(rekap_db).consistent
+
+    def test_rebuild_repairs_drift(self, rekap_db):
+        _add(rekap_db, "0811", "V10", "pending")
+        _add(rekap_db, "0812", "V10", "failed")
+        with rekap_db.get_session() as session:
+            session.execute(update(RekapDaily).values(count=RekapDaily.count + 5))
+            session.commit()
+
+        check = verify_rekap(rekap_db)
+        assert check.daily_mismatches == 2
+        assert check.msisdn_mismatches == 0
+
+        assert rebuild_rekap(rekap_db).daily_mismatches == 2
+        assert verify_rekap(rekap_db).consistent
+        assert [r.count for r in rekap_by_day(rekap_db, DAY, DAY)] == [1, 1]
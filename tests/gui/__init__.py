@@ -0,0 +1 @@
+"""GUI model and view tests."""
@@ -0,0 +1,104 @@
+"""Test the paged table model on the offscreen Qt platform."""
+
+import os
+
+import pytest
+from sqlalchemy import Table, insert
+
+pytest.importorskip("PySide6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QModelIndex, Qt
+from PySide6.QtTest import QAbstractItemModelTester
+from PySide6.QtWidgets import QApplication, QTableView
+
+from kit_automate.database import KeysetPager, MsisdnInventory
+from kit_automate.gui import PagedTableModel
+
+pytestmark = pytest.mark.gui
+
+TABLE: Table = MsisdnInventory.__table__  # type: ignore[assignment]
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def model(qapp, test_file_db_manager):
+    test_file_db_manager.create_tables()
+    with test_file_db_manager.get_session() as session:
+        session.execute(
+            insert(TABLE),
+            [
+                {"msisdn": f"62812{i:07d}", "balance": i, "port": f"COM{i % 4}"}
+                for i in range(300)
+            ],
+        )
+        session.commit()
+    pager = KeysetPager(
+        test_file_db_manager,
+        TABLE,
+        ["msisdn", "balance", "port"],
+        page_size=50,
+        max_pages=2,
+    )
+    model = PagedTableModel(pager, ["MSISDN", "Saldo", "Port"])
+    QAbstractItemModelTester(model, QAbstractItemModelTester.FailureReportingMode.Fatal)
+    return model
+
+
+class TestPagedTableModel:
+    """Test fetchMore paging, SQL sorting and filtering."""
+
+    def test_fetch_more(self, model):
+        root = QModelIndex()
+        assert model.rowCount() == 0
+        assert model.canFetchMore(root)
+
+        model.fetchMore(root)
+
+        assert model.rowCount() == 50
+        assert model.columnCount() == 3
+        assert model.data(model.index(0, 0)) == "628120000000"
+        assert model.headerData(1, Qt.Orientation.Horizontal) == "Saldo"
+
+    def test_view_scrolls_in_pages(self, model):
+        view = QTableView()
+        view.setModel(model)
+        view.resize(400, 300)
+        view.show()
+        QApplication.processEvents()
+        assert 0 < model.rowCount() < 300
+
+        while model.canFetchMore(QModelIndex()):
+            model.fetchMore(QModelIndex())
+        assert model.rowCount() == 300
+        assert model.pager.cached_pages <= 2
+        assert model.data(model.index(0, 1)) == 0
+
+    def test_sort_and_filter_in_sql(self, model):
+        model.sort(1, Qt.SortOrder.DescendingOrder)
+        model.fetchMore(QModelIndex())
+        assert model.data(model.index(0, 1)) == 299
+
+        model.setFilter(TABLE.c.port == "COM1")
+        while model.canFetchMore(QModelIndex()):
+            model.fetchMore(QModelIndex())
+        assert model.rowCount() == 75
+        assert model.data(model.index(0, 1)) == 297
+
+    def test_model_contract(self, model):
+        tester = QAbstractItemModelTester(
+            model, QAbstractItemModelTester.FailureReportingMode.Fatal
+        )
+        while model.canFetchMore(QModelIndex()):
+            model.fetchMore(QModelIndex())
+        model.sort(0, Qt.SortOrder.DescendingOrder)
+        model.fetchMore(QModelIndex())
+        model.refresh()
+
+        # The tester may fetch the first page again after the reset
+        assert model.rowCount() <= model.pager.page_size
+        del tester
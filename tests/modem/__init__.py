@@ -0,0 +1 @@
+"""Modem package tests."""
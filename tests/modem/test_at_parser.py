@@ -0,0 +1,132 @@
+"""Property-style tests for the incremental AT stream parser."""
+
+import random
+
+import pytest
+
+from kit_automate.modem import (
+    AtStreamParser,
+    FinalResult,
+    InformationLine,
+    PduPayload,
+    Prompt,
+    Urc,
+)
+
+# (wire bytes, events they must produce)
+FRAGMENTS = [
+    (b"\r\nOK\r\n", [FinalResult("OK")]),
+    (b"\r\nERROR\r\n", [FinalResult("ERROR")]),
+    (b"\r\n+CME ERROR: 10\r\n", [FinalResult("+CME ERROR: 10")]),
+    (b"\r\n+CSQ: 17,99\r\n", [InformationLine("+CSQ: 17,99")]),
+    (b"\r\n+CPIN: READY\r\n", [InformationLine("+CPIN: READY")]),
+    (b'\r\n+CMTI: "SM",12\r\n', [Urc('+CMTI: "SM",12')]),
+    (b"\r\nRING\r\n", [Urc("RING")]),
+    (
+        b'\r\n+CUSD: 0,"Sisa pulsa Rp12.500",15\r\n',
+        [Urc('+CUSD: 0,"Sisa pulsa Rp12.500",15')],
+    ),
+    (
+        b"\r\n+CMT: ,23\r\n07912618010000F0040B916281\r\n",
+        [PduPayload("+CMT: ,23", "07912618010000F0040B916281", True)],
+    ),
+    (
+        b"\r\n+CMGL: 1,1,,23\r\n0791261801\r\n",
+        [PduPayload("+CMGL: 1,1,,23", "0791261801", False)],
+    ),
+    (b"\r\n+CMT: ,0\r\n", [PduPayload("+CMT: ,0", "", True)]),
+    (b"\r\n> ", [Prompt()]),
+    (b"\xff\xfe garbage\r\n", [InformationLine("\xff\xfe garbage")]),
+]
+
+
+def _stream(rng: random.Random, count: int) -> tuple[bytes, list]:
+    wire, expected = bytearray(), []
+    for _ in range(count):
+        data, events = rng.choice(FRAGMENTS)
+        # A prompt is only recognised at the end of a read, never mid-stream
+        if isinstance(events[0], Prompt):
+            continue
+        wire += data
+        expected += events
+    return bytes(wire), expected
+
+
+def _chunks(rng: random.Random, data: bytes) -> list[bytes]:
+    chunks, i = [], 0
+    while i < len(data):
+        size = rng.choice([1, 2, 3, 7, 64, 4096])
+        chunks.append(data[i : i + size])
+        i += size
+    return chunks
+
+
+class TestAtStreamParser:
+    """Chunk boundaries must never change the event sequence."""
+
+    @pytest.mark.parametrize("seed", range(50))
+    def test_random_chunking_is_equivalent(self, seed: int):
+        rng = random.Random(seed)
+        wire, expected = _stream(rng, 200)
+        parser = AtStreamParser()
+
+        events = []
+        for chunk in _chunks(rng, wire):
+            events += parser.feed(chunk)
+
+        assert events == expected
+        assert parser.pending == 0
+
+    def test_bytewise_feed(self):
+        wire, expected = _stream(random.Random(1), 50)
+        parser = AtStreamParser()
+        events = [e for b in wire for e in parser.feed(bytes([b]))]
+        assert events == expected
+
+    def test_urc_inside_response(self):
+        parser = AtStreamParser()
+        events = parser.feed(b'\r\n+CSQ: 20,0\r\n\r\n+CMTI: "SM",1\r\n\r\nOK\r\n')
+        assert events == [
+            InformationLine("+CSQ: 20,0"),
+            Urc('+CMTI: "SM",1'),
+            FinalResult("OK"),
+        ]
+
+    def test_header_without_payload(self):
+        parser = AtStreamParser()
+        assert parser.feed(b"\r\n+CMGR: 1,,24\r\n\r\nERROR\r\n") == [
+            InformationLine("+CMGR: 1,,24"),
+            FinalResult("ERROR"),
+        ]
+
+    def test_zero_length_body(self):
+        parser = AtStreamParser()
+        events = parser.feed(b'\r\n+CMT: ,0\r\n\r\n+CMTI: "SM",1\r\n')
+        assert events == [PduPayload("+CMT: ,0", "", True), Urc('+CMTI: "SM",1')]
+        assert parser.feed(b"\r\n+CMGR: 0,,0\r\n\r\nOK\r\n") == [
+            PduPayload("+CMGR: 0,,0", "", False),
+            FinalResult("OK"),
+        ]
+
+    def test_prompt_and_reset(self):
+        parser = AtStreamParser()
+        assert parser.feed(b"\r\n> ") == [Prompt()]
+        parser.feed(b"half a li")
+        assert parser.pending == 9
+        parser.reset()
+        assert parser.pending == 0
+
+    def test_quoted_body_is_not_a_prompt(self):
+        parser = AtStreamParser()
+        assert parser.feed(b'\r\n+CMT: "+62811","","26/01/02,10:00:00+28"\r\n> ') == []
+        assert parser.feed(b"kutip\r\n") == [
+            PduPayload('+CMT: "+62811","","26/01/02,10:00:00+28"', "> kutip", True)
+        ]
+
+    def test_buffer_is_compacted(self):
+        parser = AtStreamParser()
+        line = b"\r\n+CSQ: 20,0\r\n"
+        for _ in range(2_000):
+            parser.feed(line + b"\r\nO")
+            parser.feed(b"K\r\n")
+        assert len(parser._buffer) < 8192
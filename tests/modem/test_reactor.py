@@ -0,0 +1,210 @@
+"""Test the asyncio modem reactor against pty stand-in modems."""
+
+import asyncio
+import os
+import sys
+import termios
+import tty
+
+import pytest
+
+from kit_automate.modem import (
+    AtTimeoutError,
+    ModemPool,
+    PduPayload,
+    PortClosedError,
+    Urc,
+)
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="needs pty")
+
+REPLIES = {
+    "AT": "OK",
+    "AT+CSQ": "+CSQ: 20,0\r\n\r\nOK",
+    "AT+CPIN?": "+CPIN: READY\r\n\r\nOK",
+    "AT+BAD": "+CME ERROR: 100",
+}
+
+
+class PtyModem:
+    """Minimal modem on the master side of a pty pair."""
+
+    def __init__(self):
+        self.master, slave = os.openpty()
+        tty.setraw(self.master, termios.TCSANOW)
+        self.device = os.ttyname(slave)
+        os.close(slave)
+        os.set_blocking(self.master, False)
+        self.received: list[str] = []
+        self.delay = 0.0  # seconds before each reply
+        self._buffer = b""
+        self._awaiting_payload = False
+        asyncio.get_running_loop().add_reader(self.master, self._on_readable)
+
+    def send(self, text: str) -> None:
+        os.write(self.master, f"\r\n{text}\r\n".encode())
+
+    def reply(self, text: str) -> None:
+        if self.delay:
+            asyncio.get_running_loop().call_later(self.delay, self.send, text)
+        else:
+            self.send(text)
+
+    def _on_readable(self) -> None:
+        try:
+            self._buffer += os.read(self.master, 4096)
+        except OSError:
+            return
+        while True:
+            if self._awaiting_payload:
+                end = self._buffer.find(b"\x1a")
+                if end < 0:
+                    return
+                self.received.append(self._buffer[:end].decode())
+                self._buffer = self._buffer[end + 1 :]
+                self._awaiting_payload = False
+                self.send("+CMGS: 7\r\n\r\nOK")
+                continue
+            end = self._buffer.find(b"\r")
+            if end < 0:
+                return
+            command = self._buffer[:end].decode()
+            self._buffer = self._buffer[end + 1 :]
+            self.received.append(command)
+            if command.startswith("AT+CMGS="):
+                self._awaiting_payload = True
+                os.write(self.master, b"\r\n> ")
+            elif command in REPLIES:
+                self.reply(REPLIES[command])
+
+    def close(self) -> None:
+        if self.master < 0:
+            return
+        asyncio.get_running_loop().remove_reader(self.master)
+        os.close(self.master)
+        self.master = -1
+
+
+@pytest.fixture
+async def pool_with_modems():
+    modems = {f"P{i}": PtyModem() for i in range(4)}
+    urcs: list[tuple[str, str]] = []
+    pool = ModemPool(urc_handler=lambda port, event: urcs.append((port, event)))
+    await pool.open({name: m.device for name, m in modems.items()})
+    yield pool, modems, urcs
+    await pool.close()
+    for modem in modems.values():
+        modem.close()
+
+
+class TestModemReactor:
+    """Test pipelining, timeouts and URC dispatch."""
+
+    async def test_information_response(self, pool_with_modems):
+        pool, _, _ = pool_with_modems
+        response = await pool.send("P0", "AT+CSQ")
+        assert response.ok
+        assert response.lines == ("+CSQ: 20,0",)
+
+    async def test_commands_are_pipelined_in_order(self, pool_with_modems):
+        pool, modems, _ = pool_with_modems
+        commands = ["AT", "AT+CSQ", "AT+CPIN?", "AT"] * 5
+        responses = await asyncio.gather(*(pool.send("P1", c) for c in commands))
+        assert [r.command for r in responses] == commands
+        assert modems["P1"].received == commands
+
+    async def test_error_final_result(self, pool_with_modems):
+        pool, _, _ = pool_with_modems
+        response = await pool.send("P0", "AT+BAD")
+        assert not response.ok
+        assert response.final == "+CME ERROR: 100"
+        assert pool["P0"].stats.errors == 1
+
+    async def test_timeout_does_not_block_queue(self, pool_with_modems):
+        pool, _, _ = pool_with_modems
+        slow = asyncio.create_task(pool.send("P2", "AT+SILENT", timeout=0.1))
+        fast = asyncio.create_task(pool.send("P2", "AT"))
+        with pytest.raises(AtTimeoutError):
+            await slow
+        assert (await fast).ok
+        assert pool["P2"].stats.timeouts == 1
+
+    async def test_urc_interleaved_with_response(self, pool_with_modems):
+        pool, modems, urcs = pool_with_modems
+        modems["P3"].send('+CMTI: "SM",3')
+        response = await pool.send("P3", "AT+CSQ")
+        modems["P3"].send('+CUSD: 0,"Pulsa Rp 5000",15')
+        await pool.send("P3", "AT")
+
+        assert response.lines == ("+CSQ: 20,0",)
+        assert urcs == [
+            ("P3", Urc('+CMTI: "SM",3')),
+            ("P3", Urc('+CUSD: 0,"Pulsa Rp 5000",15')),
+        ]
+
+    async def test_cmt_urc_delivered_with_payload(self, pool_with_modems):
+        pool, modems, urcs = pool_with_modems
+        modems["P2"].send("+CMT: ,24\r\n0791261801000000040C9126")
+        await pool.send("P2", "AT")
+        assert urcs == [
+            ("P2", PduPayload("+CMT: ,24", "0791261801000000040C9126", True))
+        ]
+
+    async def test_prompt_payload(self, pool_with_modems):
+        pool, modems, _ = pool_with_modems
+        response = await pool.send("P0", 'AT+CMGS="0812"', payload="hello")
+        assert response.ok
+        assert response.lines == ("+CMGS: 7",)
+        assert modems["P0"].received[-1] == "hello"
+
+    async def test_payload_larger_than_tty_buffer(self, pool_with_modems):
+        pool, modems, _ = pool_with_modems
+        payload = "x" * 200_000
+
+        response = await pool.send("P1", 'AT+CMGS="0812"', payload=payload)
+
+        assert response.ok
+        assert modems["P1"].received[-1] == payload
+
+    async def test_late_final_result_is_not_misrouted(self, pool_with_modems):
+        pool, modems, _ = pool_with_modems
+        modems["P2"].delay = 0.2
+
+        with pytest.raises(AtTimeoutError):
+            await pool.send("P2", "AT+CSQ", timeout=0.1)
+        response = await pool.send("P2", "AT+CPIN?")
+
+        assert response.lines == ("+CPIN: READY",)
+
+    async def test_close_after_device_loss(self, pool_with_modems):
+        pool, modems, _ = pool_with_modems
+        port = pool["P3"]
+        tasks = list(port._tasks)
+
+        modems["P3"].close()
+        for _ in range(100):
+            if not port.is_open:
+                break
+            await asyncio.sleep(0.01)
+        with pytest.raises(PortClosedError):
+            await port.send("AT")
+        await pool.close()
+
+        assert all(task.done() for task in tasks)
+        assert port._serial is None
+
+    async def test_broadcast_and_close(self, pool_with_modems):
+        pool, _, _ = pool_with_modems
+        results = await pool.broadcast("AT")
+        assert set(results) == {"P0", "P1", "P2", "P3"}
+        port = pool["P0"]
+        await port.close()
+        with pytest.raises(PortClosedError):
+            await port.send("AT")
+
+    async def test_cancelled_send_keeps_port_usable(self, pool_with_modems):
+        pool, _, _ = pool_with_modems
+        task = asyncio.create_task(pool.send("P1", "AT+SILENT", timeout=5))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        assert (await pool.send("P1", "AT")).ok
@@ -0,0 +1,141 @@
+"""Test the SIM check scheduler against simulated ports."""
+
+import asyncio
+import time
+
+import pytest
+
+from kit_automate.modem import Priority, SimCheckScheduler
+
+USSD_LATENCY = 0.02
+
+
+class SimulatedPorts:
+    """Ports whose checks sleep like a USSD session and record overlap."""
+
+    def __init__(self, count: int, latency: float = USSD_LATENCY):
+        self.names = [f"P{i}" for i in range(count)]
+        self.latency = latency
+        self.active: dict[str, int] = dict.fromkeys(self.names, 0)
+        self.max_per_port = 0
+        self.max_global = 0
+        self.order: list[str] = []
+
+    def check(self, port: str, label: str = "", fail: bool = False):
+        async def run() -> str:
+            self.active[port] += 1
+            self.max_per_port = max(self.max_per_port, self.active[port])
+            self.max_global = max(self.max_global, sum(self.active.values()))
+            self.order.append(label)
+            try:
+                await asyncio.sleep(self.latency)
+                if fail:
+                    raise RuntimeError(f"USSD failed on {port}")
+                return f"{port}:{label}"
+            finally:
+                self.active[port] -= 1
+
+        return run
+
+
+@pytest.fixture
+def ports() -> SimulatedPorts:
+    return SimulatedPorts(4)
+
+
+class TestSimCheckScheduler:
+    """Test exclusivity, caps, priorities and backpressure."""
+
+    async def test_sweep_runs_one_check_per_port_in_parallel(self, ports):
+        scheduler = SimCheckScheduler(ports.names)
+        checks = [(p, ports.check(p, str(i))) for i in range(5) for p in ports.names]
+
+        started = time.perf_counter()
+        results = await scheduler.sweep(checks)
+        elapsed = time.perf_counter() - started
+
+        assert results == [f"{p}:{i}" for i in range(5) for p in ports.names]
+        assert ports.max_per_port == 1
+        assert ports.max_global == 4
+        # 20 SIMs / 4 ports = 5 sequential USSD latencies
+        assert elapsed < 5 * USSD_LATENCY * 2
+        assert scheduler.stats.completed == 20
+
+    async def test_global_concurrency_cap(self, ports):
+        scheduler = SimCheckScheduler(ports.names, max_concurrency=2)
+        await scheduler.sweep([(p, ports.check(p)) for p in ports.names * 2])
+
+        assert ports.max_global == 2
+
+    async def test_urgent_check_preempts_queued_sweep(self, ports):
+        scheduler = SimCheckScheduler(ports.names[:1])
+        port = ports.names[0]
+        sweep = asyncio.create_task(
+            scheduler.sweep([(port, ports.check(port, f"s{i}")) for i in range(3)])
+        )
+        await asyncio.sleep(0)
+
+        assert await scheduler.run(port, ports.check(port, "buy"), Priority.URGENT)
+        await sweep
+
+        # s0 was already running; the urgent check goes next
+        assert ports.order == ["s0", "buy", "s1", "s2"]
+
+    async def test_urgent_reserve_keeps_slots_for_urgent(self, ports):
+        scheduler = SimCheckScheduler(ports.names, urgent_reserve=1)
+        sweep = asyncio.create_task(
+            scheduler.sweep([(p, ports.check(p)) for p in ports.names])
+        )
+        await asyncio.sleep(0)
+        assert scheduler.running == 3
+
+        urgent = await scheduler.schedule("P3", ports.check("P3"), Priority.URGENT)
+        assert scheduler.running == 4
+        await urgent
+        await sweep
+
+    async def test_backpressure_bounds_queue(self, ports):
+        scheduler = SimCheckScheduler(ports.names[:1], max_pending_per_port=2)
+        port = ports.names[0]
+        for _ in range(3):  # one running, two queued
+            await scheduler.schedule(port, ports.check(port), Priority.SWEEP)
+
+        blocked = asyncio.create_task(
+            scheduler.schedule(port, ports.check(port), Priority.SWEEP)
+        )
+        await asyncio.sleep(0)
+        assert not blocked.done()
+        assert scheduler.pending(port) == 2
+
+        await asyncio.wait_for(blocked, 1)
+        assert scheduler.stats.backpressure_waits == 1
+        await scheduler.close()
+
+    async def test_failed_check_does_not_stall_port(self, ports):
+        scheduler = SimCheckScheduler(ports.names[:1])
+        port = ports.names[0]
+
+        results = await scheduler.sweep(
+            [(port, ports.check(port, fail=True)), (port, ports.check(port, "ok"))]
+        )
+
+        assert isinstance(results[0], RuntimeError)
+        assert results[1] == f"{port}:ok"
+        assert scheduler.stats.failed == 1
+
+    async def test_close_cancels_queued_checks(self, ports):
+        scheduler = SimCheckScheduler(ports.names[:1])
+        port = ports.names[0]
+        running = await scheduler.schedule(port, ports.check(port))
+        queued = await scheduler.schedule(port, ports.check(port))
+
+        await scheduler.close()
+
+        assert running.result() == f"{port}:"
+        assert queued.cancelled()
+        with pytest.raises(RuntimeError, match="closed"):
+            await scheduler.schedule(port, ports.check(port))
+
+    def test_urgent_reserve_must_leave_capacity(self):
+        with pytest.raises(ValueError, match="urgent_reserve"):
+            SimCheckScheduler(["P0"], urgent_reserve=1)
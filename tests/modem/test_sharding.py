@@ -0,0 +1,233 @@
+"""Test the process-sharded modem pool against virtual modems."""
+
+import asyncio
+from collections.abc import Callable
+import os
+from pathlib import Path
+import signal
+import sys
+
+from loguru import logger
+import pytest
+
+from kit_automate.metrics import MetricsRegistry
+from kit_automate.modem import ModemPool, PduPayload, ShardedModemPool, sharding
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="needs pty")
+
+
+async def _until(predicate: Callable[[], bool]) -> None:
+    """Wait up to 10 seconds (shard restarts spawn a process) for ``predicate``."""
+    for _ in range(500):
+        if predicate():
+            return
+        await asyncio.sleep(0.02)
+    raise AssertionError("condition not reached")
+
+
+async def _answers(pool: ShardedModemPool, name: str) -> bool:
+    try:
+        return (await pool.send(name, "AT")).ok
+    except Exception:
+        return False
+
+
+def _take_marker(device: str) -> bool:
+    marker = Path(device)
+    if marker.suffix != ".crash" or not marker.exists():
+        return False
+    marker.unlink()
+    return True
+
+
+def _shard_crashing_on_open(*args) -> None:
+    """Shard entry point that exits while opening a ``*.crash`` marker device.
+
+    The marker file is removed first, so the restarted shard opens it
+    (and fails like any missing device) without crashing again.
+    """
+    original = ModemPool.open
+
+    async def open(self, devices):
+        if any(_take_marker(device) for device in devices.values()):
+            os._exit(3)
+        await original(self, devices)
+
+    ModemPool.open = open
+    sharding._shard_main(*args)
+
+
+@pytest.fixture
+async def sharded(virtual_modems):
+    pools: list[ShardedModemPool] = []
+
+    async def start(count: int = 8, **kwargs) -> ShardedModemPool:
+        pool = ShardedModemPool(2, default_timeout=2.0, status_interval=0.2, **kwargs)
+        pools.append(pool)
+        await pool.open(virtual_modems.start(count))
+        return pool
+
+    yield start
+    for pool in pools:
+        await pool.close()
+
+
+class TestShardedModemPool:
+    """Test the single-pool API, URC forwarding and supervision."""
+
+    async def test_ports_spread_over_shards(self, sharded):
+        metrics = MetricsRegistry()
+        pool = await sharded(metrics=metrics)
+
+        results = await pool.broadcast("AT+CNUM")
+
+        assert len(pool) == 8
+        assert [s.ports for s in pool.shard_stats()] == [4, 4]
+        assert results["SIM3"].ok
+        assert '"+628120000003"' in results["SIM3"].lines[0]
+        # The eight answers came back in far fewer pipe reads
+        text = metrics.to_prometheus()
+        batches = metrics.counter("modem_ipc_batches_total").value
+        assert metrics.counter("modem_ipc_messages_total").value > batches
+        assert "modem_ipc_batches_total" in text
+
+    async def test_urc_reaches_handler(self, sharded, virtual_modems):
+        received = []
+        pool = await sharded(4)
+        pool.urc_handler = lambda port, event: received.append((port, event))
+
+        virtual_modems["SIM2"].inject_sms("+6281199", "Kode OTP 123456")
+        await _until(lambda: bool(received))
+
+        port, event = received[0]
+        assert port == "SIM2"
+        assert isinstance(event, PduPayload)
+        assert event.data == "Kode OTP 123456"
+
+    async def test_status_reports(self, sharded):
+        pool = await sharded(2)
+        await pool.send("SIM0", "AT")
+
+        await _until(lambda: pool.port_stats.get("SIM0", None) is not None)
+        await _until(lambda: pool.port_stats["SIM0"].commands == 1)
+
+    async def test_unknown_port(self, sharded):
+        pool = await sharded(2)
+
+        with pytest.raises(KeyError):
+            await pool.send("NOPE", "AT")
+
+    async def test_crashed_shard_restarts(self, sharded):
+        pool = await sharded(4)
+        victim = pool.ports["SIM0"]
+        os.kill(pool.shard_stats()[victim].pid, signal.SIGKILL)
+
+        await _until(lambda: pool.shard_stats()[victim].restarts == 1)
+        await _until(lambda: len(pool) == 4)
+        assert pool.ports["SIM0"] == victim
+        assert await _answers(pool, "SIM0")
+
+    async def test_failing_shard_ports_move(self, sharded):
+        pool = await sharded(4, max_restarts=0)
+        victim = pool.ports["SIM0"]
+        os.kill(pool.shard_stats()[victim].pid, signal.SIGKILL)
+
+        await _until(lambda: pool.shard_stats()[victim].retired and len(pool) == 4)
+        assert set(pool.ports.values()) == {1 - victim}
+        assert await _answers(pool, "SIM0")
+
+    async def test_shard_dying_during_open_keeps_its_ports(
+        self, sharded, virtual_modems, temp_dir, monkeypatch
+    ):
+        # Spawned shards import this module to find their entry point
+        monkeypatch.setattr(sharding, "_shard_main", _shard_crashing_on_open)
+        marker = temp_dir / "modem.crash"
+        marker.touch()
+        pool = ShardedModemPool(2, default_timeout=2.0, status_interval=0.2)
+        try:
+            await pool.open({**virtual_modems.start(4), "BAD": str(marker)})
+
+            await _until(lambda: sum(s.restarts for s in pool.shard_stats()) == 1)
+            await _until(lambda: len(pool) == 4)
+            assert "BAD" not in pool.ports
+            assert all([await _answers(pool, f"SIM{i}") for i in range(4)])
+            assert sum(s.ports for s in pool.shard_stats()) == 4
+        finally:
+            await pool.close()
+
+    async def test_shard_logs_reach_parent_logger(self, sharded):
+        records = []
+        sink = logger.add(records.append, level="DEBUG", format="{message}")
+        try:
+            pool = await sharded(1)
+            await pool.open({"BAD": "/nonexistent/ttyBAD"})
+        finally:
+            logger.remove(sink)
+
+        failed = [m.record for m in records if "Cannot open modem port BAD" in m]
+        assert len(failed) == 1
+        assert failed[0]["level"].name == "ERROR"
+        assert failed[0]["name"] == "kit_automate.modem.reactor"
+        assert failed[0]["message"].startswith("[shard ")
+
+    async def test_close_cancels_recovery(self, sharded):
+        pool = await sharded(4)
+        victim = pool.ports["SIM0"]
+        os.kill(pool.shard_stats()[victim].pid, signal.SIGKILL)
+        await _until(lambda: bool(pool._tasks))
+
+        await pool.close()
+
+        assert not pool._tasks
+        assert all(s.pid is None and not s.alive for s in pool.shard_stats())
+
+    async def test_reopen_after_close(self, sharded, virtual_modems):
+        pool = await sharded(2)
+        await pool.close()
+
+        await pool.open(virtual_modems.devices)
+
+        assert len(pool) == 2
+        assert all(s.alive for s in pool.shard_stats())
+        assert await _answers(pool, "SIM1")
+
+
+class TestContextWiring:
+    """Test the pool built by create_application_context."""
+
+    @pytest.mark.parametrize(
+        ("shards", "kind"), [(0, ModemPool), (2, ShardedModemPool)]
+    )
+    def test_modem_pool(self, temp_dir, shards, kind):
+        from kit_automate.config import create_application_context
+
+        context = create_application_context(temp_dir, modem_shards=shards)
+        try:
+            pool = context.modem_pool
+            assert isinstance(pool, kind)
+            assert context.modem_pool is pool
+        finally:
+            context.cleanup()
+
+    async def test_aclose_closes_pool(self, temp_dir, virtual_modems):
+        from kit_automate.config import create_application_context
+
+        context = create_application_context(temp_dir, modem_shards=0)
+        pool = context.modem_pool
+        await pool.open(virtual_modems.start(2))
+        ports = list(pool.ports.values())
+
+        await context.aclose()
+
+        assert len(pool) == 0
+        assert not any(port.is_open for port in ports)
+        assert context._modem_pool is None
+
+    def test_shards_from_environment(self, temp_dir, monkeypatch):
+        from kit_automate.config import create_application_context
+
+        monkeypatch.setenv("MODEM_SHARDS", "3")
+        context = create_application_context(temp_dir)
+        context.cleanup()
+
+        assert context.modem_shards == 3
@@ -0,0 +1,122 @@
+"""Test the modem stack against the virtual modem pool simulator."""
+
+import asyncio
+
+import pytest
+
+from kit_automate.modem import ModemPool, PduPayload, SimProfile, Urc
+from kit_automate.modem.sms import parse_cmt
+
+
+class TestVirtualModem:
+    """Test the simulated AT command set through ModemPool."""
+
+    async def test_identity_commands(self, simulated_modem_pool, virtual_modems):
+        sim = virtual_modems["SIM3"].sim
+
+        pin = await simulated_modem_pool.send("SIM3", "AT+CPIN?")
+        imsi = await simulated_modem_pool.send("SIM3", "AT+CIMI")
+        number = await simulated_modem_pool.send("SIM3", "AT+CNUM")
+
+        assert pin.lines == ("+CPIN: READY",)
+        assert imsi.lines == (sim.imsi,)
+        assert number.lines == (f'+CNUM: "","{sim.msisdn}",145',)
+
+    async def test_unknown_command_errors(self, simulated_modem_pool):
+        response = await simulated_modem_pool.send("SIM0", "AT+NOPE")
+        assert response.final == "ERROR"
+
+    async def test_ussd_answer_arrives_as_urc(self, virtual_modems):
+        urcs: list[tuple[str, Urc | PduPayload]] = []
+        pool = ModemPool(urc_handler=lambda port, event: urcs.append((port, event)))
+        await pool.open(virtual_modems.start(1))
+
+        response = await pool.send("SIM0", 'AT+CUSD=1,"*888#",15')
+        for _ in range(50):
+            if urcs:
+                break
+            await asyncio.sleep(0.01)
+        await pool.close()
+
+        assert response.ok
+        assert urcs[0][0] == "SIM0"
+        assert urcs[0][1].text.startswith('+CUSD: 0,"Sisa pulsa Rp10000')
+
+    async def test_stored_sms_list_read_delete(
+        self, simulated_modem_pool, virtual_modems
+    ):
+        modem = virtual_modems["SIM1"]
+        modem.inject_sms("TOKOPAY", "Kode OTP 482913", store=True)
+        modem.inject_sms("PROMO", "Diskon 50%", store=True)
+        await asyncio.sleep(0.05)
+
+        listed = await simulated_modem_pool.send("SIM1", 'AT+CMGL="ALL"')
+        read = await simulated_modem_pool.send("SIM1", "AT+CMGR=1")
+        await simulated_modem_pool.send("SIM1", "AT+CMGD=1")
+        missing = await simulated_modem_pool.send("SIM1", "AT+CMGR=1")
+
+        assert listed.lines[1] == "Kode OTP 482913"
+        assert listed.lines[2].startswith('+CMGL: 2,"REC UNREAD","PROMO"')
+        assert read.lines[0].startswith('+CMGR: "REC READ","TOKOPAY"')
+        assert missing.final == "+CMS ERROR: 321"
+
+    async def test_send_sms(self, simulated_modem_pool, virtual_modems):
+        response = await simulated_modem_pool.send(
+            "SIM2", 'AT+CMGS="+62811"', payload="halo"
+        )
+
+        assert response.ok
+        assert virtual_modems["SIM2"].sent == [("+62811", "halo")]
+
+    async def test_injected_sms_reaches_urc_handler(self, virtual_modems):
+        received = asyncio.Queue()
+        pool = ModemPool(urc_handler=lambda _, event: received.put_nowait(event))
+        await pool.open(virtual_modems.start(1))
+
+        virtual_modems["SIM0"].inject_sms("TOKOPAY", "Kode OTP 482913")
+        event = await asyncio.wait_for(received.get(), 1)
+        await pool.close()
+
+        assert parse_cmt(event) == ("TOKOPAY", "Kode OTP 482913")
+
+    async def test_latency_and_error_rate(self, virtual_modems):
+        virtual_modems.profile = SimProfile(latency=0.02, error_rate=1.0)
+        pool = ModemPool()
+        await pool.open(virtual_modems.start(1))
+
+        response = await pool.send("SIM0", "AT")
+        await pool.close()
+
+        assert response.final == "+CME ERROR: 100"
+        assert response.elapsed >= 0.02
+
+    async def test_background_traffic_rate(self, virtual_modems):
+        virtual_modems.profile = SimProfile(sms_rate=50, urc_rate=50, seed=7)
+        events: list[tuple[str, Urc | PduPayload]] = []
+        pool = ModemPool(urc_handler=lambda port, event: events.append((port, event)))
+        await pool.open(virtual_modems.start(2))
+
+        await asyncio.sleep(0.5)
+        response = await pool.send("SIM0", "AT+CIMI")
+        await pool.close()
+        background = {name: m.background for name, m in virtual_modems.modems.items()}
+
+        # 100 events per second per port for about half a second; the few
+        # written while the pool closed were never read
+        assert all(20 < count < 150 for count in background.values())
+        assert 0 <= sum(background.values()) - len(events) <= 4
+        assert {port for port, _ in events} == {"SIM0", "SIM1"}
+        assert any(isinstance(event, PduPayload) for _, event in events)
+        assert any(isinstance(event, Urc) for _, event in events)
+        assert response.lines == (virtual_modems["SIM0"].sim.imsi,)
+
+
+class TestPoolScale:
+    """Drive many ports concurrently."""
+
+    @pytest.mark.parametrize("simulated_modem_pool", [8, 64, 256], indirect=True)
+    async def test_broadcast_reaches_every_port(self, simulated_modem_pool):
+        results = await simulated_modem_pool.broadcast("AT+CIMI")
+
+        assert len(results) == len(simulated_modem_pool)
+        assert all(r.ok for r in results.values())
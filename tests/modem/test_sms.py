@@ -0,0 +1,42 @@
+"""Test SMS decoding from +CMT URCs."""
+
+import pytest
+
+from kit_automate.modem.at_parser import PduPayload
+from kit_automate.modem.sms import decode_deliver_pdu, parse_cmt
+
+
+class TestSmsDecoding:
+    def test_numeric_sender_gsm7(self):
+        assert decode_deliver_pdu(
+            "07917283010010F5040BC87238880900F10000993092516195800AE8329BFD4697D9EC37"
+        ) == ("27838890001", "hellohello")
+
+    def test_alphanumeric_sender(self):
+        assert decode_deliver_pdu(
+            "0791448720003023240DD0E474D81C0EBB010000111011315214000BE474D81C0EBB5DE3771B"
+        ) == ("diafaan", "diafaan.com")
+
+    def test_ucs2_body_with_international_sender(self):
+        pdu = (
+            "00"
+            + "04"
+            + "0B912628214365F7"
+            + "00"
+            + "08"
+            + "62107110512200"
+            + "04"
+            + "00410042"
+        )
+        assert decode_deliver_pdu(pdu) == ("+62821234567", "AB")
+
+    def test_malformed_pdu(self):
+        with pytest.raises(ValueError, match="Malformed"):
+            decode_deliver_pdu("0791")
+
+    def test_parse_cmt_text_mode(self):
+        event = PduPayload('+CMT: "+62811","","26/10/17,10:00:00+28"', "OTP 1234", True)
+        assert parse_cmt(event) == ("+62811", "OTP 1234")
+
+    def test_parse_cmt_ignores_other_headers(self):
+        assert parse_cmt(PduPayload("+CMGL: 1,1,,23", "00", False)) is None
@@ -0,0 +1 @@
+"""OTP package tests."""
@@ -0,0 +1,118 @@
+"""Test the OTP waiter registry."""
+
+import asyncio
+
+import pytest
+
+from kit_automate.modem.at_parser import PduPayload, Urc
+from kit_automate.otp import OtpBroker, SmsMessage
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def broker(clock: FakeClock) -> OtpBroker:
+    return OtpBroker(buffer_ttl=30, clock=clock)
+
+
+def _sms(clock: FakeClock, msisdn="0812", sender="TOKOPAY", body="Kode OTP 482913"):
+    return SmsMessage(msisdn, sender, body, received_at=clock.now)
+
+
+class TestOtpBroker:
+    """Test direct resolution, buffering and filtering."""
+
+    async def test_waiter_resolved_by_publish(self, broker, clock):
+        task = asyncio.create_task(broker.wait_for("0812", sender="TOKO"))
+        await asyncio.sleep(0)
+        assert broker.waiting == 1
+
+        clock.now += 0.25
+        assert broker.publish(_sms(clock))
+        match = await task
+
+        assert match.code == "482913"
+        assert match.latency == 0.0
+        assert broker.waiting == 0
+        assert broker.stats.resolved == 1
+
+    async def test_late_waiter_gets_buffered_sms(self, broker, clock):
+        assert not broker.publish(_sms(clock))
+        clock.now += 5
+
+        match = await broker.wait_for("0812", timeout=0.1)
+
+        assert match.code == "482913"
+        assert match.latency == 5
+        assert broker.stats.resolved_from_buffer == 1
+        # Consumed: a second waiter does not get the same code
+        with pytest.raises(TimeoutError):
+            await broker.wait_for("0812", timeout=0.01)
+
+    async def test_buffer_entries_expire(self, broker, clock):
+        broker.publish(_sms(clock))
+        clock.now += 31
+        with pytest.raises(TimeoutError):
+            await broker.wait_for("0812", timeout=0.01)
+        assert broker.stats.expired == 1
+
+    async def test_window_and_sender_filter(self, broker, clock):
+        broker.publish(_sms(clock, body="Kode 111111"))
+        clock.now += 1
+        task = asyncio.create_task(
+            broker.wait_for("0812", sender=r"^TOKOPAY$", since=clock.now)
+        )
+        await asyncio.sleep(0)
+
+        broker.publish(_sms(clock, sender="PROMO", body="Diskon 50000"))
+        broker.publish(_sms(clock, msisdn="0899", body="Kode 222222"))
+        assert not task.done()
+        broker.publish(_sms(clock, body="Kode 333333"))
+
+        assert (await task).code == "333333"
+
+    async def test_non_otp_sms_does_not_resolve(self, broker, clock):
+        task = asyncio.create_task(broker.wait_for("0812", timeout=0.05))
+        await asyncio.sleep(0)
+        assert not broker.publish(_sms(clock, body="Terima kasih"))
+        with pytest.raises(TimeoutError):
+            await task
+        assert broker.stats.timeouts == 1
+
+    async def test_buffer_is_bounded(self, clock):
+        broker = OtpBroker(max_buffered=3, clock=clock)
+        for i in range(5):
+            clock.now += 1
+            broker.publish(_sms(clock, msisdn=f"08{i}"))
+        assert broker._buffered == 3
+        assert set(broker._buffer) == {"082", "083", "084"}
+
+    async def test_urc_handler_publishes_cmt(self, broker, clock):
+        handler = broker.urc_handler({"P1": "0812"})
+        task = asyncio.create_task(broker.wait_for("0812"))
+        await asyncio.sleep(0)
+
+        handler("P1", Urc('+CMTI: "SM",1'))
+        handler("P9", PduPayload('+CMT: "TOKOPAY",,"x"', "OTP 1234", True))
+        handler("P1", PduPayload('+CMT: "TOKOPAY",,"x"', "OTP 5678", True))
+
+        match = await task
+        assert match.code == "5678"
+        assert match.message.port == "P1"
+
+    async def test_publish_threadsafe(self, broker, clock):
+        task = asyncio.create_task(broker.wait_for("0812"))
+        await asyncio.sleep(0)
+        await asyncio.to_thread(broker.publish_threadsafe, _sms(clock))
+        assert (await task).code == "482913"
@@ -0,0 +1,119 @@
+"""Test the sender-indexed OTP rule engine."""
+
+import pytest
+
+from kit_automate.otp import OtpBroker, OtpRule, OtpRuleEngine, SmsMessage
+from kit_automate.otp.rules import RULES_FILE
+
+
+@pytest.fixture
+def engine() -> OtpRuleEngine:
+    return OtpRuleEngine(
+        [
+            OtpRule(
+                "tokopay",
+                r"kode otp[^0-9]*(?P<code>\d{6})",
+                senders=("TOKOPAY",),
+                keywords=("otp",),
+            ),
+            OtpRule(
+                "bank-token",
+                r"token (?P<code>\d{8})",
+                senders=("BANKX", "+6281100"),
+                keywords=("token",),
+            ),
+            OtpRule("generic", r"code:? (?P<code>\d{4,6})", keywords=("code",)),
+        ]
+    )
+
+
+class TestOtpRuleEngine:
+    """Test sender indexing, pre-filtering and rule attribution."""
+
+    def test_sender_specific_rule(self, engine):
+        result = engine.extract("TOKOPAY", "Kode OTP anda: 482913, jangan bagikan")
+        assert (result.code, result.rule) == ("482913", "tokopay")
+
+    def test_sender_is_normalized(self, engine):
+        assert engine.extract(" bankx", "Token 12345678").rule == "bank-token"
+        assert engine.extract("6281100", "token 12345678").code == "12345678"
+
+    def test_wildcard_rules_apply_to_every_sender(self, engine):
+        assert engine.extract("TOKOPAY", "your code 5566").rule == "generic"
+        assert engine.extract("UNKNOWN", "Your code: 9911").rule == "generic"
+
+    def test_specific_rules_do_not_leak_to_other_senders(self, engine):
+        assert engine.extract("UNKNOWN", "Kode OTP 482913") is None
+
+    def test_earliest_match_wins(self, engine):
+        result = engine.extract("TOKOPAY", "code 1111 lalu kode otp 222222")
+        assert (result.code, result.rule) == ("1111", "generic")
+
+    def test_prefilter_rejects_without_regex(self, engine):
+        assert engine.extract("TOKOPAY", "Promo pulsa 50000 murah!") is None
+        assert engine.stats.prefiltered == 1
+        assert engine.stats.matched == 0
+
+    def test_no_rules_for_sender(self):
+        engine = OtpRuleEngine([OtpRule("a", r"(?P<code>\d{4})", senders=("A",))])
+        assert engine.extract("B", "1234") is None
+        assert engine.stats.no_rules == 1
+
+    def test_inline_flags_and_references_combine(self):
+        engine = OtpRuleEngine(
+            [
+                OtpRule("flagged", r"(?s)pin.(?P<code>\d{4})", keywords=("pin",)),
+                OtpRule("twice", r"(?P<code>\d{3})-(?P=code)", keywords=("-",)),
+                OtpRule("numbered", r"(\w)\1 (?P<code>\d{5})", keywords=("zz",)),
+            ]
+        )
+        assert engine.extract("X", "PIN\n4321").rule == "flagged"
+        assert engine.extract("X", "ref 123-124 then 555-555").code == "555"
+        assert engine.extract("X", "ab zz 77777").rule == "numbered"
+        assert engine.extract("X", "zz 1 pin 9876").rule == "flagged"
+
+    @pytest.mark.parametrize(
+        "pattern",
+        [
+            r"\d{6}",
+            r"(?P<code>\d)(?P<other>\d)",
+            r"(?P<code>[0-9",
+            r"kode (?i)(?P<code>\d{6})",
+        ],
+    )
+    def test_invalid_rule_rejected(self, pattern):
+        with pytest.raises(ValueError, match=r"^Rule 'bad'"):
+            OtpRule("bad", pattern)
+
+    async def test_plugs_into_broker(self, engine):
+        broker = OtpBroker(extractor=engine)
+        broker.publish(SmsMessage("0812", "TOKOPAY", "Kode OTP 482913"))
+
+        match = await broker.wait_for("0812", timeout=0.1)
+
+        assert (match.code, match.rule) == ("482913", "tokopay")
+
+
+class TestRuleLoading:
+    """Test loading rules from the configs directory."""
+
+    def test_loads_user_rules(self, test_app_paths):
+        (test_app_paths.configs / RULES_FILE).write_text(
+            "[[rule]]\n"
+            'name = "shop"\n'
+            'senders = ["SHOP"]\n'
+            'keywords = ["pin"]\n'
+            "pattern = 'PIN (?P<code>\\d{4})'\n"
+        )
+
+        engine = OtpRuleEngine.load(test_app_paths)
+
+        assert [r.name for r in engine.rules] == ["shop"]
+        assert engine.extract("SHOP", "PIN 4321").code == "4321"
+
+    def test_falls_back_to_packaged_defaults(self, test_app_paths):
+        engine = OtpRuleEngine.load(test_app_paths)
+
+        assert engine.rules
+        assert engine.extract("ANY", "Kode OTP Anda adalah 123456").code == "123456"
+        assert engine.extract("ANY", "Promo pulsa 50000 murah") is None